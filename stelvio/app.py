@@ -4,7 +4,16 @@ from importlib import import_module
 from pathlib import Path
 from typing import Any, ClassVar, TypeVar, final
 
+import pulumi
 from pulumi import Resource as PulumiResource
+from pulumi.runtime import Mocks, set_mocks
+
+from stelvio import context
+from stelvio.aws._packaging.auto_layers import create_auto_layers
+from stelvio.aws._packaging.file_index import save_file_indexes
+from stelvio.aws._packaging.prefetch import prefetch_dependencies
+from stelvio.aws.function.concurrency import account_reserved_concurrency
+from stelvio.aws.warmer import create_warmers
 
 # Import cleanup functions for both functions and layers
 from stelvio.component import Component, ComponentRegistry
@@ -88,6 +97,17 @@ class StelvioApp:
 
         return run
 
+    def run_offline(self, mocks: Mocks) -> None:
+        """
+        Runs the app's program in-process against mocked resources, in preview mode.
+
+        No Pulumi engine, state or cloud credentials are involved. Returns once all
+        pending resource registrations are done. The app's context must be loaded.
+        """
+        ctx = context()
+        set_mocks(mocks, project=ctx.name, stack=ctx.env, preview=True)
+        pulumi.runtime.test(self._get_pulumi_program_func())()
+
     @staticmethod
     def set_user_link_for(
         component_type: type[Component[T, Any]], func: Callable[[T], LinkConfig]
@@ -98,10 +118,24 @@ class StelvioApp:
     def drive(self) -> None:
         if self._modules:
             self._load_modules(self._modules, get_project_root())
+        # Install dependencies of all known functions and layers concurrently up front so
+        # creating their resources below only hits warm caches
+        prefetch_dependencies()
+        # Functions in dev mode run through the bridge and don't package dependencies
+        if self._app_config and self._app_config.auto_layers and not context().dev_mode:
+            create_auto_layers()
         # Brm brm, vroooom through those infrastructure deployments
         # like an Alfa Romeo through those Stelvio hairpins
         for i in ComponentRegistry.all_instances():
             _ = i.resources
+        # Warmed functions run through the bridge in dev mode, there is nothing to warm
+        if not context().dev_mode:
+            for warmer in create_warmers():
+                _ = warmer.resources
+            account_reserved_concurrency(
+                self._app_config.concurrency_budget if self._app_config else None
+            )
+        save_file_indexes()
 
     def _load_modules(self, modules: list[str], project_root: Path) -> None:
         exclude_dirs = {"__pycache__", "build", "dist", "node_modules", ".egg-info"}
@@ -0,0 +1,447 @@
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+import zipfile
+from collections.abc import Callable, Collection, Generator, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+
+from stelvio.aws._packaging.dependencies import CacheLimits
+from stelvio.project import get_dot_stelvio_dir
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Archive content is either a file on disk or generated text (e.g. stlv_resources.py)
+type ArtifactContent = Path | str
+
+_ACTIVE_ARTIFACTS_FILENAME: Final[str] = "active_artifacts.txt"
+_HASH_CHUNK_SIZE: Final[int] = 1024 * 1024
+# Earliest timestamp the zip format can represent; used for every entry so that
+# identical inputs always produce byte-identical archives
+ZIP_TIMESTAMP: Final[tuple[int, int, int, int, int, int]] = (1980, 1, 1, 0, 0, 0)
+_FILE_MODE: Final[int] = 0o644
+_EXECUTABLE_MODE: Final[int] = 0o755
+_MAX_BUILD_WORKERS: Final[int] = 8
+# 0 stores entries uncompressed, 1-9 are deflate levels
+MIN_COMPRESSION_LEVEL: Final[int] = 0
+MAX_COMPRESSION_LEVEL: Final[int] = 9
+
+logger = logging.getLogger(__name__)
+
+_active_artifacts_file_lock = threading.Lock()
+
+
+def hash_file(path: Path) -> str:
+    """Returns the sha256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_fingerprint(
+    files: Mapping[str, ArtifactContent],
+    keys: Iterable[str] = (),
+    hash_path: Callable[[Path], str] = hash_file,
+) -> str:
+    """
+    Calculates a fingerprint of archive content.
+
+    Args:
+        files: Mapping of archive paths to files on disk or generated text. Files are
+               fingerprinted by content, so touching a file without changing it keeps
+               the fingerprint stable.
+        keys: Opaque keys standing in for content that is already content-addressed,
+              e.g. dependency cache keys, so their files don't have to be read.
+        hash_path: Returns the content hash of a file, e.g. FileIndex.hash to skip
+                   reading files that haven't changed since the last run.
+
+    Returns:
+        Hex digest identifying the archive content.
+    """
+    digest = hashlib.sha256()
+    for archive_path in sorted(files):
+        content = files[archive_path]
+        if isinstance(content, Path):
+            content_hash = hash_path(content)
+        else:
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        digest.update(f"file:{archive_path}:{content_hash}\n".encode())
+    for key in sorted(keys):
+        digest.update(f"key:{key}\n".encode())
+    return digest.hexdigest()
+
+
+def collect_directory_files(directory: Path, prefix: str = "") -> dict[str, Path]:
+    """Maps every file below directory to its archive path under prefix."""
+    return {
+        _join_archive_path(prefix, file_path.relative_to(directory).as_posix()): file_path
+        for file_path in directory.rglob("*")
+        if file_path.is_file()
+    }
+
+
+@dataclass(frozen=True)
+class BuiltArtifact:
+    """An artifact produced, or found up to date, for one component."""
+
+    kind: str
+    component: str
+    fingerprint: str
+    path: Path
+    size: int
+    # Seconds spent building the zip, 0 if it already existed
+    build_time: float
+
+    @property
+    def cached(self) -> bool:
+        return self.build_time == 0
+
+
+@dataclass(frozen=True)
+class _ArtifactRequest:
+    kind: str
+    component: str
+    fingerprint: str
+    path: Path
+    files: Mapping[str, ArtifactContent]
+    directories: Mapping[str, Path]
+    excluded: Collection[str]
+    log_context: str
+    compression_level: int | None
+
+
+class ArtifactCollector:
+    """
+    Collects artifacts requested while packaging instead of building them one by one.
+
+    While active (see collect_artifacts), get_or_build_artifact returns the path an
+    artifact will be stored at and leaves building missing artifacts to build, which
+    builds them concurrently.
+    """
+
+    def __init__(self) -> None:
+        self._requests: list[_ArtifactRequest] = []
+        self._lock = threading.Lock()
+
+    def add(self, request: _ArtifactRequest) -> None:
+        with self._lock:
+            self._requests.append(request)
+
+    def build(self, max_workers: int | None = None) -> list[BuiltArtifact]:
+        """
+        Builds all missing artifacts requested so far.
+
+        Args:
+            max_workers: Upper bound on concurrent builds. Defaults to the number of
+                         CPUs, capped at 8.
+
+        Returns:
+            One entry per requested artifact, in request order.
+        """
+        with self._lock:
+            requests = list(self._requests)
+        # Components with identical content share one artifact
+        missing = {request.path: request for request in requests if not request.path.is_file()}
+        build_times: dict[Path, float] = {}
+        if missing:
+            workers = max_workers or min(_MAX_BUILD_WORKERS, os.cpu_count() or 1)
+            workers = min(workers, len(missing))
+            logger.info("Building %d artifact(s) with %d worker(s).", len(missing), workers)
+
+            def build_one(request: _ArtifactRequest) -> float:
+                start = time.perf_counter()
+                _build_artifact(request)
+                return time.perf_counter() - start
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stlv-build") as ex:
+                futures = {path: ex.submit(build_one, req) for path, req in missing.items()}
+            build_times = {path: future.result() for path, future in futures.items()}
+
+        return [
+            BuiltArtifact(
+                kind=request.kind,
+                component=request.component,
+                fingerprint=request.fingerprint,
+                path=request.path,
+                size=request.path.stat().st_size,
+                build_time=build_times.get(request.path, 0),
+            )
+            for request in requests
+        ]
+
+
+_artifact_collector: ArtifactCollector | None = None
+
+
+@contextmanager
+def collect_artifacts() -> Generator[ArtifactCollector, None, None]:
+    """Defers building artifacts requested within the block to the yielded collector."""
+    global _artifact_collector  # noqa: PLW0603
+    previous, _artifact_collector = _artifact_collector, ArtifactCollector()
+    try:
+        yield _artifact_collector
+    finally:
+        _artifact_collector = previous
+
+
+def is_collecting_artifacts() -> bool:
+    """True within collect_artifacts, where missing zips are only built by the collector."""
+    return _artifact_collector is not None
+
+
+def get_or_build_artifact(  # noqa: PLR0913
+    kind: str,
+    fingerprint: str,
+    files: Mapping[str, ArtifactContent],
+    *,
+    directories: Mapping[str, Path] | None = None,
+    log_context: str = "",
+    excluded: Collection[str] = (),
+    component: str = "",
+    compression_level: int | None = None,
+) -> Path:
+    """
+    Returns the zip stored for fingerprint, building it first if it doesn't exist yet.
+
+    Args:
+        kind: Subdirectory within .stelvio/artifacts (e.g., "functions").
+        fingerprint: Fingerprint of the archive content, see compute_fingerprint.
+        files: Mapping of archive paths to files on disk or generated text.
+        directories: Mapping of archive path prefixes to directories whose files are
+                     added below that prefix. Entries from files take precedence.
+        log_context: A string identifier for logging (e.g., function name).
+        excluded: Archive paths of directory entries to leave out. The fingerprint
+                  must account for them.
+        component: Name of the component the artifact belongs to, reported by
+                   ArtifactCollector.build.
+        compression_level: 0 to store entries uncompressed, 1-9 for deflate levels.
+                           Defaults to zlib's default level. The fingerprint must
+                           account for it.
+
+    Returns:
+        Absolute path to the zip file. Within collect_artifacts, a missing zip is only
+        built by the collector.
+    """
+    artifacts_dir = _get_artifacts_dir(kind)
+    artifact_path = artifacts_dir / f"{fingerprint}.zip"
+    _mark_artifact_as_active(artifact_path)
+
+    request = _ArtifactRequest(
+        kind=kind,
+        component=component,
+        fingerprint=fingerprint,
+        path=artifact_path,
+        files=files,
+        directories=directories or {},
+        excluded=excluded,
+        log_context=log_context,
+        compression_level=compression_level,
+    )
+    if _artifact_collector is not None:
+        _artifact_collector.add(request)
+
+    if artifact_path.is_file():
+        logger.info("[%s] Artifact hit for fingerprint '%s'.", log_context, fingerprint[:16])
+        return artifact_path
+
+    if _artifact_collector is not None:
+        logger.debug("[%s] Deferring build of '%s'.", log_context, fingerprint[:16])
+        return artifact_path
+
+    _build_artifact(request)
+    return artifact_path
+
+
+def _build_artifact(request: _ArtifactRequest) -> None:
+    log_context, fingerprint = request.log_context, request.fingerprint
+    logger.info(
+        "[%s] Artifact miss for fingerprint '%s'. Building.", log_context, fingerprint[:16]
+    )
+    entries: dict[str, ArtifactContent] = {}
+    for prefix, directory in request.directories.items():
+        entries |= collect_directory_files(directory, prefix)
+    for archive_path in request.excluded:
+        entries.pop(archive_path, None)
+    entries |= request.files
+
+    artifacts_dir = request.path.parent
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    # Build next to the final location and rename so concurrent readers never see
+    # a partially written archive
+    tmp_path = artifacts_dir / f"{fingerprint}.zip.{os.getpid()}.{threading.get_ident()}.tmp"
+    start = time.perf_counter()
+    try:
+        write_deterministic_zip(tmp_path, entries, request.compression_level)
+        tmp_path.replace(request.path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    logger.debug(
+        "[%s] Wrote %d entries (%d bytes) to %s in %.2fs.",
+        log_context,
+        len(entries),
+        request.path.stat().st_size,
+        request.path,
+        time.perf_counter() - start,
+    )
+
+
+def write_deterministic_zip(
+    destination: Path,
+    entries: Mapping[str, ArtifactContent],
+    compression_level: int | None = None,
+) -> None:
+    """
+    Writes entries sorted by name with fixed timestamps and normalized permissions.
+
+    Files are streamed into the archive in fixed-size chunks, so memory use doesn't
+    grow with the size of the files.
+    """
+    compression, level = _get_compression(compression_level)
+    with zipfile.ZipFile(destination, "w", compression=compression) as archive:
+        for archive_path in sorted(entries):
+            content = entries[archive_path]
+            info = zipfile.ZipInfo(archive_path, date_time=ZIP_TIMESTAMP)
+            info.compress_type = compression
+            info._compresslevel = level  # noqa: SLF001
+            info.create_system = 3  # Unix, so external_attr carries permission bits
+            if isinstance(content, Path):
+                mode = _EXECUTABLE_MODE if os.access(content, os.X_OK) else _FILE_MODE
+                info.external_attr = (0o100000 | mode) << 16
+                # Lets zipfile pick ZIP64 headers upfront for files too large for zip
+                info.file_size = content.stat().st_size
+                with content.open("rb") as src, archive.open(info, "w") as dst:
+                    shutil.copyfileobj(src, dst, _HASH_CHUNK_SIZE)
+            else:
+                info.external_attr = (0o100000 | _FILE_MODE) << 16
+                archive.writestr(info, content)
+
+
+def validate_compression_level(compression_level: int | None) -> None:
+    if compression_level is None:
+        return
+    if isinstance(compression_level, bool) or not isinstance(compression_level, int):
+        raise TypeError("'compression_level' must be an integer")
+    if not MIN_COMPRESSION_LEVEL <= compression_level <= MAX_COMPRESSION_LEVEL:
+        raise ValueError(
+            f"'compression_level' must be between {MIN_COMPRESSION_LEVEL} (store) "
+            f"and {MAX_COMPRESSION_LEVEL}"
+        )
+
+
+def _get_compression(compression_level: int | None) -> tuple[int, int | None]:
+    if compression_level == 0:
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, compression_level
+
+
+def get_peak_rss() -> int | None:
+    """
+    Returns the peak resident memory of this process in bytes, None if unknown.
+
+    The peak covers the whole process so far, not a single artifact.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _join_archive_path(prefix: str, relative_path: str) -> str:
+    return f"{prefix.rstrip('/')}/{relative_path}" if prefix else relative_path
+
+
+def _get_artifacts_dir(kind: str) -> Path:
+    return get_dot_stelvio_dir() / "artifacts" / kind
+
+
+def _mark_artifact_as_active(path: Path) -> None:
+    """Protects an artifact from eviction and refreshes its last-used time."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    active_file = path.parent / _ACTIVE_ARTIFACTS_FILENAME
+    with _active_artifacts_file_lock, active_file.open("a", encoding="utf-8") as f:
+        f.write(f"{path.stem}\n")
+    # The file's modification time is its last-used time. Artifacts that don't exist
+    # yet get a fresh one when they are built.
+    with suppress(FileNotFoundError):
+        os.utime(path)
+
+
+def clean_active_artifacts_file(kind: str) -> None:
+    active_file = _get_artifacts_dir(kind) / _ACTIVE_ARTIFACTS_FILENAME
+    active_file.unlink(missing_ok=True)
+
+
+def evict_artifacts(limits: CacheLimits) -> list[str]:
+    """
+    Removes artifacts older than the maximum age, then the least recently used ones
+    until the artifacts fit into the maximum size.
+
+    Zips and bytecode of all kinds compete for the same space, with the limits of the
+    dependency caches. Artifacts the current command used are never removed, those
+    of other environments stay until they are evicted.
+
+    Returns:
+        Removed artifacts, as "<kind>/<file name>".
+    """
+    root = get_dot_stelvio_dir() / "artifacts"
+    if not root.is_dir():
+        return []
+    candidates: list[tuple[float, int, str, Path]] = []
+    used: set[str] = set()
+    for kind_dir in root.iterdir():
+        if kind_dir.is_dir():
+            used |= _collect_artifacts_of_kind(kind_dir, candidates)
+    candidates.sort(key=lambda candidate: candidate[0])
+
+    now = time.time()
+    total = sum(size for _, size, _, _ in candidates)
+    removed: list[str] = []
+    for mtime, size, name, path in candidates:
+        if name in used:
+            continue
+        expired = limits.max_age is not None and now - mtime > limits.max_age
+        oversized = limits.max_size is not None and total > limits.max_size
+        if not expired and not oversized:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+        removed.append(name)
+        logger.debug("Evicted artifact '%s'.", name)
+    if removed:
+        logger.info("Evicted %d unused artifacts.", len(removed))
+    return removed
+
+
+def _collect_artifacts_of_kind(
+    kind_dir: Path, candidates: list[tuple[float, int, str, Path]]
+) -> set[str]:
+    """Adds (mtime, size, name, path) of every artifact to candidates, returns active ones."""
+    active_file = kind_dir / _ACTIVE_ARTIFACTS_FILENAME
+    active = (
+        set(active_file.read_text(encoding="utf-8").splitlines())
+        if active_file.is_file()
+        else set()
+    )
+    used: set[str] = set()
+    for item in kind_dir.iterdir():
+        if item == active_file or item.name.endswith(".tmp") or not item.is_file():
+            continue
+        name = f"{kind_dir.name}/{item.name}"
+        if item.stem in active:
+            used.add(name)
+        stat = item.stat()
+        candidates.append((stat.st_mtime, stat.st_size, name, item))
+    return used
@@ -0,0 +1,207 @@
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Final
+
+from stelvio.aws._packaging.dependencies import (
+    DependencyInstall,
+    get_or_install_dependencies,
+    install_dependencies_concurrently,
+)
+from stelvio.aws._packaging.package_store import InstalledDistribution, read_distributions
+from stelvio.aws.function import Function
+from stelvio.aws.function.constants import MAX_LAMBDA_LAYERS
+from stelvio.aws.function.dependencies import _get_function_dependency_install
+from stelvio.aws.function.function import AutoLayersRegistry
+from stelvio.aws.layer import Layer, _get_layer_dependency_install
+from stelvio.component import ComponentRegistry
+from stelvio.project import get_project_root
+
+# Shared packages smaller than this aren't worth an extra layer
+_MIN_AUTO_LAYER_BYTES: Final[int] = 1024 * 1024
+_AUTO_LAYER_NAME_PREFIX: Final[str] = "auto-deps"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AutoLayerReport:
+    """Outcome of moving shared dependencies of one function into automatic layers."""
+
+    function_name: str
+    layer_names: tuple[str, ...]
+    bytes_saved: int
+
+
+@dataclass(frozen=True)
+class _FunctionDependencies:
+    function: Function
+    runtime: str
+    architecture: str
+    distributions: dict[str, InstalledDistribution]
+
+
+def create_auto_layers() -> list[AutoLayerReport]:
+    """
+    Moves dependencies shared by several functions into generated layers.
+
+    Works on the installed dependency caches of all Functions registered so far, so it
+    must run after their dependencies are installed. Distributions installed in the same
+    version by two or more functions of the same runtime and architecture are grouped
+    by the set of functions using them. Each group large enough to be worth it becomes
+    a Layer (largest savings first) as long as every function in the group has a free
+    layer slot. The layer's distributions are then left out of those functions' zips.
+
+    Returns:
+        One report per function that got at least one automatic layer.
+    """
+    dependencies = _collect_function_dependencies()
+    planned: list[tuple[Layer, DependencyInstall, list[_FunctionDependencies]]] = []
+    free_slots = {
+        deps.function.name: MAX_LAMBDA_LAYERS - len(deps.function.config.layers or [])
+        for deps in dependencies
+    }
+
+    partitions: dict[tuple[str, str], list[_FunctionDependencies]] = {}
+    for deps in dependencies:
+        partitions.setdefault((deps.runtime, deps.architecture), []).append(deps)
+
+    for (runtime, architecture), members in sorted(partitions.items()):
+        for group, distributions in _find_shared_groups(members):
+            if any(free_slots[deps.function.name] < 1 for deps in group):
+                continue
+            layer = _create_layer(distributions, runtime, architecture)
+            install = _get_layer_dependency_install(layer.name, layer.config)
+            planned.append((layer, install, group))
+            for deps in group:
+                free_slots[deps.function.name] -= 1
+
+    if not planned:
+        logger.info("No shared dependencies worth an automatic layer.")
+        return []
+
+    project_root = get_project_root()
+    install_dependencies_concurrently([install for _, install, _ in planned], project_root)
+
+    saved: dict[Function, tuple[list[str], int]] = {}
+    for layer, install, group in planned:
+        layer_cache_dir = get_or_install_dependencies(
+            requirements_source=install.requirements_source,
+            runtime=install.runtime,
+            architecture=install.architecture,
+            project_root=project_root,
+            cache_subdirectory=install.cache_subdirectory,
+            log_context=install.log_context,
+        )
+        # The layer may contain more than planned (e.g. dependencies of the pinned
+        # packages), anything it contains in the same version is left out of functions
+        layer_keys = {distribution.key for distribution in read_distributions(layer_cache_dir)}
+        for deps in group:
+            excluded = [dist for key, dist in deps.distributions.items() if key in layer_keys]
+            AutoLayersRegistry.add(deps.function, layer, excluded)
+            layer_names, bytes_saved = saved.get(deps.function, ([], 0))
+            saved[deps.function] = (
+                [*layer_names, layer.name],
+                bytes_saved + sum(dist.size for dist in excluded),
+            )
+
+    reports = [
+        AutoLayerReport(
+            function_name=function.name, layer_names=tuple(names), bytes_saved=bytes_saved
+        )
+        for function, (names, bytes_saved) in saved.items()
+    ]
+    _log_reports(reports, len(planned))
+    return reports
+
+
+def _collect_function_dependencies() -> list[_FunctionDependencies]:
+    project_root = get_project_root()
+    dependencies = []
+    for function in ComponentRegistry.instances_of(Function):
+        install = _get_function_dependency_install(function.config)
+        if install is None:
+            continue
+        cache_dir = get_or_install_dependencies(
+            requirements_source=install.requirements_source,
+            runtime=install.runtime,
+            architecture=install.architecture,
+            project_root=project_root,
+            cache_subdirectory=install.cache_subdirectory,
+            log_context=install.log_context,
+        )
+        dependencies.append(
+            _FunctionDependencies(
+                function=function,
+                runtime=install.runtime,
+                architecture=install.architecture,
+                distributions={dist.key: dist for dist in read_distributions(cache_dir)},
+            )
+        )
+    return dependencies
+
+
+def _find_shared_groups(
+    members: list[_FunctionDependencies],
+) -> list[tuple[list[_FunctionDependencies], list[InstalledDistribution]]]:
+    """Groups shared distributions by the functions using them, best savings first."""
+    users: dict[str, list[_FunctionDependencies]] = {}
+    distributions: dict[str, InstalledDistribution] = {}
+    for deps in members:
+        for key, distribution in deps.distributions.items():
+            users.setdefault(key, []).append(deps)
+            distributions[key] = distribution
+
+    groups: dict[tuple[str, ...], list[InstalledDistribution]] = {}
+    group_members: dict[tuple[str, ...], list[_FunctionDependencies]] = {}
+    for key, key_users in users.items():
+        if len(key_users) < 2:  # noqa: PLR2004
+            continue
+        group_key = tuple(sorted(deps.function.name for deps in key_users))
+        groups.setdefault(group_key, []).append(distributions[key])
+        group_members[group_key] = key_users
+
+    candidates = [
+        (group_members[group_key], sorted(dists, key=lambda dist: dist.key))
+        for group_key, dists in groups.items()
+        if sum(dist.size for dist in dists) >= _MIN_AUTO_LAYER_BYTES
+    ]
+    # Every function but one would otherwise upload its own copy
+    return sorted(
+        candidates,
+        key=lambda candidate: (
+            -sum(dist.size for dist in candidate[1]) * (len(candidate[0]) - 1),
+            [deps.function.name for deps in candidate[0]],
+        ),
+    )
+
+
+def _create_layer(
+    distributions: list[InstalledDistribution], runtime: str, architecture: str
+) -> Layer:
+    requirements = [f"{dist.name}=={dist.version}" for dist in distributions]
+    # Named by content so unchanged groups keep their layer across deployments
+    digest = hashlib.sha256(
+        "\n".join([runtime, architecture, *requirements]).encode("utf-8")
+    ).hexdigest()
+    return Layer(
+        f"{_AUTO_LAYER_NAME_PREFIX}-{digest[:8]}",
+        requirements=requirements,
+        runtime=runtime,
+        architecture=architecture,
+    )
+
+
+def _log_reports(reports: list[AutoLayerReport], layer_count: int) -> None:
+    for report in sorted(reports, key=lambda r: r.function_name):
+        logger.info(
+            "[Function: %s] %s replace %.1f MB of dependencies.",
+            report.function_name,
+            ", ".join(report.layer_names),
+            report.bytes_saved / (1024 * 1024),
+        )
+    logger.info(
+        "Created %d automatic layer(s), function zips are %.1f MB smaller in total.",
+        layer_count,
+        sum(report.bytes_saved for report in reports) / (1024 * 1024),
+    )
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from collections.abc import Callable, Mapping
+from functools import cache
+from pathlib import Path, PurePosixPath
+from typing import Final
+
+from stelvio.aws._packaging.artifacts import (
+    _get_artifacts_dir,
+    _mark_artifact_as_active,
+    clean_active_artifacts_file,
+    hash_file,
+)
+from stelvio.aws._packaging.dependencies import _mark_cache_dir_as_used
+from stelvio.aws._packaging.slim import _link_or_copy
+
+_PRECOMPILED_VARIANT_SUFFIX: Final[str] = "__pyc"
+_BYTECODE_ARTIFACTS_KIND: Final[str] = "bytecode"
+# Compiles (source, cfile, dfile) triples read from stdin with the target interpreter
+_COMPILE_SOURCES_SCRIPT: Final[str] = """
+import json, py_compile, sys
+for source, cfile, dfile in json.load(sys.stdin):
+    py_compile.compile(
+        source, cfile=cfile, dfile=dfile, doraise=False,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def get_or_create_precompiled_variant(
+    cache_dir: Path, runtime: str, cache_subdirectory: str, runtime_path: str, log_context: str
+) -> Path:
+    """
+    Returns a copy of a dependency directory with bytecode for the target runtime.
+
+    The variant lives next to cache_dir and is named after it, so it's compiled once
+    per dependency cache key. Files are hard linked from cache_dir, pycs are written
+    with unchecked-hash invalidation so Lambda never stats or recompiles sources.
+
+    Args:
+        cache_dir: Dependency cache directory (or its slimmed variant).
+        runtime: The target Python runtime (e.g., "python3.12").
+        cache_subdirectory: Subdirectory within .stelvio/lambda_dependencies the
+                            cache directory lives in (e.g., "functions").
+        runtime_path: Directory the files end up in on Lambda (e.g., "/var/task"),
+                      used for file names in tracebacks.
+        log_context: A string identifier for logging (e.g., function name).
+
+    Returns:
+        Absolute path to the precompiled directory.
+
+    Raises:
+        RuntimeError: If no interpreter matching the runtime can be found.
+    """
+    variant_name = f"{cache_dir.name}{_PRECOMPILED_VARIANT_SUFFIX}"
+    variant_dir = cache_dir.parent / variant_name
+    _mark_cache_dir_as_used(variant_name, cache_subdirectory)
+
+    if variant_dir.is_dir():
+        logger.info("[%s] Precompiled dependencies hit for '%s'.", log_context, variant_name)
+        return variant_dir
+
+    interpreter = find_interpreter(runtime)
+    tmp_dir = cache_dir.parent / f"{variant_name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        for file_path in cache_dir.rglob("*"):
+            if file_path.is_file():
+                target = tmp_dir / file_path.relative_to(cache_dir)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                _link_or_copy(file_path, target)
+        cmd = [
+            interpreter,
+            "-m",
+            "compileall",
+            "-q",
+            "-f",
+            "-j",
+            "0",
+            "--invalidation-mode",
+            "unchecked-hash",
+            "-s",
+            str(tmp_dir),
+            "-p",
+            runtime_path,
+            str(tmp_dir),
+        ]
+        logger.info("[%s] Precompiling dependencies: %s", log_context, " ".join(cmd))
+        result = subprocess.run(cmd, capture_output=True, check=False, text=True)  # noqa: S603
+        if result.returncode != 0:
+            # Some packages ship files that aren't valid for the runtime (e.g. templates
+            # named *.py), those are simply left without bytecode
+            logger.warning(
+                "[%s] Some dependency files could not be precompiled, they will be "
+                "compiled by Lambda instead. Run with -vv for details.",
+                log_context,
+            )
+            logger.debug("[%s] compileall output:\n%s", log_context, result.stdout)
+        tmp_dir.rename(variant_dir)
+    except OSError:
+        # Another process created the same variant in the meantime
+        if not variant_dir.is_dir():
+            raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return variant_dir
+
+
+def compile_sources(
+    files: Mapping[str, Path],
+    runtime: str,
+    runtime_path: str,
+    hash_path: Callable[[Path], str] = hash_file,
+) -> dict[str, Path]:
+    """
+    Compiles Python sources with the target interpreter, caching pycs by content.
+
+    Pycs use unchecked-hash invalidation, so Lambda never stats or recompiles sources.
+
+    Args:
+        files: Mapping of archive paths to source files. Only *.py files are compiled.
+        runtime: The target Python runtime (e.g., "python3.12").
+        runtime_path: Directory archive paths are relative to on Lambda.
+        hash_path: Returns the content hash of a file.
+
+    Returns:
+        Mapping of archive paths of the pycs (in __pycache__ next to their source) to
+        the compiled files.
+    """
+    cache_tag = _cache_tag(runtime)
+    bytecode_dir = _get_artifacts_dir(_BYTECODE_ARTIFACTS_KIND)
+
+    compiled: dict[str, Path] = {}
+    missing: list[tuple[str, str, str]] = []
+    for archive_path, source in files.items():
+        path = PurePosixPath(archive_path)
+        if path.suffix != ".py":
+            continue
+        dfile = f"{runtime_path.rstrip('/')}/{archive_path}"
+        key = hashlib.sha256(f"{cache_tag}\n{dfile}\n{hash_path(source)}".encode()).hexdigest()
+        cfile = bytecode_dir / f"{key}.pyc"
+        _mark_artifact_as_active(cfile)
+        compiled[bytecode_path(archive_path, runtime)] = cfile
+        if not cfile.is_file():
+            missing.append((str(source), str(cfile), dfile))
+
+    if missing:
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
+        logger.debug("Compiling %d source file(s) for %s", len(missing), runtime)
+        result = subprocess.run(  # noqa: S603
+            [find_interpreter(runtime), "-c", _COMPILE_SOURCES_SCRIPT],
+            input=json.dumps(missing),
+            capture_output=True,
+            check=False,
+            text=True,
+        )
+        if result.returncode != 0:
+            logger.warning(
+                "Some source files could not be precompiled for %s, they will be compiled "
+                "by Lambda instead. Run with -vv for details.",
+                runtime,
+            )
+        if result.stderr:
+            logger.debug("Compiling sources for %s:\n%s", runtime, result.stderr)
+    # Sources with syntax errors produce no pyc, Lambda reports those at import
+    return {archive_path: cfile for archive_path, cfile in compiled.items() if cfile.is_file()}
+
+
+def bytecode_path(archive_path: str, runtime: str) -> str:
+    """Returns the archive path of the pyc compiled for runtime from a source file."""
+    path = PurePosixPath(archive_path)
+    return str(path.parent / "__pycache__" / f"{path.stem}.{_cache_tag(runtime)}.pyc")
+
+
+def _cache_tag(runtime: str) -> str:
+    return f"cpython-{runtime.removeprefix('python').replace('.', '')}"
+
+
+@cache
+def find_interpreter(runtime: str) -> str:
+    """
+    Finds a local interpreter matching the Lambda runtime's Python version.
+
+    Raises:
+        RuntimeError: If no matching interpreter is found.
+    """
+    py_version = runtime.removeprefix("python")
+    if f"{sys.version_info.major}.{sys.version_info.minor}" == py_version:
+        return sys.executable
+
+    uv_path = shutil.which("uv")
+    if uv_path:
+        result = subprocess.run(  # noqa: S603
+            [uv_path, "python", "find", py_version], capture_output=True, check=False, text=True
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+
+    raise RuntimeError(
+        f"Stelvio: no local Python {py_version} interpreter found for runtime {runtime}, "
+        f"which is needed to precompile or profile code for it. Install one (e.g. "
+        f"'uv python install {py_version}')."
+    )
+
+
+def clean_active_bytecode_file() -> None:
+    clean_active_artifacts_file(_BYTECODE_ARTIFACTS_KIND)
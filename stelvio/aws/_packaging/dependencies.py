@@ -1,25 +1,67 @@
 import hashlib
+import json
 import logging
+import os
 import re
 import shutil
 import subprocess
-from collections.abc import Generator, Mapping
+import threading
+import time
+from collections.abc import Generator, Sequence
 from collections.abc import Set as AbstractSet
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, suppress
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Final
-
-from pulumi import Archive, Asset
-
+from typing import IO, Final
+
+from platformdirs import user_cache_dir
+
+from stelvio.aws._packaging.lockfiles import (
+    export_locked_requirements,
+    is_hash_pinned,
+    is_lockfile,
+)
+from stelvio.aws._packaging.package_store import (
+    assemble_from_store,
+    collect_store_garbage,
+    find_stored_distributions,
+    has_stored_distributions,
+    link_into_store,
+    normalize_name,
+    release_references,
+)
 from stelvio.project import get_dot_stelvio_dir
 
-type PulumiAssets = Mapping[str, Asset | Archive]
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
-_ACTIVE_CACHE_FILENAME: Final[str] = "active_caches.txt"
+_CACHE_LOCK_FILENAME: Final[str] = ".lock"
+_DEFAULT_MAX_CACHE_AGE_DAYS: Final[int] = 30
+_DEFAULT_MAX_CACHE_SIZE_MB: Final[int] = 5 * 1024
 _FILE_REFERENCE_PATTERN: Final[re.Pattern] = re.compile(r"^\s*-[rc]\s+(\S+)", re.MULTILINE)
+_MAX_CACHE_AGE_ENV: Final[str] = "STLV_CACHE_MAX_AGE_DAYS"
+_MAX_CACHE_SIZE_ENV: Final[str] = "STLV_CACHE_MAX_SIZE_MB"
+_MAX_INSTALL_WORKERS: Final[int] = 8
+_SHARED_CACHE_DIR_ENV: Final[str] = "STLV_SHARED_CACHE_DIR"
+_SHARED_CACHE_ENV: Final[str] = "STLV_SHARED_CACHE"
+# Requirements installed from local paths, whose contents aren't part of the cache key
+_LOCAL_PATH_REQUIREMENT_PATTERN: Final[re.Pattern] = re.compile(
+    r"^(-e\s+)?(\.|/|~|file:)|@\s*file:", re.MULTILINE
+)
+_STORE_SUBDIRECTORY: Final[str] = "store"
+_PIN_PATTERN: Final[re.Pattern] = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)==([^\s;\\]+)")
+_REQUIREMENT_NAME_PATTERN: Final[re.Pattern] = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)")
 
 logger = logging.getLogger(__name__)
 
+# Cache directories used by the current session, as "<subdirectory>/<cache key>".
+# Installs run on worker threads, hence the lock.
+_used_cache_dirs: set[str] = set()
+_used_cache_dirs_lock = threading.Lock()
+
 
 @dataclass(frozen=True)
 class RequirementsSpec:
@@ -27,6 +69,66 @@ class RequirementsSpec:
     path_from_root: Path | None = None
 
 
+@dataclass(frozen=True)
+class DependencyInstall:
+    """Everything needed to install one component's dependencies into the cache."""
+
+    requirements_source: RequirementsSpec
+    runtime: str
+    architecture: str
+    cache_subdirectory: str
+    log_context: str
+
+
+@dataclass(frozen=True)
+class _InstallCommand:
+    """Installer invocation of one dependency cache, without its target directory."""
+
+    installer_cmd: list[str]
+    install_flags: list[str]
+    # Value of -r, "-" reads requirements from input_
+    requirements: str
+    input_: str | None
+    no_deps: bool
+
+    @property
+    def is_uv(self) -> bool:
+        return self.installer_cmd[1:] == ["pip"]
+
+    def for_target(self, target: Path) -> list[str]:
+        cmd = [
+            *self.installer_cmd,
+            "install",
+            "-r",
+            self.requirements,
+            "--target",
+            str(target),
+            *self.install_flags,
+        ]
+        if self.no_deps:
+            # Everything is pinned already, install exactly that set without resolving
+            cmd.append("--no-deps")
+        return cmd
+
+
+@dataclass(frozen=True)
+class CacheLimits:
+    """Bounds of the dependency caches in bytes and seconds, None disables a bound."""
+
+    max_size: int | None
+    max_age: float | None
+
+
+@dataclass(frozen=True)
+class InstallReport:
+    """Outcome of installing one distinct cache key during the concurrent pre-pass."""
+
+    cache_key: str
+    cache_subdirectory: str
+    log_contexts: tuple[str, ...]
+    duration: float
+
+
 def get_or_install_dependencies(  # noqa: PLR0913
     requirements_source: RequirementsSpec,
     runtime: str,
@@ -58,23 +160,42 @@ def get_or_install_dependencies(  # noqa: PLR0913
     """
     py_version = runtime[6:]  # Assumes format like "python3.12"
 
-    cache_key = _calculate_cache_key(requirements_source, architecture, py_version, project_root)
+    cache_key = _calculate_cache_key(
+        requirements_source, architecture, py_version, project_root, log_context
+    )
 
     dependencies_dir = _get_lambda_dependencies_dir(cache_subdirectory)
     cache_dir = dependencies_dir / cache_key
 
-    _mark_cache_dir_as_active(cache_key, cache_subdirectory)
+    _mark_cache_dir_as_used(cache_key, cache_subdirectory)
 
     if cache_dir.is_dir():
         logger.info("[%s] Cache hit for key '%s'.", log_context, cache_key)
         return cache_dir
 
+    shared_dir = _get_shared_cache_dir(
+        requirements_source, project_root, cache_subdirectory, cache_key
+    )
+    if shared_dir is not None and shared_dir.is_dir():
+        logger.info("[%s] Shared cache hit for key '%s'.", log_context, cache_key)
+        _link_shared_cache_dir(shared_dir, cache_dir)
+        return cache_dir
+
     logger.info("[%s] Cache miss for key '%s'. Installing dependencies.", log_context, cache_key)
 
-    cache_dir.mkdir(parents=True, exist_ok=True)
+    # With the shared cache, install next to the shared directory and publish it with
+    # an atomic rename, so concurrent installs of one key never see a partial install
+    install_dir = cache_dir if shared_dir is None else _get_tmp_dir(shared_dir)
+    install_dir.mkdir(parents=True, exist_ok=True)
     installer_cmd, install_flags = _get_installer_command(architecture, py_version)
     input_ = None
-    if requirements_source.path_from_root is None:
+    locked_requirements = _get_locked_requirements(requirements_source, project_root, log_context)
+    if locked_requirements is not None:
+        # Lock files: pass the exported, pinned requirements via stdin
+        r_parameter_value = "-"
+        input_ = locked_requirements
+        logger.debug("[%s] Using stdin for locked requirements.", log_context)
+    elif requirements_source.path_from_root is None:
         # Inline requirements: use '-r -' and pass content via stdin
         r_parameter_value = "-"
         input_ = requirements_source.content
@@ -84,25 +205,34 @@ def get_or_install_dependencies(  # noqa: PLR0913
         r_parameter_value = str((project_root / requirements_source.path_from_root).resolve())
         logger.debug("[%s] Using requirements file: %s", log_context, r_parameter_value)
 
-    cmd = [
-        *installer_cmd,
-        "install",
-        "-r",
-        r_parameter_value,
-        "--target",
-        str(cache_dir),
-        *install_flags,
-    ]
-    logger.info("[%s] Running dependency installation command: %s", log_context, " ".join(cmd))
-
-    success = _run_install_command(cmd, input_, log_context)
-
-    if success:
+    command = _InstallCommand(
+        installer_cmd=installer_cmd,
+        install_flags=install_flags,
+        requirements=r_parameter_value,
+        input_=input_,
+        no_deps=locked_requirements is not None
+        or _is_hash_pinned_file(requirements_source, project_root),
+    )
+    target = _store_target(architecture, py_version)
+    success = None
+    if shared_dir is None:
+        success = _install_from_store(command, install_dir, target, log_context)
+    if success is None:
+        cmd = command.for_target(install_dir)
+        logger.info("[%s] Running dependency installation command: %s", log_context, " ".join(cmd))
+        success = _run_install_command(cmd, input_, log_context)
+
+    if success and shared_dir is not None:
+        _publish_shared_cache_dir(install_dir, shared_dir)
+        logger.info("[%s] Dependencies installed into shared cache %s.", log_context, shared_dir)
+        _link_shared_cache_dir(shared_dir, cache_dir)
+    elif success:
         logger.info("[%s] Dependencies installed  into %s.", log_context, cache_dir)
+        _link_cache_dir_into_store(cache_dir, cache_subdirectory, target, log_context)
     else:
-        shutil.rmtree(cache_dir, ignore_errors=True)
+        shutil.rmtree(install_dir, ignore_errors=True)
         logger.error(
-            "[%s] Installation failed. Cleaning up cache directory: %s", log_context, cache_dir
+            "[%s] Installation failed. Cleaning up cache directory: %s", log_context, install_dir
         )
         raise RuntimeError(
             f"Stelvio: [{log_context}] Failed to install dependencies. Check logs for details."
@@ -110,6 +240,106 @@ def get_or_install_dependencies(  # noqa: PLR0913
     return cache_dir
 
 
+def install_dependencies_concurrently(
+    installs: Sequence[DependencyInstall],
+    project_root: Path,
+    max_workers: int | None = None,
+) -> list[InstallReport]:
+    """
+    Installs all missing dependency caches up front using a bounded worker pool.
+
+    Installs sharing the same cache subdirectory and cache key are installed only once.
+    Cache hits are skipped here and left to the regular per-component lookup.
+
+    Args:
+        installs: Dependency installs collected from the components of the app.
+        project_root: Absolute path to the project root.
+        max_workers: Upper bound on concurrent installer processes. Defaults to the
+                     number of CPUs, capped at 8.
+
+    Returns:
+        One report per cache key that was installed, in submission order.
+
+    Raises:
+        RuntimeError: If any installation fails (raised after all workers finish).
+    """
+    pending: dict[tuple[str, str], list[DependencyInstall]] = {}
+    for install in installs:
+        py_version = install.runtime[6:]
+        cache_key = _calculate_cache_key(
+            install.requirements_source,
+            install.architecture,
+            py_version,
+            project_root,
+            install.log_context,
+        )
+        cache_dir = _get_lambda_dependencies_dir(install.cache_subdirectory) / cache_key
+        if cache_dir.is_dir():
+            continue
+        pending.setdefault((install.cache_subdirectory, cache_key), []).append(install)
+
+    if not pending:
+        logger.debug("All dependency caches are warm, nothing to pre-install.")
+        return []
+
+    workers = max_workers or min(_MAX_INSTALL_WORKERS, os.cpu_count() or 1)
+    workers = min(workers, len(pending))
+    logger.info("Pre-installing %d dependency cache(s) with %d worker(s).", len(pending), workers)
+
+    def install_one(key: tuple[str, str], group: list[DependencyInstall]) -> InstallReport:
+        first = group[0]
+        start = time.perf_counter()
+        get_or_install_dependencies(
+            requirements_source=first.requirements_source,
+            runtime=first.runtime,
+            architecture=first.architecture,
+            project_root=project_root,
+            cache_subdirectory=first.cache_subdirectory,
+            log_context=first.log_context,
+        )
+        duration = time.perf_counter() - start
+        log_contexts = tuple(install.log_context for install in group)
+        logger.info(
+            "[%s] Installed dependencies for key '%s' in %.2fs (used by %d component(s)).",
+            first.log_context,
+            key[1],
+            duration,
+            len(log_contexts),
+        )
+        return InstallReport(
+            cache_key=key[1],
+            cache_subdirectory=key[0],
+            log_contexts=log_contexts,
+            duration=duration,
+        )
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stlv-install") as executor:
+        futures = {
+            executor.submit(install_one, key, group): (key, group)
+            for key, group in pending.items()
+        }
+
+    reports = []
+    errors = []
+    for future, (key, group) in futures.items():
+        if (error := future.exception()) is not None:
+            logger.error(
+                "[%s] Failed to install dependencies for key '%s': %s",
+                group[0].log_context,
+                key[1],
+                error,
+            )
+            errors.append(error)
+        else:
+            reports.append(future.result())
+    if errors:
+        raise RuntimeError(
+            f"Failed to install {len(errors)} of {len(pending)} dependency cache(s), "
+            f"first failure: {errors[0]}"
+        ) from errors[0]
+    return reports
+
+
 def _resolve_requirements_from_path(
     req_path_str: str, project_root: Path, log_context: str
 ) -> RequirementsSpec:
@@ -229,12 +459,22 @@ def _validate_is_file_exists(abs_path: Path) -> None:
 
 
 def _calculate_cache_key(
-    source: RequirementsSpec, architecture: str, py_version: str, project_root: Path
+    source: RequirementsSpec,
+    architecture: str,
+    py_version: str,
+    project_root: Path,
+    log_context: str = "",
 ) -> str:
     """
     Calculates a unique cache key based on requirements content, architecture, and Python version.
+
+    For lock files the key is based on the locked packages, so changes to the lock file
+    that don't affect them (e.g. dev dependencies) keep the key.
     """
-    if source.path_from_root is None:
+    locked_requirements = _get_locked_requirements(source, project_root, log_context)
+    if locked_requirements is not None:
+        normalized_requirements = _normalize_requirements(locked_requirements)
+    elif source.path_from_root is None:
         if bool(_FILE_REFERENCE_PATTERN.search(source.content)):
             raise ValueError(
                 "'-r' or '-c' references are not allowed  when providing requirements as list. "
@@ -253,6 +493,25 @@ def _calculate_cache_key(
     return f"{architecture}__{py_version}__{final_hash[:16]}"
 
 
+def _get_locked_requirements(
+    source: RequirementsSpec, project_root: Path, log_context: str
+) -> str | None:
+    """Returns pinned requirements exported from a lock file source, None for other sources."""
+    if source.path_from_root is None or not is_lockfile(source.path_from_root):
+        return None
+    abs_path = _get_abs_requirements_path(source.path_from_root, project_root)
+    return export_locked_requirements(abs_path, log_context)
+
+
+def _is_hash_pinned_file(source: RequirementsSpec, project_root: Path) -> bool:
+    if source.path_from_root is None:
+        return False
+    content = _get_requirements_content(source.path_from_root, project_root)
+    return is_hash_pinned(
+        "\n".join(_normalize_requirements(content, source.path_from_root, project_root))
+    )
+
+
 def _run_install_command(cmd: list[str], input_: str, log_context: str) -> bool:
     try:
         result = subprocess.run(cmd, input=input_, capture_output=True, check=True, text=True)  # noqa: S603
@@ -302,35 +561,416 @@ def _get_installer_command(architecture: str, py_version: str) -> tuple[list[str
     return installer_cmd, install_flags
 
 
-def _get_lambda_dependencies_dir(cache_subdirectory: str) -> Path:
-    return get_dot_stelvio_dir() / "lambda_dependencies" / cache_subdirectory
+def _store_target(architecture: str, py_version: str) -> str:
+    """Names the platform distributions in the package store were installed for."""
+    return f"{architecture}__{py_version}"
 
 
-def clean_active_dependencies_caches_file(cache_subdirectory: str) -> None:
-    active_file = _get_lambda_dependencies_dir(cache_subdirectory) / _ACTIVE_CACHE_FILENAME
-    active_file.unlink(missing_ok=True)
+def _install_from_store(
+    command: _InstallCommand, install_dir: Path, target: str, log_context: str
+) -> bool | None:
+    """
+    Assembles a cache directory from the package store, installing only what's missing.
 
+    Requirements are resolved to pinned versions first. Pinned distributions in the
+    store are hard linked into install_dir, the others installed with --no-deps.
 
-def _mark_cache_dir_as_active(cache_key: str, cache_subdirectory: str) -> None:
-    dependencies_dir = _get_lambda_dependencies_dir(cache_subdirectory)
-    dependencies_dir.mkdir(parents=True, exist_ok=True)
-    active_file = dependencies_dir / _ACTIVE_CACHE_FILENAME
-    with active_file.open("a", encoding="utf-8") as f:
-        f.write(f"{cache_key}\n")
+    Returns:
+        Whether the installation succeeded, None if the store can't help, e.g. it has
+        none of the distributions or resolving failed. Nothing is installed then.
+    """
+    store_dir = _get_lambda_dependencies_dir(_STORE_SUBDIRECTORY)
+    if not has_stored_distributions(store_dir, target):
+        return None
+    pins = _resolve_pins(command, log_context)
+    if not pins:
+        return None
+    found = find_stored_distributions(store_dir, target, pins)
+    missing = {name: version for name, version in pins.items() if name not in found}
+    missing_requirements = _missing_requirements(command, missing)
+    if not found or missing_requirements is None:
+        return None
 
+    files = assemble_from_store(install_dir, store_dir, list(found.values()))
+    logger.info(
+        "[%s] Package store: assembled %d of %d distribution(s) (%d file(s)) without installing.",
+        log_context,
+        len(found),
+        len(pins),
+        files,
+    )
+    if not missing:
+        return True
 
-def clean_stale_dependency_caches(cache_subdirectory: str) -> None:
-    dependencies_dir = _get_lambda_dependencies_dir(cache_subdirectory)
-    if not dependencies_dir.is_dir():
-        return
+    missing_command = _InstallCommand(
+        installer_cmd=command.installer_cmd,
+        install_flags=command.install_flags,
+        requirements="-",
+        input_=missing_requirements,
+        no_deps=True,
+    )
+    cmd = missing_command.for_target(install_dir)
+    logger.info(
+        "[%s] Installing %d missing distribution(s): %s",
+        log_context,
+        len(missing),
+        " ".join(cmd),
+    )
+    return _run_install_command(cmd, missing_requirements, log_context)
+
+
+def _resolve_pins(command: _InstallCommand, log_context: str) -> dict[str, str] | None:
+    """Resolves requirements to pinned versions by name, without installing anything."""
+    if command.is_uv:
+        cmd = [
+            *command.installer_cmd,
+            "compile",
+            command.requirements,
+            *command.install_flags,
+            "--no-header",
+            "--no-annotate",
+            "--quiet",
+        ]
+    else:
+        cmd = [
+            *command.installer_cmd,
+            "install",
+            "-r",
+            command.requirements,
+            "--dry-run",
+            "--quiet",
+            "--report",
+            "-",
+            *command.install_flags,
+        ]
+    logger.debug("[%s] Resolving requirements: %s", log_context, " ".join(cmd))
+    try:
+        result = subprocess.run(  # noqa: S603
+            cmd, input=command.input_, capture_output=True, check=True, text=True
+        )
+        if command.is_uv:
+            return dict(
+                match.groups()
+                for line in result.stdout.splitlines()
+                if (match := _PIN_PATTERN.match(line.strip()))
+            )
+        report = json.loads(result.stdout)
+        return {
+            item["metadata"]["name"]: item["metadata"]["version"] for item in report["install"]
+        }
+    except (OSError, subprocess.CalledProcessError, ValueError, KeyError, TypeError):
+        logger.debug("[%s] Could not resolve requirements", log_context, exc_info=True)
+        return None
+
+
+def _missing_requirements(command: _InstallCommand, missing: dict[str, str]) -> str | None:
+    """
+    Requirements installing exactly the missing distributions.
+
+    Hash-pinned requirements keep their original lines, so hashes are still checked.
+    Returns None when a missing distribution has no line of its own.
+    """
+    content = command.input_
+    if content is None:
+        content = Path(command.requirements).read_text(encoding="utf-8")
+    if not is_hash_pinned(content):
+        return "\n".join(f"{name}=={version}" for name, version in missing.items())
+
+    lines = {}
+    for line in content.replace("\\\n", " ").splitlines():
+        if match := _REQUIREMENT_NAME_PATTERN.match(line.strip()):
+            lines[normalize_name(match.group(1))] = " ".join(line.split())
+    names = [normalize_name(name) for name in missing]
+    if any(name not in lines for name in names):
+        return None
+    return "\n".join(lines[name] for name in names)
 
-    active_file = dependencies_dir / _ACTIVE_CACHE_FILENAME
 
-    if not active_file.is_file():
+def _link_cache_dir_into_store(
+    cache_dir: Path, cache_subdirectory: str, target: str, log_context: str
+) -> None:
+    """Deduplicates an installed cache directory against the shared package store."""
+    store_dir = _get_lambda_dependencies_dir(_STORE_SUBDIRECTORY)
+    try:
+        report = link_into_store(
+            cache_dir, store_dir, f"{cache_subdirectory}/{cache_dir.name}", target
+        )
+    except OSError:
+        # The cache directory is complete without the store, it just isn't deduplicated
+        logger.warning("[%s] Could not link dependencies into package store.", log_context)
+        logger.debug("[%s] Package store error", log_context, exc_info=True)
         return
+    logger.info(
+        "[%s] Package store: %d distribution(s), %d new, %d file(s) (%.1f MB) hard linked.",
+        log_context,
+        len(report.distributions),
+        len(report.new_distributions),
+        report.linked_files,
+        report.linked_bytes / (1024 * 1024),
+    )
+
+
+def _get_dependency_caches_root() -> Path:
+    return get_dot_stelvio_dir() / "lambda_dependencies"
+
+
+def _get_lambda_dependencies_dir(cache_subdirectory: str) -> Path:
+    return _get_dependency_caches_root() / cache_subdirectory
+
+
+def _get_shared_cache_root() -> Path | None:
+    """Returns the machine-wide dependency cache shared by all projects, None if disabled."""
+    shared_dir = os.environ.get(_SHARED_CACHE_DIR_ENV)
+    if shared_dir:
+        return Path(shared_dir).expanduser()
+    if os.environ.get(_SHARED_CACHE_ENV, "0") == "1":
+        return Path(user_cache_dir(appname="stelvio")) / "lambda_dependencies"
+    return None
+
+
+def _get_shared_cache_dir(
+    source: RequirementsSpec, project_root: Path, cache_subdirectory: str, cache_key: str
+) -> Path | None:
+    shared_root = _get_shared_cache_root()
+    if shared_root is None or _references_local_paths(source, project_root):
+        return None
+    return shared_root / cache_subdirectory / cache_key
+
+
+def _references_local_paths(source: RequirementsSpec, project_root: Path) -> bool:
+    """True if requirements install local paths, which differ between projects."""
+    if source.path_from_root is None:
+        requirements = source.content
+    elif is_lockfile(source.path_from_root):
+        # Local packages are left out of exported lock files
+        return False
+    else:
+        content = _get_requirements_content(source.path_from_root, project_root)
+        requirements = "\n".join(
+            _normalize_requirements(content, source.path_from_root, project_root)
+        )
+    return bool(_LOCAL_PATH_REQUIREMENT_PATTERN.search(requirements))
+
+
+def _get_tmp_dir(directory: Path) -> Path:
+    return directory.with_name(f"{directory.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _publish_shared_cache_dir(tmp_dir: Path, shared_dir: Path) -> None:
+    try:
+        tmp_dir.rename(shared_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        # Another process published the same key in the meantime
+        if not shared_dir.is_dir():
+            raise
+
+
+def _link_shared_cache_dir(shared_dir: Path, cache_dir: Path) -> None:
+    """
+    Hard links a shared cache directory into the project's cache directory.
+
+    Files are copied if the shared cache is on another file system. The project's
+    package store is skipped, linked files take no extra space already.
+    """
+    tmp_dir = _get_tmp_dir(cache_dir)
+    try:
+        for dirpath, _, filenames in os.walk(shared_dir):
+            target_dir = tmp_dir / Path(dirpath).relative_to(shared_dir)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for filename in filenames:
+                try:
+                    (target_dir / filename).hardlink_to(Path(dirpath, filename))
+                except OSError:
+                    shutil.copy2(Path(dirpath, filename), target_dir / filename)
+        tmp_dir.rename(cache_dir)
+    except OSError:
+        # Another thread or process linked the same key in the meantime
+        if not cache_dir.is_dir():
+            raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _mark_cache_dir_as_used(cache_key: str, cache_subdirectory: str) -> None:
+    """Protects a cache directory from eviction and refreshes its last-used time."""
+    with _used_cache_dirs_lock:
+        _used_cache_dirs.add(f"{cache_subdirectory}/{cache_key}")
+    # The directory's modification time is its last-used time. Directories that
+    # don't exist yet get a fresh one when they are created.
+    for root in _get_cache_roots():
+        with suppress(FileNotFoundError):
+            os.utime(root / cache_subdirectory / cache_key)
+
+
+def _get_cache_roots() -> list[Path]:
+    shared_root = _get_shared_cache_root()
+    return [_get_dependency_caches_root(), *([shared_root] if shared_root else [])]
+
+
+@contextmanager
+def dependency_cache_session() -> Generator[None]:
+    """
+    Marks dependency caches as in use for the duration of a command, then evicts
+    least recently used caches beyond the configured size and age.
+
+    Every session holds a shared lock on the project's cache root and on the shared
+    cache, if enabled. Eviction needs a lock exclusively, so it is skipped while
+    another stlv process is using the caches. Eviction also runs when the command
+    fails.
+    """
+    with _used_cache_dirs_lock:
+        _used_cache_dirs.clear()
+    with ExitStack() as stack:
+        for root in _get_cache_roots():
+            stack.enter_context(_locked_cache_root(root))
+        yield
+
+
+@contextmanager
+def _locked_cache_root(root: Path) -> Generator[None]:
+    root.mkdir(parents=True, exist_ok=True)
+    with (root / _CACHE_LOCK_FILENAME).open("a") as lock_file:
+        _lock(lock_file, shared=True)
+        try:
+            yield
+        finally:
+            if _lock(lock_file, shared=False, blocking=False):
+                evict_dependency_caches(root, read_cache_limits())
+            else:
+                logger.info("Caches in %s are in use by another stlv process, not evicting.", root)
+            _unlock(lock_file)
+
+
+def evict_dependency_caches(root: Path, limits: CacheLimits) -> list[str]:
+    """
+    Removes cache directories older than the maximum age, then the least recently
+    used ones until the caches fit into the maximum size.
+
+    Caches of all subdirectories compete for the same space. Directories used by
+    the current session are never removed. Sizes count files hard linked into
+    several cache directories once, so they match the disk space removal frees.
+    Must be called while holding the cache lock exclusively.
+
+    Returns:
+        Removed cache directories, as "<subdirectory>/<cache key>".
+    """
+    with _used_cache_dirs_lock:
+        used = set(_used_cache_dirs)
+    candidates = sorted(
+        (
+            (cache_dir.stat().st_mtime, f"{subdirectory.name}/{cache_dir.name}", cache_dir)
+            for subdirectory in root.iterdir()
+            if subdirectory.is_dir() and subdirectory.name != _STORE_SUBDIRECTORY
+            for cache_dir in subdirectory.iterdir()
+            if cache_dir.is_dir() and not cache_dir.name.endswith(".tmp")
+        ),
+        key=lambda candidate: candidate[0],
+    )
+
+    to_remove: list[tuple[str, Path]] = []
+    now = time.time()
+    if limits.max_age is not None:
+        to_remove += [
+            (name, path)
+            for mtime, name, path in candidates
+            if name not in used and now - mtime > limits.max_age
+        ]
+    if limits.max_size is not None:
+        expired = {name for name, _ in to_remove}
+        remaining = [(name, path) for _, name, path in candidates if name not in expired]
+        to_remove += _over_size_limit(remaining, used, limits.max_size)
+
+    for name, path in to_remove:
+        shutil.rmtree(path, ignore_errors=True)
+        logger.info("Evicted dependency cache '%s'.", name)
+
+    # Store entries are shared between cache directories, so they are only removed once
+    # no remaining cache directory references them
+    store_dir = root / _STORE_SUBDIRECTORY
+    removed = [name for name, _ in to_remove]
+    release_references(store_dir, removed)
+    collect_store_garbage(store_dir)
+    return removed
+
+
+def _over_size_limit(
+    candidates: list[tuple[str, Path]], used: AbstractSet[str], max_size: int
+) -> list[tuple[str, Path]]:
+    """Returns the least recently used candidates to remove to get below max_size."""
+    files = _index_files(candidates)
+    total = sum(size for size, _ in files.values())
+    owned: dict[str, list[tuple[int, set[str]]]] = {}
+    for entry in files.values():
+        for name in entry[1]:
+            owned.setdefault(name, []).append(entry)
+
+    removed = []
+    for name, path in candidates:
+        if total <= max_size:
+            break
+        if name in used:
+            continue
+        removed.append((name, path))
+        for size, owners in owned.get(name, []):
+            owners.discard(name)
+            if not owners:
+                total -= size
+    return removed
+
+
+def _index_files(
+    candidates: list[tuple[str, Path]],
+) -> dict[tuple[int, int], tuple[int, set[str]]]:
+    """Maps the (device, inode) of every file to its size and the directories linking it."""
+    files: dict[tuple[int, int], tuple[int, set[str]]] = {}
+    for name, path in candidates:
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                stat = Path(dirpath, filename).lstat()
+                _, owners = files.setdefault((stat.st_dev, stat.st_ino), (stat.st_size, set()))
+                owners.add(name)
+    return files
+
+
+def read_cache_limits() -> CacheLimits:
+    """Reads the cache limits, set by STLV_CACHE_MAX_SIZE_MB and STLV_CACHE_MAX_AGE_DAYS."""
+    max_size_mb = _read_limit(_MAX_CACHE_SIZE_ENV, _DEFAULT_MAX_CACHE_SIZE_MB)
+    max_age_days = _read_limit(_MAX_CACHE_AGE_ENV, _DEFAULT_MAX_CACHE_AGE_DAYS)
+    return CacheLimits(
+        max_size=max_size_mb * 1024 * 1024 if max_size_mb else None,
+        max_age=max_age_days * 24 * 60 * 60 if max_age_days else None,
+    )
+
+
+def _read_limit(variable: str, default: int) -> int:
+    value = os.environ.get(variable)
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = -1
+    if limit < 0:
+        logger.warning("Ignoring %s=%r, expected a non-negative integer.", variable, value)
+        return default
+    return limit
+
+
+def _lock(lock_file: IO[str], *, shared: bool, blocking: bool = True) -> bool:
+    if fcntl is None:
+        # No advisory locks on this platform, parallel runs aren't protected
+        return True
+    operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    if not blocking:
+        operation |= fcntl.LOCK_NB
+    try:
+        fcntl.flock(lock_file, operation)
+    except BlockingIOError:
+        return False
+    return True
 
-    active_caches = set(active_file.read_text(encoding="utf-8").splitlines())
 
-    for item in dependencies_dir.iterdir():
-        if item.is_dir() and item.name not in active_caches:
-            shutil.rmtree(item)
+def _unlock(lock_file: IO[str]) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Final
+
+from stelvio.aws._packaging.artifacts import hash_file
+from stelvio.project import get_dot_stelvio_dir
+
+_FILE_INDEX_FILENAME: Final[str] = "file_index.json"
+_FILE_INDEX_VERSION: Final[int] = 1
+# Files modified this recently may still change within the same mtime tick, so their
+# hashes are not stored (same idea as git's "racily clean" entries)
+_RACY_WINDOW_NS: Final[int] = 2_000_000_000
+
+logger = logging.getLogger(__name__)
+
+type _StatKey = tuple[int, int, int]
+
+_indexes: dict[Path, "FileIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+class FileIndex:
+    """
+    Persistent mapping of file stats to content hashes.
+
+    Files whose (path, size, mtime_ns, inode) match a previous run are not read again,
+    so unchanged source trees are fingerprinted by stat calls alone.
+    """
+
+    def __init__(self, index_file: Path) -> None:
+        self.index_file = index_file
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[_StatKey, str]] = self._load()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def hash(self, path: Path) -> str:
+        """Returns the sha256 hex digest of a file, reading it only if its stats changed."""
+        key = str(path.resolve())
+        stat = path.stat()
+        stat_key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stat_key:
+                self.hits += 1
+                return entry[1]
+
+        content_hash = hash_file(path)
+        with self._lock:
+            self.misses += 1
+            if time.time_ns() - stat.st_mtime_ns > _RACY_WINDOW_NS:
+                self._entries[key] = (stat_key, content_hash)
+                self._dirty = True
+        return content_hash
+
+    def save(self) -> None:
+        """Writes the index if it changed, dropping entries for files that no longer exist."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = {
+                path: [*stat_key, content_hash]
+                for path, (stat_key, content_hash) in self._entries.items()
+                if os.path.exists(path)  # noqa: PTH110
+            }
+            self._dirty = False
+
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(
+            json.dumps({"version": _FILE_INDEX_VERSION, "entries": entries}), encoding="utf-8"
+        )
+        tmp_file.replace(self.index_file)
+        logger.debug("Saved file index with %d entries to %s", len(entries), self.index_file)
+
+    def _load(self) -> dict[str, tuple[_StatKey, str]]:
+        if not self.index_file.is_file():
+            return {}
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+            if data.get("version") != _FILE_INDEX_VERSION:
+                return {}
+            return {
+                path: ((size, mtime_ns, inode), content_hash)
+                for path, (size, mtime_ns, inode, content_hash) in data["entries"].items()
+            }
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            logger.debug("Ignoring unreadable file index %s", self.index_file)
+            return {}
+
+
+def get_file_index() -> FileIndex:
+    """Returns the file index of the current project, shared by all functions."""
+    index_file = get_dot_stelvio_dir() / _FILE_INDEX_FILENAME
+    with _indexes_lock:
+        if index_file not in _indexes:
+            _indexes[index_file] = FileIndex(index_file)
+        return _indexes[index_file]
+
+
+def save_file_indexes() -> None:
+    """Persists all file indexes used in this process and logs their hit/miss stats."""
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    for index in indexes:
+        if index.hits or index.misses:
+            logger.info(
+                "File index: %d unchanged files skipped, %d files hashed",
+                index.hits,
+                index.misses,
+            )
+            index.hits = index.misses = 0
+        index.save()
@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import re
+import shutil
+import subprocess
+import threading
+import tomllib
+from pathlib import Path
+from typing import Any, Final
+
+_UV_LOCK_FILENAME: Final[str] = "uv.lock"
+# PEP 751: pylock.toml or pylock.<name>.toml
+_PYLOCK_FILENAME_PATTERN: Final[re.Pattern] = re.compile(r"^pylock\.([^.]+\.)?toml$")
+_HASH_OPTION_PATTERN: Final[re.Pattern] = re.compile(r"--hash[=\s]")
+
+logger = logging.getLogger(__name__)
+
+# Exported requirements by (lock file, content hash), so every component sharing a lock
+# file reuses one export per run
+_exported_locks: dict[tuple[Path, str], str] = {}
+_exported_locks_lock = threading.Lock()
+
+
+def is_lockfile(path: Path) -> bool:
+    """Returns whether path names a lock file (uv.lock or PEP 751 pylock.toml)."""
+    return path.name == _UV_LOCK_FILENAME or bool(_PYLOCK_FILENAME_PATTERN.match(path.name))
+
+
+def is_hash_pinned(requirements_content: str) -> bool:
+    """Returns whether requirements content pins its packages with --hash options."""
+    return bool(_HASH_OPTION_PATTERN.search(requirements_content))
+
+
+def export_locked_requirements(lock_path: Path, log_context: str) -> str:
+    """
+    Converts a lock file into hash-pinned requirements for an exact installation.
+
+    uv.lock files are exported with 'uv export', pylock.toml files are converted
+    directly. Dev dependencies and local projects (e.g. the project the lock file
+    belongs to) are left out, their code is packaged by the function or layer itself.
+    Exports are reused for unchanged lock files.
+
+    Args:
+        lock_path: Absolute path to the lock file.
+        log_context: A string identifier for logging (e.g., function name).
+
+    Returns:
+        Requirements content pinning every locked package.
+
+    Raises:
+        RuntimeError: If 'uv' is needed but missing or fails to export the lock file.
+        ValueError: If the lock file contains packages that can't be installed from an
+                    index (e.g. VCS checkouts or archive URLs).
+    """
+    content = lock_path.read_bytes()
+    key = (lock_path, hashlib.sha256(content).hexdigest())
+    with _exported_locks_lock:
+        if key in _exported_locks:
+            return _exported_locks[key]
+
+        logger.info("[%s] Exporting locked requirements from %s", log_context, lock_path)
+        if lock_path.name == _UV_LOCK_FILENAME:
+            requirements = _export_uv_lock(lock_path, log_context)
+        else:
+            requirements = _export_pylock(tomllib.loads(content.decode("utf-8")), lock_path)
+        _exported_locks[key] = requirements
+        return requirements
+
+
+def _export_uv_lock(lock_path: Path, log_context: str) -> str:
+    uv_path = shutil.which("uv")
+    if not uv_path:
+        raise RuntimeError(
+            f"Stelvio: [{log_context}] 'uv' is needed to install from {lock_path.name}. "
+            f"Please ensure it is installed and in your PATH."
+        )
+    cmd = [
+        uv_path,
+        "export",
+        "--frozen",
+        "--format",
+        "requirements-txt",
+        "--no-dev",
+        "--no-editable",
+        "--no-emit-workspace",
+        "--no-header",
+        "--no-annotate",
+    ]
+    try:
+        result = subprocess.run(  # noqa: S603
+            cmd, cwd=lock_path.parent, capture_output=True, check=True, text=True
+        )
+    except subprocess.CalledProcessError as e:
+        logger.exception(
+            "[%s] Exporting lock file failed.\nCommand: %s\nStderr:\n%s",
+            log_context,
+            " ".join(cmd),
+            e.stderr,
+        )
+        raise RuntimeError(
+            f"Stelvio: [{log_context}] Failed to export {lock_path}. Check logs for details."
+        ) from None
+    return result.stdout
+
+
+def _export_pylock(lock: dict[str, Any], lock_path: Path) -> str:
+    lines = []
+    for package in lock.get("packages", []):
+        name = package["name"]
+        if "directory" in package:
+            logger.debug("Skipping local package '%s' from %s", name, lock_path)
+            continue
+        version = package.get("version")
+        if version is None or "vcs" in package or "archive" in package:
+            raise ValueError(
+                f"Package '{name}' in {lock_path} is not installed from an index, which "
+                f"is not supported for Lambda dependencies."
+            )
+        line = f"{name}=={version}"
+        if marker := package.get("marker"):
+            line += f" ; {marker}"
+        hashes = sorted(
+            f"{algorithm}:{digest}"
+            for artifact in [*package.get("wheels", []), package.get("sdist") or {}]
+            for algorithm, digest in artifact.get("hashes", {}).items()
+        )
+        lines.append(" ".join([line, *(f"--hash={value}" for value in hashes)]))
+    return "\n".join(lines) + "\n"
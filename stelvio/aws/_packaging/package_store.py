@@ -0,0 +1,345 @@
+import csv
+import logging
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass
+from email.parser import HeaderParser
+from pathlib import Path
+from typing import Final
+
+# Installer bookkeeping that differs between installs of the same wheel (e.g. REQUESTED
+# is only written for top-level requirements), so it stays local to each cache directory
+_LOCAL_DIST_INFO_FILES: Final[frozenset[str]] = frozenset(
+    {"RECORD", "REQUESTED", "INSTALLER", "direct_url.json"}
+)
+_PACKAGES_DIRNAME: Final[str] = "packages"
+_REFS_DIRNAME: Final[str] = "refs"
+# Stored distribution of each pinned name and version, per target (architecture and
+# Python version), used to assemble cache directories without installing
+_TARGETS_DIRNAME: Final[str] = "targets"
+_NAME_NORMALIZE_PATTERN: Final[re.Pattern] = re.compile(r"[-_.]+")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InstalledDistribution:
+    """A distribution installed into a dependency cache directory."""
+
+    key: str
+    name: str
+    version: str
+    # Paths relative to the cache directory, including installer bookkeeping
+    files: tuple[Path, ...]
+    size: int
+
+
+@dataclass(frozen=True)
+class StoreLinkReport:
+    """Outcome of linking one dependency cache directory against the package store."""
+
+    distributions: tuple[str, ...]
+    new_distributions: tuple[str, ...]
+    linked_files: int
+    linked_bytes: int
+
+
+def link_into_store(
+    cache_dir: Path, store_dir: Path, ref_name: str, target: str | None = None
+) -> StoreLinkReport:
+    """
+    Moves installed distributions into the package store and hard links them back.
+
+    Distributions are identified by name, version and wheel tags. The first install of
+    a distribution populates the store, later installs of the same distribution replace
+    their copies with hard links to the stored files. Files that can't be linked (e.g.
+    the store is on another filesystem) are left as regular copies.
+
+    Args:
+        cache_dir: Dependency cache directory populated by the installer (--target).
+        store_dir: Root directory of the package store.
+        ref_name: Unique name of the cache directory, recorded as a reference to every
+                  distribution it uses so unused store entries can be collected.
+        target: Architecture and Python version the distributions were installed for.
+                When given, they can be found by find_stored_distributions.
+
+    Returns:
+        Which distributions were linked and how many bytes are now shared.
+    """
+    packages_dir = store_dir / _PACKAGES_DIRNAME
+    packages_dir.mkdir(parents=True, exist_ok=True)
+
+    distributions = []
+    new_distributions = []
+    linked_files = 0
+    linked_bytes = 0
+    for distribution in read_distributions(cache_dir):
+        dist_key = distribution.key
+        relative_files = [path for path in distribution.files if not _is_local_file(path)]
+        if not relative_files:
+            continue
+
+        entry_dir = packages_dir / dist_key
+        if not entry_dir.is_dir() and _populate_store_entry(cache_dir, entry_dir, relative_files):
+            new_distributions.append(dist_key)
+
+        for relative_path in relative_files:
+            stored = entry_dir / relative_path
+            local = cache_dir / relative_path
+            if not stored.is_file() or _is_same_file(stored, local):
+                continue
+            if _replace_with_link(stored, local):
+                linked_files += 1
+                linked_bytes += stored.stat().st_size
+        distributions.append(dist_key)
+        if target is not None:
+            _write_target_entry(store_dir, target, distribution, dist_key)
+
+    _write_references(store_dir, ref_name, distributions)
+    return StoreLinkReport(
+        distributions=tuple(distributions),
+        new_distributions=tuple(new_distributions),
+        linked_files=linked_files,
+        linked_bytes=linked_bytes,
+    )
+
+
+def find_stored_distributions(
+    store_dir: Path, target: str, pins: dict[str, str]
+) -> dict[str, str]:
+    """
+    Looks up pinned distributions in the package store.
+
+    Args:
+        store_dir: Root directory of the package store.
+        target: Architecture and Python version, as passed to link_into_store.
+        pins: Versions by distribution name, e.g. resolved from requirements.
+
+    Returns:
+        Store entry keys by name of the pinned distributions in the store.
+    """
+    target_dir = store_dir / _TARGETS_DIRNAME / target
+    found = {}
+    for name, version in pins.items():
+        entry_file = target_dir / f"{normalize_name(name)}=={version}"
+        if not entry_file.is_file():
+            continue
+        dist_key = entry_file.read_text(encoding="utf-8").strip()
+        if dist_key and (store_dir / _PACKAGES_DIRNAME / dist_key).is_dir():
+            found[name] = dist_key
+    return found
+
+
+def has_stored_distributions(store_dir: Path, target: str) -> bool:
+    """Returns whether any distribution installed for target is in the package store."""
+    target_dir = store_dir / _TARGETS_DIRNAME / target
+    return target_dir.is_dir() and any(target_dir.iterdir())
+
+
+def assemble_from_store(cache_dir: Path, store_dir: Path, dist_keys: list[str]) -> int:
+    """
+    Hard links stored distributions into a dependency cache directory.
+
+    Each distribution gets a RECORD listing its files, like the installer writes, so
+    the cache directory reads the same as one populated by installing. Files are
+    copied when they can't be linked.
+
+    Returns:
+        Number of files linked or copied.
+    """
+    count = 0
+    for dist_key in dist_keys:
+        entry_dir = store_dir / _PACKAGES_DIRNAME / dist_key
+        relative_files = sorted(
+            path.relative_to(entry_dir) for path in entry_dir.rglob("*") if path.is_file()
+        )
+        for relative_path in relative_files:
+            local = cache_dir / relative_path
+            local.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                local.hardlink_to(entry_dir / relative_path)
+            except OSError:
+                shutil.copy2(entry_dir / relative_path, local)
+        count += len(relative_files)
+        dist_infos = {
+            path.parts[0] for path in relative_files if path.parts[0].endswith(".dist-info")
+        }
+        for dist_info in dist_infos:
+            record = Path(dist_info) / "RECORD"
+            rows = [*(path.as_posix() for path in relative_files), record.as_posix()]
+            (cache_dir / record).write_text(
+                "".join(f"{row},,\n" for row in rows), encoding="utf-8"
+            )
+    return count
+
+
+def normalize_name(name: str) -> str:
+    """Normalizes a distribution name the way store entry keys spell it."""
+    return _NAME_NORMALIZE_PATTERN.sub("_", name).lower()
+
+
+def release_references(store_dir: Path, ref_names: list[str]) -> None:
+    """Forgets the distributions referenced by removed cache directories."""
+    for ref_name in ref_names:
+        (store_dir / _REFS_DIRNAME / ref_name).unlink(missing_ok=True)
+
+
+def collect_store_garbage(store_dir: Path) -> list[str]:
+    """Removes store entries no longer referenced by any cache directory."""
+    packages_dir = store_dir / _PACKAGES_DIRNAME
+    if not packages_dir.is_dir():
+        return []
+
+    referenced: set[str] = set()
+    refs_dir = store_dir / _REFS_DIRNAME
+    if refs_dir.is_dir():
+        for ref_file in refs_dir.rglob("*"):
+            if ref_file.is_file():
+                referenced.update(ref_file.read_text(encoding="utf-8").splitlines())
+
+    removed = []
+    for entry_dir in packages_dir.iterdir():
+        if entry_dir.is_dir() and entry_dir.name not in referenced:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            removed.append(entry_dir.name)
+    _forget_target_entries(store_dir, removed)
+    if removed:
+        logger.info("Removed %d unreferenced package(s) from store.", len(removed))
+    return removed
+
+
+def read_distributions(cache_dir: Path) -> list[InstalledDistribution]:
+    """
+    Lists distributions installed in a dependency cache directory.
+
+    Distributions are identified by name, version and wheel tags, read from their
+    dist-info directory. Their files come from RECORD, limited to files that exist
+    inside cache_dir.
+    """
+    distributions = []
+    for dist_info in sorted(cache_dir.glob("*.dist-info")):
+        identity = _read_identity(dist_info)
+        if identity is None:
+            continue
+        name, version, tags = identity
+        files = _read_record(cache_dir, dist_info)
+        distributions.append(
+            InstalledDistribution(
+                key=f"{normalize_name(name)}-{version}-{'.'.join(sorted(tags))}",
+                name=name,
+                version=version,
+                files=files,
+                size=sum((cache_dir / path).stat().st_size for path in files),
+            )
+        )
+    return distributions
+
+
+def _read_identity(dist_info: Path) -> tuple[str, str, list[str]] | None:
+    metadata_file = dist_info / "METADATA"
+    wheel_file = dist_info / "WHEEL"
+    if not metadata_file.is_file() or not wheel_file.is_file():
+        return None
+
+    parser = HeaderParser()
+    metadata = parser.parsestr(metadata_file.read_text(encoding="utf-8", errors="replace"))
+    wheel = parser.parsestr(wheel_file.read_text(encoding="utf-8", errors="replace"))
+    name, version, tags = metadata["Name"], metadata["Version"], wheel.get_all("Tag")
+    if not name or not version or not tags:
+        return None
+    return name, version, tags
+
+
+def _read_record(cache_dir: Path, dist_info: Path) -> tuple[Path, ...]:
+    record_file = dist_info / "RECORD"
+    if not record_file.is_file():
+        return ()
+
+    resolved_cache_dir = cache_dir.resolve()
+    files = []
+    with record_file.open(encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if not row or not row[0]:
+                continue
+            relative_path = Path(row[0])
+            local = cache_dir / relative_path
+            # Scripts may be recorded outside the target directory, those aren't included
+            if not local.resolve().is_relative_to(resolved_cache_dir) or not local.is_file():
+                continue
+            files.append(relative_path)
+    return tuple(files)
+
+
+def _is_local_file(relative_path: Path) -> bool:
+    return (
+        relative_path.parent.name.endswith(".dist-info")
+        and relative_path.name in _LOCAL_DIST_INFO_FILES
+    )
+
+
+def _populate_store_entry(cache_dir: Path, entry_dir: Path, relative_files: list[Path]) -> bool:
+    """Copies files into a new store entry, returns False if another install won the race."""
+    tmp_dir = entry_dir.with_name(f"{entry_dir.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        for relative_path in relative_files:
+            destination = tmp_dir / relative_path
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(cache_dir / relative_path, destination)
+        tmp_dir.rename(entry_dir)
+    except OSError:
+        if not entry_dir.is_dir():
+            raise
+        return False
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return True
+
+
+def _replace_with_link(stored: Path, local: Path) -> bool:
+    tmp_link = local.with_name(f"{local.name}.stlv-link")
+    try:
+        tmp_link.unlink(missing_ok=True)
+        tmp_link.hardlink_to(stored)
+        tmp_link.replace(local)
+    except OSError:
+        tmp_link.unlink(missing_ok=True)
+        logger.debug("Could not hard link %s, keeping a copy", local)
+        return False
+    return True
+
+
+def _is_same_file(first: Path, second: Path) -> bool:
+    try:
+        return first.samefile(second)
+    except OSError:
+        return False
+
+
+def _write_references(store_dir: Path, ref_name: str, distributions: list[str]) -> None:
+    ref_file = store_dir / _REFS_DIRNAME / ref_name
+    ref_file.parent.mkdir(parents=True, exist_ok=True)
+    ref_file.write_text("".join(f"{dist}\n" for dist in distributions), encoding="utf-8")
+
+
+def _forget_target_entries(store_dir: Path, removed: list[str]) -> None:
+    targets_dir = store_dir / _TARGETS_DIRNAME
+    if not removed or not targets_dir.is_dir():
+        return
+    for entry_file in targets_dir.rglob("*"):
+        if entry_file.is_file() and entry_file.read_text(encoding="utf-8") in removed:
+            entry_file.unlink(missing_ok=True)
+
+
+def _write_target_entry(
+    store_dir: Path, target: str, distribution: InstalledDistribution, dist_key: str
+) -> None:
+    entry_file = (
+        store_dir
+        / _TARGETS_DIRNAME
+        / target
+        / f"{normalize_name(distribution.name)}=={distribution.version}"
+    )
+    entry_file.parent.mkdir(parents=True, exist_ok=True)
+    entry_file.write_text(dist_key, encoding="utf-8")
@@ -0,0 +1,53 @@
+import logging
+
+from stelvio import context
+from stelvio.aws._packaging.dependencies import (
+    DependencyInstall,
+    InstallReport,
+    install_dependencies_concurrently,
+)
+from stelvio.aws.function import Function
+from stelvio.aws.function.dependencies import _get_function_dependency_install
+from stelvio.aws.layer import Layer, _get_layer_dependency_install
+from stelvio.component import ComponentRegistry
+from stelvio.project import get_project_root
+
+logger = logging.getLogger(__name__)
+
+
+def collect_dependency_installs() -> list[DependencyInstall]:
+    """Collects dependency installs of all Functions and Layers registered so far.
+
+    Functions in dev mode run through the bridge stub and never package their
+    dependencies, so they are skipped.
+    """
+    installs = [
+        install
+        for layer in ComponentRegistry.instances_of(Layer)
+        if (install := _get_layer_dependency_install(layer.name, layer.config)) is not None
+    ]
+    if not context().dev_mode:
+        installs += [
+            install
+            for function in ComponentRegistry.instances_of(Function)
+            if (install := _get_function_dependency_install(function.config)) is not None
+        ]
+    return installs
+
+
+def prefetch_dependencies(max_workers: int | None = None) -> list[InstallReport]:
+    """Installs missing dependency caches of all registered components concurrently.
+
+    Components created later (e.g. Functions created by an Api for its routes) are
+    not known yet and keep installing on demand when their resources are created.
+    """
+    installs = collect_dependency_installs()
+    if not installs:
+        return []
+    reports = install_dependencies_concurrently(installs, get_project_root(), max_workers)
+    if reports:
+        total = sum(report.duration for report in reports)
+        logger.info(
+            "Pre-installed %d dependency cache(s), %.2fs of installer time.", len(reports), total
+        )
+    return reports
@@ -0,0 +1,230 @@
+import logging
+import re
+import zipfile
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, ClassVar, Final
+
+from stelvio.aws._packaging.package_store import read_distributions
+from stelvio.aws.function.constants import (
+    LAMBDA_MAX_DIRECT_UPLOAD_SIZE,
+    LAMBDA_MAX_UNZIPPED_SIZE,
+)
+from stelvio.aws.size_budget import SizeBudgetConfig
+from stelvio.exceptions import StelvioValidationError
+
+_MB: Final[int] = 1024 * 1024
+_FUNCTION_KIND: Final[str] = "functions"
+_LAYER_KIND: Final[str] = "layers"
+# Layer code and dependencies are nested below python/ (and its site-packages)
+_LAYER_PATH_PREFIX: Final[re.Pattern] = re.compile(r"^python/(lib/python[^/]+/site-packages/)?")
+# Packages listed in size limit errors
+_ERROR_PACKAGES: Final[int] = 5
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactContentsRegistry:
+    """Zips packaged for Functions and Layers and the dependency directories they contain."""
+
+    _artifacts: ClassVar[dict[tuple[str, str], tuple[Path, dict[str, Path]]]] = {}
+
+    @classmethod
+    def add(cls, kind: str, component: str, path: Path, directories: Mapping[str, Path]) -> None:
+        cls._artifacts[kind, component] = (path, dict(directories))
+
+    @classmethod
+    def get(cls, kind: str, component: str) -> tuple[Path, dict[str, Path]] | None:
+        return cls._artifacts.get((kind, component))
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._artifacts.clear()
+
+
+@dataclass(frozen=True)
+class PackageSize:
+    """Unzipped size of one installed distribution, or of a top-level entry of own code."""
+
+    name: str
+    size: int
+
+
+@dataclass(frozen=True)
+class ArtifactSize:
+    kind: str
+    component: str
+    size: int
+    unzipped_size: int
+    # Largest first
+    packages: tuple[PackageSize, ...]
+
+
+@dataclass(frozen=True)
+class FunctionSizeReport:
+    """Sizes of a function's zip and its layers, checked against limits and budget."""
+
+    function: str
+    # The function's own artifact first, then its layers
+    artifacts: tuple[ArtifactSize, ...]
+    budget: SizeBudgetConfig | None
+    # Staged zips are uploaded to S3, so the direct upload limit doesn't apply
+    staged: bool
+
+    @property
+    def zipped_size(self) -> int:
+        return self.artifacts[0].size
+
+    @property
+    def unzipped_size(self) -> int:
+        return sum(artifact.unzipped_size for artifact in self.artifacts)
+
+    @property
+    def violations(self) -> list[str]:
+        """Describes every exceeded limit, empty if the function fits."""
+        violations = []
+        if self.unzipped_size > LAMBDA_MAX_UNZIPPED_SIZE:
+            violations.append(
+                f"unzipped size {_format_mb(self.unzipped_size)} (code and layers) exceeds "
+                f"Lambda's limit of {_format_mb(LAMBDA_MAX_UNZIPPED_SIZE)}"
+            )
+        if not self.staged and self.zipped_size > LAMBDA_MAX_DIRECT_UPLOAD_SIZE:
+            violations.append(
+                f"zipped size {_format_mb(self.zipped_size)} exceeds Lambda's direct upload "
+                f"limit of {_format_mb(LAMBDA_MAX_DIRECT_UPLOAD_SIZE)}, "
+                f"set stage_artifacts=True in StelvioAppConfig to upload through S3"
+            )
+        if self.budget is not None:
+            max_zipped, max_unzipped = self.budget.max_zipped_mb, self.budget.max_unzipped_mb
+            if max_zipped is not None and self.zipped_size > max_zipped * _MB:
+                violations.append(
+                    f"zipped size {_format_mb(self.zipped_size)} exceeds its budget of "
+                    f"{max_zipped:g} MB"
+                )
+            if max_unzipped is not None and self.unzipped_size > max_unzipped * _MB:
+                violations.append(
+                    f"unzipped size {_format_mb(self.unzipped_size)} (code and layers) exceeds "
+                    f"its budget of {max_unzipped:g} MB"
+                )
+        return violations
+
+    def largest_packages(self, limit: int) -> list[tuple[str, PackageSize]]:
+        """Returns the largest packages of all artifacts with the component they're in."""
+        packages = [
+            (f"{artifact.kind}/{artifact.component}", package)
+            for artifact in self.artifacts
+            for package in artifact.packages
+        ]
+        return sorted(packages, key=lambda item: item[1].size, reverse=True)[:limit]
+
+    def to_dict(self, top: int) -> dict[str, Any]:
+        return {
+            "function": self.function,
+            "zipped_size": self.zipped_size,
+            "unzipped_size": self.unzipped_size,
+            "budget": None
+            if self.budget is None
+            else {
+                "max_zipped_mb": self.budget.max_zipped_mb,
+                "max_unzipped_mb": self.budget.max_unzipped_mb,
+            },
+            "violations": self.violations,
+            "artifacts": [
+                {
+                    "kind": artifact.kind,
+                    "component": artifact.component,
+                    "size": artifact.size,
+                    "unzipped_size": artifact.unzipped_size,
+                    "packages": [
+                        {"name": package.name, "size": package.size}
+                        for package in artifact.packages[:top]
+                    ],
+                }
+                for artifact in self.artifacts
+            ],
+        }
+
+
+def measure_artifact(kind: str, component: str) -> ArtifactSize:
+    """
+    Measures a packaged zip and breaks its unzipped size down by package.
+
+    Files of distributions installed in the zip's dependency directories are counted
+    per distribution, everything else per top-level entry. Slimmed dependencies lose
+    their RECORD files, so their files count per top-level entry too.
+    """
+    contents = ArtifactContentsRegistry.get(kind, component)
+    if contents is None:
+        raise RuntimeError(f"No {kind} artifact was packaged for '{component}'.")
+    path, directories = contents
+    with zipfile.ZipFile(path) as archive:
+        file_sizes = {info.filename: info.file_size for info in archive.infolist()}
+
+    packages: dict[str, int] = defaultdict(int)
+    for prefix, directory in directories.items():
+        for distribution in read_distributions(directory):
+            name = f"{distribution.name} {distribution.version}"
+            for relative_path in distribution.files:
+                archive_path = str(PurePosixPath(prefix, relative_path.as_posix()))
+                if archive_path in file_sizes:
+                    packages[name] += file_sizes.pop(archive_path)
+    for archive_path, size in file_sizes.items():
+        name = _LAYER_PATH_PREFIX.sub("", archive_path) if kind == _LAYER_KIND else archive_path
+        packages[PurePosixPath(name).parts[0]] += size
+
+    return ArtifactSize(
+        kind=kind,
+        component=component,
+        size=path.stat().st_size,
+        unzipped_size=sum(packages.values()),
+        packages=tuple(
+            PackageSize(name, size)
+            for name, size in sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        ),
+    )
+
+
+def analyze_function_size(
+    function: str, layers: Sequence[str], budget: SizeBudgetConfig | None, *, staged: bool
+) -> FunctionSizeReport:
+    """Measures the packaged zips of a function and its layers (in attachment order)."""
+    return FunctionSizeReport(
+        function=function,
+        artifacts=(
+            measure_artifact(_FUNCTION_KIND, function),
+            *(measure_artifact(_LAYER_KIND, layer) for layer in layers),
+        ),
+        budget=budget,
+        staged=staged,
+    )
+
+
+def enforce_size_limits(report: FunctionSizeReport) -> None:
+    """
+    Raises:
+        StelvioValidationError: If the function exceeds Lambda's limits or its budget.
+    """
+    violations = report.violations
+    if not violations:
+        logger.debug(
+            "Function '%s' fits its size limits: %s zipped, %s unzipped.",
+            report.function,
+            _format_mb(report.zipped_size),
+            _format_mb(report.unzipped_size),
+        )
+        return
+    largest = "\n".join(
+        f"  {_format_mb(package.size):>10}  {package.name} ({component})"
+        for component, package in report.largest_packages(_ERROR_PACKAGES)
+    )
+    raise StelvioValidationError(
+        f"Function '{report.function}' is too large to deploy:\n"
+        + "\n".join(f"  - {violation}" for violation in violations)
+        + f"\nLargest packages:\n{largest}"
+    )
+
+
+def _format_mb(size: int) -> str:
+    return f"{size / _MB:.1f} MB"
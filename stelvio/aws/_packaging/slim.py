@@ -0,0 +1,143 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+from typing import Final
+
+from stelvio.aws._packaging.dependencies import _mark_cache_dir_as_used
+from stelvio.aws.slim import SlimConfig
+
+_SLIM_VARIANT_SEPARATOR: Final[str] = "__slim_"
+_REPORTED_TOP_LEVEL_ENTRIES: Final[int] = 10
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SlimReport:
+    """Sizes of a dependency directory before and after slimming."""
+
+    original_bytes: int
+    slimmed_bytes: int
+    removed_files: int
+    # Removed bytes per top-level entry (package or dist-info directory)
+    removed_by_entry: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def removed_bytes(self) -> int:
+        return self.original_bytes - self.slimmed_bytes
+
+
+def get_or_create_slim_variant(
+    cache_dir: Path, slim: SlimConfig, cache_subdirectory: str, log_context: str
+) -> Path:
+    """
+    Returns a slimmed copy of a dependency cache directory, creating it if needed.
+
+    The variant lives next to the original cache directory and is named after it and
+    the slimming rules, so the original install stays reusable and other functions
+    with different rules get their own variant. Files are hard linked, so the variant
+    takes almost no extra disk space.
+
+    Args:
+        cache_dir: Dependency cache directory populated by the installer.
+        slim: Slimming rules to apply.
+        cache_subdirectory: Subdirectory within .stelvio/lambda_dependencies the
+                            cache directory lives in (e.g., "functions").
+        log_context: A string identifier for logging (e.g., function name).
+
+    Returns:
+        Absolute path to the slimmed directory.
+    """
+    rules = json.dumps({"deny": slim.deny_patterns, "allow": slim.allow}, sort_keys=True)
+    rules_hash = hashlib.sha256(rules.encode("utf-8")).hexdigest()[:8]
+    variant_name = f"{cache_dir.name}{_SLIM_VARIANT_SEPARATOR}{rules_hash}"
+    variant_dir = cache_dir.parent / variant_name
+    _mark_cache_dir_as_used(variant_name, cache_subdirectory)
+
+    if variant_dir.is_dir():
+        logger.info("[%s] Slimmed dependencies hit for '%s'.", log_context, variant_name)
+        return variant_dir
+
+    tmp_dir = cache_dir.parent / f"{variant_name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        report = slim_directory(cache_dir, tmp_dir, slim)
+        tmp_dir.rename(variant_dir)
+    except OSError:
+        # Another process created the same variant in the meantime
+        if not variant_dir.is_dir():
+            raise
+        return variant_dir
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    _log_report(report, log_context)
+    return variant_dir
+
+
+def slim_directory(source: Path, destination: Path, slim: SlimConfig) -> SlimReport:
+    """Hard links (or copies) every file of source not removed by slim into destination."""
+    deny_patterns = slim.deny_patterns
+    original_bytes = slimmed_bytes = removed_files = 0
+    removed_by_entry: dict[str, int] = {}
+
+    destination.mkdir(parents=True)
+    for file_path in sorted(source.rglob("*")):
+        if not file_path.is_file():
+            continue
+        relative_path = PurePosixPath(file_path.relative_to(source).as_posix())
+        size = file_path.stat().st_size
+        original_bytes += size
+        if _matches(relative_path, deny_patterns) and not _matches(relative_path, slim.allow):
+            removed_files += 1
+            entry = relative_path.parts[0]
+            removed_by_entry[entry] = removed_by_entry.get(entry, 0) + size
+            continue
+        slimmed_bytes += size
+        target = destination / relative_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _link_or_copy(file_path, target)
+
+    return SlimReport(
+        original_bytes=original_bytes,
+        slimmed_bytes=slimmed_bytes,
+        removed_files=removed_files,
+        removed_by_entry=removed_by_entry,
+    )
+
+
+def _matches(relative_path: PurePosixPath, patterns: tuple[str, ...] | list[str]) -> bool:
+    candidates = [str(relative_path), *(str(parent) for parent in relative_path.parents)]
+    return any(
+        fnmatchcase(candidate, pattern)
+        for candidate in candidates
+        if candidate != "."
+        for pattern in patterns
+    )
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    try:
+        target.hardlink_to(source)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _log_report(report: SlimReport, log_context: str) -> None:
+    mb = 1024 * 1024
+    logger.info(
+        "[%s] Slimmed dependencies from %.1f MB to %.1f MB (%d files, %.1f MB removed).",
+        log_context,
+        report.original_bytes / mb,
+        report.slimmed_bytes / mb,
+        report.removed_files,
+        report.removed_bytes / mb,
+    )
+    largest = sorted(report.removed_by_entry.items(), key=lambda item: (-item[1], item[0]))
+    for entry, removed in largest[:_REPORTED_TOP_LEVEL_ENTRIES]:
+        logger.debug("[%s]   %s: %.2f MB removed", log_context, entry, removed / mb)
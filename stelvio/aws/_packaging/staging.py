@@ -0,0 +1,163 @@
+import json
+import logging
+import threading
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Final
+
+import pulumi
+from pulumi import FileArchive
+
+from stelvio.aws._packaging.file_index import get_file_index
+from stelvio.home import Home
+
+# Keyed by app only, so environments of an app deploying the same zip share one object
+ARTIFACT_KEY: Final[str] = "artifacts/{app}/{content_hash}.zip"
+_ARTIFACTS_PREFIX: Final[str] = "artifacts/{app}/"
+# Keys of the artifacts each environment's last deploy referenced
+ARTIFACT_REFERENCES_KEY: Final[str] = "artifacts/{app}/references/{env}.json"
+# Unreferenced artifacts newer than this may belong to a deploy that is still running
+_DELETE_GRACE_PERIOD: Final[timedelta] = timedelta(days=1)
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactStager:
+    """
+    Uploads artifacts to the home storage so Lambda fetches code from S3.
+
+    Objects are keyed by the zip's content hash, objects that already exist are never
+    uploaded again. Different artifacts are uploaded concurrently.
+    """
+
+    def __init__(self, home: Home, app: str) -> None:
+        self._home = home
+        self._app = app
+        self._staged: set[str] = set()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def bucket(self) -> str:
+        return self._home.storage_name
+
+    @property
+    def staged_keys(self) -> list[str]:
+        """Keys of all artifacts staged so far, uploaded or already stored."""
+        with self._lock:
+            return sorted(self._staged)
+
+    def stage(self, artifact_path: Path, log_context: str = "") -> str:
+        """
+        Uploads an artifact unless an identical one is already stored.
+
+        Nothing is uploaded during previews, the key is known without uploading.
+
+        Returns:
+            Key of the artifact in the storage.
+        """
+        key = ARTIFACT_KEY.format(app=self._app, content_hash=get_file_index().hash(artifact_path))
+        if pulumi.runtime.is_dry_run():
+            return key
+        with self._lock:
+            if key in self._staged:
+                return key
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Only stagers of the same key wait for the upload
+        with key_lock:
+            with self._lock:
+                if key in self._staged:
+                    return key
+
+            if self._home.file_exists(key):
+                logger.info("[%s] Artifact already staged as '%s'.", log_context, key)
+            else:
+                logger.info(
+                    "[%s] Staging artifact (%d bytes) as '%s'.",
+                    log_context,
+                    artifact_path.stat().st_size,
+                    key,
+                )
+                self._home.write_file(key, artifact_path)
+            with self._lock:
+                self._staged.add(key)
+        return key
+
+
+def clean_staged_artifacts(
+    home: Home, app: str, env: str, referenced: Iterable[str], workdir: Path
+) -> list[str]:
+    """
+    Records the artifacts an environment references and deletes unreferenced ones.
+
+    Artifacts are shared by the environments of an app, so an artifact is deleted
+    only once no environment's last deploy referenced it. Artifacts uploaded within
+    the grace period are kept, another environment's deploy may not have recorded
+    its references yet. An environment without references (e.g. after a destroy)
+    forgets its previous ones.
+
+    Args:
+        home: Storage holding the artifacts.
+        app: Name of the app.
+        env: Environment that was deployed or destroyed.
+        referenced: Keys of the artifacts the environment uses now.
+        workdir: Directory for temporary files.
+
+    Returns:
+        Keys of the deleted artifacts.
+    """
+    references_key = ARTIFACT_REFERENCES_KEY.format(app=app, env=env)
+    keys = sorted(set(referenced))
+    if keys:
+        references_file = workdir / "artifact_references.json"
+        references_file.write_text(json.dumps(keys, indent=2))
+        home.write_file(references_key, references_file)
+    elif home.file_exists(references_key):
+        home.delete_file(references_key)
+
+    in_use = set()
+    stored = []
+    now = datetime.now(UTC)
+    for key, modified in home.list_files(_ARTIFACTS_PREFIX.format(app=app)).items():
+        if key.endswith(".json"):
+            in_use.update(_read_references(home, key, workdir))
+        elif now - modified > _DELETE_GRACE_PERIOD:
+            stored.append(key)
+
+    unreferenced = [key for key in stored if key not in in_use]
+    for key in unreferenced:
+        home.delete_file(key)
+    if unreferenced:
+        logger.info("Deleted %d unreferenced staged artifact(s) of '%s'.", len(unreferenced), app)
+    return unreferenced
+
+
+def _read_references(home: Home, key: str, workdir: Path) -> list[str]:
+    local_path = workdir / "artifact_references" / key.rsplit("/", 1)[-1]
+    if not home.read_file(key, local_path):
+        return []
+    return json.loads(local_path.read_text())
+
+
+_artifact_stager: ArtifactStager | None = None
+
+
+def set_artifact_stager(stager: ArtifactStager | None) -> None:
+    """Makes Lambda functions and layers created from now on use staged code, or not."""
+    global _artifact_stager  # noqa: PLW0603
+    _artifact_stager = stager
+
+
+def get_code_args(artifact_path: Path, log_context: str = "") -> dict[str, Any]:
+    """
+    Returns the code arguments of a Lambda function or layer version for an artifact.
+
+    Code is passed inline unless artifacts are staged, in which case it's referenced by
+    its bucket and key.
+    """
+    stager = _artifact_stager
+    if stager is None:
+        return {"code": FileArchive(str(artifact_path))}
+    return {"s3_bucket": stager.bucket, "s3_key": stager.stage(artifact_path, log_context)}
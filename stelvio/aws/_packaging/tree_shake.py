@@ -0,0 +1,182 @@
+import ast
+import logging
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+
+from stelvio.aws._packaging.artifacts import hash_file
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _Import:
+    # Imported module, None for "from . import x"
+    module: str | None
+    # Names imported from the module, which may be submodules
+    names: tuple[str, ...] = ()
+    # Number of leading dots of relative imports
+    level: int = 0
+
+
+@dataclass(frozen=True)
+class _ParsedModule:
+    imports: tuple[_Import, ...]
+    # Line numbers of dynamic imports whose module isn't a string literal
+    unresolved: tuple[int, ...]
+    syntax_error: bool = False
+
+
+# Parsed modules by content hash, so functions sharing a folder parse each file once
+_parsed_modules: dict[str, _ParsedModule] = {}
+_parsed_modules_lock = threading.Lock()
+
+
+def shake_code_files(
+    files: Mapping[str, Path],
+    entry_point: str,
+    include: Sequence[str],
+    log_context: str,
+    hash_path: Callable[[Path], str] = hash_file,
+) -> dict[str, Path]:
+    """
+    Keeps the first-party modules reachable from an entry point, plus included files.
+
+    Imports are followed statically, including imports inside functions and calls to
+    importlib.import_module or __import__ with a string literal. Modules not among
+    files (standard library, dependencies) are not followed. Other files are only
+    kept if they match one of the include patterns.
+
+    Args:
+        files: Mapping of archive paths to files, as collected from the function folder.
+        entry_point: Archive path of the handler file (e.g., "orders/handler.py").
+        include: Glob patterns of archive paths to keep. Matching modules are followed
+                 like the entry point.
+        log_context: A string identifier for logging (e.g., function name).
+        hash_path: Returns the content hash of a file.
+
+    Returns:
+        The subset of files to package.
+    """
+    modules = {
+        _module_name(archive_path): archive_path
+        for archive_path in files
+        if archive_path.endswith(".py")
+    }
+    included = {
+        archive_path
+        for archive_path in files
+        if any(fnmatchcase(archive_path, pattern) for pattern in include)
+    }
+
+    pending = [_module_name(entry_point)]
+    pending += [_module_name(path) for path in sorted(included) if path.endswith(".py")]
+    reachable: set[str] = set()
+    while pending:
+        name = pending.pop()
+        if name in reachable:
+            continue
+        reachable.add(name)
+        archive_path = modules[name]
+        parsed = _parse_module(files[archive_path], hash_path)
+        if parsed.syntax_error:
+            logger.warning(
+                "[%s] Can't parse %s, its imports are not packaged unless they match 'include'.",
+                log_context,
+                archive_path,
+            )
+        for line in parsed.unresolved:
+            logger.warning(
+                "[%s] Can't resolve dynamic import in %s:%d. Add the modules it imports "
+                "to 'include'.",
+                log_context,
+                archive_path,
+                line,
+            )
+        is_package = archive_path.endswith("__init__.py")
+        for imported in parsed.imports:
+            pending += [
+                target
+                for target in _resolve_import(imported, name, is_package)
+                if target in modules and target not in reachable
+            ]
+
+    kept = {modules[name] for name in reachable} | included
+    logger.info("[%s] Tree shaking kept %d of %d files.", log_context, len(kept), len(files))
+    return {archive_path: files[archive_path] for archive_path in sorted(kept)}
+
+
+def _module_name(archive_path: str) -> str:
+    parts = PurePosixPath(archive_path).with_suffix("").parts
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def _resolve_import(imported: _Import, current: str, is_package: bool) -> list[str]:
+    """Returns the modules an import may load, including parent packages."""
+    if imported.level:
+        package = current if is_package else current.rpartition(".")[0]
+        package_parts = package.split(".") if package else []
+        if imported.level - 1 > len(package_parts) or (
+            imported.level - 1 == len(package_parts) and not imported.module
+        ):
+            return []
+        base_parts = package_parts[: len(package_parts) - (imported.level - 1)]
+        target_parts = [*base_parts, *(imported.module.split(".") if imported.module else [])]
+    else:
+        target_parts = imported.module.split(".")
+    if not target_parts:
+        return []
+
+    target = ".".join(target_parts)
+    # Importing a module imports its parent packages first
+    targets = [".".join(target_parts[:i]) for i in range(1, len(target_parts) + 1)]
+    targets += [f"{target}.{name}" for name in imported.names if name != "*"]
+    return targets
+
+
+def _parse_module(path: Path, hash_path: Callable[[Path], str]) -> _ParsedModule:
+    content_hash = hash_path(path)
+    with _parsed_modules_lock:
+        if content_hash in _parsed_modules:
+            return _parsed_modules[content_hash]
+
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (SyntaxError, ValueError):
+        parsed = _ParsedModule(imports=(), unresolved=(), syntax_error=True)
+    else:
+        parsed = _collect_imports(tree)
+
+    with _parsed_modules_lock:
+        _parsed_modules[content_hash] = parsed
+    return parsed
+
+
+def _collect_imports(tree: ast.AST) -> _ParsedModule:
+    imports: list[_Import] = []
+    unresolved: list[int] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports += [_Import(alias.name) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            names = tuple(alias.name for alias in node.names)
+            imports.append(_Import(node.module, names, node.level))
+        elif isinstance(node, ast.Call) and _is_dynamic_import(node.func):
+            argument = node.args[0] if node.args else None
+            if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+                module = argument.value.lstrip(".")
+                level = len(argument.value) - len(module)
+                imports.append(_Import(module or None, (), level))
+            else:
+                unresolved.append(node.lineno)
+    return _ParsedModule(imports=tuple(imports), unresolved=tuple(unresolved))
+
+
+def _is_dynamic_import(func: ast.expr) -> bool:
+    if isinstance(func, ast.Name):
+        return func.id in ("import_module", "__import__")
+    return isinstance(func, ast.Attribute) and func.attr == "import_module"
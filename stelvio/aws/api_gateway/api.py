@@ -164,6 +164,7 @@ class Api(Component[ApiResources, ApiCustomizationDict]):
             ),
             action="lambda:InvokeFunction",
             function=function.function_name,
+            qualifier=function.qualifier,
             principal="apigateway.amazonaws.com",
             source_arn=pulumi.Output.all(rest_api.execution_arn, authorizer.id).apply(
                 lambda args: f"{args[0]}/authorizers/{args[1]}"
@@ -831,6 +832,7 @@ class Api(Component[ApiResources, ApiCustomizationDict]):
             context().prefix(f"{function.name}-permission"),
             action="lambda:InvokeFunction",
             function=function.function_name,
+            qualifier=function.qualifier,
             principal="apigateway.amazonaws.com",
             source_arn=rest_api.execution_arn.apply(lambda arn: f"{arn}/*/*"),
             opts=self._resource_opts(),
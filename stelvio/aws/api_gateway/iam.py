@@ -3,14 +3,10 @@ from functools import cache
 
 from pulumi import Output, ResourceOptions
 from pulumi_aws.apigateway import Account
-from pulumi_aws.iam import (
-    GetPolicyDocumentStatementArgs,
-    GetPolicyDocumentStatementPrincipalArgs,
-    Role,
-    get_policy_document,
-)
+from pulumi_aws.iam import Role
 
 from stelvio.aws.api_gateway.constants import API_GATEWAY_LOGS_POLICY, API_GATEWAY_ROLE_NAME
+from stelvio.aws.permission import render_assume_role_policy
 from stelvio.provider import ProviderStore
 
 logger = logging.getLogger("stelvio.aws.api_gateway")
@@ -49,21 +45,9 @@ def _create_api_gateway_account_and_role() -> Output[Account]:
 
 
 def _create_api_gateway_role(provider_opts: ResourceOptions) -> Role:
-    assume_role_policy = get_policy_document(
-        statements=[
-            GetPolicyDocumentStatementArgs(
-                actions=["sts:AssumeRole"],
-                principals=[
-                    GetPolicyDocumentStatementPrincipalArgs(
-                        identifiers=["apigateway.amazonaws.com"], type="Service"
-                    )
-                ],
-            )
-        ]
-    )
     return Role(
         API_GATEWAY_ROLE_NAME,
-        assume_role_policy=assume_role_policy.json,
+        assume_role_policy=render_assume_role_policy("apigateway.amazonaws.com"),
         managed_policy_arns=[API_GATEWAY_LOGS_POLICY],
         opts=ResourceOptions.merge(
             provider_opts,
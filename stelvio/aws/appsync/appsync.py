@@ -551,6 +551,7 @@ class AppSync(Component[AppSyncResources, AppSyncCustomizationDict], LinkableMix
                     {
                         "action": "lambda:InvokeFunction",
                         "function": auth_function.function_name,
+                        "qualifier": auth_function.qualifier,
                         "principal": "appsync.amazonaws.com",
                         "source_arn": graphql_api.arn,
                     },
@@ -567,6 +568,7 @@ class AppSync(Component[AppSyncResources, AppSyncCustomizationDict], LinkableMix
                     {
                         "action": "lambda:InvokeFunction",
                         "function": function.function_name,
+                        "qualifier": function.qualifier,
                         "principal": "appsync.amazonaws.com",
                         "source_arn": graphql_api.arn,
                     },
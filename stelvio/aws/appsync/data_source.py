@@ -184,7 +184,7 @@ class AppSyncDataSource(Component[AppSyncDataSourceResources, AppSyncDataSourceC
             "service_role_arn": role.arn,
         }
         if function_instance is not None:
-            ds_args["lambda_config"] = {"function_arn": function_instance.resources.function.arn}
+            ds_args["lambda_config"] = {"function_arn": function_instance.invocation_arn}
         ds_args.update(self._build_ds_type_config())
 
         data_source = appsync.DataSource(
@@ -302,7 +302,7 @@ class AppSyncDataSource(Component[AppSyncDataSourceResources, AppSyncDataSourceC
         prefix = context().prefix
 
         if self.ds_type == DS_TYPE_LAMBDA and function_instance is not None:
-            fn_arn = function_instance.resources.function.arn
+            fn_arn = function_instance.invocation_arn
             self._policies.append(
                 iam.RolePolicy(
                     safe_name(prefix(), f"{self._api.name}-ds-{self.name}-lambda-policy", 128),
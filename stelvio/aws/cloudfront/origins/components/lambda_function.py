@@ -32,6 +32,7 @@ class LambdaFunctionCloudfrontAdapter(ComponentCloudfrontAdapter):
             self.function.resources.function,
             url_config,
             self.resource_opts,
+            qualifier=self.function.qualifier,
         )
 
         # Create OAC if using IAM authentication (secure by default)
@@ -148,6 +149,7 @@ class LambdaFunctionCloudfrontAdapter(ComponentCloudfrontAdapter):
             context().prefix(f"{self.function.name}-cloudfront-permission-{self.idx}"),
             action="lambda:InvokeFunctionUrl",
             function=self.function.resources.function.name,
+            qualifier=self.function.qualifier,
             principal="cloudfront.amazonaws.com",
             source_arn=distribution.arn,
             function_url_auth_type="AWS_IAM",
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Unpack, final
+from typing import Any, Unpack, final
 
 import pulumi
 import pulumi_aws
@@ -18,12 +18,10 @@ from stelvio.aws.cognito.types import (
 )
 from stelvio.aws.cognito.user_pool import UserPool
 from stelvio.aws.cognito.user_pool_client import UserPoolClient
+from stelvio.aws.permission import render_policy_document
 from stelvio.component import Component, link_config_creator, safe_name
 from stelvio.link import LinkableMixin, LinkConfig
 
-if TYPE_CHECKING:
-    from stelvio.aws.permission import AwsPermission
-
 MAX_IDENTITY_POOL_NAME_LENGTH = 128
 MAX_ROLE_NAME_LENGTH = 64
 
@@ -87,32 +85,6 @@ def _build_trust_policy(identity_pool_id: Output[str], *, authenticated: bool) -
     )
 
 
-def _build_inline_policy(permissions: list[AwsPermission]) -> Output[str]:
-    """Build an inline policy document from a list of AwsPermission."""
-    all_resources = []
-    resource_counts = []
-    for perm in permissions:
-        all_resources.extend(perm.resources)
-        resource_counts.append(len(perm.resources))
-
-    def _build(resolved: list[str]) -> str:
-        statements = []
-        offset = 0
-        for i, perm in enumerate(permissions):
-            count = resource_counts[i]
-            statements.append(
-                {
-                    "Effect": "Allow",
-                    "Action": list(perm.actions),
-                    "Resource": list(resolved[offset : offset + count]),
-                }
-            )
-            offset += count
-        return json.dumps({"Version": "2012-10-17", "Statement": statements})
-
-    return Output.all(*all_resources).apply(_build)
-
-
 @final
 @dataclass(frozen=True)
 class IdentityPoolResources:
@@ -219,7 +191,7 @@ class IdentityPool(
         # 4. Create authenticated role policy if permissions specified
         authenticated_role_policy: RolePolicy | None = None
         if self._config.permissions and self._config.permissions.authenticated:
-            policy_doc = _build_inline_policy(self._config.permissions.authenticated)
+            policy_doc = render_policy_document(self._config.permissions.authenticated)
             authenticated_role_policy = RolePolicy(
                 safe_name(prefix, f"{self.name}-auth-policy", MAX_ROLE_NAME_LENGTH),
                 **self._customizer(
@@ -247,7 +219,7 @@ class IdentityPool(
             )
 
             if self._config.permissions and self._config.permissions.unauthenticated:
-                policy_doc = _build_inline_policy(self._config.permissions.unauthenticated)
+                policy_doc = render_policy_document(self._config.permissions.unauthenticated)
                 unauthenticated_role_policy = RolePolicy(
                     safe_name(prefix, f"{self.name}-unauth-policy", MAX_ROLE_NAME_LENGTH),
                     **self._customizer(
@@ -228,7 +228,7 @@ class Cron(Component[CronResources, CronCustomizationDict]):
                 "target",
                 {
                     "rule": rule.name,
-                    "arn": lambda_function.arn,
+                    "arn": stelvio_function.invocation_arn,
                     "input": json.dumps(self._payload) if self._payload is not None else None,
                 },
             ),
@@ -243,6 +243,7 @@ class Cron(Component[CronResources, CronCustomizationDict]):
                 {
                     "action": "lambda:InvokeFunction",
                     "function": lambda_function.name,
+                    "qualifier": stelvio_function.qualifier,
                     "principal": "events.amazonaws.com",
                     "source_arn": rule.arn,
                 },
@@ -285,7 +285,7 @@ class DynamoSubscription(
                 "event_source_mapping",
                 {
                     "event_source_arn": self._table.stream_arn,
-                    "function_name": function.function_name,
+                    "function_name": function.invocation_name,
                     "starting_position": "LATEST",
                     "batch_size": self._batch_size or 100,
                     "maximum_batching_window_in_seconds": 0,
@@ -1,4 +1,13 @@
-from .config import FunctionConfig, FunctionConfigDict, FunctionUrlConfig, FunctionUrlConfigDict
+from .config import (
+    FunctionConfig,
+    FunctionConfigDict,
+    FunctionUrlConfig,
+    FunctionUrlConfigDict,
+    ProvisionedConcurrencyConfig,
+    ProvisionedConcurrencyConfigDict,
+    WarmConfig,
+    WarmConfigDict,
+)
 from .function import Function, FunctionCustomizationDict, FunctionResources
 
 
@@ -61,4 +70,8 @@ __all__ = [
     "FunctionResources",
     "FunctionUrlConfig",
     "FunctionUrlConfigDict",
+    "ProvisionedConcurrencyConfig",
+    "ProvisionedConcurrencyConfigDict",
+    "WarmConfig",
+    "WarmConfigDict",
 ]
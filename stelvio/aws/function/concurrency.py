@@ -0,0 +1,61 @@
+import logging
+from dataclasses import dataclass
+from typing import Final
+
+import pulumi
+
+from stelvio.aws.function.function import Function
+from stelvio.component import ComponentRegistry
+
+# Reservations listed in the budget warning
+_WARNING_FUNCTIONS: Final[int] = 5
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReservedConcurrencyReport:
+    """Concurrency reserved by the app's functions, largest reservation first."""
+
+    reservations: tuple[tuple[str, int], ...]
+    budget: int | None
+
+    @property
+    def total(self) -> int:
+        return sum(reserved for _, reserved in self.reservations)
+
+    @property
+    def exceeds_budget(self) -> bool:
+        return self.budget is not None and self.total > self.budget
+
+
+def account_reserved_concurrency(budget: int | None) -> ReservedConcurrencyReport:
+    """Sums reserved_concurrency of all functions and warns if it exceeds the budget.
+
+    The warning is a Pulumi diagnostic, so it shows up in diffs before anything
+    is deployed. Lambda itself rejects reservations that would leave less than
+    100 unreserved executions in the account.
+    """
+    report = ReservedConcurrencyReport(
+        reservations=tuple(
+            sorted(
+                (
+                    (function.name, function.config.reserved_concurrency)
+                    for function in ComponentRegistry.instances_of(Function)
+                    if function.config.reserved_concurrency is not None
+                ),
+                key=lambda reservation: (-reservation[1], reservation[0]),
+            )
+        ),
+        budget=budget,
+    )
+    logger.debug("Functions reserve %d concurrent executions (budget: %s).", report.total, budget)
+    if report.exceeds_budget:
+        largest = ", ".join(
+            f"{name} ({reserved})" for name, reserved in report.reservations[:_WARNING_FUNCTIONS]
+        )
+        pulumi.log.warn(
+            f"Functions reserve {report.total} concurrent executions, more than the "
+            f"concurrency_budget of {budget}. Largest reservations: {largest}."
+        )
+    return report
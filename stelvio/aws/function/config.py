@@ -2,9 +2,28 @@ from collections import Counter
 from dataclasses import MISSING, Field, dataclass, field, fields
 from typing import Literal, TypedDict
 
+from stelvio.aws._packaging.artifacts import validate_compression_level
 from stelvio.aws.cors import CorsConfig, CorsConfigDict
-from stelvio.aws.function.constants import DEFAULT_ARCHITECTURE, DEFAULT_RUNTIME, MAX_LAMBDA_LAYERS
+from stelvio.aws.function.constants import (
+    DEFAULT_ARCHITECTURE,
+    DEFAULT_PROVISIONED_CONCURRENCY_UTILIZATION,
+    DEFAULT_RUNTIME,
+    DEFAULT_WARM_RATE,
+    MAX_LAMBDA_LAYERS,
+    SNAP_START_RUNTIMES,
+)
 from stelvio.aws.layer import Layer
+from stelvio.aws.size_budget import (
+    SizeBudgetConfig,
+    SizeBudgetConfigDict,
+    normalize_size_budget_config,
+)
+from stelvio.aws.slim import SlimConfig, SlimConfigDict, normalize_slim_config
+from stelvio.aws.tree_shake import (
+    TreeShakeConfig,
+    TreeShakeConfigDict,
+    normalize_tree_shake_config,
+)
 from stelvio.aws.types import AwsArchitecture, AwsLambdaRuntime
 from stelvio.link import Link, Linkable
 
@@ -65,6 +84,125 @@ class FunctionUrlConfig:
         return None
 
 
+class ProvisionedConcurrencyConfigDict(TypedDict, total=False):
+    min_capacity: int
+    max_capacity: int
+    target_utilization: float
+
+
+@dataclass(frozen=True, kw_only=True)
+class ProvisionedConcurrencyConfig:
+    """Provisioned concurrency scaled by Application Auto Scaling.
+
+    Attributes:
+        min_capacity: Minimum number of provisioned execution environments.
+        max_capacity: Maximum number of provisioned execution environments.
+        target_utilization: Share of provisioned concurrency in use (between 0 and 1)
+            that auto scaling keeps the function at.
+    """
+
+    min_capacity: int
+    max_capacity: int
+    target_utilization: float = DEFAULT_PROVISIONED_CONCURRENCY_UTILIZATION
+
+    def __post_init__(self) -> None:
+        for name in ("min_capacity", "max_capacity"):
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise TypeError(f"{name} must be an integer")
+            if value < 1:
+                raise ValueError(f"{name} must be at least 1")
+        if self.min_capacity > self.max_capacity:
+            raise ValueError("min_capacity cannot be greater than max_capacity")
+        if isinstance(self.target_utilization, bool) or not isinstance(
+            self.target_utilization, int | float
+        ):
+            raise TypeError("target_utilization must be a number")
+        if not 0 < self.target_utilization < 1:
+            raise ValueError("target_utilization must be between 0 and 1")
+
+
+def normalize_provisioned_concurrency_config(
+    provisioned_concurrency: int
+    | ProvisionedConcurrencyConfig
+    | ProvisionedConcurrencyConfigDict
+    | None,
+) -> int | ProvisionedConcurrencyConfig | None:
+    """Converts the accepted forms of the 'provisioned_concurrency' option.
+
+    Returns a fixed number of execution environments, ProvisionedConcurrencyConfig
+    for auto scaling, or None if provisioned concurrency is disabled.
+    """
+    if provisioned_concurrency is None:
+        return None
+    if isinstance(provisioned_concurrency, bool):
+        raise TypeError("'provisioned_concurrency' must be an integer, not a boolean.")
+    if isinstance(provisioned_concurrency, int):
+        if provisioned_concurrency < 1:
+            raise ValueError("'provisioned_concurrency' must be at least 1.")
+        return provisioned_concurrency
+    if isinstance(provisioned_concurrency, ProvisionedConcurrencyConfig):
+        return provisioned_concurrency
+    if isinstance(provisioned_concurrency, dict):
+        return ProvisionedConcurrencyConfig(**provisioned_concurrency)
+    raise TypeError(
+        f"'provisioned_concurrency' must be an integer, ProvisionedConcurrencyConfig or "
+        f"ProvisionedConcurrencyConfigDict. Got type: {type(provisioned_concurrency).__name__}."
+    )
+
+
+class WarmConfigDict(TypedDict, total=False):
+    concurrency: int
+    rate: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class WarmConfig:
+    """Scheduled pings keeping execution environments of a function initialized.
+
+    Attributes:
+        concurrency: Number of execution environments each ping keeps warm.
+        rate: Time between pings as the value of an EventBridge rate expression,
+            e.g. "5 minutes".
+    """
+
+    concurrency: int = 1
+    rate: str = DEFAULT_WARM_RATE
+
+    def __post_init__(self) -> None:
+        # cron imports Function, so its validation is imported when needed
+        from stelvio.aws.cron import _validate_rate_expression  # noqa: PLC0415
+
+        if isinstance(self.concurrency, bool) or not isinstance(self.concurrency, int):
+            raise TypeError("concurrency must be an integer")
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if not isinstance(self.rate, str):
+            raise TypeError("rate must be a string")
+        _validate_rate_expression(self.schedule)
+
+    @property
+    def schedule(self) -> str:
+        return f"rate({self.rate})"
+
+
+def normalize_warm_config(
+    warm: bool | WarmConfig | WarmConfigDict | None,
+) -> WarmConfig | None:
+    """Converts the accepted forms of the 'warm' option to WarmConfig, or None."""
+    if warm is None or warm is False:
+        return None
+    if warm is True:
+        return WarmConfig()
+    if isinstance(warm, WarmConfig):
+        return warm
+    if isinstance(warm, dict):
+        return WarmConfig(**warm)
+    raise TypeError(
+        f"'warm' must be a bool, WarmConfig or WarmConfigDict. Got type: {type(warm).__name__}."
+    )
+
+
 class FunctionConfigDict(TypedDict, total=False):
     handler: str
     folder: str
@@ -77,6 +215,18 @@ class FunctionConfigDict(TypedDict, total=False):
     requirements: str | list[str] | Literal[False] | None
     layers: list[Layer] | None
     url: Literal["public", "private"] | FunctionUrlConfig | FunctionUrlConfigDict | None
+    slim: bool | SlimConfig | SlimConfigDict | None
+    precompile: bool | None
+    tree_shake: bool | TreeShakeConfig | TreeShakeConfigDict | None
+    compression_level: int | None
+    size_budget: SizeBudgetConfig | SizeBudgetConfigDict | None
+    provisioned_concurrency: (
+        int | ProvisionedConcurrencyConfig | ProvisionedConcurrencyConfigDict | None
+    )
+    snap_start: bool | None
+    reserved_concurrency: int | None
+    warm: bool | WarmConfig | WarmConfigDict | None
+    metrics: bool | None
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -95,6 +245,18 @@ class FunctionConfig:
     requirements: str | list[str] | Literal[False] | None = None
     layers: list[Layer] = field(default_factory=list)
     url: Literal["public", "private"] | FunctionUrlConfig | FunctionUrlConfigDict | None = None
+    slim: bool | SlimConfig | SlimConfigDict | None = None
+    precompile: bool | None = None
+    tree_shake: bool | TreeShakeConfig | TreeShakeConfigDict | None = None
+    compression_level: int | None = None
+    size_budget: SizeBudgetConfig | SizeBudgetConfigDict | None = None
+    provisioned_concurrency: (
+        int | ProvisionedConcurrencyConfig | ProvisionedConcurrencyConfigDict | None
+    ) = None
+    snap_start: bool | None = None
+    reserved_concurrency: int | None = None
+    warm: bool | WarmConfig | WarmConfigDict | None = None
+    metrics: bool | None = None
 
     def __post_init__(self) -> None:
         handler_parts = self.handler.split("::")
@@ -131,6 +293,15 @@ class FunctionConfig:
             function_architecture=self.architecture or DEFAULT_ARCHITECTURE,
         )
         self._validate_url()
+        normalize_slim_config(self.slim)
+        self._validate_flags()
+        self._validate_tree_shake()
+        validate_compression_level(self.compression_level)
+        normalize_size_budget_config(self.size_budget)
+        normalize_provisioned_concurrency_config(self.provisioned_concurrency)
+        self._validate_snap_start()
+        self._validate_reserved_concurrency()
+        normalize_warm_config(self.warm)
 
     def _validate_requirements(self) -> None:
         """Validates the 'requirements' property against allowed types and values."""
@@ -205,6 +376,47 @@ class FunctionConfig:
                     f"with Layer '{layer.name}' architecture '{layer_architecture}'."
                 )
 
+    def _validate_flags(self) -> None:
+        for name in ("precompile", "metrics"):
+            value = getattr(self, name)
+            if value is not None and not isinstance(value, bool):
+                raise TypeError(f"'{name}' must be a boolean")
+
+    def _validate_snap_start(self) -> None:
+        """Validates the 'snap_start' property against the runtime and other options."""
+        if self.snap_start is not None and not isinstance(self.snap_start, bool):
+            raise TypeError("'snap_start' must be a boolean")
+        if not self.snap_start:
+            return
+        runtime = self.runtime or DEFAULT_RUNTIME
+        if runtime not in SNAP_START_RUNTIMES:
+            raise ValueError(
+                f"SnapStart is not supported for runtime '{runtime}'. "
+                f"Supported runtimes: {', '.join(SNAP_START_RUNTIMES)}."
+            )
+        if self.provisioned_concurrency is not None:
+            raise ValueError(
+                "'snap_start' cannot be combined with 'provisioned_concurrency', "
+                "Lambda doesn't support both on the same function version."
+            )
+
+    def _validate_tree_shake(self) -> None:
+        if normalize_tree_shake_config(self.tree_shake) and not self.folder_path:
+            raise ValueError(
+                "'tree_shake' only applies to folder-based functions, single-file functions "
+                "already package just their handler file."
+            )
+
+    def _validate_reserved_concurrency(self) -> None:
+        if self.reserved_concurrency is None:
+            return
+        if isinstance(self.reserved_concurrency, bool) or not isinstance(
+            self.reserved_concurrency, int
+        ):
+            raise TypeError("'reserved_concurrency' must be an integer")
+        if self.reserved_concurrency < 0:
+            raise ValueError("'reserved_concurrency' cannot be negative")
+
     def _validate_url(self) -> None:
         """Validates the 'url' property against allowed types and values."""
         if self.url is None:
@@ -230,6 +442,11 @@ class FunctionConfig:
                 f"Got {type(self.url).__name__}"
             )
 
+    @property
+    def publishes_versions(self) -> bool:
+        """Whether deploys publish a version behind the function's 'live' alias."""
+        return self.provisioned_concurrency is not None or bool(self.snap_start)
+
     @property
     def folder_path(self) -> str | None:
         """Returns the folder containing the handler code.
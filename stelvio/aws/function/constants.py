@@ -6,6 +6,21 @@ LAMBDA_EXCLUDED_FILES = ["stlv.py", ".DS_Store"]  # exact file matches
 LAMBDA_EXCLUDED_DIRS = ["__pycache__"]
 LAMBDA_EXCLUDED_EXTENSIONS = [".pyc"]
 MAX_LAMBDA_LAYERS = 5
+# Alias that invokers target when a function publishes versions
+LIVE_ALIAS_NAME = "live"
+DEFAULT_PROVISIONED_CONCURRENCY_UTILIZATION = 0.7
+SNAP_START_RUNTIMES = ("python3.12", "python3.13")
+DEFAULT_WARM_RATE = "5 minutes"
+# Key of warm ping events, the warm handler wrapper answers them without the handler
+WARM_EVENT_KEY = "stlv_warm"
+WARM_HANDLER_MODULE = "stlv_warm"
+METRICS_MODULE = "stlv_metrics"
+ASYNC_HANDLER_MODULE = "stlv_async"
+# Lambda's package limits, its megabytes are mebibytes
+LAMBDA_MAX_UNZIPPED_SIZE = 250 * 1024 * 1024  # function code and all layers
+LAMBDA_MAX_DIRECT_UPLOAD_SIZE = 50 * 1024 * 1024  # zip uploaded with the API call
+# Where Lambda extracts the function's zip
+LAMBDA_TASK_ROOT = "/var/task"
 # "arn:aws:iam::aws:policy/service-role/AWSLambdaVPCAccessExecutionRole",
 LAMBDA_BASIC_EXECUTION_ROLE = "arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"
 NUMBER_WORDS = {
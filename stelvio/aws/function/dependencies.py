@@ -2,19 +2,22 @@ import logging
 from pathlib import Path
 from typing import Final
 
-from pulumi import FileArchive
-
+from stelvio.aws._packaging.bytecode import get_or_create_precompiled_variant
 from stelvio.aws._packaging.dependencies import (
-    PulumiAssets,
+    DependencyInstall,
     RequirementsSpec,
     _resolve_requirements_from_list,
     _resolve_requirements_from_path,
-    clean_active_dependencies_caches_file,
-    clean_stale_dependency_caches,
     get_or_install_dependencies,
 )
+from stelvio.aws._packaging.slim import get_or_create_slim_variant
 from stelvio.aws.function.config import FunctionConfig
-from stelvio.aws.function.constants import DEFAULT_ARCHITECTURE, DEFAULT_RUNTIME
+from stelvio.aws.function.constants import (
+    DEFAULT_ARCHITECTURE,
+    DEFAULT_RUNTIME,
+    LAMBDA_TASK_ROOT,
+)
+from stelvio.aws.slim import normalize_slim_config
 from stelvio.project import get_project_root
 
 # Constants specific to function dependency resolution
@@ -24,44 +27,66 @@ _FUNCTION_CACHE_SUBDIR: Final[str] = "functions"
 logger = logging.getLogger(__name__)
 
 
-def _get_function_packages(function_config: FunctionConfig) -> PulumiAssets | None:
+def _get_function_packages_dir(function_config: FunctionConfig) -> Path | None:
     """
-    Resolves, installs (via shared logic), and packages Lambda function dependencies.
+    Resolves and installs (via shared logic) Lambda function dependencies.
 
     Args:
         function_config: The configuration object for the Lambda function.
 
     Returns:
-        A dictionary mapping filenames/paths to Pulumi Assets/Archives for the
-        dependencies, or None if no requirements are specified or found.
+        Absolute path to the dependency cache directory (or its slimmed and/or
+        precompiled variant if the function enables those), whose name identifies its
+        content, or None if no requirements are specified or found.
     """
+    install = _get_function_dependency_install(function_config)
+    if install is None:
+        return None
+
+    # Ensure Dependencies are Installed (using shared function)
+    cache_dir = get_or_install_dependencies(
+        requirements_source=install.requirements_source,
+        runtime=install.runtime,
+        architecture=install.architecture,
+        project_root=get_project_root(),
+        cache_subdirectory=install.cache_subdirectory,
+        log_context=install.log_context,
+    )
+    slim = normalize_slim_config(function_config.slim)
+    if slim is not None:
+        cache_dir = get_or_create_slim_variant(
+            cache_dir, slim, install.cache_subdirectory, install.log_context
+        )
+    if function_config.precompile:
+        cache_dir = get_or_create_precompiled_variant(
+            cache_dir,
+            install.runtime,
+            install.cache_subdirectory,
+            LAMBDA_TASK_ROOT,
+            install.log_context,
+        )
+    return cache_dir
+
+
+def _get_function_dependency_install(function_config: FunctionConfig) -> DependencyInstall | None:
+    """Describes how the function's dependencies get installed, or None if it has none."""
     project_root = get_project_root()
     log_context = f"Function: {function_config.handler}"  # Use handler for context
     logger.debug("[%s] Starting dependency resolution", log_context)
 
-    # 1. Resolve requirements source
     source = _resolve_requirements_source(function_config, project_root, log_context)
     if source is None:
         logger.debug("[%s] No requirements source found or requirements disabled.", log_context)
         return None
 
-    # 2. Determine runtime, architecture, and source context path for shared functions
-    runtime = function_config.runtime or DEFAULT_RUNTIME
-    architecture = function_config.architecture or DEFAULT_ARCHITECTURE
-
-    # 3. Ensure Dependencies are Installed (using shared function)
-    cache_dir = get_or_install_dependencies(
+    return DependencyInstall(
         requirements_source=source,
-        runtime=runtime,
-        architecture=architecture,
-        project_root=project_root,
+        runtime=function_config.runtime or DEFAULT_RUNTIME,
+        architecture=function_config.architecture or DEFAULT_ARCHITECTURE,
         cache_subdirectory=_FUNCTION_CACHE_SUBDIR,
         log_context=log_context,
     )
 
-    # 4. Package dependencies from the cache directory (using shared function)
-    return {"": FileArchive(str(cache_dir))}
-
 
 def _handle_requirements_none(
     config: FunctionConfig, project_root: Path, log_context: str
@@ -123,11 +148,3 @@ def _resolve_requirements_source(
     raise TypeError(
         f"[{log_context}] Unexpected type for requirements configuration: {type(requirements)}"
     )
-
-
-def clean_function_active_dependencies_caches_file() -> None:
-    clean_active_dependencies_caches_file(_FUNCTION_CACHE_SUBDIR)
-
-
-def clean_function_stale_dependency_caches() -> None:
-    clean_stale_dependency_caches(_FUNCTION_CACHE_SUBDIR)
@@ -1,4 +1,5 @@
 import asyncio
+import inspect
 import json
 import logging
 import os
@@ -8,7 +9,7 @@ import time
 import uuid
 from collections.abc import Generator, Sequence
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from hashlib import sha256
 from pathlib import Path
 from typing import Any, ClassVar, TypedDict, Unpack, final
@@ -16,40 +17,72 @@ from typing import Any, ClassVar, TypedDict, Unpack, final
 import pulumi
 from awslambdaric.lambda_context import LambdaContext
 from pulumi import Input, Output, ResourceOptions
-from pulumi_aws import lambda_
+from pulumi_aws import appautoscaling, lambda_
 from pulumi_aws.iam import (
-    GetPolicyDocumentStatementArgs,
     Policy,
     PolicyArgs,
     Role,
     RoleArgs,
-    get_policy_document,
+    RolePolicy,
+    RolePolicyArgs,
 )
 from pulumi_aws.lambda_ import FunctionUrl, FunctionUrlCorsArgs
 
 from stelvio import context
-from stelvio.aws.function.config import FunctionConfig, FunctionConfigDict, FunctionUrlConfig
+from stelvio.aws._packaging.artifacts import is_collecting_artifacts
+from stelvio.aws._packaging.package_store import InstalledDistribution
+from stelvio.aws._packaging.size_budget import analyze_function_size, enforce_size_limits
+from stelvio.aws.function.config import (
+    FunctionConfig,
+    FunctionConfigDict,
+    FunctionUrlConfig,
+    ProvisionedConcurrencyConfig,
+    normalize_provisioned_concurrency_config,
+    normalize_warm_config,
+)
 from stelvio.aws.function.constants import (
+    ASYNC_HANDLER_MODULE,
     DEFAULT_ARCHITECTURE,
     DEFAULT_MEMORY,
     DEFAULT_RUNTIME,
     DEFAULT_TIMEOUT,
+    LIVE_ALIAS_NAME,
+    METRICS_MODULE,
+    WARM_HANDLER_MODULE,
 )
 from stelvio.aws.function.iam import _attach_role_policies, _create_lambda_role
 from stelvio.aws.function.naming import _envar_name
-from stelvio.aws.function.packaging import _create_lambda_archive
+from stelvio.aws.function.packaging import _create_lambda_code, _is_async_handler
 from stelvio.aws.function.resources_codegen import (
     _create_stlv_resource_file,
+    create_stlv_metrics_file_content,
     create_stlv_resource_file_content,
 )
-from stelvio.aws.permission import AwsPermission
+from stelvio.aws.layer import Layer
+from stelvio.aws.permission import (
+    MANAGED_POLICY_MAX_SIZE,
+    ROLE_MANAGED_POLICY_QUOTA,
+    AwsPermission,
+    compact_permissions,
+    estimate_policy_size,
+    policy_size,
+    render_policy_document,
+    split_permissions,
+)
+from stelvio.aws.size_budget import normalize_size_budget_config
 from stelvio.bridge.local.dtos import BridgeInvocationResult
 from stelvio.bridge.local.handlers import WebsocketHandlers
 from stelvio.bridge.remote.infrastructure import (
     _create_lambda_bridge_archive,
     discover_or_create_appsync,
 )
-from stelvio.component import BridgeableMixin, Component, link_config_creator, safe_name
+from stelvio.component import (
+    BridgeableMixin,
+    Component,
+    ComponentRegistry,
+    link_config_creator,
+    safe_name,
+)
 from stelvio.link import Link, Linkable, LinkableMixin, LinkConfig
 from stelvio.project import get_project_root
 
@@ -63,6 +96,13 @@ class FunctionResources:
     role: Role
     policy: Policy | None
     function_url: FunctionUrl | None = None
+    alias: lambda_.Alias | None = None
+    provisioned_concurrency: lambda_.ProvisionedConcurrencyConfig | None = None
+    scaling_target: appautoscaling.Target | None = None
+    scaling_policy: appautoscaling.Policy | None = None
+    warm_policy: RolePolicy | None = None
+    # Policies of permissions that don't fit in policy within IAM's size limit
+    additional_policies: list[Policy] = field(default_factory=list)
 
 
 class FunctionCustomizationDict(TypedDict, total=False):
@@ -70,6 +110,11 @@ class FunctionCustomizationDict(TypedDict, total=False):
     role: RoleArgs | dict[str, Any] | None
     policy: PolicyArgs | dict[str, Any] | None
     function_url: lambda_.FunctionUrlArgs | dict[str, Any] | None
+    alias: lambda_.AliasArgs | dict[str, Any] | None
+    provisioned_concurrency: lambda_.ProvisionedConcurrencyConfigArgs | dict[str, Any] | None
+    scaling_target: appautoscaling.TargetArgs | dict[str, Any] | None
+    scaling_policy: appautoscaling.PolicyArgs | dict[str, Any] | None
+    warm_policy: RolePolicyArgs | dict[str, Any] | None
 
 
 @final
@@ -180,12 +225,40 @@ class Function(
 
     @property
     def invoke_arn(self) -> Output[str]:
+        if self.resources.alias is not None:
+            return self.resources.alias.invoke_arn
         return self.resources.function.invoke_arn
 
     @property
     def function_name(self) -> Output[str]:
         return self.resources.function.name
 
+    @property
+    def qualifier(self) -> Output[str] | None:
+        """Name of the alias invokers target, None if they invoke $LATEST."""
+        if self.resources.alias is None:
+            return None
+        return self.resources.alias.name
+
+    @property
+    def invocation_arn(self) -> Output[str]:
+        """ARN that event sources invoke, the alias ARN if the function has an alias."""
+        if self.resources.alias is not None:
+            return self.resources.alias.arn
+        return self.resources.function.arn
+
+    @property
+    def invocation_name(self) -> Output[str]:
+        """Name for event source mappings, the alias ARN if the function has an alias."""
+        if self.resources.alias is not None:
+            return self.resources.alias.arn
+        return self.resources.function.name
+
+    @property
+    def layers(self) -> list[Layer]:
+        """Layers of the function, its configured layers followed by automatic ones."""
+        return [*(self.config.layers or []), *AutoLayersRegistry.get_layers(self)]
+
     @property
     def url(self) -> Output[str | None]:
         """Function URL endpoint if configured, None otherwise."""
@@ -193,53 +266,98 @@ class Function(
             return Output.from_input(None)
         return self.resources.function_url.function_url
 
-    def _create_function_policy(
-        self, name: str, statements: Sequence[GetPolicyDocumentStatementArgs]
-    ) -> Policy | None:
-        """Create IAM policy for Lambda if there are any statements."""
-        if not statements:
-            return None
-
-        policy_document = get_policy_document(statements=statements)
+    def _create_function_policies(
+        self, name: str, permissions: Sequence[AwsPermission]
+    ) -> list[Policy]:
+        """Create IAM policies for Lambda if there are any permissions.
 
-        return Policy(
-            safe_name(context().prefix(), name, 128, "-p"),
-            **self._customizer(
-                "policy",
-                {"path": "/", "policy": policy_document.json},
-                inject_tags=True,
-            ),
-            opts=self._resource_opts(),
+        Permissions are compacted first and split over more policies only when they
+        don't fit in one.
+        """
+        if not permissions:
+            return []
+
+        compacted = compact_permissions(permissions)
+        groups = split_permissions(compacted)
+        logger.debug(
+            "Function '%s': %d permissions compacted to %d statements, estimated %d characters",
+            name,
+            len(permissions),
+            len(compacted),
+            estimate_policy_size(compacted),
         )
+        if len(groups) > 1:
+            logger.info("Function '%s': permissions split over %d IAM policies", name, len(groups))
+        # One more for AWSLambdaBasicExecutionRole
+        if len(groups) + 1 > ROLE_MANAGED_POLICY_QUOTA:
+            logger.warning(
+                "Function '%s' needs %d managed policies on its role, more than the default "
+                "quota of %d",
+                name,
+                len(groups) + 1,
+                ROLE_MANAGED_POLICY_QUOTA,
+            )
+
+        policies = []
+        for index, group in enumerate(groups):
+            document = render_policy_document(group).apply(
+                lambda doc, number=index + 1: _check_policy_size(name, doc, number, len(groups))
+            )
+            policies.append(
+                Policy(
+                    safe_name(context().prefix(), name, 128, f"-p{index + 1}" if index else "-p"),
+                    **self._customizer(
+                        "policy", {"path": "/", "policy": document}, inject_tags=True
+                    ),
+                    opts=self._resource_opts(),
+                )
+            )
+        return policies
 
     def _create_resources(self) -> FunctionResources:
         logger.debug("Creating resources for function '%s'", self.name)
-        iam_statements = _extract_links_permissions(self._config.links)
-        function_policy = self._create_function_policy(self.name, iam_statements)
-
-        lambda_role = _create_lambda_role(
-            self.name,
-            customizer=lambda resource_name, default_props: self._customizer(
-                resource_name, default_props, inject_tags=True
-            ),
-            opts=self._resource_opts(),
-        )
-        role_attachments = _attach_role_policies(
-            self.name, lambda_role, function_policy, opts=self._resource_opts()
-        )
-
-        folder_path = self.config.folder_path or str(Path(self.config.handler_file_path).parent)
+        folder_path = _code_folder(self.config)
 
         links_props = _extract_links_property_mappings(self._config.links)
         # Check if CORS env vars are present
         cors_env_vars = FunctionEnvVarsRegistry.get_env_vars(self)
         has_cors = "STLV_CORS_ALLOW_ORIGIN" in cors_env_vars
 
-        lambda_resource_file_content = create_stlv_resource_file_content(links_props, has_cors)
+        snap_start = bool(self.config.snap_start)
+
+        lambda_resource_file_content = create_stlv_resource_file_content(
+            links_props, has_cors, snap_start
+        )
         LinkPropertiesRegistry.add(folder_path, links_props)
 
         ide_resource_file_content = create_stlv_resource_file_content(
-            LinkPropertiesRegistry.get_link_properties_map(folder_path), has_cors
+            LinkPropertiesRegistry.get_link_properties_map(folder_path), has_cors, snap_start
+        )
+
+        # Code is packaged and checked against Lambda's size limits before any of the
+        # function's resources are registered, so an oversized function deploys nothing
+        code_args = None
+        if not context().dev_mode:
+            code_args = _create_lambda_code(
+                self.config,
+                lambda_resource_file_content,
+                AutoLayersRegistry.get_excluded_distributions(self),
+                self.name,
+            )
+            self._check_package_size()
+
+        permissions = _extract_links_permissions(self._config.links)
+        function_policies = self._create_function_policies(self.name, permissions)
+
+        lambda_role = _create_lambda_role(
+            self.name,
+            customizer=lambda resource_name, default_props: self._customizer(
+                resource_name, default_props, inject_tags=True
+            ),
+            opts=self._resource_opts(),
+        )
+        role_attachments = _attach_role_policies(
+            self.name, lambda_role, function_policies, opts=self._resource_opts()
         )
 
         # Determine effective runtime and architecture for the function
@@ -250,6 +368,7 @@ class Function(
         env_vars = {
             **_extract_links_env_vars(self._config.links),
             **FunctionEnvVarsRegistry.get_env_vars(self),
+            **(self._metrics_env_vars() if self.config.metrics else {}),
             **self.config.environment,
         }
 
@@ -276,13 +395,14 @@ class Function(
                 environment={"variables": env_vars},
                 memory_size=self.config.memory or DEFAULT_MEMORY,
                 timeout=self.config.timeout or DEFAULT_TIMEOUT,
-                layers=[layer.arn for layer in self.config.layers] if self.config.layers else None,
+                layers=self._layer_arns(),
                 tags=self.tags or None,
                 # Technically this is necessary only for tests as otherwise
                 # it's ok if role attachments are created after functions
                 opts=self._resource_opts(depends_on=role_attachments),
             )
         else:
+            handler = self._wrap_handler(env_vars)
             function_resource = lambda_.Function(
                 safe_name(context().prefix(), self.name, 64),
                 **self._customizer(
@@ -291,14 +411,23 @@ class Function(
                         "role": lambda_role.arn,
                         "architectures": [function_architecture],
                         "runtime": function_runtime,
-                        "code": _create_lambda_archive(self.config, lambda_resource_file_content),
-                        "handler": self.config.handler_format,
+                        **code_args,
+                        "handler": handler,
                         "environment": {"variables": env_vars},
                         "memory_size": self.config.memory or DEFAULT_MEMORY,
                         "timeout": self.config.timeout or DEFAULT_TIMEOUT,
-                        "layers": [layer.arn for layer in self.config.layers]
-                        if self.config.layers
-                        else None,
+                        "layers": self._layer_arns(),
+                        **({"publish": True} if self.config.publishes_versions else {}),
+                        **(
+                            {"snap_start": {"apply_on": "PublishedVersions"}}
+                            if self.config.snap_start
+                            else {}
+                        ),
+                        **(
+                            {"reserved_concurrent_executions": self.config.reserved_concurrency}
+                            if self.config.reserved_concurrency is not None
+                            else {}
+                        ),
                     },
                     inject_tags=True,
                 ),
@@ -308,17 +437,223 @@ class Function(
             )
         # Create IDE resource file after successful function creation
         _create_stlv_resource_file(get_project_root() / folder_path, ide_resource_file_content)
+        # Other functions may share the folder, the module is removed once none of them
+        # has metrics
+        _create_stlv_resource_file(
+            get_project_root() / folder_path,
+            create_stlv_metrics_file_content() if _folder_has_metrics(folder_path) else None,
+            f"{METRICS_MODULE}.py",
+        )
+
+        alias, provisioned, scaling_target, scaling_policy = self._create_version_resources(
+            function_resource
+        )
+        warm_policy = self._create_warm_policy(function_resource, lambda_role)
 
         # Create function URL if configured
         function_url = None
         if self.config.url is not None:
             url_config = self._normalize_url_config(self.config.url)
             function_url = _create_function_url(
-                self.name, function_resource, url_config, self._resource_opts()
+                self.name,
+                function_resource,
+                url_config,
+                self._resource_opts(),
+                qualifier=alias.name if alias is not None else None,
             )
             self.register_outputs({"url": function_url.function_url})
 
-        return FunctionResources(function_resource, lambda_role, function_policy, function_url)
+        return FunctionResources(
+            function_resource,
+            lambda_role,
+            function_policies[0] if function_policies else None,
+            function_url,
+            alias=alias,
+            provisioned_concurrency=provisioned,
+            scaling_target=scaling_target,
+            scaling_policy=scaling_policy,
+            warm_policy=warm_policy,
+            additional_policies=function_policies[1:],
+        )
+
+    def _wrap_handler(self, env_vars: dict[str, Any]) -> str:
+        """Returns the Lambda handler, pointing env_vars of wrappers to what they wrap."""
+        handler = self.config.handler_format
+        if _is_async_handler(self.config):
+            # Async handlers run on an event loop kept by a synchronous wrapper
+            env_vars["STLV_ASYNC_HANDLER"] = handler
+            handler = f"{ASYNC_HANDLER_MODULE}.handler"
+        if normalize_warm_config(self.config.warm) is not None:
+            # Warm pings are answered by a wrapper that imports the real handler
+            env_vars["STLV_WARM_HANDLER"] = handler
+            handler = f"{WARM_HANDLER_MODULE}.handler"
+        return handler
+
+    def _metrics_env_vars(self) -> dict[str, str]:
+        """Dimensions of metrics emitted by the stlv_metrics module."""
+        return {
+            "STLV_APP_NAME": context().name,
+            "STLV_STAGE": context().env,
+            "STLV_FUNCTION_NAME": self.name,
+        }
+
+    def _create_warm_policy(
+        self, function_resource: lambda_.Function, lambda_role: Role
+    ) -> RolePolicy | None:
+        """Lets the function invoke itself to fan warm pings out to more environments."""
+        warm = normalize_warm_config(self.config.warm)
+        if context().dev_mode or warm is None or warm.concurrency == 1:
+            return None
+        return RolePolicy(
+            safe_name(context().prefix(), self.name, 128, "-warm-p"),
+            **self._customizer(
+                "warm_policy",
+                {
+                    "role": lambda_role.name,
+                    "policy": function_resource.arn.apply(
+                        lambda arn: json.dumps(
+                            {
+                                "Version": "2012-10-17",
+                                "Statement": [
+                                    {
+                                        "Effect": "Allow",
+                                        "Action": "lambda:InvokeFunction",
+                                        # Versions and aliases too
+                                        "Resource": [arn, f"{arn}:*"],
+                                    }
+                                ],
+                            }
+                        )
+                    ),
+                },
+            ),
+            opts=self._resource_opts(),
+        )
+
+    def _create_version_resources(
+        self, function_resource: lambda_.Function
+    ) -> tuple[
+        lambda_.Alias | None,
+        lambda_.ProvisionedConcurrencyConfig | None,
+        appautoscaling.Target | None,
+        appautoscaling.Policy | None,
+    ]:
+        """Creates the 'live' alias and its provisioned concurrency if versions are published.
+
+        Skipped in dev mode where the function only forwards invocations to the local
+        bridge. SnapStart snapshots are taken of published versions only, invokers use
+        the alias to get them.
+        """
+        if context().dev_mode or not self.config.publishes_versions:
+            return None, None, None, None
+        alias = self._create_alias(function_resource)
+        return alias, *self._create_provisioned_concurrency(function_resource, alias)
+
+    def _create_alias(self, function_resource: lambda_.Function) -> lambda_.Alias:
+        """Points the 'live' alias at the version published by the latest deploy."""
+        return lambda_.Alias(
+            safe_name(context().prefix(), self.name, 128, "-alias"),
+            **self._customizer(
+                "alias",
+                {
+                    "name": LIVE_ALIAS_NAME,
+                    "function_name": function_resource.name,
+                    "function_version": function_resource.version,
+                },
+            ),
+            opts=self._resource_opts(),
+        )
+
+    def _create_provisioned_concurrency(
+        self, function_resource: lambda_.Function, alias: lambda_.Alias
+    ) -> tuple[
+        lambda_.ProvisionedConcurrencyConfig | None,
+        appautoscaling.Target | None,
+        appautoscaling.Policy | None,
+    ]:
+        """Provisions a fixed number of environments for the alias or auto scales them."""
+        provisioned_concurrency = normalize_provisioned_concurrency_config(
+            self.config.provisioned_concurrency
+        )
+        if provisioned_concurrency is None:
+            return None, None, None
+
+        if not isinstance(provisioned_concurrency, ProvisionedConcurrencyConfig):
+            provisioned = lambda_.ProvisionedConcurrencyConfig(
+                safe_name(context().prefix(), self.name, 128, "-pc"),
+                **self._customizer(
+                    "provisioned_concurrency",
+                    {
+                        "function_name": function_resource.name,
+                        "qualifier": alias.name,
+                        "provisioned_concurrent_executions": provisioned_concurrency,
+                    },
+                ),
+                opts=self._resource_opts(),
+            )
+            return provisioned, None, None
+
+        scaling_target = appautoscaling.Target(
+            safe_name(context().prefix(), self.name, 128, "-pc-target"),
+            **self._customizer(
+                "scaling_target",
+                {
+                    "service_namespace": "lambda",
+                    "scalable_dimension": "lambda:function:ProvisionedConcurrency",
+                    "resource_id": Output.concat(
+                        "function:", function_resource.name, ":", alias.name
+                    ),
+                    "min_capacity": provisioned_concurrency.min_capacity,
+                    "max_capacity": provisioned_concurrency.max_capacity,
+                },
+                inject_tags=True,
+            ),
+            opts=self._resource_opts(),
+        )
+        scaling_policy = appautoscaling.Policy(
+            safe_name(context().prefix(), self.name, 128, "-pc-policy"),
+            **self._customizer(
+                "scaling_policy",
+                {
+                    "policy_type": "TargetTrackingScaling",
+                    "service_namespace": scaling_target.service_namespace,
+                    "scalable_dimension": scaling_target.scalable_dimension,
+                    "resource_id": scaling_target.resource_id,
+                    "target_tracking_scaling_policy_configuration": {
+                        "target_value": provisioned_concurrency.target_utilization,
+                        "predefined_metric_specification": {
+                            "predefined_metric_type": "LambdaProvisionedConcurrencyUtilization",
+                        },
+                    },
+                },
+            ),
+            opts=self._resource_opts(),
+        )
+        return None, scaling_target, scaling_policy
+
+    def _layer_arns(self) -> list[Output[str]] | None:
+        return [layer.arn for layer in self.layers] or None
+
+    def _check_package_size(self) -> None:
+        """Fails if the function's zip and layers exceed Lambda's limits or its budget.
+
+        Layers are only packaged here, their resources are created later with the function.
+        Within `stlv build` zips are built after all components are packaged, sizes are
+        checked there instead.
+        """
+        if is_collecting_artifacts():
+            return
+        layers = self.layers
+        for layer in layers:
+            layer.package()
+        enforce_size_limits(
+            analyze_function_size(
+                self.name,
+                [layer.name for layer in layers],
+                normalize_size_budget_config(self.config.size_budget),
+                staged=context().stage_artifacts,
+            )
+        )
 
     async def _handle_bridge_event(self, data: dict) -> BridgeInvocationResult | None:
         project_root = get_project_root()
@@ -348,9 +683,13 @@ class Function(
                 success = None
                 error = None
                 try:
-                    success = await asyncio.get_running_loop().run_in_executor(
-                        None, function, event.get("event", {}), lambda_context
-                    )
+                    if inspect.iscoroutinefunction(function):
+                        # Awaited on the bridge's loop, no executor thread needed
+                        success = await function(event.get("event", {}), lambda_context)
+                    else:
+                        success = await asyncio.get_running_loop().run_in_executor(
+                            None, function, event.get("event", {}), lambda_context
+                        )
                 except Exception as e:
                     error = e
                 end_time = time.perf_counter()
@@ -416,6 +755,35 @@ class Function(
         return new_environ
 
 
+def _check_policy_size(name: str, document: str, number: int, total: int) -> str:
+    """Returns the rendered policy document if it fits in a managed policy.
+
+    Raises:
+        ValueError: If the resolved resources are longer than split_permissions estimated
+            and the document exceeds the managed policy size limit.
+    """
+    size = policy_size(document)
+    logger.debug("Function '%s': policy %d/%d is %d characters", name, number, total, size)
+    if size > MANAGED_POLICY_MAX_SIZE:
+        raise ValueError(
+            f"Function '{name}': IAM policy {number}/{total} is {size} characters once its "
+            f"resources are resolved, more than the limit of {MANAGED_POLICY_MAX_SIZE}. "
+            "Link fewer resources to the function or use wildcard resources in its permissions."
+        )
+    return document
+
+
+def _code_folder(config: FunctionConfig) -> str:
+    return config.folder_path or str(Path(config.handler_file_path).parent)
+
+
+def _folder_has_metrics(folder_path: str) -> bool:
+    return any(
+        function.config.metrics and _code_folder(function.config) == folder_path
+        for function in ComponentRegistry.instances_of(Function)
+    )
+
+
 class LinkPropertiesRegistry:
     _folder_links_properties_map: ClassVar[dict[str, dict[str, list[str]]]] = {}
 
@@ -440,15 +808,45 @@ class FunctionEnvVarsRegistry:
         return cls._functions_env_vars_map.get(function_, {}).copy()
 
 
+class AutoLayersRegistry:
+    """Layers generated for shared dependencies and the distributions they replace."""
+
+    _functions_layers_map: ClassVar[dict[Function, list[Layer]]] = {}
+    _functions_excluded_map: ClassVar[dict[Function, list[InstalledDistribution]]] = {}
+
+    @classmethod
+    def add(
+        cls, function_: Function, layer: Layer, distributions: list[InstalledDistribution]
+    ) -> None:
+        cls._functions_layers_map.setdefault(function_, []).append(layer)
+        cls._functions_excluded_map.setdefault(function_, []).extend(distributions)
+
+    @classmethod
+    def get_layers(cls, function_: Function) -> list[Layer]:
+        return cls._functions_layers_map.get(function_, []).copy()
+
+    @classmethod
+    def get_excluded_distributions(cls, function_: Function) -> list[InstalledDistribution]:
+        return cls._functions_excluded_map.get(function_, []).copy()
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._functions_layers_map.clear()
+        cls._functions_excluded_map.clear()
+
+
 def _create_function_url(
     name: str,
     function: lambda_.Function,
     url_config: FunctionUrlConfig,
     opts: ResourceOptions | None = None,
+    *,
+    qualifier: Input[str] | None = None,
 ) -> FunctionUrl:
     """Create a Function URL with the given configuration.
 
     For standalone Functions, auth='default' is normalized to None (public access).
+    The URL invokes the alias named by `qualifier`, or $LATEST without one.
     """
     # Normalize auth: 'default' → None for Function, 'iam' → 'AWS_IAM'
     auth_type = "AWS_IAM" if url_config.auth == "iam" else url_config.auth
@@ -478,6 +876,7 @@ def _create_function_url(
     return FunctionUrl(
         safe_name(context().prefix(), name, 64, suffix="-url"),
         function_name=function.name,
+        qualifier=qualifier,
         authorization_type=auth_type or "NONE",
         cors=cors_config,
         invoke_mode=invoke_mode,
@@ -487,8 +886,8 @@ def _create_function_url(
 
 def _extract_links_permissions(
     linkables: Sequence[Link | Linkable],
-) -> Sequence[GetPolicyDocumentStatementArgs]:
-    """Extracts IAM statements from permissions for function's IAM policy"""
+) -> Sequence[AwsPermission]:
+    """Extracts permissions of links for function's IAM policy"""
     permissions = [
         p
         for linkable in linkables
@@ -501,7 +900,7 @@ def _extract_links_permissions(
                 f"AWS Function requires AwsPermission, got {type(p).__name__}. "
                 f"Cannot use permissions from other cloud providers with AWS Lambda."
             )
-    return [permission.to_provider_format() for permission in permissions]
+    return permissions
 
 
 def _extract_links_env_vars(linkables: Sequence[Link | Linkable]) -> dict[str, Input[str]]:
@@ -548,15 +947,19 @@ def temporary_environment(
 @link_config_creator(Function)
 def default_function_link(function_component: Function) -> LinkConfig:
     function_resource = function_component.resources.function
+    # Linked code invokes the alias when there is one, IAM needs its qualified ARN
+    resources = [function_resource.arn]
+    if function_component.resources.alias is not None:
+        resources.append(function_component.resources.alias.arn)
     return LinkConfig(
         properties={
-            "function_arn": function_resource.arn,
+            "function_arn": function_component.invocation_arn,
             "function_name": function_resource.name,
         },
         permissions=[
             AwsPermission(
                 actions=["lambda:InvokeFunction"],
-                resources=[function_resource.arn],
+                resources=resources,
             ),
         ],
     )
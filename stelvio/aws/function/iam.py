@@ -1,16 +1,10 @@
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 
 import pulumi
-from pulumi_aws.iam import (
-    GetPolicyDocumentStatementArgs,
-    GetPolicyDocumentStatementPrincipalArgs,
-    Policy,
-    Role,
-    RolePolicyAttachment,
-    get_policy_document,
-)
+from pulumi_aws.iam import Policy, Role, RolePolicyAttachment
 
 from stelvio import context
+from stelvio.aws.permission import render_assume_role_policy
 from stelvio.component import safe_name
 
 from .constants import LAMBDA_BASIC_EXECUTION_ROLE
@@ -28,20 +22,7 @@ def _create_lambda_role(
         customizer: Optional callback to apply customizations to the role properties.
         opts: Pulumi resource options (parent, aliases, etc.).
     """
-    assume_role_policy = get_policy_document(
-        statements=[
-            GetPolicyDocumentStatementArgs(
-                actions=["sts:AssumeRole"],
-                principals=[
-                    GetPolicyDocumentStatementPrincipalArgs(
-                        identifiers=["lambda.amazonaws.com"], type="Service"
-                    )
-                ],
-            )
-        ]
-    )
-
-    default_props = {"assume_role_policy": assume_role_policy.json}
+    default_props = {"assume_role_policy": render_assume_role_policy("lambda.amazonaws.com")}
     if customizer:
         default_props = customizer("role", default_props)
 
@@ -55,7 +36,7 @@ def _create_lambda_role(
 def _attach_role_policies(
     name: str,
     role: Role,
-    function_policy: Policy | None,
+    function_policies: Sequence[Policy],
     opts: pulumi.ResourceOptions | None = None,
 ) -> list[RolePolicyAttachment]:
     """Attach required policies to Lambda role."""
@@ -65,13 +46,13 @@ def _attach_role_policies(
         policy_arn=LAMBDA_BASIC_EXECUTION_ROLE,
         opts=opts,
     )
-    if function_policy:
-        default_role_attachment = RolePolicyAttachment(
-            context().prefix(f"{name}-default-r-p-attachment"),
+    policy_attachments = [
+        RolePolicyAttachment(
+            context().prefix(f"{name}-default-r-p-attachment{f'-{index + 1}' if index else ''}"),
             role=role.name,
-            policy_arn=function_policy.arn,
+            policy_arn=policy.arn,
             opts=opts,
         )
-        return [basic_role_attachment, default_role_attachment]
-
-    return [basic_role_attachment]
+        for index, policy in enumerate(function_policies)
+    ]
+    return [basic_role_attachment, *policy_attachments]
@@ -1,25 +1,133 @@
+import ast
+from collections.abc import Sequence
 from pathlib import Path
+from typing import Any, Final
 
-from pulumi import Archive, Asset, AssetArchive, FileAsset, StringAsset
-
+from stelvio.aws._packaging.artifacts import (
+    ArtifactContent,
+    clean_active_artifacts_file,
+    compute_fingerprint,
+    get_or_build_artifact,
+)
+from stelvio.aws._packaging.bytecode import (
+    bytecode_path,
+    clean_active_bytecode_file,
+    compile_sources,
+)
+from stelvio.aws._packaging.file_index import get_file_index
+from stelvio.aws._packaging.package_store import InstalledDistribution
+from stelvio.aws._packaging.size_budget import ArtifactContentsRegistry
+from stelvio.aws._packaging.staging import get_code_args
+from stelvio.aws._packaging.tree_shake import shake_code_files
+from stelvio.aws.tree_shake import normalize_tree_shake_config
 from stelvio.project import get_project_root
 
-from .config import FunctionConfig
-from .constants import LAMBDA_EXCLUDED_DIRS, LAMBDA_EXCLUDED_EXTENSIONS, LAMBDA_EXCLUDED_FILES
-from .dependencies import _get_function_packages
+from .config import FunctionConfig, normalize_warm_config
+from .constants import (
+    ASYNC_HANDLER_MODULE,
+    DEFAULT_RUNTIME,
+    LAMBDA_EXCLUDED_DIRS,
+    LAMBDA_EXCLUDED_EXTENSIONS,
+    LAMBDA_EXCLUDED_FILES,
+    LAMBDA_TASK_ROOT,
+    METRICS_MODULE,
+    WARM_HANDLER_MODULE,
+)
+from .dependencies import _get_function_packages_dir
+from .resources_codegen import create_stlv_metrics_file_content
+
+_FUNCTION_ARTIFACTS_KIND: Final[str] = "functions"
+_WARM_HANDLER_PATH: Final[Path] = Path(__file__).parent / "stub" / "warm_handler.py"
+_ASYNC_HANDLER_PATH: Final[Path] = Path(__file__).parent / "stub" / "async_handler.py"
 
 
-def _create_lambda_archive(
+def _create_lambda_code(
     function_config: FunctionConfig,
     resource_file_content: str | None,
-) -> AssetArchive:
-    """Create an AssetArchive for Lambda function based on configuration.
+    excluded_distributions: Sequence[InstalledDistribution] = (),
+    component_name: str = "",
+) -> dict[str, Any]:
+    """Create the code arguments for Lambda function based on configuration.
     Handles both single file and folder-based Lambdas.
     """
+    log_context = f"Function: {function_config.handler}"
+    files = _collect_code_files(function_config)
+    tree_shake = normalize_tree_shake_config(function_config.tree_shake)
+    if tree_shake and function_config.folder_path:
+        files = shake_code_files(
+            files,
+            f"{function_config.handler_file_path}.py",
+            tree_shake.include,
+            log_context,
+            get_file_index().hash,
+        )
+    if function_config.precompile:
+        files |= compile_sources(
+            {path: content for path, content in files.items() if isinstance(content, Path)},
+            function_config.runtime or DEFAULT_RUNTIME,
+            LAMBDA_TASK_ROOT,
+            get_file_index().hash,
+        )
+
+    # Generated modules and handler wrappers live next to the handler
+    if resource_file_content:
+        files["stlv_resources.py"] = resource_file_content
+    if normalize_warm_config(function_config.warm) is not None:
+        files[f"{WARM_HANDLER_MODULE}.py"] = _WARM_HANDLER_PATH
+    if _is_async_handler(function_config):
+        files[f"{ASYNC_HANDLER_MODULE}.py"] = _ASYNC_HANDLER_PATH
+    if function_config.metrics:
+        files[f"{METRICS_MODULE}.py"] = create_stlv_metrics_file_content()
+
+    packages_dir = _get_function_packages_dir(function_config)
+    # Dependency cache directories are named by their cache key, which already
+    # identifies their content
+    keys = [f"dependencies:{packages_dir.name}"] if packages_dir else []
+    keys += [f"excluded:{distribution.key}" for distribution in excluded_distributions]
+    if function_config.compression_level is not None:
+        keys.append(f"compression:{function_config.compression_level}")
+    fingerprint = compute_fingerprint(files, keys, get_file_index().hash)
 
+    artifact_path = get_or_build_artifact(
+        _FUNCTION_ARTIFACTS_KIND,
+        fingerprint,
+        files,
+        directories={"": packages_dir} if packages_dir else None,
+        log_context=log_context,
+        excluded=_excluded_archive_paths(function_config, excluded_distributions),
+        component=component_name,
+        compression_level=function_config.compression_level,
+    )
+    ArtifactContentsRegistry.add(
+        _FUNCTION_ARTIFACTS_KIND,
+        component_name,
+        artifact_path,
+        {"": packages_dir} if packages_dir else {},
+    )
+    return get_code_args(artifact_path, log_context)
+
+
+def _excluded_archive_paths(
+    function_config: FunctionConfig, excluded_distributions: Sequence[InstalledDistribution]
+) -> list[str]:
+    """Archive paths of the files of excluded distributions, e.g. provided by a layer.
+
+    Their files come from RECORD, which doesn't list the bytecode precompiled
+    dependencies get, so pycs of their sources are left out too.
+    """
+    runtime = function_config.runtime or DEFAULT_RUNTIME
+    excluded = []
+    for distribution in excluded_distributions:
+        for path in distribution.files:
+            excluded.append(path.as_posix())
+            if function_config.precompile and path.suffix == ".py":
+                excluded.append(bytecode_path(path.as_posix(), runtime))
+    return excluded
+
+
+def _collect_code_files(function_config: FunctionConfig) -> dict[str, ArtifactContent]:
     project_root = get_project_root()
 
-    assets: dict[str, Asset | Archive] = {}
     handler_file = str(Path(function_config.handler_file_path).with_suffix(".py"))
     if function_config.folder_path:
         # Handle folder-based Lambda
@@ -33,8 +141,8 @@ def _create_lambda_archive(
             raise ValueError(f"Handler file not found in folder: {absolute_handler_file}.py")
 
         # Recursively collect all files from the folder
-        assets |= {
-            str(file_path.relative_to(full_folder_path)): FileAsset(file_path)
+        return {
+            file_path.relative_to(full_folder_path).as_posix(): file_path
             for file_path in full_folder_path.rglob("*")
             if not (
                 file_path.is_dir()
@@ -44,16 +152,34 @@ def _create_lambda_archive(
             )
         }
     # Handle single file Lambda
-    else:
-        absolute_handler_file = project_root / handler_file
-        if not absolute_handler_file.exists():
-            raise ValueError(f"Handler file not found: {absolute_handler_file}")
-        assets[absolute_handler_file.name] = FileAsset(absolute_handler_file)
+    absolute_handler_file = project_root / handler_file
+    if not absolute_handler_file.exists():
+        raise ValueError(f"Handler file not found: {absolute_handler_file}")
+    return {absolute_handler_file.name: absolute_handler_file}
+
+
+def _is_async_handler(function_config: FunctionConfig) -> bool:
+    """Whether the handler is an async def at the top level of its module.
+
+    Handlers aren't imported while deploying, so this reads the handler's source.
+    Handlers created any other way (e.g. returned by a factory) count as synchronous.
+    """
+    path = get_project_root() / function_config.full_handler_python_path
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return False
+    is_async = False
+    # The last definition of the name wins, like when the module is imported
+    for node in tree.body:
+        if (
+            isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef)
+            and node.name == function_config.handler_function_name
+        ):
+            is_async = isinstance(node, ast.AsyncFunctionDef)
+    return is_async
 
-    if resource_file_content:
-        assets["stlv_resources.py"] = StringAsset(resource_file_content)
 
-    function_packages_archives = _get_function_packages(function_config)
-    if function_packages_archives:
-        assets |= function_packages_archives
-    return AssetArchive(assets)
+def clean_function_active_artifacts_file() -> None:
+    clean_active_artifacts_file(_FUNCTION_ARTIFACTS_KIND)
+    clean_active_bytecode_file()
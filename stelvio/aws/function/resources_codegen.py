@@ -1,13 +1,44 @@
 import re
 from pathlib import Path
+from typing import Final, NamedTuple
 
 from .constants import NUMBER_WORDS
 from .naming import _envar_name
 
 
-def _create_stlv_resource_file(folder: Path, content: str | None) -> None:
+class _LinkService(NamedTuple):
+    """boto3 service of linked resources, recognized by a property of their default links."""
+
+    name: str
+    stubs_module: str
+    client_type: str
+
+
+# Checked in order, e.g. user pool client links also have user_pool_id
+_LINK_SERVICES: Final[dict[str, _LinkService]] = {
+    "table_name": _LinkService("dynamodb", "mypy_boto3_dynamodb", "DynamoDBClient"),
+    "bucket_name": _LinkService("s3", "mypy_boto3_s3", "S3Client"),
+    "queue_url": _LinkService("sqs", "mypy_boto3_sqs", "SQSClient"),
+    "topic_arn": _LinkService("sns", "mypy_boto3_sns", "SNSClient"),
+    "function_name": _LinkService("lambda", "mypy_boto3_lambda", "LambdaClient"),
+    "user_pool_id": _LinkService(
+        "cognito-idp", "mypy_boto3_cognito_idp", "CognitoIdentityProviderClient"
+    ),
+    "identity_pool_id": _LinkService(
+        "cognito-identity", "mypy_boto3_cognito_identity", "CognitoIdentityClient"
+    ),
+    "email_identity_sender": _LinkService("sesv2", "mypy_boto3_sesv2", "SESV2Client"),
+}
+# Accessor of the boto3 DynamoDB Table resource of linked tables
+_TABLE_PROPERTY: Final[str] = "table_name"
+_METRICS_MODULE_PATH: Final[Path] = Path(__file__).parent / "stub" / "metrics.py"
+
+
+def _create_stlv_resource_file(
+    folder: Path, content: str | None, file_name: str = "stlv_resources.py"
+) -> None:
     """Create resource access file with supplied content."""
-    path = folder / "stlv_resources.py"
+    path = folder / file_name
     # Delete file if no content
     if not content:
         path.unlink(missing_ok=True)
@@ -17,19 +48,23 @@ def _create_stlv_resource_file(folder: Path, content: str | None) -> None:
 
 
 def create_stlv_resource_file_content(
-    link_properties_map: dict[str, list[str]], include_cors: bool = False
+    link_properties_map: dict[str, list[str]],
+    include_cors: bool = False,
+    include_snap_start: bool = False,
 ) -> str | None:
     """Generate resource access file content with classes for linked resources."""
-    # Return None if no properties to generate and no CORS
-    if not any(link_properties_map.values()) and not include_cors:
+    # Return None if no properties to generate, no CORS and no SnapStart hooks
+    if not any(link_properties_map.values()) and not include_cors and not include_snap_start:
         return None
 
-    lines = [
-        "import os",
-        "from dataclasses import dataclass",
-        "from typing import Final",
-        "from functools import cached_property\n\n",
-    ]
+    link_services = _link_services(link_properties_map)
+
+    lines = _create_imports(link_services, link_properties_map)
+
+    if include_snap_start:
+        lines.extend(_create_snap_start_hooks())
+
+    lines.extend(_create_client_cache(link_services, reset_after_restore=include_snap_start))
 
     # Generate CORS class if needed
     if include_cors:
@@ -38,7 +73,9 @@ def create_stlv_resource_file_content(
     for link_name, properties in link_properties_map.items():
         if not properties:
             continue
-        lines.extend(_create_link_resource_class(link_name, properties))
+        lines.extend(
+            _create_link_resource_class(link_name, properties, link_services.get(link_name))
+        )
 
     lines.extend(["@dataclass(frozen=True)", "class LinkedResources:"])
 
@@ -53,11 +90,21 @@ def create_stlv_resource_file_content(
         lines.append(
             f"    {_pascal_to_snake(cls_name)}: Final[{cls_name}Resource] = {cls_name}Resource()"
         )
+    if lines[-1] == "class LinkedResources:":
+        lines.append("    pass")
     lines.extend(["\n", "Resources: Final = LinkedResources()"])
 
     return "\n".join(lines)
 
 
+def create_stlv_metrics_file_content() -> str:
+    """Generate module emitting CloudWatch Embedded Metric Format (EMF) log lines.
+
+    The module doesn't depend on links, its content is the same for every function.
+    """
+    return _METRICS_MODULE_PATH.read_text()
+
+
 def _create_cors_class() -> list[str]:
     """Generate CORS resource class with env vars and get_headers() helper."""
     return [
@@ -88,7 +135,163 @@ def _create_cors_class() -> list[str]:
     ]
 
 
-def _create_link_resource_class(link_name: str, properties: list[str]) -> list[str] | None:
+def _create_snap_start_hooks() -> list[str]:
+    """Generate decorators registering SnapStart runtime hooks.
+
+    snapshot_restore_py ships with Lambda's Python runtimes; outside Lambda (tests,
+    stlv dev) the decorators leave functions as they are and never call them.
+    """
+    return [
+        "try:",
+        "    from snapshot_restore_py import register_after_restore, register_before_snapshot",
+        "except ImportError:  # Not running in Lambda",
+        "",
+        "    def register_before_snapshot(func, *args, **kwargs):",
+        "        return func",
+        "",
+        "    def register_after_restore(func, *args, **kwargs):",
+        "        return func",
+        "",
+        "",
+        "def before_snapshot(func):",
+        '    """Runs func before Lambda snapshots the initialized execution environment.',
+        "",
+        "    Close network connections and drop state that must not be shared by",
+        "    restored environments.",
+        '    """',
+        "    return register_before_snapshot(func)",
+        "",
+        "",
+        "def after_restore(func):",
+        '    """Runs func when Lambda resumes an execution environment from the snapshot.',
+        "",
+        "    Re-establish connections and refresh credentials, caches or unique values",
+        "    created during initialization.",
+        '    """',
+        "    return register_after_restore(func)",
+        "",
+        "",
+    ]
+
+
+def _link_services(link_properties_map: dict[str, list[str]]) -> dict[str, _LinkService]:
+    """Returns services of linked resources, skipping links whose properties don't tell it."""
+    services = {}
+    for link_name, properties in link_properties_map.items():
+        service = next(
+            (_LINK_SERVICES[prop] for prop in _LINK_SERVICES if prop in properties), None
+        )
+        if service is not None:
+            services[link_name] = service
+    return services
+
+
+def _has_table(properties: list[str]) -> bool:
+    return _TABLE_PROPERTY in properties and "table" not in properties
+
+
+def _create_imports(
+    link_services: dict[str, _LinkService], link_properties_map: dict[str, list[str]]
+) -> list[str]:
+    if not link_services:
+        return [
+            "import os",
+            "from dataclasses import dataclass",
+            "from typing import Final",
+            "from functools import cached_property\n\n",
+        ]
+    return [
+        "import os",
+        "import threading",
+        "from dataclasses import dataclass",
+        "from typing import TYPE_CHECKING, Final",
+        "from functools import cached_property\n",
+        *_create_client_type_imports(link_services, link_properties_map),
+    ]
+
+
+def _create_client_type_imports(
+    link_services: dict[str, _LinkService], link_properties_map: dict[str, list[str]]
+) -> list[str]:
+    """Generate imports of mypy-boto3 client types, only needed by type checkers."""
+    imports = {
+        f"    from {service.stubs_module} import {service.client_type}"
+        for service in link_services.values()
+    }
+    if any(_has_table(link_properties_map[link_name]) for link_name in link_services):
+        imports.add("    from mypy_boto3_dynamodb.service_resource import Table")
+    return ["if TYPE_CHECKING:", *sorted(imports), "", ""]
+
+
+def _create_client_cache(
+    link_services: dict[str, _LinkService], *, reset_after_restore: bool
+) -> list[str]:
+    """Generate module level cache of boto3 clients shared by all linked resources.
+
+    Clients are created on first use, so functions that don't use them don't pay for
+    it, and are reused by later invocations in the same execution environment along
+    with their open connections.
+    """
+    if not link_services:
+        return []
+    lines = [
+        "# An execution environment runs one request at a time, so the pool only has to",
+        "# fit threads of the handler",
+        '_MAX_POOL_CONNECTIONS: Final = int(os.environ.get("STLV_MAX_POOL_CONNECTIONS", "10"))',
+        "_clients = {}",
+        "_resources = {}",
+        "# boto3's default session isn't thread safe when creating clients",
+        "_clients_lock = threading.Lock()",
+        "",
+        "",
+        "def _client_config():",
+        "    from botocore.config import Config",
+        "",
+        "    return Config(",
+        "        tcp_keepalive=True,",
+        "        max_pool_connections=_MAX_POOL_CONNECTIONS,",
+        '        retries={"mode": "adaptive", "max_attempts": 5},',
+        "    )",
+        "",
+        "",
+        "def _client(service: str):",
+        "    with _clients_lock:",
+        "        if service not in _clients:",
+        "            import boto3",
+        "",
+        "            _clients[service] = boto3.client(service, config=_client_config())",
+        "        return _clients[service]",
+        "",
+        "",
+        "def _resource(service: str):",
+        "    with _clients_lock:",
+        "        if service not in _resources:",
+        "            import boto3",
+        "",
+        "            _resources[service] = boto3.resource(service, config=_client_config())",
+        "        return _resources[service]",
+        "",
+        "",
+    ]
+    if reset_after_restore:
+        lines.extend(
+            [
+                "@after_restore",
+                "def _reset_clients():",
+                "    # Connections opened before the snapshot don't survive restoring it",
+                "    with _clients_lock:",
+                "        _clients.clear()",
+                "        _resources.clear()",
+                "",
+                "",
+            ]
+        )
+    return lines
+
+
+def _create_link_resource_class(
+    link_name: str, properties: list[str], service: _LinkService | None = None
+) -> list[str] | None:
     if not properties:
         return None
     class_name = _to_valid_python_class_name(link_name)
@@ -104,6 +307,22 @@ def _create_link_resource_class(link_name: str, properties: list[str]) -> list[s
                 f'        return os.environ["{_envar_name(link_name, prop)}"]\n',
             ]
         )
+    if service is not None and "client" not in properties:
+        lines.extend(
+            [
+                "    @property",
+                f'    def client(self) -> "{service.client_type}":',
+                f'        return _client("{service.name}")\n',
+            ]
+        )
+    if service is not None and _has_table(properties):
+        lines.extend(
+            [
+                "    @property",
+                '    def table(self) -> "Table":',
+                f'        return _resource("dynamodb").Table(self.{_TABLE_PROPERTY})\n',
+            ]
+        )
     lines.append("")
     return lines
 
@@ -0,0 +1,34 @@
+# noqa: INP001
+
+"""
+Handler wrapper of functions with async handlers.
+
+Lambda calls handlers synchronously, so the wrapper runs each invocation's coroutine
+to completion on an event loop created once per execution environment. Unlike
+asyncio.run(), the loop stays open between invocations, so clients and connections
+bound to it are reused by warm invocations.
+"""
+
+import asyncio
+import importlib
+import os
+
+# Created before the handler is imported, so code run at import time can use it
+_event_loop = asyncio.new_event_loop()
+asyncio.set_event_loop(_event_loop)
+
+_module_name, _function_name = os.environ["STLV_ASYNC_HANDLER"].rsplit(".", 1)
+_handler = getattr(importlib.import_module(_module_name.replace("/", ".")), _function_name)
+
+
+def get_or_create_loop() -> asyncio.AbstractEventLoop:
+    """Returns the environment's event loop, replacing it if the handler closed it."""
+    global _event_loop  # noqa: PLW0603
+    if _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    return _event_loop
+
+
+def handler(event: object, context: object) -> object:
+    return get_or_create_loop().run_until_complete(_handler(event, context))
@@ -0,0 +1,130 @@
+# noqa: INP001
+
+"""
+CloudWatch metrics of this function, generated by Stelvio.
+
+Metrics are printed as CloudWatch Embedded Metric Format (EMF) documents, which
+CloudWatch Logs turns into metrics without any API calls. They're buffered during an
+invocation and printed when it ends. Setting STLV_METRICS_DISABLED to "true" turns
+everything into no-ops without changing the handler.
+"""
+
+import contextlib
+import functools
+import inspect
+import json
+import os
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, Final
+
+_ENABLED: Final = os.environ.get("STLV_METRICS_DISABLED", "false") != "true"
+_NAMESPACE: Final = os.environ.get("STLV_METRICS_NAMESPACE", "Stelvio")
+_DIMENSIONS: Final = {
+    "App": os.environ.get("STLV_APP_NAME", ""),
+    "Stage": os.environ.get("STLV_STAGE", ""),
+    "Function": os.environ.get("STLV_FUNCTION_NAME", ""),
+}
+# EMF takes up to 100 metrics per document and 100 values per metric
+_MAX_DOCUMENT_ENTRIES: Final = 100
+
+# Provisioned and SnapStart environments are initialized before requests arrive.
+# Warm pings clear it too, see stlv_warm
+cold_start = os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE", "on-demand") == "on-demand"
+_buffer: list[tuple[str, float, str]] = []
+
+
+def put_metric(name: str, value: float, unit: str = "None") -> None:
+    """Buffers a metric value until flush(), unit is one of CloudWatch's units."""
+    if _ENABLED:
+        _buffer.append((name, value, unit))
+
+
+@contextlib.contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Records how long the block takes in milliseconds, e.g. a downstream call."""
+    if not _ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        put_metric(name, (time.perf_counter() - start) * 1000, "Milliseconds")
+
+
+def flush() -> None:
+    """Prints buffered metrics as EMF documents and empties the buffer."""
+    documents: list[tuple[dict[str, str], dict[str, list[float]]]] = []
+    for name, value, unit in _buffer:
+        if (
+            not documents
+            or (name not in documents[-1][1] and len(documents[-1][1]) == _MAX_DOCUMENT_ENTRIES)
+            or len(documents[-1][1].get(name, ())) == _MAX_DOCUMENT_ENTRIES
+        ):
+            documents.append(({}, {}))
+        units, values = documents[-1]
+        units[name] = unit
+        values.setdefault(name, []).append(value)
+    _buffer.clear()
+
+    timestamp = int(time.time() * 1000)
+    for units, values in documents:
+        metadata = {
+            "Timestamp": timestamp,
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": _NAMESPACE,
+                    "Dimensions": [list(_DIMENSIONS)],
+                    "Metrics": [{"Name": name, "Unit": unit} for name, unit in units.items()],
+                }
+            ],
+        }
+        document = {
+            "_aws": metadata,
+            **_DIMENSIONS,
+            **{name: v[0] if len(v) == 1 else v for name, v in values.items()},
+        }
+        print(json.dumps(document, separators=(",", ":")), flush=True)  # noqa: T201
+
+
+@contextlib.contextmanager
+def _invocation() -> Iterator[None]:
+    global cold_start
+    is_cold_start, cold_start = cold_start, False
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        put_metric("Duration", (time.perf_counter() - start) * 1000, "Milliseconds")
+        put_metric("ColdStart", int(is_cold_start), "Count")
+        put_metric("Errors", int(failed), "Count")
+        flush()
+
+
+def instrument(handler: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+    """Records Duration, ColdStart and Errors of every invocation of handler.
+
+    Metrics put by the handler are flushed with them when it returns or raises.
+    Async handlers stay async.
+    """
+    if not _ENABLED:
+        return handler
+
+    if inspect.iscoroutinefunction(handler):
+
+        @functools.wraps(handler)
+        async def async_wrapper(event: Any, context: Any) -> Any:  # noqa: ANN401
+            with _invocation():
+                return await handler(event, context)
+
+        return async_wrapper
+
+    @functools.wraps(handler)
+    def wrapper(event: Any, context: Any) -> Any:  # noqa: ANN401
+        with _invocation():
+            return handler(event, context)
+
+    return wrapper
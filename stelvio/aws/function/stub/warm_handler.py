@@ -0,0 +1,66 @@
+# noqa: INP001
+
+"""
+Handler wrapper of functions kept warm by Stelvio.
+
+Answers warm pings without calling the function's handler. A ping asking for more
+than one warm environment is fanned out to concurrent invocations of the function
+itself, each of them keeps one more execution environment initialized. Every other
+event goes straight to the handler.
+"""
+
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Key of warm ping events, must match WARM_EVENT_KEY in stelvio.aws.function.constants
+WARM_EVENT_KEY = "stlv_warm"
+# Must match METRICS_MODULE in stelvio.aws.function.constants
+METRICS_MODULE = "stlv_metrics"
+# Fanned out pings stay busy long enough for Lambda to run each of them in its own
+# execution environment
+FAN_OUT_HOLD_SECONDS = 0.1
+
+# The handler is imported during initialization, like without the wrapper
+_module_name, _function_name = os.environ["STLV_WARM_HANDLER"].rsplit(".", 1)
+_handler = getattr(importlib.import_module(_module_name.replace("/", ".")), _function_name)
+
+# Created on first fan out and reused by later pings to the same environment
+_lambda_client = None
+
+
+def handler(event: object, context: object) -> object:
+    if not isinstance(event, dict) or WARM_EVENT_KEY not in event:
+        return _handler(event, context)
+
+    ping = event[WARM_EVENT_KEY]
+    # Requests to a pinged environment don't wait for its initialization
+    metrics = sys.modules.get(METRICS_MODULE)
+    if metrics is not None:
+        metrics.cold_start = False
+    if ping.get("fanned_out"):
+        time.sleep(FAN_OUT_HOLD_SECONDS)
+    elif ping.get("concurrency", 1) > 1:
+        _fan_out(context.invoked_function_arn, ping["concurrency"] - 1)
+    return {"warm": True}
+
+
+def _fan_out(function_arn: str, count: int) -> None:
+    global _lambda_client  # noqa: PLW0603
+    if _lambda_client is None:
+        import boto3  # noqa: PLC0415
+        from botocore.config import Config  # noqa: PLC0415
+
+        _lambda_client = boto3.client("lambda", config=Config(max_pool_connections=count))
+
+    payload = json.dumps({WARM_EVENT_KEY: {"fanned_out": True}}).encode()
+    # Synchronous invocations overlap, so none of them can reuse another's environment
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        for _ in executor.map(
+            lambda _: _lambda_client.invoke(FunctionName=function_arn, Payload=payload),
+            range(count),
+        ):
+            pass
@@ -1,4 +1,5 @@
 import hashlib
+from datetime import datetime
 from pathlib import Path
 
 import boto3
@@ -42,6 +43,10 @@ class AwsHome:
         self._bucket = name
         return name
 
+    @property
+    def storage_name(self) -> str | None:
+        return self._bucket
+
     def _generate_bucket_name(self) -> str:
         """Generate bucket name from account ID and region."""
         account_id = self._session.client("sts").get_caller_identity()["Account"]
@@ -96,6 +101,15 @@ class AwsHome:
         else:
             return True
 
+    def list_files(self, prefix: str) -> dict[str, datetime]:
+        """Map keys of all files with given prefix to their last modification time."""
+        paginator = self._s3.get_paginator("list_objects_v2")
+        return {
+            obj["Key"]: obj["LastModified"]
+            for page in paginator.paginate(Bucket=self._bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        }
+
     def delete_prefix(self, prefix: str) -> None:
         """Delete all files with given prefix."""
         paginator = self._s3.get_paginator("list_objects_v2")
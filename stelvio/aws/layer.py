@@ -3,19 +3,36 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Final, TypedDict, Unpack, final
 
-from pulumi import Archive, Asset, AssetArchive, FileArchive, Output
+from pulumi import Output
 from pulumi_aws.lambda_ import LayerVersion, LayerVersionArgs
 
 from stelvio import context
+from stelvio.aws._packaging.artifacts import (
+    clean_active_artifacts_file,
+    collect_directory_files,
+    compute_fingerprint,
+    get_or_build_artifact,
+    validate_compression_level,
+)
+from stelvio.aws._packaging.bytecode import compile_sources, get_or_create_precompiled_variant
 from stelvio.aws._packaging.dependencies import (
+    DependencyInstall,
     RequirementsSpec,
     _resolve_requirements_from_list,
     _resolve_requirements_from_path,
-    clean_active_dependencies_caches_file,
-    clean_stale_dependency_caches,
     get_or_install_dependencies,
 )
-from stelvio.aws.function.constants import DEFAULT_ARCHITECTURE, DEFAULT_RUNTIME
+from stelvio.aws._packaging.file_index import get_file_index
+from stelvio.aws._packaging.size_budget import ArtifactContentsRegistry
+from stelvio.aws._packaging.slim import get_or_create_slim_variant
+from stelvio.aws._packaging.staging import get_code_args
+from stelvio.aws.function.constants import (
+    DEFAULT_ARCHITECTURE,
+    DEFAULT_RUNTIME,
+    LAMBDA_EXCLUDED_DIRS,
+    LAMBDA_EXCLUDED_EXTENSIONS,
+)
+from stelvio.aws.slim import SlimConfig, SlimConfigDict, normalize_slim_config
 from stelvio.aws.types import AwsArchitecture, AwsLambdaRuntime
 from stelvio.component import Component
 from stelvio.project import get_project_root
@@ -23,6 +40,9 @@ from stelvio.project import get_project_root
 logger = logging.getLogger(__name__)
 
 _LAYER_CACHE_SUBDIR: Final[str] = "layers"
+_LAYER_ARTIFACTS_KIND: Final[str] = "layers"
+# Lambda extracts layers into /opt
+_LAYER_RUNTIME_PATH: Final[str] = "/opt"
 
 
 __all__ = ["Layer", "LayerConfig", "LayerConfigDict", "LayerResources"]
@@ -36,6 +56,15 @@ class LayerConfig:
     requirements: str | list[str] | bool | None = None
     runtime: AwsLambdaRuntime | None = None
     architecture: AwsArchitecture | None = None
+    slim: bool | SlimConfig | SlimConfigDict | None = None
+    precompile: bool | None = None
+    compression_level: int | None = None
+
+    def __post_init__(self) -> None:
+        normalize_slim_config(self.slim)
+        if self.precompile is not None and not isinstance(self.precompile, bool):
+            raise TypeError("'precompile' must be a boolean")
+        validate_compression_level(self.compression_level)
 
 
 class LayerConfigDict(TypedDict, total=False):
@@ -45,6 +74,9 @@ class LayerConfigDict(TypedDict, total=False):
     requirements: str | list[str] | bool | None
     runtime: AwsLambdaRuntime | None
     architecture: AwsArchitecture | None
+    slim: bool | SlimConfig | SlimConfigDict | None
+    precompile: bool | None
+    compression_level: int | None
 
 
 @final
@@ -83,6 +115,15 @@ class Layer(Component[LayerResources, LayerCustomizationDict]):
                  Defaults to the project's default runtime if None.
         architecture: The compatible instruction set architecture (e.g., "x86_64").
                       Defaults to the project's default architecture if None.
+        slim: Removes files not needed at runtime (tests, type stubs, bytecode built
+              for the local interpreter, ...) from installed dependencies. `True`
+              applies the default rules, a SlimConfig adds deny/allow patterns.
+        precompile: Ships bytecode compiled for the layer's runtime, so Lambda doesn't
+                    compile the layer's modules on every cold start. Needs a local
+                    interpreter of the runtime's Python version.
+        compression_level: Compression of the layer archive, 0 stores files uncompressed
+                           and 1-9 are deflate levels trading build time for upload
+                           size. Defaults to deflate's default level.
     """
 
     _config: LayerConfig
@@ -101,6 +142,7 @@ class Layer(Component[LayerResources, LayerCustomizationDict]):
         if not self._config.code and not self._config.requirements:
             raise ValueError(f"Layer '{name}' must specify 'code' and/or 'requirements'.")
         self._validate_requirements()
+        self._artifact_path: Path | None = None
         # TODO: validate arch and runtime values
 
     @staticmethod
@@ -154,28 +196,54 @@ class Layer(Component[LayerResources, LayerCustomizationDict]):
     def arn(self) -> Output[str]:
         return self.resources.layer_version.arn
 
-    def _create_resources(self) -> LayerResources:
-        logger.debug("Creating resources for Layer '%s'", self.name)
-        log_context = f"Layer: {self.name}"
+    def package(self) -> Path:
+        """Builds the layer's zip without creating any resources. Packaged only once."""
+        if self._artifact_path is None:
+            self._artifact_path = self._build_artifact()
+        return self._artifact_path
 
+    def _build_artifact(self) -> Path:
+        log_context = f"Layer: {self.name}"
         runtime = self._config.runtime or DEFAULT_RUNTIME
         architecture = self._config.architecture or DEFAULT_ARCHITECTURE
 
-        assets = _gather_layer_assets(
+        files, directories = _gather_layer_contents(
             code=self._config.code,
             requirements=self._config.requirements,
             log_context=log_context,
             runtime=runtime,
             architecture=architecture,
+            slim=normalize_slim_config(self._config.slim),
+            precompile=bool(self._config.precompile),
         )
 
-        if not assets:
+        if not files and not directories:
             raise ValueError(
                 f"[{log_context}] Layer must contain code or requirements, "
                 f"but resulted in an empty package."
             )
 
-        asset_archive = AssetArchive(assets)
+        # Dependency cache directories are named by their cache key, which already
+        # identifies their content
+        keys = [f"dependencies:{prefix}:{path.name}" for prefix, path in directories.items()]
+        if self._config.compression_level is not None:
+            keys.append(f"compression:{self._config.compression_level}")
+        artifact_path = get_or_build_artifact(
+            _LAYER_ARTIFACTS_KIND,
+            compute_fingerprint(files, keys, get_file_index().hash),
+            files,
+            directories=directories,
+            log_context=log_context,
+            component=self.name,
+            compression_level=self._config.compression_level,
+        )
+        ArtifactContentsRegistry.add(_LAYER_ARTIFACTS_KIND, self.name, artifact_path, directories)
+        return artifact_path
+
+    def _create_resources(self) -> LayerResources:
+        logger.debug("Creating resources for Layer '%s'", self.name)
+        log_context = f"Layer: {self.name}"
+        artifact_path = self.package()
 
         layer_version_resource = LayerVersion(
             context().prefix(self.name),
@@ -183,9 +251,11 @@ class Layer(Component[LayerResources, LayerCustomizationDict]):
                 "layer_version",
                 {
                     "layer_name": context().prefix(self.name),
-                    "code": asset_archive,
-                    "compatible_runtimes": [runtime],
-                    "compatible_architectures": [architecture],
+                    **get_code_args(artifact_path, log_context),
+                    "compatible_runtimes": [self._config.runtime or DEFAULT_RUNTIME],
+                    "compatible_architectures": [
+                        self._config.architecture or DEFAULT_ARCHITECTURE
+                    ],
                 },
             ),
             opts=self._resource_opts(),
@@ -214,14 +284,42 @@ def _resolve_requirements_source(
     )
 
 
-def _gather_layer_assets(
+def _get_layer_dependency_install(
+    layer_name: str, config: LayerConfig
+) -> DependencyInstall | None:
+    """Describes how the layer's dependencies get installed, or None if it has none."""
+    log_context = f"Layer: {layer_name}"
+    source = _resolve_requirements_source(config.requirements, get_project_root(), log_context)
+    if source is None:
+        return None
+    return DependencyInstall(
+        requirements_source=source,
+        runtime=config.runtime or DEFAULT_RUNTIME,
+        architecture=config.architecture or DEFAULT_ARCHITECTURE,
+        cache_subdirectory=_LAYER_CACHE_SUBDIR,
+        log_context=log_context,
+    )
+
+
+def _gather_layer_contents(  # noqa: PLR0913
     code: str | None,
     requirements: str | list[str] | bool | None,
     log_context: str,
     runtime: str,
     architecture: str,
-) -> dict[str, Asset | Archive]:
-    assets: dict[str, Asset | Archive] = {}
+    *,
+    slim: SlimConfig | None = None,
+    precompile: bool = False,
+) -> tuple[dict[str, Path], dict[str, Path]]:
+    """
+    Collects what goes into the layer's archive.
+
+    Returns:
+        Mapping of archive paths to code files, and mapping of archive path prefixes
+        to dependency directories whose files are added below them.
+    """
+    files: dict[str, Path] = {}
+    directories: dict[str, Path] = {}
     project_root = get_project_root()
     if code:
         code_path_relative = Path(code)
@@ -246,7 +344,17 @@ def _gather_layer_assets(
             code_path_abs,
             archive_code_path,
         )
-        assets[archive_code_path] = FileArchive(str(code_path_abs))
+        # Bytecode of the local interpreter is never shipped
+        files = {
+            archive_path: file_path
+            for archive_path, file_path in collect_directory_files(
+                code_path_abs, archive_code_path
+            ).items()
+            if file_path.parent.name not in LAMBDA_EXCLUDED_DIRS
+            and file_path.suffix not in LAMBDA_EXCLUDED_EXTENSIONS
+        }
+        if precompile:
+            files |= compile_sources(files, runtime, _LAYER_RUNTIME_PATH, get_file_index().hash)
 
     source = _resolve_requirements_source(requirements, project_root, log_context)
 
@@ -260,8 +368,20 @@ def _gather_layer_assets(
             cache_subdirectory=_LAYER_CACHE_SUBDIR,
             log_context=log_context,
         )
+        if slim is not None:
+            cache_dir = get_or_create_slim_variant(
+                cache_dir, slim, _LAYER_CACHE_SUBDIR, log_context
+            )
         # Package the entire cache directory into the standard layer path
         dep_archive_path = f"python/lib/{runtime}/site-packages"
+        if precompile:
+            cache_dir = get_or_create_precompiled_variant(
+                cache_dir,
+                runtime,
+                _LAYER_CACHE_SUBDIR,
+                f"{_LAYER_RUNTIME_PATH}/{dep_archive_path}",
+                log_context,
+            )
         logger.debug(
             "[%s] Packaging dependency cache '%s' into archive path '%s'",
             log_context,
@@ -270,7 +390,7 @@ def _gather_layer_assets(
         )
         # Only add if cache_dir actually exists and has content
         if cache_dir.exists() and any(cache_dir.iterdir()):
-            assets[dep_archive_path] = FileArchive(str(cache_dir))
+            directories[dep_archive_path] = cache_dir
         else:
             logger.warning(
                 "[%s] Dependency cache directory '%s' is empty or missing after "
@@ -278,14 +398,9 @@ def _gather_layer_assets(
                 log_context,
                 cache_dir,
             )
-    return assets
-
-
-def clean_layer_active_dependencies_caches_file() -> None:
-    """Removes the tracking file for active layer dependency caches."""
-    clean_active_dependencies_caches_file(_LAYER_CACHE_SUBDIR)
+    return files, directories
 
 
-def clean_layer_stale_dependency_caches() -> None:
-    """Removes stale cached dependency directories specific to layers."""
-    clean_stale_dependency_caches(_LAYER_CACHE_SUBDIR)
+def clean_layer_active_artifacts_file() -> None:
+    """Removes the tracking file for active layer artifacts."""
+    clean_active_artifacts_file(_LAYER_ARTIFACTS_KIND)
@@ -1,9 +1,22 @@
+import json
 from collections.abc import Sequence
 from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Final
 
-from pulumi import Input
+from pulumi import Input, Output
 from pulumi_aws.iam import GetPolicyDocumentStatementArgs
 
+POLICY_VERSION: Final[str] = "2012-10-17"
+# IAM counts characters of a managed policy without whitespace
+MANAGED_POLICY_MAX_SIZE: Final[int] = 6144
+# Default quota of managed policies attached to a role
+ROLE_MANAGED_POLICY_QUOTA: Final[int] = 10
+# Resources only known after deployment are sized by this when splitting policies,
+# it fits ARNs of tables, buckets, queues and functions with Stelvio's names
+_ESTIMATED_OUTPUT_LENGTH: Final[int] = 160
+_STATEMENT_SEPARATOR_SIZE: Final[int] = 1
+
 
 @dataclass(frozen=True)
 class AwsPermission:
@@ -12,3 +25,206 @@ class AwsPermission:
 
     def to_provider_format(self) -> GetPolicyDocumentStatementArgs:
         return GetPolicyDocumentStatementArgs(actions=self.actions, resources=self.resources)
+
+
+def render_policy_document(permissions: Sequence[AwsPermission]) -> Output[str]:
+    """Renders the JSON of an IAM policy allowing each of the permissions.
+
+    Rendered locally once resources that are Outputs resolve, unlike
+    iam.get_policy_document, which is a call into the AWS provider for every policy.
+    Duplicate resources and resources another statement already allows, e.g. by a
+    wildcard resource, are left out.
+    """
+    resources = [resource for permission in permissions for resource in permission.resources]
+
+    def render(resolved: list[str]) -> str:
+        statements = []
+        offset = 0
+        for permission in permissions:
+            count = len(permission.resources)
+            statements.append((list(permission.actions), resolved[offset : offset + count]))
+            offset += count
+        return json.dumps(
+            {
+                "Version": POLICY_VERSION,
+                "Statement": [
+                    _statement(actions, folded) for actions, folded in _fold_statements(statements)
+                ],
+            }
+        )
+
+    return Output.all(*resources).apply(render)
+
+
+def render_assume_role_policy(service: str) -> str:
+    """Renders the JSON of a trust policy letting an AWS service assume a role."""
+    return json.dumps(
+        {
+            "Version": POLICY_VERSION,
+            "Statement": [
+                {
+                    "Effect": "Allow",
+                    "Action": "sts:AssumeRole",
+                    "Principal": {"Service": service},
+                }
+            ],
+        }
+    )
+
+
+def policy_size(document: str) -> int:
+    """Returns the size of a policy document the way IAM counts it, without whitespace."""
+    return len(json.dumps(json.loads(document), separators=(",", ":")))
+
+
+def compact_permissions(permissions: Sequence[AwsPermission]) -> list[AwsPermission]:
+    """Merges permissions allowing the same actions into one, without duplicate resources.
+
+    Resources that are Outputs are told apart by identity here. Once resolved,
+    render_policy_document drops the remaining duplicates and covered resources.
+    """
+    merged: dict[frozenset[str], tuple[list[str], list[Input[str]], set[object]]] = {}
+    for permission in permissions:
+        _, resources, seen = merged.setdefault(
+            frozenset(permission.actions), (list(dict.fromkeys(permission.actions)), [], set())
+        )
+        for resource in permission.resources:
+            key = resource if isinstance(resource, str) else id(resource)
+            if key not in seen:
+                seen.add(key)
+                resources.append(resource)
+    return [
+        AwsPermission(actions=actions, resources=resources)
+        for actions, resources, _ in merged.values()
+    ]
+
+
+def split_permissions(
+    permissions: Sequence[AwsPermission], max_size: int = MANAGED_POLICY_MAX_SIZE
+) -> list[list[AwsPermission]]:
+    """Splits permissions into groups whose policy documents fit in max_size characters.
+
+    Resources aren't known until deployment, so sizes are estimated with Outputs
+    counted as _ESTIMATED_OUTPUT_LENGTH characters, check the sizes of the rendered
+    documents once they're resolved. Permissions too large for one policy are split
+    by resources. Groups are filled in order, so permissions of links added later
+    don't move earlier ones to another policy.
+    """
+    budget = max_size - _document_size([])
+    groups: list[list[AwsPermission]] = []
+    sizes: list[int] = []
+    for permission in permissions:
+        for part in _split_resources(permission, budget):
+            size = _statement_size(part) + _STATEMENT_SEPARATOR_SIZE
+            index = next((i for i, s in enumerate(sizes) if s + size <= budget), len(groups))
+            if index == len(groups):
+                groups.append([])
+                sizes.append(0)
+            groups[index].append(part)
+            sizes[index] += size
+    return groups
+
+
+def estimate_policy_size(permissions: Sequence[AwsPermission]) -> int:
+    """Estimates the size of the policy document of permissions, see split_permissions."""
+    return _document_size([_estimated_statement(p) for p in permissions])
+
+
+def _split_resources(permission: AwsPermission, budget: int) -> list[AwsPermission]:
+    parts: list[AwsPermission] = []
+    resources: list[Input[str]] = []
+    for resource in permission.resources:
+        candidate = AwsPermission(actions=permission.actions, resources=[*resources, resource])
+        if resources and _statement_size(candidate) + _STATEMENT_SEPARATOR_SIZE > budget:
+            parts.append(AwsPermission(actions=permission.actions, resources=resources))
+            resources = [resource]
+        else:
+            resources.append(resource)
+    parts.append(AwsPermission(actions=permission.actions, resources=resources))
+    return parts
+
+
+def _statement(actions: list[str], resources: list[str]) -> dict:
+    return {"Effect": "Allow", "Action": actions, "Resource": resources}
+
+
+def _estimated_statement(permission: AwsPermission) -> dict:
+    return _statement(
+        list(permission.actions),
+        [
+            r if isinstance(r, str) else "*" * _ESTIMATED_OUTPUT_LENGTH
+            for r in permission.resources
+        ],
+    )
+
+
+def _statement_size(permission: AwsPermission) -> int:
+    return len(json.dumps(_estimated_statement(permission), separators=(",", ":")))
+
+
+def _document_size(statements: list[dict]) -> int:
+    return len(
+        json.dumps({"Version": POLICY_VERSION, "Statement": statements}, separators=(",", ":"))
+    )
+
+
+def _matches(value: str, pattern: str, *, ignore_case: bool = False) -> bool:
+    if ignore_case:
+        return fnmatchcase(value.lower(), pattern.lower())
+    return fnmatchcase(value, pattern)
+
+
+def _is_pattern(resource: str) -> bool:
+    return any(char in resource for char in "*?[")
+
+
+def _actions_cover(actions: Sequence[str], other_actions: Sequence[str]) -> bool:
+    """Whether actions allow every action of other_actions."""
+    return all(
+        any(_matches(action, a, ignore_case=True) for a in actions) for action in other_actions
+    )
+
+
+def _fold_statements(
+    statements: list[tuple[list[str], list[str]]],
+) -> list[tuple[list[str], list[str]]]:
+    """Drops duplicate resources and resources another statement covers.
+
+    A resource is only dropped when it's strictly covered, so of statements allowing
+    the same, e.g. with actions in different case, all are kept. Resources are grouped
+    by their actions, so actions are compared once per pair of groups and resources only
+    with the patterns and equal resources of groups allowing their actions.
+    """
+    groups: dict[tuple[str, ...], list[tuple[int, str]]] = {}
+    for index, (actions, resources) in enumerate(statements):
+        groups.setdefault(tuple(actions), []).extend(
+            (index, resource) for resource in dict.fromkeys(resources)
+        )
+    covering = {
+        actions: [other for other in groups if _actions_cover(other, actions)]
+        for actions in groups
+    }
+    patterns = {
+        actions: [resource for _, resource in pairs if _is_pattern(resource)]
+        for actions, pairs in groups.items()
+    }
+    names = {actions: {resource for _, resource in pairs} for actions, pairs in groups.items()}
+
+    def is_covered(actions: tuple[str, ...], resource: str) -> bool:
+        for other in covering[actions]:
+            candidates = patterns[other] + ([resource] if resource in names[other] else [])
+            for other_resource in candidates:
+                if (other, other_resource) == (actions, resource):
+                    continue
+                if _matches(resource, other_resource) and not (
+                    actions in covering[other] and _matches(other_resource, resource)
+                ):
+                    return True
+        return False
+
+    kept: dict[int, list[str]] = {}
+    for actions, pairs in groups.items():
+        for index, resource in pairs:
+            if not is_covered(actions, resource):
+                kept.setdefault(index, []).append(resource)
+    return [(statements[index][0], kept[index]) for index in sorted(kept)]
@@ -203,7 +203,7 @@ class QueueSubscription(Component[QueueSubscriptionResources, QueueSubscriptionC
                 "event_source_mapping",
                 {
                     "event_source_arn": self._queue.arn,
-                    "function_name": function.function_name,
+                    "function_name": function.invocation_name,
                     "batch_size": self._batch_size or DEFAULT_QUEUE_BATCH_SIZE,
                     "filter_criteria": (
                         {"filters": [{"pattern": json.dumps(f)} for f in self._filters]}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass, field, replace
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, Unpack, final, get_args
 
@@ -9,7 +10,7 @@ from pulumi_aws import lambda_, sns, sqs
 
 from stelvio import context
 from stelvio.aws.function import Function, FunctionConfig, FunctionConfigDict, parse_handler_config
-from stelvio.aws.permission import AwsPermission
+from stelvio.aws.permission import POLICY_VERSION, AwsPermission
 from stelvio.aws.queue import Queue
 from stelvio.aws.topic import Topic
 from stelvio.component import Component, link_config_creator, safe_name
@@ -169,6 +170,7 @@ class BucketNotifySubscription(
                     {
                         "action": "lambda:InvokeFunction",
                         "function": function.resources.function.name,
+                        "qualifier": function.qualifier,
                         "principal": "s3.amazonaws.com",
                         "source_arn": self._bucket_arn,
                     },
@@ -291,7 +293,7 @@ class BucketNotifySubscription(
                     "function target, but got None. This is an internal error."
                 )
 
-            target_arn = function.resources.function.arn
+            target_arn = function.invocation_arn
             target_type = "lambda"
         elif self._queue is not None:
             target_arn = self._resolve_queue_arn()
@@ -433,20 +435,20 @@ class Bucket(Component[BucketResources, BucketCustomizationDict], LinkableMixin)
                 ),
                 opts=self._resource_opts(),
             )
-            public_read_policy = pulumi_aws.iam.get_policy_document(
-                statements=[
+            public_read_policy = bucket.arn.apply(
+                lambda arn: json.dumps(
                     {
-                        "effect": "Allow",
-                        "principals": [
+                        "Version": POLICY_VERSION,
+                        "Statement": [
                             {
-                                "type": "*",
-                                "identifiers": ["*"],
+                                "Effect": "Allow",
+                                "Principal": "*",
+                                "Action": ["s3:GetObject"],
+                                "Resource": [f"{arn}/*"],
                             }
                         ],
-                        "actions": ["s3:GetObject"],
-                        "resources": [bucket.arn.apply(lambda arn: f"{arn}/*")],
                     }
-                ]
+                )
             )
             bucket_policy = pulumi_aws.s3.BucketPolicy(
                 context().prefix(f"{self.name}-policy"),
@@ -454,7 +456,7 @@ class Bucket(Component[BucketResources, BucketCustomizationDict], LinkableMixin)
                     "bucket_policy",
                     {
                         "bucket": bucket.id,
-                        "policy": public_read_policy.json,
+                        "policy": public_read_policy,
                     },
                 ),
                 opts=self._resource_opts(),
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from typing import TypedDict
+
+
+class SizeBudgetConfigDict(TypedDict, total=False):
+    max_zipped_mb: float | None
+    max_unzipped_mb: float | None
+
+
+@dataclass(frozen=True, kw_only=True)
+class SizeBudgetConfig:
+    """Size limits of a function's package, stricter than the limits of Lambda.
+
+    Attributes:
+        max_zipped_mb: Maximum size of the function's zip in megabytes.
+        max_unzipped_mb: Maximum unzipped size of the function's code and all its
+            layers in megabytes, the way Lambda counts its 250 MB limit.
+    """
+
+    max_zipped_mb: float | None = None
+    max_unzipped_mb: float | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("max_zipped_mb", "max_unzipped_mb"):
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, int | float):
+                raise TypeError(f"{name} must be a number")
+            if value <= 0:
+                raise ValueError(f"{name} must be greater than 0")
+
+
+def normalize_size_budget_config(
+    size_budget: SizeBudgetConfig | SizeBudgetConfigDict | None,
+) -> SizeBudgetConfig | None:
+    """Converts the accepted forms of the 'size_budget' option to SizeBudgetConfig, or None."""
+    if size_budget is None:
+        return None
+    if isinstance(size_budget, SizeBudgetConfig):
+        return size_budget
+    if isinstance(size_budget, dict):
+        return SizeBudgetConfig(**size_budget)
+    raise TypeError(
+        f"'size_budget' must be a SizeBudgetConfig or SizeBudgetConfigDict. "
+        f"Got type: {type(size_budget).__name__}."
+    )
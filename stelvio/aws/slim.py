@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+from typing import Final, TypedDict
+
+# Files installed packages don't need at runtime on Lambda. Patterns are matched against
+# paths relative to the dependency directory and against each of their parent directories
+DEFAULT_SLIM_DENY: Final[tuple[str, ...]] = (
+    "__pycache__",
+    "*/__pycache__",
+    "*.pyc",
+    "*.pyo",
+    "*.pyi",
+    "tests",
+    "*/tests",
+    "*.dist-info/RECORD",
+)
+
+
+def _validate_patterns(value: list[str], field_name: str) -> None:
+    if not isinstance(value, list):
+        raise TypeError(f"{field_name} must be a list of glob patterns")
+    for item in value:
+        if not isinstance(item, str) or not item.strip():
+            raise ValueError(f"Each {field_name} pattern must be a non-empty string")
+
+
+class SlimConfigDict(TypedDict, total=False):
+    deny: list[str]
+    allow: list[str]
+    use_defaults: bool
+
+
+@dataclass(frozen=True, kw_only=True)
+class SlimConfig:
+    """Configuration for removing unneeded files from installed dependencies.
+
+    Patterns are glob patterns matched against file paths relative to the dependency
+    directory (e.g. "numpy/_core/tests/test_api.py") and against each of their parent
+    directories, so "*/tests" removes every file below any "tests" directory.
+
+    Attributes:
+        deny: Additional patterns of files to remove.
+        allow: Patterns of files to keep even if a deny pattern matches them.
+        use_defaults: Whether to apply DEFAULT_SLIM_DENY in addition to deny.
+    """
+
+    deny: list[str] = field(default_factory=list)
+    allow: list[str] = field(default_factory=list)
+    use_defaults: bool = True
+
+    def __post_init__(self) -> None:
+        _validate_patterns(self.deny, "deny")
+        _validate_patterns(self.allow, "allow")
+        if not isinstance(self.use_defaults, bool):
+            raise TypeError("use_defaults must be a boolean")
+
+    @property
+    def deny_patterns(self) -> tuple[str, ...]:
+        defaults = DEFAULT_SLIM_DENY if self.use_defaults else ()
+        return (*defaults, *self.deny)
+
+
+def normalize_slim_config(slim: bool | SlimConfig | SlimConfigDict | None) -> SlimConfig | None:
+    """Converts the accepted forms of the 'slim' option to SlimConfig, or None if disabled."""
+    if slim is None or slim is False:
+        return None
+    if slim is True:
+        return SlimConfig()
+    if isinstance(slim, SlimConfig):
+        return slim
+    if isinstance(slim, dict):
+        return SlimConfig(**slim)
+    raise TypeError(
+        f"'slim' must be a bool, SlimConfig or SlimConfigDict. Got type: {type(slim).__name__}."
+    )
@@ -95,7 +95,7 @@ class TopicSubscription(Component[TopicSubscriptionResources, TopicSubscriptionC
                 {
                     "topic": self._topic.arn,
                     "protocol": "lambda",
-                    "endpoint": function.resources.function.arn,
+                    "endpoint": function.invocation_arn,
                     "filter_policy": json.dumps(self._filter) if self._filter else None,
                 },
             ),
@@ -109,6 +109,7 @@ class TopicSubscription(Component[TopicSubscriptionResources, TopicSubscriptionC
                 {
                     "action": "lambda:InvokeFunction",
                     "function": function.function_name,
+                    "qualifier": function.qualifier,
                     "principal": "sns.amazonaws.com",
                     "source_arn": self._topic.arn,
                 },
@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from typing import TypedDict
+
+
+class TreeShakeConfigDict(TypedDict, total=False):
+    include: list[str]
+
+
+@dataclass(frozen=True, kw_only=True)
+class TreeShakeConfig:
+    """Configuration for packaging only the modules a folder-based function imports.
+
+    Attributes:
+        include: Glob patterns of additional files to package, matched against paths
+            relative to the function's folder (e.g. "templates/*", "config.json").
+            Matching Python modules are packaged along with everything they import,
+            which covers modules that are only imported dynamically.
+    """
+
+    include: list[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.include, list):
+            raise TypeError("include must be a list of glob patterns")
+        for item in self.include:
+            if not isinstance(item, str) or not item.strip():
+                raise ValueError("Each include pattern must be a non-empty string")
+
+
+def normalize_tree_shake_config(
+    tree_shake: bool | TreeShakeConfig | TreeShakeConfigDict | None,
+) -> TreeShakeConfig | None:
+    """Converts the accepted forms of the 'tree_shake' option to TreeShakeConfig, or None."""
+    if tree_shake is None or tree_shake is False:
+        return None
+    if tree_shake is True:
+        return TreeShakeConfig()
+    if isinstance(tree_shake, TreeShakeConfig):
+        return tree_shake
+    if isinstance(tree_shake, dict):
+        return TreeShakeConfig(**tree_shake)
+    raise TypeError(
+        f"'tree_shake' must be a bool, TreeShakeConfig or TreeShakeConfigDict. "
+        f"Got type: {type(tree_shake).__name__}."
+    )
@@ -0,0 +1,139 @@
+"""Warmer component keeping functions configured with `warm` initialized."""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Final, TypedDict, final
+
+from pulumi_aws import cloudwatch, lambda_
+
+from stelvio import context
+from stelvio.aws.cron import _validate_schedule
+from stelvio.aws.function import Function
+from stelvio.aws.function.config import WarmConfig, normalize_warm_config
+from stelvio.aws.function.constants import WARM_EVENT_KEY
+from stelvio.component import Component, ComponentRegistry, safe_name
+
+_WARMER_NAME_PREFIX: Final[str] = "warmer"
+# EventBridge allows 5 targets per rule
+MAX_RULE_TARGETS: Final[int] = 5
+
+
+@final
+@dataclass(frozen=True)
+class WarmerResources:
+    """Resources created by a Warmer component."""
+
+    rules: list[cloudwatch.EventRule]
+    targets: list[cloudwatch.EventTarget]
+    permissions: list[lambda_.Permission]
+
+
+class WarmerCustomizationDict(TypedDict, total=False):
+    rules: cloudwatch.EventRuleArgs | dict[str, Any] | None
+    targets: cloudwatch.EventTargetArgs | dict[str, Any] | None
+    permissions: lambda_.PermissionArgs | dict[str, Any] | None
+
+
+@final
+class Warmer(Component[WarmerResources, WarmerCustomizationDict]):
+    """Pings warmed functions sharing a rate from one EventBridge schedule.
+
+    Created by Stelvio for functions configured with `warm`, see create_warmers.
+    Each function gets a ping asking for its warm concurrency. A rule takes up to
+    five functions, more functions spread over more rules with the same schedule.
+
+    Args:
+        name: Unique name for the warmer
+        rate: Value of the rate expression all functions are pinged at
+        functions: Functions to ping, all warmed at this rate
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: str,
+        functions: list[Function],
+        *,
+        customize: WarmerCustomizationDict | None = None,
+    ):
+        super().__init__("stelvio:aws:Warmer", name, customize=customize)
+        self._schedule = f"rate({rate})"
+        _validate_schedule(self._schedule)
+        self._functions = functions
+
+    @property
+    def functions(self) -> list[Function]:
+        return list(self._functions)
+
+    def _create_resources(self) -> WarmerResources:
+        rules = []
+        targets = []
+        permissions = []
+        for index in range(0, len(self._functions), MAX_RULE_TARGETS):
+            rule = cloudwatch.EventRule(
+                safe_name(context().prefix(), f"{self.name}-{index // MAX_RULE_TARGETS}", 64),
+                **self._customizer(
+                    "rules",
+                    {"schedule_expression": self._schedule, "state": "ENABLED"},
+                    inject_tags=True,
+                ),
+                opts=self._resource_opts(),
+            )
+            rules.append(rule)
+            for function in self._functions[index : index + MAX_RULE_TARGETS]:
+                target, permission = self._create_ping(rule, function)
+                targets.append(target)
+                permissions.append(permission)
+
+        return WarmerResources(rules=rules, targets=targets, permissions=permissions)
+
+    def _create_ping(
+        self, rule: cloudwatch.EventRule, function: Function
+    ) -> tuple[cloudwatch.EventTarget, lambda_.Permission]:
+        warm = normalize_warm_config(function.config.warm) or WarmConfig()
+        target = cloudwatch.EventTarget(
+            safe_name(context().prefix(), f"{self.name}-{function.name}", 64),
+            **self._customizer(
+                "targets",
+                {
+                    "rule": rule.name,
+                    "arn": function.invocation_arn,
+                    "input": json.dumps({WARM_EVENT_KEY: {"concurrency": warm.concurrency}}),
+                },
+            ),
+            opts=self._resource_opts(),
+        )
+        permission = lambda_.Permission(
+            safe_name(context().prefix(), f"{self.name}-{function.name}-permission", 64),
+            **self._customizer(
+                "permissions",
+                {
+                    "action": "lambda:InvokeFunction",
+                    "function": function.function_name,
+                    "qualifier": function.qualifier,
+                    "principal": "events.amazonaws.com",
+                    "source_arn": rule.arn,
+                },
+            ),
+            opts=self._resource_opts(),
+        )
+        return target, permission
+
+
+def create_warmers() -> list[Warmer]:
+    """
+    Creates a Warmer for each distinct warm rate of the Functions registered so far.
+
+    Functions are created by other components while their resources are created, so
+    this runs after all other components created theirs.
+    """
+    functions_by_rate: dict[str, list[Function]] = {}
+    for function in ComponentRegistry.instances_of(Function):
+        warm = normalize_warm_config(function.config.warm)
+        if warm is not None:
+            functions_by_rate.setdefault(warm.rate, []).append(function)
+
+    return [
+        Warmer(f"{_WARMER_NAME_PREFIX}-{rate.replace(' ', '-')}", rate, functions)
+        for rate, functions in sorted(functions_by_rate.items())
+    ]
@@ -0,0 +1,147 @@
+"""Builds the Lambda artifacts of an app without deploying it.
+
+The app's Pulumi program runs in-process against mocked resources in preview mode, so
+no Pulumi engine, state or cloud credentials are needed. Components package their code
+exactly like during a deploy (same dependency caches, same fingerprints), but missing
+zips are built concurrently once every component has been packaged. A later deploy of
+the same code finds all artifacts already built.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Final
+
+from pulumi.runtime import MockCallArgs, MockResourceArgs, Mocks
+
+from stelvio import context
+from stelvio.app import StelvioApp
+from stelvio.aws._packaging.artifacts import BuiltArtifact, collect_artifacts, get_peak_rss
+from stelvio.aws._packaging.size_budget import FunctionSizeReport, analyze_function_size
+from stelvio.aws.function import Function
+from stelvio.aws.size_budget import normalize_size_budget_config
+from stelvio.component import ComponentRegistry
+from stelvio.project import get_dot_stelvio_dir, get_project_root
+
+MANIFEST_VERSION: Final[int] = 1
+_MANIFEST_FILENAME: Final[str] = "manifest.json"
+# Largest packages listed per artifact in the manifest's size reports
+_MANIFEST_TOP_PACKAGES: Final[int] = 10
+_PLACEHOLDER_ACCOUNT_ID: Final[str] = "000000000000"
+_PLACEHOLDER_REGION: Final[str] = "us-east-1"
+
+logger = logging.getLogger(__name__)
+
+
+class _BuildMocks(Mocks):
+    """
+    Resources output their inputs, other outputs stay unknown like in a preview.
+
+    Invokes used while creating resources get offline placeholders, none of them end
+    up in artifacts.
+    """
+
+    def new_resource(self, args: MockResourceArgs) -> tuple[str, dict[str, Any]]:
+        return f"{args.name}-build-id", dict(args.inputs)
+
+    def call(self, args: MockCallArgs) -> tuple[dict[str, Any], list[tuple[str, str]]]:
+        if args.token == "aws:index/getCallerIdentity:getCallerIdentity":  # noqa: S105
+            return {"accountId": _PLACEHOLDER_ACCOUNT_ID}, []
+        if args.token == "aws:index/getRegion:getRegion":  # noqa: S105
+            region = context().aws.region or _PLACEHOLDER_REGION
+            return {"name": region, "region": region}, []
+        return {}, []
+
+
+def build_artifacts(max_workers: int | None = None) -> list[BuiltArtifact]:
+    """
+    Runs the loaded app's program and builds the artifacts of all its components.
+
+    Must be called after the app and its context are loaded.
+
+    Args:
+        max_workers: Upper bound on concurrent artifact builds.
+
+    Returns:
+        One entry per Function and Layer artifact, in the order they were packaged.
+    """
+    with collect_artifacts() as collector:
+        StelvioApp.get_instance().run_offline(_BuildMocks())
+        return collector.build(max_workers)
+
+
+def analyze_function_sizes() -> list[FunctionSizeReport]:
+    """
+    Measures the built artifacts of every Function together with its layers.
+
+    Must be called after build_artifacts.
+
+    Returns:
+        One report per Function, in registration order.
+    """
+    return [
+        analyze_function_size(
+            function.name,
+            [layer.name for layer in function.layers],
+            normalize_size_budget_config(function.config.size_budget),
+            staged=context().stage_artifacts,
+        )
+        for function in ComponentRegistry.instances_of(Function)
+    ]
+
+
+def get_default_manifest_path() -> Path:
+    return get_dot_stelvio_dir() / "artifacts" / _MANIFEST_FILENAME
+
+
+def write_build_manifest(
+    artifacts: list[BuiltArtifact],
+    manifest_path: Path,
+    size_reports: list[FunctionSizeReport] | None = None,
+) -> dict[str, Any]:
+    """
+    Writes a JSON manifest describing the built artifacts.
+
+    Artifact paths are relative to the project root, so the manifest stays valid when
+    .stelvio is restored in another checkout (e.g. from a CI cache). Size reports list
+    each function's sizes, largest packages and exceeded limits. The peak resident
+    memory is the build process's, artifacts are built concurrently so it isn't
+    broken down per artifact.
+
+    Returns:
+        The manifest as written.
+    """
+    ctx = context()
+    project_root = get_project_root()
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "app": ctx.name,
+        "env": ctx.env,
+        "peak_rss": get_peak_rss(),
+        "artifacts": [
+            {
+                "component": artifact.component,
+                "kind": artifact.kind,
+                "fingerprint": artifact.fingerprint,
+                "path": _relative_to(artifact.path, project_root),
+                "size": artifact.size,
+                "build_time": round(artifact.build_time, 3),
+                "cached": artifact.cached,
+            }
+            for artifact in artifacts
+        ],
+        "functions": [report.to_dict(_MANIFEST_TOP_PACKAGES) for report in size_reports or []],
+    }
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(manifest_path)
+    logger.info("Wrote build manifest with %d artifact(s) to %s", len(artifacts), manifest_path)
+    return manifest
+
+
+def _relative_to(path: Path, root: Path) -> str:
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return str(path)
@@ -19,11 +19,13 @@ from rich.console import Console
 from rich.logging import RichHandler
 
 from stelvio.cli.commands import (
+    run_build,
     run_deploy,
     run_destroy,
     run_dev,
     run_diff,
     run_outputs,
+    run_profile_imports,
     run_refresh,
     run_state_list,
     run_state_remove,
@@ -365,6 +367,65 @@ def deploy(
         raise
 
 
+@click.command()
+@click.argument("env", default=None, required=False)
+@click.option(
+    "--manifest",
+    "manifest_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Where to write the build manifest (default: .stelvio/artifacts/manifest.json)",
+)
+@click.option(
+    "--workers", type=click.IntRange(min=1), default=None, help="Maximum concurrent builds"
+)
+@click.option("--json", "json_output", is_flag=True, help="Output the manifest in JSON format")
+def build(
+    env: str | None, manifest_path: Path | None, workers: int | None, json_output: bool
+) -> None:
+    """
+    Builds function and layer artifacts without deploying.
+    Needs neither cloud credentials nor Pulumi state. Fails if a function exceeds
+    Lambda's size limits or its size budget.
+    """
+    error_ctx = {"operation": "build", "env": env, "json_output": json_output}
+    try:
+        env = determine_env(env, require_explicit_in_ci=True, command_name="build")
+        error_ctx["env"] = env
+        run_build(env, manifest_path=manifest_path, max_workers=workers, json_output=json_output)
+    except (StelvioProjectError, StelvioValidationError) as e:
+        _handle_cli_error(e, **error_ctx)
+    except Exception as e:
+        if json_output:
+            _handle_cli_error(e, **error_ctx)
+        raise
+
+
+@click.command("profile-imports")
+@click.argument("function_name", metavar="FUNCTION")
+@click.argument("env", default=None, required=False)
+@click.option(
+    "--top", type=click.IntRange(min=1), default=10, help="Number of modules and entries shown"
+)
+@click.option("--json", "json_output", is_flag=True, help="Output in JSON format")
+def profile_imports(function_name: str, env: str | None, top: int, json_output: bool) -> None:
+    """
+    Profiles cold-start imports of a function's packaged code.
+    Imports the handler from the built artifacts with 'python -X importtime'.
+    """
+    error_ctx = {"operation": "profile_imports", "env": env, "json_output": json_output}
+    try:
+        env = determine_env(env, require_explicit_in_ci=True, command_name="profile-imports")
+        error_ctx["env"] = env
+        run_profile_imports(env, function_name, top=top, json_output=json_output)
+    except (StelvioProjectError, StelvioValidationError) as e:
+        _handle_cli_error(e, **error_ctx)
+    except Exception as e:
+        if json_output:
+            _handle_cli_error(e, **error_ctx)
+        raise
+
+
 @click.command()
 @click.argument("env", default=None, required=False)
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation prompts")
@@ -525,6 +586,8 @@ cli.add_command(version)
 cli.add_command(init)
 cli.add_command(diff)
 cli.add_command(deploy)
+cli.add_command(build)
+cli.add_command(profile_imports)
 cli.add_command(dev)
 cli.add_command(refresh)
 cli.add_command(destroy)
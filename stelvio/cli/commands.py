@@ -1,19 +1,25 @@
 import os
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
 
 from pulumi.automation import CommandError
 from rich.console import Console
 from rich.status import Status
 
 from stelvio import context
-from stelvio.aws.function.dependencies import (
-    clean_function_active_dependencies_caches_file,
-    clean_function_stale_dependency_caches,
-)
-from stelvio.aws.layer import (
-    clean_layer_active_dependencies_caches_file,
-    clean_layer_stale_dependency_caches,
-)
+from stelvio.aws._packaging.artifacts import evict_artifacts
+from stelvio.aws._packaging.dependencies import dependency_cache_session, read_cache_limits
+from stelvio.aws._packaging.size_budget import FunctionSizeReport
+from stelvio.aws.function.packaging import clean_function_active_artifacts_file
+from stelvio.aws.layer import clean_layer_active_artifacts_file
 from stelvio.bridge.local.listener import run_bridge_server
+from stelvio.build import (
+    analyze_function_sizes,
+    build_artifacts,
+    get_default_manifest_path,
+    write_build_manifest,
+)
 from stelvio.cli.json_output import (
     emit_stream_start,
     print_json_error,
@@ -23,7 +29,8 @@ from stelvio.cli.json_output import (
     stream_writer,
 )
 from stelvio.cli.state_rendering import format_state_tree_lines
-from stelvio.command_run import CommandRun, force_unlock
+from stelvio.command_run import CommandRun, _load_stlv_app, force_unlock
+from stelvio.profile_imports import profile_function_imports
 from stelvio.pulumi import _show_simple_error, print_operation_header
 from stelvio.rich_deployment_handler import RichDeploymentHandler
 from stelvio.stack_outputs import (
@@ -43,15 +50,22 @@ from stelvio.state_ops import (
 
 console = Console()
 
+_KB = 1024
+# Largest packages listed for functions exceeding their size limits
+_SIZE_REPORT_TOP_PACKAGES = 5
 
-def _reset_cache_tracking() -> None:
-    clean_function_active_dependencies_caches_file()
-    clean_layer_active_dependencies_caches_file()
+
+@contextmanager
+def _track_caches() -> Generator[None]:
+    """Tracks the artifacts a command uses and evicts unused dependency caches after it."""
+    clean_function_active_artifacts_file()
+    clean_layer_active_artifacts_file()
+    with dependency_cache_session():
+        yield
 
 
 def _clean_stale_caches() -> None:
-    clean_function_stale_dependency_caches()
-    clean_layer_stale_dependency_caches()
+    evict_artifacts(read_cache_limits())
 
 
 def _handle_error(error: CommandError) -> None:
@@ -208,9 +222,8 @@ def run_diff(
     env: str, show_unchanged: bool = False, compact: bool = False, *, json_output: bool = False
 ) -> None:
     status = _start_loading(enabled=not json_output)
-    _reset_cache_tracking()
 
-    with CommandRun(env) as run:
+    with _track_caches(), CommandRun(env) as run:
         if status:
             status.stop()
         if not json_output:
@@ -248,9 +261,8 @@ def run_deploy(
     stream_output: bool = False,
 ) -> None:
     status = _start_loading(enabled=not (json_output or stream_output))
-    _reset_cache_tracking()
 
-    with CommandRun(env, lock_as="deploy") as run:
+    with _track_caches(), CommandRun(env, lock_as="deploy") as run:
         if status:
             status.stop()
         operation_str = f"Deploying {'NEW ' if not run.has_deployed else ''}app"
@@ -281,6 +293,8 @@ def run_deploy(
         run.push_state()
         run.create_state_snapshot()
         run.complete_update(errors=[str(error_exc)] if error_exc else None)
+        if not error_exc:
+            run.clean_staged_artifacts()
 
         stack_outputs = _best_effort_outputs(run)
         if error_exc:
@@ -306,9 +320,8 @@ def run_deploy(
 def run_dev(env: str, show_unchanged: bool = False) -> None:
     status = console.status("Loading app...")
     status.start()
-    _reset_cache_tracking()
 
-    with CommandRun(env, lock_as="dev-mode", dev_mode=True) as run:
+    with _track_caches(), CommandRun(env, lock_as="dev-mode", dev_mode=True) as run:
         status.stop()
         operation_str = f"Deploying {'' if run.has_deployed else 'NEW '}app in DEV MODE"
         print_operation_header(operation_str, run.app_name, env)
@@ -431,6 +444,7 @@ def run_destroy(
         actual_resources = [r for r in resources if r.get("type") != "pulumi:pulumi:Stack"]
         if len(actual_resources) == 0:
             run.delete_snapshots()
+            run.clean_staged_artifacts(destroyed=True)
 
         run.complete_update(errors=[str(error_exc)] if error_exc else None)
 
@@ -449,6 +463,126 @@ def run_destroy(
         )
 
 
+def run_build(
+    env: str,
+    *,
+    manifest_path: Path | None = None,
+    max_workers: int | None = None,
+    json_output: bool = False,
+) -> None:
+    status = _start_loading(enabled=not json_output)
+    with _track_caches():
+        try:
+            _load_stlv_app(env, dev_mode=False)
+            if status:
+                status.update("Building artifacts...")
+            artifacts = build_artifacts(max_workers)
+            size_reports = analyze_function_sizes()
+        finally:
+            if status:
+                status.stop()
+        _clean_stale_caches()
+
+    manifest_path = manifest_path or get_default_manifest_path()
+    manifest = write_build_manifest(artifacts, manifest_path, size_reports)
+    oversized = [report for report in size_reports if report.violations]
+    if json_output:
+        console.print_json(data=manifest)
+        if oversized:
+            raise SystemExit(1)
+        return
+
+    print_operation_header("Built", context().name, env)
+    for artifact in artifacts:
+        outcome = "[dim]cached[/dim]" if artifact.cached else f"{artifact.build_time:.2f}s"
+        console.print(
+            f"  [green]✓[/green] {artifact.kind}/{artifact.component} "
+            f"[dim]{_format_size(artifact.size)}[/dim] {outcome}"
+        )
+    _print_size_reports(size_reports)
+    # Components with identical code share one zip, built once
+    built = len({artifact.path for artifact in artifacts if not artifact.cached})
+    peak_rss = manifest["peak_rss"]
+    console.print(
+        f"\n[bold green]✓[/bold green] {len(artifacts)} artifact(s), {built} built"
+        + (f", peak RSS {_format_size(peak_rss)}" if peak_rss is not None else "")
+        + f". Manifest: {manifest_path}"
+    )
+    if oversized:
+        console.print(
+            f"[bold red]✗[/bold red] {len(oversized)} function(s) exceed their size limits."
+        )
+        raise SystemExit(1)
+
+
+def _print_size_reports(size_reports: list[FunctionSizeReport]) -> None:
+    if size_reports:
+        console.print("\n[bold]Function sizes[/bold] [dim](zipped / unzipped with layers)[/dim]")
+    for report in size_reports:
+        mark = "[red]✗[/red]" if report.violations else "[green]✓[/green]"
+        console.print(
+            f"  {mark} {report.function} [dim]{_format_size(report.zipped_size)} / "
+            f"{_format_size(report.unzipped_size)}[/dim]"
+        )
+        if not report.violations:
+            continue
+        for violation in report.violations:
+            console.print(f"      [red]{violation}[/red]", highlight=False)
+        for component, package in report.largest_packages(_SIZE_REPORT_TOP_PACKAGES):
+            console.print(
+                f"      {_format_size(package.size):>10}  {package.name} [dim]{component}[/dim]",
+                highlight=False,
+            )
+
+
+def run_profile_imports(
+    env: str, function_name: str, *, top: int = 10, json_output: bool = False
+) -> None:
+    status = _start_loading(enabled=not json_output)
+    try:
+        _load_stlv_app(env, dev_mode=False)
+        if status:
+            status.update("Building artifacts...")
+        profile = profile_function_imports(function_name)
+    finally:
+        if status:
+            status.stop()
+
+    if json_output:
+        console.print_json(data=profile.to_dict(top))
+        return
+
+    print_operation_header("Import profile of", context().name, env)
+    console.print(
+        f"  [cyan]{profile.function}[/cyan] ({profile.runtime}): imported "
+        f"[bold]{profile.module_count}[/bold] modules in "
+        f"[bold]{profile.import_time_us / 1000:.1f} ms[/bold]\n"
+    )
+    console.print("[bold]Slowest imports[/bold] [dim](self / cumulative)[/dim]")
+    for module in profile.top_modules(top):
+        console.print(
+            f"  {module.self_us / 1000:8.1f} ms {module.cumulative_us / 1000:8.1f} ms  "
+            f"{module.module}",
+            highlight=False,
+        )
+    for artifact in profile.artifacts:
+        console.print(
+            f"\n[bold]{artifact.kind}/{artifact.component}[/bold] "
+            f"[dim]{_format_size(artifact.size)} zipped, "
+            f"{_format_size(artifact.uncompressed_size)} unzipped[/dim]"
+        )
+        for name, size in artifact.entries[:top]:
+            console.print(f"  {_format_size(size):>10}  {name}", highlight=False)
+
+
+def _format_size(size: int) -> str:
+    if size < _KB:
+        return f"{size} B"
+    if size < _KB * _KB:
+        return f"{size / _KB:.1f} KB"
+    return f"{size / (_KB * _KB):.1f} MB"
+
+
 def run_unlock(env: str) -> dict | None:
     """Returns lock info if lock existed, None otherwise."""
     status = console.status("Loading app...")
@@ -70,6 +70,11 @@ from pulumi.automation import (
 from semver import VersionInfo
 
 from stelvio.app import StelvioApp
+from stelvio.aws._packaging.staging import (
+    ArtifactStager,
+    clean_staged_artifacts,
+    set_artifact_stager,
+)
 from stelvio.aws.home import AwsHome
 from stelvio.config import StelvioAppConfig
 from stelvio.context import AppContext, _ContextStore, context
@@ -224,6 +229,7 @@ def _load_stlv_app(env: str, dev_mode: bool) -> None:
             home=config.home,
             customize=config.customize,
             dev_mode=dev_mode,
+            stage_artifacts=config.stage_artifacts,
         )
     )
     _validate_environment(config, env)
@@ -317,6 +323,7 @@ class CommandRun:
         self._push_trigger: threading.Event | None = None
         self._last_pushed_hash: str | None = None
         self._had_state: bool = False
+        self._artifact_stager: ArtifactStager | None = None
 
     def __enter__(self) -> Self:
         # 1. Load app, 2. Create home, 3. Init storage
@@ -341,6 +348,10 @@ class CommandRun:
             # 8. Create Pulumi stack (skip for state_only mode)
             if not self._state_only:
                 self._stack = _create_stack(ctx, passphrase, self._workdir)
+                # 9. Stage Lambda code in the state bucket if enabled
+                if ctx.stage_artifacts:
+                    self._artifact_stager = ArtifactStager(self._home, self._app_name)
+                    set_artifact_stager(self._artifact_stager)
         except Exception:
             if self._locked:
                 self._unlock()
@@ -350,6 +361,7 @@ class CommandRun:
         return self
 
     def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> bool:
+        set_artifact_stager(None)
         try:
             self._unlock()
         finally:
@@ -406,6 +418,17 @@ class CommandRun:
         prefix = f"snapshot/{self._app_name}/{self.env}/"
         self._home.delete_prefix(prefix)
 
+    def clean_staged_artifacts(self, *, destroyed: bool = False) -> None:
+        """Delete staged Lambda code no environment of the app uses any more.
+
+        After a deploy this environment uses the artifacts it staged, after a destroy
+        none.
+        """
+        staged = self._artifact_stager.staged_keys if self._artifact_stager else []
+        clean_staged_artifacts(
+            self._home, self._app_name, self.env, [] if destroyed else staged, self._workdir
+        )
+
     def start_partial_push(self, interval: float = 5.0) -> None:
         """Start background thread that pushes state periodically.
 
@@ -105,6 +105,12 @@ class StelvioAppConfig:
         environments: List of shared environment names (e.g., ["staging", "production"]).
         home: State storage backend. Currently only "aws" is supported.
         customize: Customization dictionary for Pulumi resources.
+        auto_layers: Move dependencies shared by several functions into generated
+            layers instead of packaging them into every function.
+        stage_artifacts: Upload function and layer code to the state bucket and let
+            Lambda fetch it from there, instead of sending it with each API call.
+        concurrency_budget: Concurrency the app's functions may reserve combined.
+            Deployments warn when their reserved_concurrency adds up to more.
     """
 
     aws: AwsConfig = field(default_factory=AwsConfig)
@@ -113,8 +119,20 @@ class StelvioAppConfig:
     environments: list[str] = field(default_factory=list)
     home: Literal["aws"] = "aws"
     customize: dict[type["Component[Any, Any]"], dict[str, dict]] = field(default_factory=dict)
+    auto_layers: bool = False
+    stage_artifacts: bool = False
+    concurrency_budget: int | None = None
 
     def __post_init__(self) -> None:
+        if self.concurrency_budget is not None and (
+            isinstance(self.concurrency_budget, bool)
+            or not isinstance(self.concurrency_budget, int)
+            or self.concurrency_budget < 0
+        ):
+            raise ValueError(
+                "Invalid app config concurrency_budget: expected a non-negative integer, "
+                f"got {self.concurrency_budget!r}"
+            )
         if self.tags is None:
             object.__setattr__(self, "tags", {})
             return
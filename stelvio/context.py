@@ -19,6 +19,7 @@ class AppContext:
     dns: Dns | None = None
     tags: dict[str, str] = field(default_factory=dict)
     dev_mode: bool = False
+    stage_artifacts: bool = False
     customize: dict[type["Component[Any, Any]"], dict[str, dict]] = field(default_factory=dict)
 
     def prefix(self, name: str | None = None) -> str:
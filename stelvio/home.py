@@ -1,3 +1,4 @@
+from datetime import datetime
 from pathlib import Path
 from typing import Protocol
 
@@ -21,6 +22,11 @@ class Home(Protocol):
         """
         ...
 
+    @property
+    def storage_name(self) -> str | None:
+        """Name of the initialized storage, None before init_storage."""
+        ...
+
     # Files (S3 in AWS, filesystem locally, etc.)
     def read_file(self, key: str, local_path: Path) -> bool:
         """Download file to local_path. Returns True if file existed."""
@@ -38,6 +44,10 @@ class Home(Protocol):
         """Check if file exists."""
         ...
 
+    def list_files(self, prefix: str) -> dict[str, datetime]:
+        """Map keys of all files with given prefix to their last modification time."""
+        ...
+
     def delete_prefix(self, prefix: str) -> None:
         """Delete all files with given prefix."""
         ...
@@ -0,0 +1,251 @@
+"""Profiles the cold-start imports of a function from the artifacts Stelvio deploys.
+
+The function's zip and the zips of its layers are built like in `stlv build`, unpacked
+into a temporary directory laid out like on Lambda (/var/task and /opt) and the handler
+module is imported under `python -X importtime` with an interpreter matching the
+function's runtime.
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+import tempfile
+import zipfile
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, Final
+
+from stelvio import context
+from stelvio.aws._packaging.artifacts import BuiltArtifact
+from stelvio.aws._packaging.bytecode import find_interpreter
+from stelvio.aws.function import Function
+from stelvio.aws.function.constants import DEFAULT_RUNTIME
+from stelvio.build import build_artifacts
+from stelvio.component import ComponentRegistry
+from stelvio.exceptions import StelvioValidationError
+
+PROFILE_VERSION: Final[int] = 1
+# Separates interpreter startup imports from the handler's in -X importtime output
+_PROFILE_MARKER: Final[str] = "stlv-profile-imports-start"
+_PROFILE_SCRIPT: Final[str] = f"""
+import json, sys, time
+print("{_PROFILE_MARKER}", file=sys.stderr, flush=True)
+start = time.perf_counter_ns()
+# Unlike importlib.import_module, the builtin import is reported by -X importtime
+__import__(sys.argv[1])
+print(json.dumps({{"import_ns": time.perf_counter_ns() - start}}))
+"""
+# e.g. "import time:       322 |        861 |   encodings"
+_IMPORTTIME_LINE: Final[re.Pattern] = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+_SITE_PACKAGES_PREFIX: Final[re.Pattern] = re.compile(r"^python/(lib/python[^/]+/site-packages/)?")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModuleImport:
+    """Import time of one module as reported by -X importtime."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    # Nesting level, 0 for the handler module
+    depth: int
+
+
+@dataclass(frozen=True)
+class ArtifactBreakdown:
+    """Sizes of a function or layer zip and of its largest top-level entries."""
+
+    kind: str
+    component: str
+    path: Path
+    size: int
+    uncompressed_size: int
+    # Uncompressed bytes per top-level package or file, largest first
+    entries: list[tuple[str, int]]
+
+
+@dataclass(frozen=True)
+class ImportProfile:
+    function: str
+    runtime: str
+    handler_module: str
+    # Wall-clock time of importing the handler module
+    import_time_us: int
+    modules: list[ModuleImport]
+    artifacts: list[ArtifactBreakdown]
+
+    @property
+    def module_count(self) -> int:
+        return len(self.modules)
+
+    def top_modules(self, limit: int) -> list[ModuleImport]:
+        """Returns the modules that took the longest themselves, slowest first."""
+        return sorted(self.modules, key=lambda m: m.self_us, reverse=True)[:limit]
+
+    def to_dict(self, top: int) -> dict[str, Any]:
+        return {
+            "version": PROFILE_VERSION,
+            "function": self.function,
+            "runtime": self.runtime,
+            "handler_module": self.handler_module,
+            "import_time_ms": round(self.import_time_us / 1000, 3),
+            "module_count": self.module_count,
+            "top_modules": [
+                {
+                    "module": module.module,
+                    "self_ms": round(module.self_us / 1000, 3),
+                    "cumulative_ms": round(module.cumulative_us / 1000, 3),
+                }
+                for module in self.top_modules(top)
+            ],
+            "artifacts": [
+                {
+                    "kind": artifact.kind,
+                    "component": artifact.component,
+                    "size": artifact.size,
+                    "uncompressed_size": artifact.uncompressed_size,
+                    "entries": [
+                        {"name": name, "size": size} for name, size in artifact.entries[:top]
+                    ],
+                }
+                for artifact in self.artifacts
+            ],
+        }
+
+
+def profile_function_imports(function_name: str) -> ImportProfile:
+    """
+    Builds the artifacts of the loaded app and profiles the imports of one function.
+
+    Must be called after the app and its context are loaded.
+
+    Raises:
+        StelvioValidationError: If the app has no function with that name.
+        RuntimeError: If importing the handler fails or no matching interpreter is found.
+    """
+    artifacts = build_artifacts()
+    function = _find_function(function_name)
+    runtime = function.config.runtime or DEFAULT_RUNTIME
+    layer_names = [layer.name for layer in function.layers]
+    function_artifact = _find_artifact(artifacts, "functions", function.name)
+    # Later layers override earlier ones, like on Lambda
+    layer_artifacts = [_find_artifact(artifacts, "layers", name) for name in layer_names]
+    handler_module = function.config.local_handler_file_path.replace("/", ".")
+
+    with tempfile.TemporaryDirectory(prefix="stlv-profile-") as tmp:
+        task_root, opt_root = Path(tmp) / "task", Path(tmp) / "opt"
+        _extract(function_artifact.path, task_root)
+        for artifact in layer_artifacts:
+            _extract(artifact.path, opt_root)
+        import_time_us, modules = _run_importtime(
+            find_interpreter(runtime), runtime, handler_module, task_root, opt_root
+        )
+
+    return ImportProfile(
+        function=function.name,
+        runtime=runtime,
+        handler_module=handler_module,
+        import_time_us=import_time_us,
+        modules=modules,
+        artifacts=[_breakdown(a) for a in [function_artifact, *layer_artifacts]],
+    )
+
+
+def _find_function(function_name: str) -> Function:
+    functions = list(ComponentRegistry.instances_of(Function))
+    for function in functions:
+        if function.name == function_name:
+            return function
+    available = ", ".join(sorted(f.name for f in functions)) or "none"
+    raise StelvioValidationError(
+        f"Function '{function_name}' not found. Functions in this app: {available}."
+    )
+
+
+def _find_artifact(artifacts: list[BuiltArtifact], kind: str, component: str) -> BuiltArtifact:
+    for artifact in artifacts:
+        if artifact.kind == kind and artifact.component == component:
+            return artifact
+    raise RuntimeError(f"No {kind} artifact was built for '{component}'.")
+
+
+def _extract(archive_path: Path, target: Path) -> None:
+    with zipfile.ZipFile(archive_path) as archive:
+        archive.extractall(target)
+
+
+def _run_importtime(
+    interpreter: str, runtime: str, handler_module: str, task_root: Path, opt_root: Path
+) -> tuple[int, list[ModuleImport]]:
+    py_version = runtime.removeprefix("python")
+    # Lambda's import path: the function code, then layers
+    python_path = [
+        task_root,
+        opt_root / "python" / "lib" / f"python{py_version}" / "site-packages",
+        opt_root / "python",
+    ]
+    env = {key: value for key, value in os.environ.items() if not key.startswith("PYTHON")}
+    region = context().aws.region or env.get("AWS_REGION") or "us-east-1"
+    env |= {
+        "PYTHONPATH": os.pathsep.join(str(path) for path in python_path),
+        # Lambda's file system is read-only, sources are compiled on every cold start
+        "PYTHONDONTWRITEBYTECODE": "1",
+        "LAMBDA_TASK_ROOT": str(task_root),
+        "AWS_REGION": region,
+        "AWS_DEFAULT_REGION": region,
+    }
+    cmd = [interpreter, "-s", "-X", "importtime", "-c", _PROFILE_SCRIPT, handler_module]
+    logger.info("Profiling imports of '%s' with %s", handler_module, interpreter)
+    result = subprocess.run(  # noqa: S603
+        cmd, cwd=task_root, env=env, capture_output=True, check=False, text=True
+    )
+    _, _, handler_output = result.stderr.partition(f"{_PROFILE_MARKER}\n")
+    if result.returncode != 0:
+        details = "\n".join(
+            line for line in handler_output.splitlines() if not line.startswith("import time:")
+        )
+        raise RuntimeError(f"Importing '{handler_module}' failed:\n{details.strip()}")
+
+    import_ns = json.loads(result.stdout.splitlines()[-1])["import_ns"]
+    return import_ns // 1000, _parse_importtime(handler_output)
+
+
+def _parse_importtime(output: str) -> list[ModuleImport]:
+    modules = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append(
+                ModuleImport(
+                    module=module,
+                    self_us=int(self_us),
+                    cumulative_us=int(cumulative_us),
+                    # -X importtime indents nested imports by two spaces
+                    depth=(len(indent) - 1) // 2,
+                )
+            )
+    return modules
+
+
+def _breakdown(artifact: BuiltArtifact) -> ArtifactBreakdown:
+    entries: dict[str, int] = defaultdict(int)
+    with zipfile.ZipFile(artifact.path) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if artifact.kind == "layers":
+                name = _SITE_PACKAGES_PREFIX.sub("", name)
+            entries[PurePosixPath(name).parts[0]] += info.file_size
+    return ArtifactBreakdown(
+        kind=artifact.kind,
+        component=artifact.component,
+        path=artifact.path,
+        size=artifact.size,
+        uncompressed_size=sum(entries.values()),
+        entries=sorted(entries.items(), key=lambda item: item[1], reverse=True),
+    )
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from stelvio.aws._packaging import artifacts
+
+# Compiling for the interpreter running the tests needs no other Python installed
+RUNTIME = f"python{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def write_distribution(target: Path, name: str, version: str, size: int) -> None:
+    """Writes an installed distribution with one module of size bytes."""
+    dist_info = target / f"{name}-{version}.dist-info"
+    dist_info.mkdir(parents=True)
+    (target / name).mkdir()
+    (target / name / "__init__.py").write_bytes(b"#" * size)
+    (dist_info / "METADATA").write_text(f"Name: {name}\nVersion: {version}\n")
+    (dist_info / "WHEEL").write_text("Tag: py3-none-any\n")
+    (dist_info / "RECORD").write_text(
+        f"{name}/__init__.py,,\n{dist_info.name}/METADATA,,\n"
+        f"{dist_info.name}/WHEEL,,\n{dist_info.name}/RECORD,,\n"
+    )
+
+
+@pytest.fixture
+def dot_stelvio(tmp_path: Path, monkeypatch) -> Path:
+    dot_stelvio_dir = tmp_path / ".stelvio"
+    monkeypatch.setattr(artifacts, "get_dot_stelvio_dir", lambda: dot_stelvio_dir)
+    return dot_stelvio_dir
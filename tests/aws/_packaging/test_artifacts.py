@@ -0,0 +1,212 @@
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from stelvio.aws._packaging import artifacts
+from stelvio.aws._packaging.artifacts import (
+    ZIP_TIMESTAMP,
+    clean_active_artifacts_file,
+    collect_artifacts,
+    compute_fingerprint,
+    evict_artifacts,
+    get_or_build_artifact,
+)
+from stelvio.aws._packaging.dependencies import CacheLimits
+
+
+@pytest.fixture
+def source_dir(tmp_path: Path) -> Path:
+    src = tmp_path / "src"
+    (src / "pkg").mkdir(parents=True)
+    (src / "handler.py").write_text("def handler(event, context): ...\n")
+    (src / "pkg" / "__init__.py").write_text("VALUE = 1\n")
+    return src
+
+
+def test_fingerprint_depends_on_content_not_mtime(source_dir: Path):
+    files = {"handler.py": source_dir / "handler.py"}
+    before = compute_fingerprint(files)
+
+    os.utime(source_dir / "handler.py", (0, 0))
+    assert compute_fingerprint(files) == before
+
+    (source_dir / "handler.py").write_text("changed\n")
+    assert compute_fingerprint(files) != before
+
+
+def test_fingerprint_covers_names_generated_text_and_keys(source_dir: Path):
+    files = {"handler.py": source_dir / "handler.py"}
+    base = compute_fingerprint(files, ["dependencies:a"])
+
+    assert compute_fingerprint({"other.py": source_dir / "handler.py"}, ["dependencies:a"]) != base
+    assert compute_fingerprint(files, ["dependencies:b"]) != base
+    assert compute_fingerprint(files | {"stlv_resources.py": "x"}, ["dependencies:a"]) != base
+
+
+def test_builds_deterministic_zip(dot_stelvio: Path, source_dir: Path, tmp_path: Path):
+    files = {"handler.py": source_dir / "handler.py", "stlv_resources.py": "RESOURCES = 1\n"}
+    path = get_or_build_artifact("functions", "fp1", files, directories={"": source_dir / "pkg"})
+
+    assert path == dot_stelvio / "artifacts" / "functions" / "fp1.zip"
+    with zipfile.ZipFile(path) as archive:
+        infos = archive.infolist()
+        assert [info.filename for info in infos] == [
+            "__init__.py",
+            "handler.py",
+            "stlv_resources.py",
+        ]
+        assert all(info.date_time == ZIP_TIMESTAMP for info in infos)
+        assert all(info.external_attr >> 16 == 0o100644 for info in infos)
+        assert archive.read("stlv_resources.py") == b"RESOURCES = 1\n"
+
+    # Same content built again elsewhere is byte-identical
+    other = tmp_path / "other.zip"
+    artifacts.write_deterministic_zip(
+        other, files | {"__init__.py": source_dir / "pkg/__init__.py"}
+    )
+    assert other.read_bytes() == path.read_bytes()
+
+
+def test_directory_entries_are_overridden_by_files(dot_stelvio: Path, source_dir: Path):
+    path = get_or_build_artifact(
+        "functions", "fp", {"pkg/__init__.py": "OVERRIDE = 1\n"}, directories={"": source_dir}
+    )
+
+    with zipfile.ZipFile(path) as archive:
+        assert archive.read("pkg/__init__.py") == b"OVERRIDE = 1\n"
+        assert "handler.py" in archive.namelist()
+
+
+def test_preserves_executable_bit_only(dot_stelvio: Path, source_dir: Path):
+    script = source_dir / "run.sh"
+    script.write_text("#!/bin/sh\n")
+    script.chmod(0o775)
+
+    path = get_or_build_artifact("functions", "fp", {"run.sh": script})
+
+    with zipfile.ZipFile(path) as archive:
+        assert archive.getinfo("run.sh").external_attr >> 16 == 0o100755
+
+
+def test_reuses_existing_artifact(dot_stelvio: Path, source_dir: Path, monkeypatch):
+    files = {"handler.py": source_dir / "handler.py"}
+    first = get_or_build_artifact("functions", "fp", files)
+    os.utime(first, (0, 0))
+
+    def fail_build(*_args, **_kwargs):
+        raise AssertionError("artifact should not be rebuilt")
+
+    monkeypatch.setattr(artifacts, "write_deterministic_zip", fail_build)
+    assert get_or_build_artifact("functions", "fp", files) == first
+    # Reuse refreshes the last-used time
+    assert first.stat().st_mtime > 0
+
+
+def test_failed_build_leaves_no_partial_artifact(dot_stelvio: Path, source_dir: Path):
+    with pytest.raises(FileNotFoundError):
+        get_or_build_artifact("functions", "fp", {"missing.py": source_dir / "missing.py"})
+
+    assert list((dot_stelvio / "artifacts" / "functions").glob("*.zip*")) == []
+
+
+def test_evict_artifacts_keeps_unused_artifacts_within_limits(dot_stelvio: Path, source_dir: Path):
+    files = {"handler.py": source_dir / "handler.py"}
+    other_env = get_or_build_artifact("functions", "other-env", files)
+    clean_active_artifacts_file("functions")
+    get_or_build_artifact("layers", "current", files)
+
+    assert evict_artifacts(CacheLimits(max_size=None, max_age=3600)) == []
+    assert other_env.is_file()
+
+
+def test_evict_artifacts_removes_expired_unused_artifacts(dot_stelvio: Path, source_dir: Path):
+    files = {"handler.py": source_dir / "handler.py"}
+    old = get_or_build_artifact("functions", "old", files)
+    clean_active_artifacts_file("functions")
+    current = get_or_build_artifact("functions", "current", files)
+    os.utime(old, (0, 0))
+    os.utime(current, (0, 0))
+
+    assert evict_artifacts(CacheLimits(max_size=None, max_age=3600)) == ["functions/old.zip"]
+    assert current.is_file()
+
+
+def test_evict_artifacts_removes_least_recently_used_over_size(
+    dot_stelvio: Path, source_dir: Path
+):
+    files = {"handler.py": source_dir / "handler.py"}
+    paths = [get_or_build_artifact("functions", name, files) for name in ["a", "b", "c"]]
+    clean_active_artifacts_file("functions")
+    for age, path in zip([300, 100, 200], paths, strict=True):
+        os.utime(path, (path.stat().st_mtime - age,) * 2)
+    size = paths[0].stat().st_size
+
+    removed = evict_artifacts(CacheLimits(max_size=size, max_age=None))
+
+    assert removed == ["functions/a.zip", "functions/c.zip"]
+    assert paths[1].is_file()
+
+
+def test_collected_artifacts_are_built_once_by_the_collector(dot_stelvio: Path, source_dir: Path):
+    files = {"handler.py": source_dir / "handler.py"}
+    existing = get_or_build_artifact("functions", "existing", files)
+
+    with collect_artifacts() as collector:
+        path = get_or_build_artifact("functions", "new", files, component="a")
+        shared = get_or_build_artifact("functions", "new", files, component="b")
+        get_or_build_artifact("functions", "existing", files, component="c")
+        # Building is deferred until the collector builds
+        assert not path.exists()
+        built = collector.build(max_workers=2)
+
+    assert shared == path
+    assert path.is_file()
+    assert [(a.component, a.path, a.cached) for a in built] == [
+        ("a", path, False),
+        ("b", path, False),
+        ("c", existing, True),
+    ]
+    assert built[0].size == path.stat().st_size
+    # Outside the block artifacts are built right away again
+    assert get_or_build_artifact("functions", "other", files).is_file()
+
+
+@pytest.mark.parametrize(
+    ("compression_level", "compress_type"),
+    [(0, zipfile.ZIP_STORED), (1, zipfile.ZIP_DEFLATED), (None, zipfile.ZIP_DEFLATED)],
+)
+def test_builds_zip_with_compression_level(
+    dot_stelvio: Path, source_dir: Path, compression_level, compress_type
+):
+    (source_dir / "data.txt").write_text("stelvio " * 10_000)
+
+    path = get_or_build_artifact(
+        "functions",
+        f"fp-{compression_level}",
+        {"data.txt": source_dir / "data.txt"},
+        compression_level=compression_level,
+    )
+
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo("data.txt")
+        assert info.compress_type == compress_type
+        assert archive.read("data.txt") == (source_dir / "data.txt").read_bytes()
+
+
+def test_higher_compression_level_writes_smaller_zip(tmp_path: Path, source_dir: Path):
+    data = source_dir / "data.txt"
+    data.write_text("".join(f"line {i} {i * i % 97}\n" for i in range(20_000)))
+
+    sizes = []
+    for level in (0, 1, 9):
+        destination = tmp_path / f"{level}.zip"
+        artifacts.write_deterministic_zip(destination, {"data.txt": data}, level)
+        sizes.append(destination.stat().st_size)
+
+    assert sizes[0] > sizes[1] >= sizes[2]
+
+
+def test_peak_rss_is_reported_for_the_process():
+    assert artifacts.get_peak_rss() > 0
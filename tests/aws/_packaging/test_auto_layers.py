@@ -0,0 +1,148 @@
+import sys
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from stelvio.aws._packaging import auto_layers
+from stelvio.aws._packaging import dependencies as deps
+from stelvio.aws._packaging.auto_layers import create_auto_layers
+from stelvio.aws._packaging.bytecode import get_or_create_precompiled_variant
+from stelvio.aws._packaging.package_store import read_distributions
+from stelvio.aws.function import Function, FunctionConfig, packaging
+from stelvio.aws.function.function import AutoLayersRegistry
+from stelvio.aws.layer import Layer
+from stelvio.component import ComponentRegistry
+
+from .conftest import RUNTIME, write_distribution
+
+pytestmark = pytest.mark.usefixtures("project_cwd")
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def fake_installs(tmp_path: Path):
+    """Installs requirements as fake distributions of the size given by their version."""
+
+    def install(requirements_source, cache_subdirectory, log_context, **_kwargs):
+        requirements = sorted(requirements_source.content.splitlines())
+        cache_dir = tmp_path / "cache" / cache_subdirectory / "_".join(requirements)
+        if not cache_dir.exists():
+            for requirement in requirements:
+                name, version = requirement.split("==")
+                write_distribution(cache_dir, name, version, int(version) * MB)
+        return cache_dir
+
+    with (
+        patch.object(auto_layers, "get_or_install_dependencies", side_effect=install),
+        patch.object(auto_layers, "install_dependencies_concurrently") as concurrent,
+    ):
+        yield concurrent
+
+
+def _function(name: str, requirements: list[str], **kwargs) -> Function:
+    return Function(name, handler="functions/simple.handler", requirements=requirements, **kwargs)
+
+
+def _auto_layers() -> list[Layer]:
+    return list(ComponentRegistry.instances_of(Layer))
+
+
+def test_moves_shared_distributions_into_layer(fake_installs):
+    a = _function("a", ["big==3", "small==1"])
+    b = _function("b", ["big==3", "other==2"])
+    c = _function("c", ["other==3"])
+
+    reports = create_auto_layers()
+
+    (layer,) = _auto_layers()
+    assert layer.name.startswith("auto-deps-")
+    assert layer.config.requirements == ["big==3"]
+    assert AutoLayersRegistry.get_layers(a) == [layer]
+    assert AutoLayersRegistry.get_layers(b) == [layer]
+    assert AutoLayersRegistry.get_layers(c) == []
+    assert [d.key for d in AutoLayersRegistry.get_excluded_distributions(a)] == [
+        "big-3-py3-none-any"
+    ]
+    assert {r.function_name: r.bytes_saved for r in reports} == {
+        "a": pytest.approx(3 * MB, abs=1024),
+        "b": pytest.approx(3 * MB, abs=1024),
+    }
+    fake_installs.assert_called_once()
+
+
+def test_groups_distributions_by_functions_using_them(fake_installs):
+    _function("a", ["big==3", "mid==2"])
+    _function("b", ["big==3", "mid==2"])
+    _function("c", ["big==3"])
+
+    create_auto_layers()
+
+    assert sorted(layer.config.requirements for layer in _auto_layers()) == [
+        ["big==3"],
+        ["mid==2"],
+    ]
+
+
+def test_skips_small_and_unshared_distributions(fake_installs):
+    _function("a", ["tiny==0", "big==3"])
+    _function("b", ["tiny==0"])
+
+    assert create_auto_layers() == []
+    assert _auto_layers() == []
+    fake_installs.assert_not_called()
+
+
+def test_different_versions_are_not_shared(fake_installs):
+    _function("a", ["big==3"])
+    _function("b", ["big==4"])
+
+    assert create_auto_layers() == []
+
+
+def test_respects_layer_limit(fake_installs):
+    user_layers = [Layer(f"user-{i}", requirements=["x"]) for i in range(5)]
+    a = _function("a", ["big==3"], layers=user_layers)
+    _function("b", ["big==3"])
+
+    assert create_auto_layers() == []
+    assert AutoLayersRegistry.get_layers(a) == []
+
+
+def test_functions_of_different_architectures_are_not_grouped(fake_installs):
+    _function("a", ["big==3"], architecture="arm64")
+    _function("b", ["big==3"], architecture="x86_64")
+
+    assert create_auto_layers() == []
+
+
+@pytest.mark.skipif(
+    RUNTIME not in ("python3.12", "python3.13"), reason="needs a Lambda runtime interpreter"
+)
+def test_precompiled_function_leaves_out_bytecode_of_layer_distributions(
+    tmp_path: Path, monkeypatch
+):
+    monkeypatch.setattr(deps, "_get_lambda_dependencies_dir", lambda subdir: tmp_path / subdir)
+    cache_dir = tmp_path / "functions" / "x86_64__3.12__abc"
+    write_distribution(cache_dir, "big", "3", 10)
+    write_distribution(cache_dir, "own", "1", 10)
+    variant = get_or_create_precompiled_variant(
+        cache_dir, RUNTIME, "functions", "/var/task", "test"
+    )
+    in_layer = [d for d in read_distributions(cache_dir) if d.name == "big"]
+    config = FunctionConfig(handler="functions/simple.handler", runtime=RUNTIME, precompile=True)
+
+    with (
+        patch.object(packaging, "_get_function_packages_dir", return_value=variant),
+        patch.object(packaging, "get_code_args") as get_code_args,
+    ):
+        packaging._create_lambda_code(config, None, in_layer, "fn")
+
+    with zipfile.ZipFile(get_code_args.call_args.args[0]) as archive:
+        names = archive.namelist()
+    cache_tag = sys.implementation.cache_tag
+    assert f"own/__pycache__/__init__.{cache_tag}.pyc" in names
+    assert f"__pycache__/simple.{cache_tag}.pyc" in names
+    assert not [name for name in names if name.startswith("big")]
@@ -0,0 +1,147 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from stelvio.aws._packaging import bytecode
+from stelvio.aws._packaging import dependencies as deps
+from stelvio.aws._packaging.artifacts import evict_artifacts
+from stelvio.aws._packaging.bytecode import (
+    compile_sources,
+    find_interpreter,
+    get_or_create_precompiled_variant,
+)
+from stelvio.aws._packaging.dependencies import CacheLimits
+
+from .conftest import RUNTIME
+
+CACHE_TAG = sys.implementation.cache_tag
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    base = tmp_path / "lambda_dependencies"
+    monkeypatch.setattr(deps, "_get_lambda_dependencies_dir", lambda subdir: base / subdir)
+    monkeypatch.setattr(deps, "_used_cache_dirs", set())
+    cache = base / "functions" / "x86_64__3.12__abc"
+    (cache / "pkg").mkdir(parents=True)
+    (cache / "pkg" / "__init__.py").write_text("VALUE = 1\n")
+    (cache / "pkg" / "template.py").write_text("{% if x %}\n")
+    return cache
+
+
+def _read_pyc_header(pyc: Path) -> tuple[bytes, int]:
+    data = pyc.read_bytes()
+    return data[:4], int.from_bytes(data[4:8], "little")
+
+
+def test_precompiled_variant_contains_unchecked_hash_pycs(cache_dir: Path):
+    variant = get_or_create_precompiled_variant(
+        cache_dir, RUNTIME, "functions", "/var/task", "test"
+    )
+
+    assert variant.name == f"{cache_dir.name}__pyc"
+    assert (variant / "pkg" / "__init__.py").samefile(cache_dir / "pkg" / "__init__.py")
+    pyc = variant / "pkg" / "__pycache__" / f"__init__.{CACHE_TAG}.pyc"
+    magic, flags = _read_pyc_header(pyc)
+    assert magic == importlib.util.MAGIC_NUMBER
+    # Hash based (bit 0) without check_source (bit 1)
+    assert flags == 0b01
+    # Files that don't compile are shipped as they are
+    assert (variant / "pkg" / "template.py").is_file()
+    assert not (variant / "pkg" / "__pycache__" / f"template.{CACHE_TAG}.pyc").exists()
+    # The cache directory itself is left untouched
+    assert not (cache_dir / "pkg" / "__pycache__").exists()
+    assert f"functions/{variant.name}" in deps._used_cache_dirs
+
+
+def test_precompiled_variant_is_reused(cache_dir: Path, monkeypatch):
+    variant = get_or_create_precompiled_variant(cache_dir, RUNTIME, "functions", "/x", "test")
+
+    def fail_find(runtime):
+        raise AssertionError("should not compile again")
+
+    monkeypatch.setattr(bytecode, "find_interpreter", fail_find)
+    again = get_or_create_precompiled_variant(cache_dir, RUNTIME, "functions", "/x", "test")
+
+    assert again == variant
+
+
+def test_compile_sources_names_pycs_next_to_sources(dot_stelvio: Path, tmp_path: Path):
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "handler.py").write_text("def handler(event, context): ...\n")
+    (tmp_path / "src" / "pkg" / "util.py").write_text("X = 1\n")
+    (tmp_path / "src" / "data.json").write_text("{}")
+    files = {
+        "handler.py": tmp_path / "src" / "handler.py",
+        "pkg/util.py": tmp_path / "src" / "pkg" / "util.py",
+        "data.json": tmp_path / "src" / "data.json",
+    }
+
+    compiled = compile_sources(files, RUNTIME, "/var/task")
+
+    assert set(compiled) == {
+        f"__pycache__/handler.{CACHE_TAG}.pyc",
+        f"pkg/__pycache__/util.{CACHE_TAG}.pyc",
+    }
+    for pyc in compiled.values():
+        assert pyc.parent == dot_stelvio / "artifacts" / "bytecode"
+        assert _read_pyc_header(pyc)[1] == 0b01
+
+
+def test_compile_sources_reuses_cached_pycs(dot_stelvio: Path, tmp_path: Path, monkeypatch):
+    source = tmp_path / "handler.py"
+    source.write_text("def handler(event, context): ...\n")
+    first = compile_sources({"handler.py": source}, RUNTIME, "/var/task")
+
+    def fail_find(runtime):
+        raise AssertionError("should not compile again")
+
+    monkeypatch.setattr(bytecode, "find_interpreter", fail_find)
+    assert compile_sources({"handler.py": source}, RUNTIME, "/var/task") == first
+
+
+def test_compile_sources_warns_when_compiling_fails(
+    dot_stelvio: Path, tmp_path: Path, monkeypatch, caplog
+):
+    source = tmp_path / "handler.py"
+    source.write_text("A = 1\n")
+    monkeypatch.setattr(bytecode, "_COMPILE_SOURCES_SCRIPT", "import sys; sys.exit('boom')")
+
+    with caplog.at_level("DEBUG", logger=bytecode.__name__):
+        compiled = compile_sources({"handler.py": source}, RUNTIME, "/var/task")
+
+    assert compiled == {}
+    assert "could not be precompiled" in caplog.text
+    assert "boom" in caplog.text
+
+
+def test_expired_bytecode_is_evicted(dot_stelvio: Path, tmp_path: Path):
+    source = tmp_path / "handler.py"
+    source.write_text("A = 1\n")
+    (old,) = compile_sources({"handler.py": source}, RUNTIME, "/var/task").values()
+    bytecode.clean_active_bytecode_file()
+    source.write_text("A = 2\n")
+    (new,) = compile_sources({"handler.py": source}, RUNTIME, "/var/task").values()
+    os.utime(old, (0, 0))
+
+    evict_artifacts(CacheLimits(max_size=None, max_age=3600))
+
+    assert new.is_file()
+    assert not old.exists()
+
+
+def test_find_interpreter_prefers_running_interpreter():
+    assert find_interpreter(RUNTIME) == sys.executable
+
+
+def test_find_interpreter_without_match_raises(monkeypatch):
+    monkeypatch.setattr(bytecode.shutil, "which", lambda name: None)
+    find_interpreter.cache_clear()
+    try:
+        with pytest.raises(RuntimeError, match=r"uv python install 3\.99"):
+            find_interpreter("python3.99")
+    finally:
+        find_interpreter.cache_clear()
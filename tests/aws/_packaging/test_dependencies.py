@@ -1,9 +1,12 @@
 import hashlib
 import itertools
+import json
 import logging
+import os
 import re
 import shutil
 import subprocess
+import time
 from dataclasses import dataclass, field, replace
 from functools import partial
 from pathlib import Path
@@ -13,10 +16,15 @@ import pytest
 
 from stelvio.aws._packaging import dependencies as deps
 from stelvio.aws._packaging.dependencies import (
-    _ACTIVE_CACHE_FILENAME,
+    CacheLimits,
+    DependencyInstall,
     RequirementsSpec,
+    dependency_cache_session,
+    evict_dependency_caches,
     get_or_install_dependencies,
+    install_dependencies_concurrently,
 )
+from stelvio.aws._packaging.package_store import read_distributions
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +41,13 @@ def project_root(tmp_path: Path) -> Path:
 def dependencies_cache_base(tmp_path: Path, monkeypatch) -> Path:
     """
     Creates a temporary directory for dependency caches and patches
-    _get_lambda_dependencies_dir to use it.
+    _get_dependency_caches_root to use it.
     """
     cache_base = tmp_path / "dot_stelvio" / "lambda_dependencies"
     cache_base.mkdir(parents=True)
 
-    monkeypatch.setattr(deps, "_get_lambda_dependencies_dir", lambda subdir: cache_base / subdir)
+    monkeypatch.setattr(deps, "_get_dependency_caches_root", lambda: cache_base)
+    monkeypatch.setattr(deps, "_used_cache_dirs", set())
     return cache_base
 
 
@@ -68,7 +77,7 @@ def _get_expected_cache_details(
     cache_subdirectory: str,
 ) -> tuple[str, Path, Path]:
     """
-    Calculates expected cache key, directory path, and active file path
+    Calculates expected cache key, directory path, and name of the used cache directory
     by replicating the expected hashing logic for inline requirements.
     """
     py_version = runtime[6:]
@@ -77,8 +86,7 @@ def _get_expected_cache_details(
     cache_key = f"{architecture}__{py_version}__{content_hash[:16]}"
 
     cache_dir = dependencies_cache_base / cache_subdirectory / cache_key
-    active_file = dependencies_cache_base / cache_subdirectory / _ACTIVE_CACHE_FILENAME
-    return cache_key, cache_dir, active_file
+    return cache_key, cache_dir, f"{cache_subdirectory}/{cache_key}"
 
 
 def _create_side_effect_simulation(packages_to_simulate: list[str], raise_: bool = False):
@@ -156,11 +164,8 @@ def assert_installer_call(  # noqa: PLR0913
     assert cmd_list == expected_cmd_list
 
 
-def assert_active_cache_file(expected_active_file_path: Path, expected_cache_key: str):
-    assert expected_active_file_path.is_file(), "Active cache file not found"
-    active_keys = set(expected_active_file_path.read_text().splitlines())
-    assert len(active_keys) == 1
-    assert expected_cache_key in active_keys
+def assert_cache_dir_used(expected_used_name: str):
+    assert deps._used_cache_dirs == {expected_used_name}
 
 
 @dataclass
@@ -330,7 +335,7 @@ def test_get_or_install_dependencies__(  # noqa: C901, PLR0912
         test_case.requirements_packages, raise_=test_case.simulate_installer_error
     )
 
-    expected_cache_key, expected_cache_dir, expected_active_file = _get_expected_cache_details(
+    _, expected_cache_dir, expected_used_name = _get_expected_cache_details(
         requirements_content="\n".join(sorted(test_case.requirements_list)),
         runtime=test_case.runtime,
         architecture=test_case.architecture,
@@ -397,7 +402,7 @@ def test_get_or_install_dependencies__(  # noqa: C901, PLR0912
         mock_subprocess_run.assert_not_called()
         mock_shutil_which.assert_not_called()
 
-    assert_active_cache_file(expected_active_file, expected_cache_key)
+    assert_cache_dir_used(expected_used_name)
 
 
 @dataclass
@@ -615,3 +620,503 @@ def test_requirements_normalization(
             log_context="TestNormalization",
         )
         assert result_dir.name == clean_key
+
+
+def _inline_install(
+    requirements: list[str], log_context: str, cache_subdirectory: str = "functions"
+) -> DependencyInstall:
+    return DependencyInstall(
+        requirements_source=RequirementsSpec(content="\n".join(requirements)),
+        runtime="python3.12",
+        architecture="x86_64",
+        cache_subdirectory=cache_subdirectory,
+        log_context=log_context,
+    )
+
+
+def test_install_concurrently_installs_each_distinct_key_once(
+    project_root: Path, dependencies_cache_base: Path, patch_installer_calls
+):
+    mock_run, mock_which = patch_installer_calls
+    mock_which.side_effect = {"uv": "/path/to/uv"}.get
+    mock_run.side_effect = _create_side_effect_simulation(["pkg"])
+
+    installs = [
+        _inline_install(["requests"], "Function: a"),
+        _inline_install(["requests"], "Function: b"),
+        _inline_install(["boto3"], "Function: c"),
+        # Same requirements as functions but layer caches live in their own subdirectory
+        _inline_install(["requests"], "Layer: d", cache_subdirectory="layers"),
+    ]
+
+    reports = install_dependencies_concurrently(installs, project_root, max_workers=4)
+
+    assert mock_run.call_count == 3
+    assert len(reports) == 3
+    by_context = {report.log_contexts: report for report in reports}
+    assert set(by_context) == {("Function: a", "Function: b"), ("Function: c",), ("Layer: d",)}
+    for report in reports:
+        assert report.duration >= 0
+        cache_dir = dependencies_cache_base / report.cache_subdirectory / report.cache_key
+        assert (cache_dir / "pkg" / "__init__.py").is_file()
+
+
+def test_install_concurrently_skips_warm_caches(
+    project_root: Path, dependencies_cache_base: Path, patch_installer_calls
+):
+    mock_run, mock_which = patch_installer_calls
+    mock_which.side_effect = {"uv": "/path/to/uv"}.get
+    mock_run.side_effect = _create_side_effect_simulation(["pkg"])
+    warm_key, warm_dir, _ = _get_expected_cache_details(
+        "requests", "python3.12", "x86_64", dependencies_cache_base, "functions"
+    )
+    warm_dir.mkdir(parents=True)
+
+    reports = install_dependencies_concurrently(
+        [_inline_install(["requests"], "Function: warm"), _inline_install(["boto3"], "cold")],
+        project_root,
+    )
+
+    assert mock_run.call_count == 1
+    assert [report.log_contexts for report in reports] == [("cold",)]
+    assert warm_key not in {report.cache_key for report in reports}
+
+
+def test_install_concurrently_returns_nothing_when_all_caches_warm(
+    project_root: Path, dependencies_cache_base: Path, patch_installer_calls
+):
+    mock_run, _ = patch_installer_calls
+    _, warm_dir, _ = _get_expected_cache_details(
+        "requests", "python3.12", "x86_64", dependencies_cache_base, "functions"
+    )
+    warm_dir.mkdir(parents=True)
+
+    reports = install_dependencies_concurrently(
+        [_inline_install(["requests"], "Function: warm")], project_root
+    )
+
+    assert reports == []
+    mock_run.assert_not_called()
+
+
+def test_install_concurrently_raises_after_all_workers_finish(
+    project_root: Path, dependencies_cache_base: Path, patch_installer_calls, caplog
+):
+    mock_run, mock_which = patch_installer_calls
+    mock_which.side_effect = {"uv": "/path/to/uv"}.get
+
+    def fail_for_broken(cmd, *args, **kwargs):
+        if kwargs.get("input").startswith("broken"):
+            raise subprocess.CalledProcessError(1, cmd)
+        return _create_side_effect_simulation(["pkg"])(cmd, *args, **kwargs)
+
+    mock_run.side_effect = fail_for_broken
+
+    with (
+        caplog.at_level(logging.ERROR, logger="stelvio.aws._packaging.dependencies"),
+        pytest.raises(RuntimeError, match=r"Failed to install 2 of 3 dependency cache") as error,
+    ):
+        install_dependencies_concurrently(
+            [
+                _inline_install(["broken"], "Function: broken"),
+                _inline_install(["ok"], "ok"),
+                _inline_install(["broken", "also"], "Function: also-broken"),
+            ],
+            project_root,
+        )
+
+    assert "[Function: broken] Failed to install" in str(error.value)
+    assert isinstance(error.value.__cause__, RuntimeError)
+    failed = [
+        record.getMessage()
+        for record in caplog.records
+        if "Failed to install dependencies for key" in record.getMessage()
+    ]
+    assert len(failed) == 2
+    assert failed[0].startswith("[Function: broken] Failed to install dependencies")
+    assert failed[1].startswith("[Function: also-broken] Failed to install dependencies")
+    assert mock_run.call_count == 3
+    _, ok_dir, _ = _get_expected_cache_details(
+        "ok", "python3.12", "x86_64", dependencies_cache_base, "functions"
+    )
+    assert ok_dir.is_dir()
+
+
+_WHEELS = {"pkg": "1.0", "extra": "2.0"}
+
+
+def _simulate_wheel_install(cmd, *args, **kwargs):
+    requested = [line.split("==")[0] for line in kwargs["input"].splitlines()]
+    wheels = {name: version for name, version in _WHEELS.items() if name in requested}
+    if "compile" in cmd:
+        pins = "".join(f"{name}=={version}\n" for name, version in wheels.items())
+        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=pins, stderr="")
+
+    target = Path(cmd[cmd.index("--target") + 1])
+    for name, version in wheels.items():
+        dist_info = target / f"{name}-{version}.dist-info"
+        dist_info.mkdir(parents=True)
+        (target / name).mkdir()
+        (target / name / "__init__.py").write_text("VALUE = 1\n")
+        (dist_info / "METADATA").write_text(f"Name: {name}\nVersion: {version}\n")
+        (dist_info / "WHEEL").write_text("Tag: py3-none-any\n")
+        (dist_info / "RECORD").write_text(
+            f"{name}/__init__.py,,\n{dist_info.name}/METADATA,,\n{dist_info.name}/WHEEL,,\n"
+        )
+    return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="", stderr="")
+
+
+def test_installs_share_package_store_until_last_reference_is_cleaned(
+    project_root: Path, dependencies_cache_base: Path, patch_installer_calls
+):
+    mock_run, mock_which = patch_installer_calls
+    mock_which.side_effect = {"uv": "/path/to/uv"}.get
+    mock_run.side_effect = _simulate_wheel_install
+    install = partial(
+        get_or_install_dependencies,
+        runtime="python3.12",
+        architecture="x86_64",
+        project_root=project_root,
+        cache_subdirectory="functions",
+    )
+
+    first = install(RequirementsSpec(content="pkg"), log_context="a")
+    second = install(RequirementsSpec(content="pkg\nother"), log_context="b")
+
+    assert (first / "pkg" / "__init__.py").samefile(second / "pkg" / "__init__.py")
+    store_entry = dependencies_cache_base / "store" / "packages" / "pkg-1.0-py3-none-any"
+    assert store_entry.is_dir()
+
+    evict_unused = partial(
+        evict_dependency_caches, dependencies_cache_base, CacheLimits(max_size=0, max_age=None)
+    )
+    deps._used_cache_dirs.clear()
+    install(RequirementsSpec(content="pkg"), log_context="a")
+    evict_unused()
+    assert not second.exists()
+    assert store_entry.is_dir()
+
+    deps._used_cache_dirs.clear()
+    install(RequirementsSpec(content="unrelated"), log_context="c")
+    evict_unused()
+    assert not first.exists()
+    assert not store_entry.exists()
+
+
+def test_cache_dir_is_assembled_from_store_installing_only_missing(
+    project_root: Path, dependencies_cache_base: Path, patch_installer_calls
+):
+    mock_run, mock_which = patch_installer_calls
+    mock_which.side_effect = {"uv": "/path/to/uv"}.get
+    mock_run.side_effect = _simulate_wheel_install
+    install = partial(
+        get_or_install_dependencies,
+        runtime="python3.12",
+        architecture="x86_64",
+        project_root=project_root,
+        cache_subdirectory="functions",
+    )
+
+    first = install(RequirementsSpec(content="pkg"), log_context="a")
+    second = install(RequirementsSpec(content="pkg\nextra"), log_context="b")
+
+    assert mock_run.call_count == 3
+    resolve_cmd = mock_run.call_args_list[1].args[0]
+    assert resolve_cmd[:4] == ["/path/to/uv", "pip", "compile", "-"]
+    assert "--target" not in resolve_cmd
+    missing_call = mock_run.call_args_list[2]
+    assert missing_call.kwargs["input"] == "extra==2.0"
+    assert missing_call.args[0][-1] == "--no-deps"
+
+    assert (first / "pkg" / "__init__.py").samefile(second / "pkg" / "__init__.py")
+    assert [d.key for d in read_distributions(second)] == [
+        "extra-2.0-py3-none-any",
+        "pkg-1.0-py3-none-any",
+    ]
+    assert (dependencies_cache_base / "store" / "packages" / "extra-2.0-py3-none-any").is_dir()
+
+
+def test_store_is_not_used_when_resolving_fails(
+    project_root: Path, dependencies_cache_base: Path, patch_installer_calls
+):
+    mock_run, mock_which = patch_installer_calls
+    mock_which.side_effect = {"uv": "/path/to/uv"}.get
+
+    def fail_to_resolve(cmd, *args, **kwargs):
+        if "compile" in cmd:
+            raise subprocess.CalledProcessError(1, cmd)
+        return _simulate_wheel_install(cmd, *args, **kwargs)
+
+    mock_run.side_effect = fail_to_resolve
+    install = partial(
+        get_or_install_dependencies,
+        runtime="python3.12",
+        architecture="x86_64",
+        project_root=project_root,
+        cache_subdirectory="functions",
+    )
+
+    install(RequirementsSpec(content="pkg"), log_context="a")
+    second = install(RequirementsSpec(content="pkg\nextra"), log_context="b")
+
+    full_install = mock_run.call_args_list[-1]
+    assert full_install.kwargs["input"] == "pkg\nextra"
+    assert (second / "extra" / "__init__.py").is_file()
+
+
+def test_resolves_pins_from_pip_report(patch_installer_calls):
+    mock_run, _ = patch_installer_calls
+    report = {"install": [{"metadata": {"name": "Requests", "version": "2.32.3"}}]}
+    mock_run.return_value = subprocess.CompletedProcess(
+        args=[], returncode=0, stdout=json.dumps(report), stderr=""
+    )
+    command = deps._InstallCommand(
+        installer_cmd=["/path/to/pip"],
+        install_flags=["--only-binary=:all:"],
+        requirements="-",
+        input_="requests",
+        no_deps=False,
+    )
+
+    assert deps._resolve_pins(command, "test") == {"Requests": "2.32.3"}
+    cmd = mock_run.call_args.args[0]
+    assert cmd[cmd.index("--report") + 1] == "-"
+    assert "--dry-run" in cmd
+
+
+def test_missing_requirements_keep_hashes():
+    content = (
+        "requests==2.32.3 \\\n    --hash=sha256:aaa\nurllib3==2.2.0 \\\n    --hash=sha256:bbb\n"
+    )
+    command = deps._InstallCommand(
+        installer_cmd=["/path/to/uv", "pip"],
+        install_flags=[],
+        requirements="-",
+        input_=content,
+        no_deps=True,
+    )
+
+    assert deps._missing_requirements(command, {"urllib3": "2.2.0"}) == (
+        "urllib3==2.2.0 --hash=sha256:bbb"
+    )
+    assert deps._missing_requirements(command, {"idna": "3.7"}) is None
+
+
+def _create_cache_dir(base: Path, name: str, size: int, days_ago: float) -> Path:
+    cache_dir = base / name
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "data.bin").write_bytes(b"x" * size)
+    mtime = time.time() - days_ago * 24 * 60 * 60
+    os.utime(cache_dir, (mtime, mtime))
+    return cache_dir
+
+
+def test_eviction_removes_least_recently_used_across_subdirectories(
+    dependencies_cache_base: Path,
+):
+    oldest = _create_cache_dir(dependencies_cache_base, "functions/oldest", 100, days_ago=4)
+    used = _create_cache_dir(dependencies_cache_base, "functions/used", 100, days_ago=3)
+    older = _create_cache_dir(dependencies_cache_base, "layers/older", 100, days_ago=2)
+    recent = _create_cache_dir(dependencies_cache_base, "layers/recent", 100, days_ago=1)
+    deps._used_cache_dirs.add("functions/used")
+
+    removed = evict_dependency_caches(
+        dependencies_cache_base, CacheLimits(max_size=250, max_age=None)
+    )
+
+    assert removed == ["functions/oldest", "layers/older"]
+    assert not oldest.exists()
+    assert not older.exists()
+    assert used.is_dir()
+    assert recent.is_dir()
+
+
+def test_eviction_removes_caches_older_than_max_age(dependencies_cache_base: Path):
+    expired = _create_cache_dir(dependencies_cache_base, "functions/expired", 1, days_ago=10)
+    fresh = _create_cache_dir(dependencies_cache_base, "layers/fresh", 1, days_ago=5)
+
+    removed = evict_dependency_caches(
+        dependencies_cache_base, CacheLimits(max_size=None, max_age=7 * 24 * 60 * 60)
+    )
+
+    assert removed == ["functions/expired"]
+    assert not expired.exists()
+    assert fresh.is_dir()
+
+
+def test_eviction_counts_hard_linked_files_once(dependencies_cache_base: Path):
+    original = _create_cache_dir(dependencies_cache_base, "functions/original", 100, days_ago=2)
+    variant = dependencies_cache_base / "functions" / "original__pyc"
+    variant.mkdir()
+    (variant / "data.bin").hardlink_to(original / "data.bin")
+
+    removed = evict_dependency_caches(
+        dependencies_cache_base, CacheLimits(max_size=100, max_age=None)
+    )
+
+    assert removed == []
+    assert variant.is_dir()
+
+
+def test_cache_session_evicts_after_failure(dependencies_cache_base: Path, monkeypatch):
+    monkeypatch.setenv("STLV_CACHE_MAX_AGE_DAYS", "7")
+    stale = _create_cache_dir(dependencies_cache_base, "functions/stale", 1, days_ago=10)
+    reused = _create_cache_dir(dependencies_cache_base, "layers/reused", 1, days_ago=10)
+
+    def failing_deploy():
+        with dependency_cache_session():
+            deps._mark_cache_dir_as_used("reused", "layers")
+            raise RuntimeError("deploy failed")
+
+    with pytest.raises(RuntimeError, match="deploy failed"):
+        failing_deploy()
+
+    assert not stale.exists()
+    assert reused.is_dir()
+    assert time.time() - reused.stat().st_mtime < 60
+
+
+def test_cache_session_does_not_evict_while_caches_are_in_use(
+    dependencies_cache_base: Path, monkeypatch
+):
+    fcntl = pytest.importorskip("fcntl")
+    monkeypatch.setenv("STLV_CACHE_MAX_AGE_DAYS", "7")
+    stale = _create_cache_dir(dependencies_cache_base, "functions/stale", 1, days_ago=10)
+
+    # Another stlv process in the middle of a command
+    with (dependencies_cache_base / ".lock").open("a") as other_process:
+        fcntl.flock(other_process, fcntl.LOCK_SH)
+        with dependency_cache_session():
+            pass
+
+    assert stale.is_dir()
+
+
+def test_cache_limits_ignore_invalid_values(monkeypatch, caplog):
+    monkeypatch.setenv("STLV_CACHE_MAX_SIZE_MB", "lots")
+    monkeypatch.setenv("STLV_CACHE_MAX_AGE_DAYS", "0")
+
+    limits = deps.read_cache_limits()
+
+    assert limits == CacheLimits(max_size=5 * 1024 * 1024 * 1024, max_age=None)
+    assert "Ignoring STLV_CACHE_MAX_SIZE_MB='lots'" in caplog.text
+
+
+def test_lockfile_installs_locked_set_exactly(
+    project_root: Path, dependencies_cache_base: Path, patch_installer_calls
+):
+    mock_run, mock_which = patch_installer_calls
+    mock_which.side_effect = {"uv": "/path/to/uv"}.get
+    mock_run.side_effect = _create_side_effect_simulation(["requests"])
+    lock_path = project_root / "pylock.toml"
+    lock_path.write_text(
+        'lock-version = "1.0"\ncreated-by = "uv"\n\n[[packages]]\nname = "requests"\n'
+        'version = "2.32.3"\nwheels = [{ hashes = { sha256 = "aaa" } }]\n'
+    )
+    install = partial(
+        get_or_install_dependencies,
+        requirements_source=RequirementsSpec(path_from_root=Path("pylock.toml")),
+        runtime="python3.12",
+        architecture="x86_64",
+        project_root=project_root,
+        cache_subdirectory="functions",
+        log_context="test",
+    )
+
+    cache_dir = install()
+
+    args, kwargs = mock_run.call_args
+    assert args[0][args[0].index("-r") + 1] == "-"
+    assert args[0][-1] == "--no-deps"
+    assert kwargs["input"] == "requests==2.32.3 --hash=sha256:aaa\n"
+    # Lock file changes that don't affect the locked packages keep the cache
+    lock_path.write_text(lock_path.read_text().replace('"uv"', '"pdm"'))
+    assert install() == cache_dir
+    assert mock_run.call_count == 1
+
+
+def test_hash_pinned_requirements_file_installs_without_dependencies(
+    project_root: Path, dependencies_cache_base: Path, patch_installer_calls
+):
+    mock_run, mock_which = patch_installer_calls
+    mock_which.side_effect = {"uv": "/path/to/uv"}.get
+    mock_run.side_effect = _create_side_effect_simulation(["requests"])
+    (project_root / "requirements.txt").write_text("requests==2.32.3 \\\n    --hash=sha256:aaa\n")
+
+    get_or_install_dependencies(
+        requirements_source=RequirementsSpec(path_from_root=Path("requirements.txt")),
+        runtime="python3.12",
+        architecture="x86_64",
+        project_root=project_root,
+        cache_subdirectory="functions",
+        log_context="test",
+    )
+
+    args, _ = mock_run.call_args
+    assert args[0][args[0].index("-r") + 1] == str(project_root / "requirements.txt")
+    assert args[0][-1] == "--no-deps"
+
+
+def test_shared_cache_is_reused_across_projects(
+    tmp_path: Path,
+    project_root: Path,
+    dependencies_cache_base: Path,
+    patch_installer_calls,
+    monkeypatch,
+):
+    mock_run, mock_which = patch_installer_calls
+    mock_which.side_effect = {"uv": "/path/to/uv"}.get
+    mock_run.side_effect = _simulate_wheel_install
+    shared_root = tmp_path / "shared"
+    monkeypatch.setenv("STLV_SHARED_CACHE_DIR", str(shared_root))
+    install = partial(
+        get_or_install_dependencies,
+        requirements_source=RequirementsSpec(content="pkg"),
+        runtime="python3.12",
+        architecture="x86_64",
+        project_root=project_root,
+        cache_subdirectory="functions",
+        log_context="test",
+    )
+
+    first = install()
+    other_project_base = tmp_path / "other" / "lambda_dependencies"
+    monkeypatch.setattr(deps, "_get_dependency_caches_root", lambda: other_project_base)
+    second = install()
+
+    mock_run.assert_called_once()
+    shared_dir = shared_root / "functions" / first.name
+    assert second == other_project_base / "functions" / first.name
+    assert (first / "pkg" / "__init__.py").samefile(shared_dir / "pkg" / "__init__.py")
+    assert (second / "pkg" / "__init__.py").samefile(shared_dir / "pkg" / "__init__.py")
+    assert [path.name for path in (shared_root / "functions").iterdir()] == [first.name]
+    # Already deduplicated through the shared cache
+    assert not (dependencies_cache_base / "store").exists()
+
+
+def test_shared_cache_skips_local_path_requirements(
+    tmp_path: Path, project_root: Path, dependencies_cache_base: Path, monkeypatch
+):
+    monkeypatch.setenv("STLV_SHARED_CACHE_DIR", str(tmp_path / "shared"))
+
+    local = deps._get_shared_cache_dir(
+        RequirementsSpec(content="requests\n./libs/mylib"), project_root, "functions", "key"
+    )
+    remote = deps._get_shared_cache_dir(
+        RequirementsSpec(content="requests"), project_root, "functions", "key"
+    )
+
+    assert local is None
+    assert remote == tmp_path / "shared" / "functions" / "key"
+
+
+def test_shared_cache_keeps_directory_published_by_concurrent_install(tmp_path: Path):
+    shared_dir = tmp_path / "functions" / "key"
+    (shared_dir / "pkg").mkdir(parents=True)
+    tmp_dir = deps._get_tmp_dir(shared_dir)
+    (tmp_dir / "pkg").mkdir(parents=True)
+
+    deps._publish_shared_cache_dir(tmp_dir, shared_dir)
+
+    assert (shared_dir / "pkg").is_dir()
+    assert not tmp_dir.exists()
@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from stelvio.aws._packaging import file_index
+from stelvio.aws._packaging.artifacts import hash_file
+from stelvio.aws._packaging.file_index import FileIndex, get_file_index, save_file_indexes
+
+# Well outside the racy window so hashes get stored
+OLD_MTIME = 1_600_000_000
+
+
+@pytest.fixture
+def source_file(tmp_path: Path) -> Path:
+    path = tmp_path / "src" / "handler.py"
+    path.parent.mkdir()
+    path.write_text("def handler(event, context): ...\n")
+    os.utime(path, (OLD_MTIME, OLD_MTIME))
+    return path
+
+
+def _reads(index: FileIndex, path: Path) -> int:
+    with patch.object(file_index, "hash_file", wraps=hash_file) as spy:
+        index.hash(path)
+    return spy.call_count
+
+
+def test_unchanged_file_is_not_read_again(tmp_path: Path, source_file: Path):
+    index = FileIndex(tmp_path / "index.json")
+
+    assert index.hash(source_file) == hash_file(source_file)
+    assert _reads(index, source_file) == 0
+    assert (index.hits, index.misses) == (1, 1)
+
+
+def test_index_persists_across_instances(tmp_path: Path, source_file: Path):
+    index_file = tmp_path / "index.json"
+    FileIndex(index_file).hash(source_file)
+    FileIndex(index_file).save()
+    assert not index_file.exists()  # Nothing to save without changes
+
+    first = FileIndex(index_file)
+    first.hash(source_file)
+    first.save()
+
+    assert _reads(FileIndex(index_file), source_file) == 0
+
+
+def test_changed_stats_trigger_rehash(tmp_path: Path, source_file: Path):
+    index = FileIndex(tmp_path / "index.json")
+    index.hash(source_file)
+
+    source_file.write_text("changed\n")
+    os.utime(source_file, (OLD_MTIME + 10, OLD_MTIME + 10))
+
+    assert index.hash(source_file) == hash_file(source_file)
+    assert index.misses == 2
+
+
+def test_recently_modified_files_are_not_stored(tmp_path: Path, source_file: Path):
+    index = FileIndex(tmp_path / "index.json")
+    source_file.touch()
+
+    index.hash(source_file)
+
+    assert _reads(index, source_file) == 1
+
+
+def test_save_drops_deleted_files(tmp_path: Path, source_file: Path):
+    index_file = tmp_path / "index.json"
+    other = source_file.with_name("other.py")
+    other.write_text("x = 1\n")
+    os.utime(other, (OLD_MTIME, OLD_MTIME))
+    index = FileIndex(index_file)
+    index.hash(source_file)
+    index.hash(other)
+
+    other.unlink()
+    index.save()
+
+    assert str(other.resolve()) not in index_file.read_text()
+    assert str(source_file.resolve()) in index_file.read_text()
+
+
+def test_unreadable_index_starts_empty(tmp_path: Path, source_file: Path):
+    index_file = tmp_path / "index.json"
+    index_file.write_text("{not json")
+
+    index = FileIndex(index_file)
+
+    assert index.hash(source_file) == hash_file(source_file)
+    assert index.misses == 1
+
+
+def test_index_is_shared_within_project(tmp_path: Path, source_file: Path, monkeypatch, caplog):
+    monkeypatch.setattr(file_index, "_indexes", {})
+    monkeypatch.setattr(file_index, "get_dot_stelvio_dir", lambda: tmp_path / ".stelvio")
+
+    get_file_index().hash(source_file)
+    assert get_file_index().hash(source_file) == hash_file(source_file)
+
+    with caplog.at_level("INFO", logger=file_index.__name__):
+        save_file_indexes()
+
+    assert "1 unchanged files skipped, 1 files hashed" in caplog.text
+    assert (tmp_path / ".stelvio" / "file_index.json").is_file()
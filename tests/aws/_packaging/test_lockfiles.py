@@ -0,0 +1,107 @@
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from stelvio.aws._packaging.lockfiles import (
+    export_locked_requirements,
+    is_hash_pinned,
+    is_lockfile,
+)
+
+PYLOCK = """
+lock-version = "1.0"
+created-by = "uv"
+
+[[packages]]
+name = "requests"
+version = "2.32.3"
+wheels = [{ name = "requests-2.32.3-py3-none-any.whl", hashes = { sha256 = "aaa" } }]
+sdist = { name = "requests-2.32.3.tar.gz", hashes = { sha256 = "bbb" } }
+
+[[packages]]
+name = "tzdata"
+version = "2025.1"
+marker = "sys_platform == 'win32'"
+wheels = [{ name = "tzdata-2025.1-py2.py3-none-any.whl", hashes = { sha256 = "ccc" } }]
+
+[[packages]]
+name = "my-project"
+directory = { path = "." }
+"""
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("uv.lock", True),
+        ("pylock.toml", True),
+        ("pylock.lambda.toml", True),
+        ("requirements.txt", False),
+        ("pylock.a.b.toml", False),
+        ("poetry.lock", False),
+    ],
+)
+def test_is_lockfile(name, expected):
+    assert is_lockfile(Path("deps") / name) is expected
+
+
+def test_is_hash_pinned():
+    assert is_hash_pinned("requests==2.32.3 --hash=sha256:aaa")
+    assert not is_hash_pinned("requests==2.32.3")
+
+
+def test_pylock_is_converted_to_hash_pinned_requirements(tmp_path: Path):
+    lock_path = tmp_path / "pylock.toml"
+    lock_path.write_text(PYLOCK)
+
+    requirements = export_locked_requirements(lock_path, "test")
+
+    assert requirements.splitlines() == [
+        "requests==2.32.3 --hash=sha256:aaa --hash=sha256:bbb",
+        "tzdata==2025.1 ; sys_platform == 'win32' --hash=sha256:ccc",
+    ]
+
+
+def test_pylock_with_vcs_package_raises(tmp_path: Path):
+    lock_path = tmp_path / "pylock.toml"
+    lock_path.write_text(
+        '[[packages]]\nname = "lib"\nvcs = { type = "git", url = "https://x", '
+        'commit-id = "abc" }\n'
+    )
+
+    with pytest.raises(ValueError, match=r"'lib' .* is not installed from an index"):
+        export_locked_requirements(lock_path, "test")
+
+
+def test_uv_lock_is_exported_once_per_content(tmp_path: Path, monkeypatch):
+    lock_path = tmp_path / "uv.lock"
+    lock_path.write_text("version = 1\n")
+    mock_run = MagicMock(
+        return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="pkg==1.0\n")
+    )
+    monkeypatch.setattr(subprocess, "run", mock_run)
+    monkeypatch.setattr(shutil, "which", {"uv": "/path/to/uv"}.get)
+
+    first = export_locked_requirements(lock_path, "a")
+    second = export_locked_requirements(lock_path, "b")
+    lock_path.write_text("version = 1\nrevision = 2\n")
+    export_locked_requirements(lock_path, "c")
+
+    assert first == second == "pkg==1.0\n"
+    assert mock_run.call_count == 2
+    args, kwargs = mock_run.call_args
+    assert args[0][:4] == ["/path/to/uv", "export", "--frozen", "--format"]
+    assert {"--no-dev", "--no-emit-workspace"} <= set(args[0])
+    assert kwargs["cwd"] == tmp_path
+
+
+def test_uv_lock_without_uv_raises(tmp_path: Path, monkeypatch):
+    lock_path = tmp_path / "uv.lock"
+    lock_path.write_text("version = 1\nrevision = 3\n")
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+
+    with pytest.raises(RuntimeError, match=r"'uv' is needed to install from uv\.lock"):
+        export_locked_requirements(lock_path, "test")
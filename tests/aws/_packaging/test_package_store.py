@@ -0,0 +1,172 @@
+from pathlib import Path
+
+import pytest
+
+from stelvio.aws._packaging.package_store import (
+    assemble_from_store,
+    collect_store_garbage,
+    find_stored_distributions,
+    has_stored_distributions,
+    link_into_store,
+    read_distributions,
+    release_references,
+)
+
+
+def _install(target: Path, name: str, version: str, *, requested: bool = False) -> None:
+    """Simulates what pip/uv write for a wheel installed with --target."""
+    package = name.lower().replace("-", "_")
+    dist_info = target / f"{package}-{version}.dist-info"
+    dist_info.mkdir(parents=True)
+    (target / package).mkdir()
+    (target / package / "__init__.py").write_text(f"VERSION = '{version}'\n")
+    (target / package / "core.py").write_text("def run(): ...\n" * 100)
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+    )
+    (dist_info / "WHEEL").write_text("Wheel-Version: 1.0\nTag: py3-none-any\n")
+    (dist_info / "INSTALLER").write_text("uv\n")
+    files = [
+        f"{package}/__init__.py",
+        f"{package}/core.py",
+        f"{dist_info.name}/METADATA",
+        f"{dist_info.name}/WHEEL",
+        f"{dist_info.name}/INSTALLER",
+        f"{dist_info.name}/RECORD",
+        "../../bin/outside",
+    ]
+    if requested:
+        (dist_info / "REQUESTED").touch()
+        files.append(f"{dist_info.name}/REQUESTED")
+    (dist_info / "RECORD").write_text("".join(f"{f},,\n" for f in files))
+
+
+@pytest.fixture
+def store_dir(tmp_path: Path) -> Path:
+    return tmp_path / "store"
+
+
+def test_first_install_populates_store_and_links_back(tmp_path: Path, store_dir: Path):
+    cache_dir = tmp_path / "functions" / "key-a"
+    _install(cache_dir, "My-Package", "1.0")
+
+    report = link_into_store(cache_dir, store_dir, "functions/key-a")
+
+    assert report.distributions == ("my_package-1.0-py3-none-any",)
+    assert report.new_distributions == report.distributions
+    stored = store_dir / "packages" / "my_package-1.0-py3-none-any" / "my_package" / "core.py"
+    assert stored.samefile(cache_dir / "my_package" / "core.py")
+    # Installer bookkeeping is never shared
+    assert not (stored.parents[1] / "my_package-1.0.dist-info" / "RECORD").exists()
+    assert not (stored.parents[1] / "my_package-1.0.dist-info" / "INSTALLER").exists()
+
+
+def test_same_distribution_in_other_cache_dir_is_hard_linked(tmp_path: Path, store_dir: Path):
+    first, second = tmp_path / "functions" / "key-a", tmp_path / "functions" / "key-b"
+    _install(first, "pkg", "1.0", requested=True)
+    _install(second, "pkg", "1.0")
+    link_into_store(first, store_dir, "functions/key-a")
+
+    report = link_into_store(second, store_dir, "functions/key-b")
+
+    assert report.new_distributions == ()
+    assert report.linked_files == 4  # package files, METADATA and WHEEL
+    assert (first / "pkg" / "core.py").samefile(second / "pkg" / "core.py")
+    assert (first / "pkg-1.0.dist-info" / "REQUESTED").is_file()
+    assert not (second / "pkg-1.0.dist-info" / "REQUESTED").exists()
+
+
+def test_different_versions_get_separate_entries(tmp_path: Path, store_dir: Path):
+    first, second = tmp_path / "a", tmp_path / "b"
+    _install(first, "pkg", "1.0")
+    _install(second, "pkg", "2.0")
+
+    link_into_store(first, store_dir, "functions/a")
+    link_into_store(second, store_dir, "functions/b")
+
+    assert (second / "pkg" / "__init__.py").read_text() == "VERSION = '2.0'\n"
+    assert sorted(p.name for p in (store_dir / "packages").iterdir()) == [
+        "pkg-1.0-py3-none-any",
+        "pkg-2.0-py3-none-any",
+    ]
+
+
+def test_directories_without_dist_info_are_left_alone(tmp_path: Path, store_dir: Path):
+    cache_dir = tmp_path / "plain"
+    (cache_dir / "module").mkdir(parents=True)
+    (cache_dir / "module" / "__init__.py").touch()
+
+    report = link_into_store(cache_dir, store_dir, "functions/plain")
+
+    assert report.distributions == ()
+    assert (cache_dir / "module" / "__init__.py").is_file()
+
+
+def test_garbage_collection_keeps_referenced_entries(tmp_path: Path, store_dir: Path):
+    first, second = tmp_path / "a", tmp_path / "b"
+    _install(first, "shared", "1.0")
+    _install(first, "only-a", "1.0")
+    _install(second, "shared", "1.0")
+    link_into_store(first, store_dir, "functions/a")
+    link_into_store(second, store_dir, "layers/b")
+
+    release_references(store_dir, ["functions/a"])
+    removed = collect_store_garbage(store_dir)
+
+    assert removed == ["only_a-1.0-py3-none-any"]
+    assert (store_dir / "packages" / "shared-1.0-py3-none-any").is_dir()
+    assert (second / "shared" / "core.py").is_file()
+
+    release_references(store_dir, ["layers/b"])
+    assert collect_store_garbage(store_dir) == ["shared-1.0-py3-none-any"]
+
+
+def test_garbage_collection_without_store_is_noop(store_dir: Path):
+    assert collect_store_garbage(store_dir) == []
+
+
+def test_stored_distributions_are_found_by_target_and_pin(tmp_path: Path, store_dir: Path):
+    cache_dir = tmp_path / "functions" / "key-a"
+    _install(cache_dir, "My-Package", "1.0")
+    link_into_store(cache_dir, store_dir, "functions/key-a", "x86_64__3.12")
+
+    assert has_stored_distributions(store_dir, "x86_64__3.12")
+    assert not has_stored_distributions(store_dir, "arm64__3.12")
+    pins = {"my.package": "1.0", "other": "2.0"}
+    assert find_stored_distributions(store_dir, "x86_64__3.12", pins) == {
+        "my.package": "my_package-1.0-py3-none-any"
+    }
+    assert find_stored_distributions(store_dir, "x86_64__3.12", {"my-package": "1.1"}) == {}
+    assert find_stored_distributions(store_dir, "arm64__3.12", pins) == {}
+
+
+def test_assembled_cache_dir_links_stored_files_and_records_them(tmp_path: Path, store_dir: Path):
+    installed = tmp_path / "functions" / "key-a"
+    _install(installed, "My-Package", "1.0")
+    link_into_store(installed, store_dir, "functions/key-a", "x86_64__3.12")
+    assembled = tmp_path / "functions" / "key-b"
+
+    files = assemble_from_store(assembled, store_dir, ["my_package-1.0-py3-none-any"])
+
+    assert files == 4
+    assert (assembled / "my_package" / "core.py").samefile(installed / "my_package" / "core.py")
+    [distribution] = read_distributions(assembled)
+    assert distribution.key == "my_package-1.0-py3-none-any"
+    assert {path.as_posix() for path in distribution.files} == {
+        "my_package/__init__.py",
+        "my_package/core.py",
+        "my_package-1.0.dist-info/METADATA",
+        "my_package-1.0.dist-info/WHEEL",
+        "my_package-1.0.dist-info/RECORD",
+    }
+
+
+def test_garbage_collection_forgets_removed_distributions(tmp_path: Path, store_dir: Path):
+    cache_dir = tmp_path / "a"
+    _install(cache_dir, "only-a", "1.0")
+    link_into_store(cache_dir, store_dir, "functions/a", "x86_64__3.12")
+
+    release_references(store_dir, ["functions/a"])
+    collect_store_garbage(store_dir)
+
+    assert not has_stored_distributions(store_dir, "x86_64__3.12")
@@ -0,0 +1,68 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from stelvio.aws._packaging.prefetch import collect_dependency_installs, prefetch_dependencies
+from stelvio.aws.function import Function
+from stelvio.aws.layer import Layer
+from stelvio.config import AwsConfig
+from stelvio.context import AppContext, _ContextStore
+
+pytestmark = pytest.mark.usefixtures("project_cwd")
+
+
+def _contexts(installs) -> list[str]:
+    return sorted(install.log_context for install in installs)
+
+
+def test_collects_functions_and_layers_with_requirements(project_cwd: Path):
+    Function("with-reqs", handler="functions/simple.handler", requirements=["requests"])
+    Function("no-reqs", handler="functions/simple2.handler", requirements=False)
+    Layer("libs", requirements=["boto3"], runtime="python3.13", architecture="arm64")
+
+    installs = collect_dependency_installs()
+
+    assert _contexts(installs) == ["Function: functions/simple.handler", "Layer: libs"]
+    layer_install = next(i for i in installs if i.log_context == "Layer: libs")
+    assert layer_install.runtime == "python3.13"
+    assert layer_install.architecture == "arm64"
+    assert layer_install.cache_subdirectory == "layers"
+
+
+def test_skips_functions_in_dev_mode(project_cwd: Path):
+    _ContextStore.clear()
+    _ContextStore.set(
+        AppContext(
+            name="test", env="test", aws=AwsConfig(region="us-east-1"), home="aws", dev_mode=True
+        )
+    )
+    Function("with-reqs", handler="functions/simple.handler", requirements=["requests"])
+    Layer("libs", requirements=["boto3"])
+
+    assert _contexts(collect_dependency_installs()) == ["Layer: libs"]
+
+
+def test_prefetch_installs_collected_dependencies(project_cwd: Path):
+    Function("with-reqs", handler="functions/simple.handler", requirements=["requests"])
+
+    with patch(
+        "stelvio.aws._packaging.prefetch.install_dependencies_concurrently", return_value=[]
+    ) as mock_install:
+        prefetch_dependencies(max_workers=2)
+
+    installs, project_root, max_workers = mock_install.call_args.args
+    assert _contexts(installs) == ["Function: functions/simple.handler"]
+    assert project_root == project_cwd
+    assert max_workers == 2
+
+
+def test_prefetch_without_dependencies_does_nothing(project_cwd: Path):
+    Function("no-reqs", handler="functions/simple.handler")
+
+    with patch(
+        "stelvio.aws._packaging.prefetch.install_dependencies_concurrently"
+    ) as mock_install:
+        assert prefetch_dependencies() == []
+
+    mock_install.assert_not_called()
@@ -0,0 +1,128 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from stelvio.aws._packaging import size_budget
+from stelvio.aws._packaging.size_budget import (
+    ArtifactContentsRegistry,
+    PackageSize,
+    analyze_function_size,
+    enforce_size_limits,
+    measure_artifact,
+)
+from stelvio.aws.size_budget import SizeBudgetConfig
+from stelvio.exceptions import StelvioValidationError
+
+from .conftest import write_distribution
+
+
+def _package(kind: str, component: str, directory: Path, prefix: str, extra: dict) -> None:
+    path = directory.parent / f"{kind}-{component}.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        for file_path in directory.rglob("*"):
+            if file_path.is_file():
+                relative = file_path.relative_to(directory).as_posix()
+                archive.write(file_path, f"{prefix}/{relative}" if prefix else relative)
+        for name, content in extra.items():
+            archive.writestr(name, content)
+    ArtifactContentsRegistry.add(kind, component, path, {prefix: directory})
+
+
+@pytest.fixture
+def packaged(tmp_path: Path) -> None:
+    function_deps = tmp_path / "function-deps"
+    write_distribution(function_deps, "small", "1.0", 1000)
+    write_distribution(function_deps, "big", "2.0", 5000)
+    _package("functions", "api", function_deps, "", {"handler.py": "#" * 300})
+
+    layer_deps = tmp_path / "layer-deps"
+    write_distribution(layer_deps, "shared", "3.0", 2000)
+    site_packages = "python/lib/python3.12/site-packages"
+    _package("layers", "common", layer_deps, site_packages, {"python/utils/a.py": "#" * 200})
+
+
+@pytest.mark.usefixtures("packaged")
+def test_measure_artifact_breaks_size_down_by_distribution():
+    artifact = measure_artifact("functions", "api")
+
+    assert [package.name for package in artifact.packages[:3]] == [
+        "big 2.0",
+        "small 1.0",
+        "handler.py",
+    ]
+    assert artifact.packages[0].size > 5000
+    assert artifact.unzipped_size == sum(package.size for package in artifact.packages)
+
+
+@pytest.mark.usefixtures("packaged")
+def test_measure_layer_counts_own_code_per_top_level_package():
+    artifact = measure_artifact("layers", "common")
+
+    assert artifact.packages[-1] == PackageSize("utils", 200)
+    assert artifact.packages[0].name == "shared 3.0"
+
+
+@pytest.mark.usefixtures("packaged")
+def test_function_report_adds_layers_to_unzipped_size():
+    report = analyze_function_size("api", ["common"], None, staged=False)
+
+    assert report.zipped_size == report.artifacts[0].size
+    assert report.unzipped_size == sum(a.unzipped_size for a in report.artifacts)
+    assert report.violations == []
+    enforce_size_limits(report)
+
+
+@pytest.mark.usefixtures("packaged")
+def test_budget_violations_fail_with_largest_packages():
+    budget = SizeBudgetConfig(max_unzipped_mb=0.001)
+    report = analyze_function_size("api", ["common"], budget, staged=False)
+
+    with pytest.raises(StelvioValidationError) as exc_info:
+        enforce_size_limits(report)
+
+    message = str(exc_info.value)
+    assert "Function 'api' is too large to deploy" in message
+    assert "exceeds its budget of 0.001 MB" in message
+    assert "big 2.0 (functions/api)" in message
+    assert "shared 3.0 (layers/common)" in message
+
+
+@pytest.mark.usefixtures("packaged")
+def test_direct_upload_limit_only_applies_without_staging(monkeypatch):
+    monkeypatch.setattr(size_budget, "LAMBDA_MAX_DIRECT_UPLOAD_SIZE", 100)
+
+    direct = analyze_function_size("api", [], None, staged=False)
+    staged = analyze_function_size("api", [], None, staged=True)
+
+    assert len(direct.violations) == 1
+    assert "direct upload limit" in direct.violations[0]
+    assert staged.violations == []
+
+
+@pytest.mark.usefixtures("packaged")
+def test_lambda_unzipped_limit_counts_layers(monkeypatch):
+    function_only = analyze_function_size("api", [], None, staged=True).unzipped_size
+    monkeypatch.setattr(size_budget, "LAMBDA_MAX_UNZIPPED_SIZE", function_only)
+
+    assert analyze_function_size("api", [], None, staged=True).violations == []
+    violations = analyze_function_size("api", ["common"], None, staged=True).violations
+    assert len(violations) == 1
+    assert "exceeds Lambda's limit" in violations[0]
+
+
+@pytest.mark.usefixtures("packaged")
+def test_report_to_dict():
+    report = analyze_function_size(
+        "api", ["common"], SizeBudgetConfig(max_zipped_mb=10), staged=False
+    )
+
+    data = report.to_dict(top=1)
+
+    assert data["function"] == "api"
+    assert data["budget"] == {"max_zipped_mb": 10, "max_unzipped_mb": None}
+    assert data["violations"] == []
+    assert [a["component"] for a in data["artifacts"]] == ["api", "common"]
+    assert data["artifacts"][0]["packages"] == [
+        {"name": "big 2.0", "size": report.artifacts[0].packages[0].size}
+    ]
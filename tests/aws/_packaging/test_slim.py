@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+
+from stelvio.aws._packaging import dependencies as deps
+from stelvio.aws._packaging.slim import get_or_create_slim_variant, slim_directory
+from stelvio.aws.slim import DEFAULT_SLIM_DENY, SlimConfig, normalize_slim_config
+
+FILES = {
+    "pkg/__init__.py": 10,
+    "pkg/core.py": 100,
+    "pkg/core.pyi": 20,
+    "pkg/__pycache__/core.cpython-312.pyc": 50,
+    "pkg/tests/test_core.py": 200,
+    "pkg/testing/helpers.py": 30,
+    "pkg/docs/index.md": 40,
+    "pkg-1.0.dist-info/METADATA": 5,
+    "pkg-1.0.dist-info/RECORD": 15,
+    "tests/conftest.py": 7,
+}
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    cache = tmp_path / "lambda_dependencies" / "functions" / "x86_64__3.12__abc"
+    for relative_path, size in FILES.items():
+        path = cache / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+    return cache
+
+
+def _files(directory: Path) -> set[str]:
+    return {p.relative_to(directory).as_posix() for p in directory.rglob("*") if p.is_file()}
+
+
+def test_default_rules_remove_runtime_unneeded_files(cache_dir: Path, tmp_path: Path):
+    report = slim_directory(cache_dir, tmp_path / "out", SlimConfig())
+
+    assert _files(tmp_path / "out") == {
+        "pkg/__init__.py",
+        "pkg/core.py",
+        "pkg/testing/helpers.py",
+        "pkg/docs/index.md",
+        "pkg-1.0.dist-info/METADATA",
+    }
+    assert report.original_bytes == sum(FILES.values())
+    assert report.removed_bytes == 50 + 20 + 200 + 15 + 7
+    assert report.removed_files == 5
+    assert report.removed_by_entry == {"pkg": 270, "pkg-1.0.dist-info": 15, "tests": 7}
+
+
+def test_deny_adds_to_defaults_and_allow_wins(cache_dir: Path, tmp_path: Path):
+    slim = SlimConfig(deny=["*/docs"], allow=["pkg/tests"])
+
+    slim_directory(cache_dir, tmp_path / "out", slim)
+
+    files = _files(tmp_path / "out")
+    assert "pkg/docs/index.md" not in files
+    assert "pkg/tests/test_core.py" in files
+    assert "pkg/core.pyi" not in files
+
+
+def test_without_defaults_only_own_patterns_apply(cache_dir: Path, tmp_path: Path):
+    slim_directory(cache_dir, tmp_path / "out", SlimConfig(deny=["*.md"], use_defaults=False))
+
+    assert _files(tmp_path / "out") == set(FILES) - {"pkg/docs/index.md"}
+
+
+def test_slimmed_files_are_hard_linked(cache_dir: Path, tmp_path: Path):
+    slim_directory(cache_dir, tmp_path / "out", SlimConfig())
+
+    assert (tmp_path / "out" / "pkg" / "core.py").samefile(cache_dir / "pkg" / "core.py")
+
+
+def test_variant_is_created_once_next_to_original(cache_dir: Path, monkeypatch):
+    base = cache_dir.parents[1]
+    monkeypatch.setattr(deps, "_get_lambda_dependencies_dir", lambda subdir: base / subdir)
+    monkeypatch.setattr(deps, "_used_cache_dirs", set())
+
+    variant = get_or_create_slim_variant(cache_dir, SlimConfig(), "functions", "test")
+    again = get_or_create_slim_variant(cache_dir, SlimConfig(), "functions", "test")
+    other = get_or_create_slim_variant(cache_dir, SlimConfig(deny=["*.md"]), "functions", "t")
+
+    assert variant == again
+    assert variant.parent == cache_dir.parent
+    assert variant.name.startswith(f"{cache_dir.name}__slim_")
+    assert other != variant
+    # The original install is untouched
+    assert _files(cache_dir) == set(FILES)
+    assert deps._used_cache_dirs == {f"functions/{variant.name}", f"functions/{other.name}"}
+
+
+@pytest.mark.parametrize(
+    ("slim", "expected"),
+    [
+        (None, None),
+        (False, None),
+        (True, SlimConfig()),
+        ({"deny": ["*.md"]}, SlimConfig(deny=["*.md"])),
+    ],
+)
+def test_normalize_slim_config(slim, expected):
+    assert normalize_slim_config(slim) == expected
+
+
+def test_deny_patterns_include_defaults():
+    assert SlimConfig(deny=["*.md"]).deny_patterns == (*DEFAULT_SLIM_DENY, "*.md")
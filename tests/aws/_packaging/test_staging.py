@@ -0,0 +1,204 @@
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pulumi
+import pytest
+from pulumi import FileArchive
+
+from stelvio.aws._packaging import file_index
+from stelvio.aws._packaging.artifacts import hash_file
+from stelvio.aws._packaging.staging import (
+    ArtifactStager,
+    clean_staged_artifacts,
+    get_code_args,
+    set_artifact_stager,
+)
+
+# Files that already exist were uploaded long before the tests
+LONG_AGO = datetime(2020, 1, 1, tzinfo=UTC)
+
+
+class FakeHome:
+    def __init__(self, existing: set[str] | None = None) -> None:
+        self.files = dict.fromkeys(existing or set(), b"")
+        self.modified = dict.fromkeys(self.files, LONG_AGO)
+        self.uploads: list[str] = []
+
+    @property
+    def storage_name(self) -> str:
+        return "stlv-state-test"
+
+    def file_exists(self, key: str) -> bool:
+        return key in self.files
+
+    def write_file(self, key: str, local_path: Path) -> None:
+        self.uploads.append(key)
+        self.files[key] = local_path.read_bytes()
+        self.modified[key] = datetime.now(UTC)
+
+    def read_file(self, key: str, local_path: Path) -> bool:
+        if key not in self.files:
+            return False
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        local_path.write_bytes(self.files[key])
+        return True
+
+    def delete_file(self, key: str) -> None:
+        self.files.pop(key, None)
+
+    def list_files(self, prefix: str) -> dict[str, datetime]:
+        return {
+            key: self.modified.get(key, LONG_AGO) for key in self.files if key.startswith(prefix)
+        }
+
+
+@pytest.fixture(autouse=True)
+def isolated_file_index(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(file_index, "_indexes", {})
+    monkeypatch.setattr(file_index, "get_dot_stelvio_dir", lambda: tmp_path / ".stelvio")
+
+
+@pytest.fixture
+def artifact(tmp_path: Path) -> Path:
+    path = tmp_path / "fp.zip"
+    path.write_bytes(b"zip content")
+    return path
+
+
+def test_stage_uploads_once_under_content_hash_key(artifact: Path):
+    home = FakeHome()
+    stager = ArtifactStager(home, "my-app")
+
+    key = stager.stage(artifact)
+
+    assert key == f"artifacts/my-app/{hash_file(artifact)}.zip"
+    assert stager.stage(artifact) == key
+    assert home.uploads == [key]
+    assert home.files[key] == b"zip content"
+
+
+def test_stage_skips_existing_objects(artifact: Path):
+    key = f"artifacts/my-app/{hash_file(artifact)}.zip"
+    home = FakeHome(existing={key})
+
+    assert ArtifactStager(home, "my-app").stage(artifact) == key
+    assert home.uploads == []
+
+
+def test_identical_artifacts_share_one_object(artifact: Path, tmp_path: Path):
+    copy = tmp_path / "other.zip"
+    copy.write_bytes(artifact.read_bytes())
+    home = FakeHome()
+
+    # e.g. two environments of the same app
+    first = ArtifactStager(home, "my-app").stage(artifact)
+    second = ArtifactStager(home, "my-app").stage(copy)
+
+    assert first == second
+    assert home.uploads == [first]
+
+
+def test_uploads_of_different_artifacts_do_not_wait_for_each_other(artifact: Path, tmp_path: Path):
+    other = tmp_path / "other.zip"
+    other.write_bytes(b"other content")
+    uploading = threading.Event()
+    other_staged = threading.Event()
+    waits: list[bool] = []
+
+    class SlowHome(FakeHome):
+        def write_file(self, key: str, local_path: Path) -> None:
+            if local_path == artifact:
+                uploading.set()
+                waits.append(other_staged.wait(timeout=5))
+            super().write_file(key, local_path)
+
+    stager = ArtifactStager(SlowHome(), "my-app")
+    upload = threading.Thread(target=stager.stage, args=(artifact,))
+    upload.start()
+    assert uploading.wait(timeout=5)
+    stager.stage(other)
+    other_staged.set()
+    upload.join()
+
+    assert waits == [True]
+    assert len(stager.staged_keys) == 2
+
+
+def test_stage_does_not_upload_during_preview(artifact: Path, monkeypatch):
+    monkeypatch.setattr(pulumi.runtime, "is_dry_run", lambda: True)
+    home = FakeHome()
+
+    key = ArtifactStager(home, "my-app").stage(artifact)
+
+    assert key.startswith("artifacts/my-app/")
+    assert home.uploads == []
+
+
+def test_code_args_reference_staged_artifact(artifact: Path):
+    home = FakeHome()
+    set_artifact_stager(ArtifactStager(home, "my-app"))
+    try:
+        args = get_code_args(artifact)
+    finally:
+        set_artifact_stager(None)
+
+    assert args == {"s3_bucket": "stlv-state-test", "s3_key": home.uploads[0]}
+
+
+def test_code_args_without_stager_pass_code_inline(artifact: Path):
+    args = get_code_args(artifact)
+
+    assert set(args) == {"code"}
+    assert isinstance(args["code"], FileArchive)
+    assert args["code"].path == str(artifact)
+
+
+def test_clean_deletes_artifacts_no_environment_references(tmp_path: Path):
+    home = FakeHome(
+        existing={"artifacts/my-app/old.zip", "artifacts/my-app/new.zip", "artifacts/other/x.zip"}
+    )
+
+    deleted = clean_staged_artifacts(home, "my-app", "dev", ["artifacts/my-app/new.zip"], tmp_path)
+
+    assert deleted == ["artifacts/my-app/old.zip"]
+    assert set(home.files) == {
+        "artifacts/my-app/new.zip",
+        "artifacts/my-app/references/dev.json",
+        "artifacts/other/x.zip",
+    }
+
+
+def test_clean_keeps_artifacts_other_environments_reference(tmp_path: Path):
+    home = FakeHome(existing={"artifacts/my-app/shared.zip", "artifacts/my-app/dev.zip"})
+    home.files["artifacts/my-app/references/prod.json"] = b'["artifacts/my-app/shared.zip"]'
+
+    deleted = clean_staged_artifacts(home, "my-app", "dev", ["artifacts/my-app/dev.zip"], tmp_path)
+
+    assert deleted == []
+    assert "artifacts/my-app/shared.zip" in home.files
+
+
+def test_clean_keeps_recently_uploaded_artifacts(tmp_path: Path, artifact: Path):
+    home = FakeHome()
+    # Uploaded by a deploy of another environment that is still running
+    key = ArtifactStager(home, "my-app").stage(artifact)
+
+    deleted = clean_staged_artifacts(home, "my-app", "dev", [], tmp_path)
+
+    assert deleted == []
+    assert key in home.files
+
+
+def test_clean_after_destroy_forgets_environment_references(tmp_path: Path):
+    home = FakeHome(existing={"artifacts/my-app/shared.zip", "artifacts/my-app/dev.zip"})
+    home.files["artifacts/my-app/references/prod.json"] = b'["artifacts/my-app/shared.zip"]'
+    home.files["artifacts/my-app/references/dev.json"] = b'["artifacts/my-app/dev.zip"]'
+
+    deleted = clean_staged_artifacts(home, "my-app", "dev", [], tmp_path)
+
+    assert deleted == ["artifacts/my-app/dev.zip"]
+    assert set(home.files) == {
+        "artifacts/my-app/shared.zip",
+        "artifacts/my-app/references/prod.json",
+    }
@@ -0,0 +1,98 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from stelvio.aws._packaging.tree_shake import shake_code_files
+
+
+@pytest.fixture
+def folder(tmp_path: Path) -> Path:
+    sources = {
+        "orders/handler.py": (
+            "import json\n"
+            "from shared import db\n"
+            "from . import helpers\n"
+            "from .models import Order\n"
+            "def handler(event, context):\n"
+            "    from shared.lazy import value\n"
+            "    return value\n"
+        ),
+        "orders/__init__.py": "",
+        "orders/helpers.py": "import shared.text as text\n",
+        "orders/models.py": "Order = dict\n",
+        "orders/unused.py": "import shared.heavy\n",
+        "shared/__init__.py": "",
+        "shared/db.py": "import boto3\n",
+        "shared/lazy.py": "value = 1\n",
+        "shared/text.py": "import top\n",
+        "shared/heavy.py": "import numpy\n",
+        "shared/plugins/__init__.py": "",
+        "shared/plugins/csv.py": "",
+        "top.py": "",
+        "templates/order.html": "<html></html>",
+        "README.md": "docs",
+    }
+    for archive_path, content in sources.items():
+        (tmp_path / archive_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / archive_path).write_text(content)
+    return tmp_path
+
+
+def _files(folder: Path) -> dict[str, Path]:
+    return {
+        path.relative_to(folder).as_posix(): path for path in folder.rglob("*") if path.is_file()
+    }
+
+
+def test_keeps_only_reachable_modules(folder: Path):
+    kept = shake_code_files(_files(folder), "orders/handler.py", [], "test")
+
+    assert set(kept) == {
+        "orders/__init__.py",
+        "orders/handler.py",
+        "orders/helpers.py",
+        "orders/models.py",
+        "shared/__init__.py",
+        "shared/db.py",
+        "shared/lazy.py",
+        "shared/text.py",
+        "top.py",
+    }
+
+
+def test_includes_matching_files_and_their_imports(folder: Path):
+    kept = shake_code_files(
+        _files(folder), "orders/handler.py", ["templates/*", "orders/unused.py"], "test"
+    )
+
+    assert "templates/order.html" in kept
+    assert "orders/unused.py" in kept
+    assert "shared/heavy.py" in kept
+    assert "README.md" not in kept
+
+
+def test_follows_literal_dynamic_imports_and_warns_about_others(folder: Path, caplog):
+    (folder / "orders" / "handler.py").write_text(
+        "import importlib\n"
+        "plugin = importlib.import_module('shared.plugins.csv')\n"
+        "name = 'x'\n"
+        "other = importlib.import_module(name)\n"
+    )
+
+    with caplog.at_level(logging.WARNING):
+        kept = shake_code_files(_files(folder), "orders/handler.py", [], "test")
+
+    assert "shared/plugins/csv.py" in kept
+    assert "shared/plugins/__init__.py" in kept
+    assert "Can't resolve dynamic import in orders/handler.py:4" in caplog.text
+
+
+def test_unparsable_module_is_kept_with_warning(folder: Path, caplog):
+    (folder / "orders" / "handler.py").write_text("def handler(:\n")
+
+    with caplog.at_level(logging.WARNING):
+        kept = shake_code_files(_files(folder), "orders/handler.py", [], "test")
+
+    assert set(kept) == {"orders/handler.py"}
+    assert "Can't parse orders/handler.py" in caplog.text
@@ -133,12 +133,16 @@ API_EXECUTION_ARN_TEMPLATE = (
     f"arn:aws:execute-api:{DEFAULT_REGION}:{ACCOUNT_ID}:{SAMPLE_API_ID}/*/*"
 )
 
-API_GATEWAY_ASSUME_ROLE_POLICY = [
-    {
-        "actions": ["sts:AssumeRole"],
-        "principals": [{"identifiers": ["apigateway.amazonaws.com"], "type": "Service"}],
-    }
-]
+API_GATEWAY_ASSUME_ROLE_POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Action": "sts:AssumeRole",
+            "Principal": {"Service": "apigateway.amazonaws.com"},
+        }
+    ],
+}
 
 
 def assert_rest_api(mocks: PulumiTestMocks, name: str, expected_endpoint_type: str = "REGIONAL"):
@@ -166,22 +166,23 @@ def verify_function_stream_permissions(pulumi_mocks, function_mock, expected_str
 
     # Parse the policy document and verify it contains the expected stream permissions
 
-    actual_statements = json.loads(function_policy.inputs["policy"])
+    actual_statements = json.loads(function_policy.inputs["policy"])["Statement"]
 
     # Expected policy should contain basic Lambda execution + DynamoDB stream permissions
     expected_stream_statement = {
-        "actions": [
+        "Effect": "Allow",
+        "Action": [
             "dynamodb:DescribeStream",
             "dynamodb:GetRecords",
             "dynamodb:GetShardIterator",
             "dynamodb:ListStreams",
         ],
-        "resources": [expected_stream_arn],
+        "Resource": [expected_stream_arn],
     }
 
     # Find the stream statement in actual policy
     stream_statements = [
-        stmt for stmt in actual_statements if "dynamodb:DescribeStream" in stmt.get("actions", [])
+        stmt for stmt in actual_statements if "dynamodb:DescribeStream" in stmt.get("Action", [])
     ]
     stream_statement = stream_statements[0] if stream_statements else None
 
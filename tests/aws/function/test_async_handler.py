@@ -0,0 +1,60 @@
+import asyncio
+import importlib.util
+import sys
+from types import ModuleType
+
+import pytest
+
+from stelvio.project import get_stelvio_lib_root
+
+ASYNC_HANDLER_PATH = get_stelvio_lib_root() / "aws" / "function" / "stub" / "async_handler.py"
+
+HANDLER_SOURCE = """import asyncio
+
+loops = []
+
+
+async def process(event, context):
+    loops.append(asyncio.get_running_loop())
+    results = await asyncio.gather(*(asyncio.sleep(0, result=item) for item in event))
+    return {"handled": results}
+"""
+
+
+@pytest.fixture
+def async_handler(tmp_path, monkeypatch) -> ModuleType:
+    (tmp_path / "orders").mkdir()
+    (tmp_path / "orders" / "handler.py").write_text(HANDLER_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("STLV_ASYNC_HANDLER", "orders/handler.process")
+    spec = importlib.util.spec_from_file_location("stlv_async", ASYNC_HANDLER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    module._event_loop.close()
+    asyncio.set_event_loop(None)
+    sys.modules.pop("orders.handler", None)
+    sys.modules.pop("orders", None)
+
+
+def test_runs_async_handler_to_completion(async_handler):
+    assert async_handler.handler([1, 2, 3], None) == {"handled": [1, 2, 3]}
+
+
+def test_reuses_event_loop_across_invocations(async_handler):
+    async_handler.handler([1], None)
+    async_handler.handler([2], None)
+
+    loops = sys.modules["orders.handler"].loops
+    assert loops[0] is loops[1]
+    assert loops[0] is async_handler._event_loop
+    assert not loops[0].is_closed()
+
+
+def test_replaces_event_loop_closed_by_handler(async_handler):
+    async_handler.handler([1], None)
+    async_handler._event_loop.close()
+
+    assert async_handler.handler([2], None) == {"handled": [2]}
+    loops = sys.modules["orders.handler"].loops
+    assert loops[1] is not loops[0]
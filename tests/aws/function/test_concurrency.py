@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+import pytest
+
+from stelvio.aws.function import Function
+from stelvio.aws.function.concurrency import account_reserved_concurrency
+
+pytestmark = pytest.mark.usefixtures("project_cwd")
+
+
+@pytest.fixture
+def functions() -> None:
+    Function("api", handler="functions/simple.handler", reserved_concurrency=50)
+    Function("worker", handler="functions/simple.handler", reserved_concurrency=200)
+    Function("unreserved", handler="functions/simple.handler")
+
+
+@pytest.mark.usefixtures("functions")
+def test_sums_reservations_of_all_functions():
+    with patch("pulumi.log.warn") as warn:
+        report = account_reserved_concurrency(None)
+
+    assert report.reservations == (("worker", 200), ("api", 50))
+    assert report.total == 250
+    assert not report.exceeds_budget
+    warn.assert_not_called()
+
+
+@pytest.mark.usefixtures("functions")
+def test_warns_when_reservations_exceed_budget():
+    with patch("pulumi.log.warn") as warn:
+        report = account_reserved_concurrency(200)
+
+    assert report.exceeds_budget
+    warn.assert_called_once()
+    message = warn.call_args.args[0]
+    assert "reserve 250 concurrent executions, more than the concurrency_budget of 200" in message
+    assert "worker (200), api (50)" in message
+
+
+@pytest.mark.usefixtures("functions")
+def test_no_warning_within_budget():
+    with patch("pulumi.log.warn") as warn:
+        assert not account_reserved_concurrency(250).exceeds_budget
+
+    warn.assert_not_called()
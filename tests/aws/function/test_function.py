@@ -19,7 +19,11 @@ For Function we need to test:
                 - [x] With packaged proper code for single file and folder based lambdas
 """
 
+import asyncio
 import json
+import sys
+import threading
+import zipfile
 from collections.abc import Callable
 from dataclasses import dataclass, field, replace
 from functools import partial
@@ -33,12 +37,12 @@ from pulumi import (
     AssetArchive,
     FileArchive,
     FileAsset,
-    RemoteAsset,
     StringAsset,
 )
 from pulumi.runtime import MockResourceArgs
 
 from stelvio.aws._packaging.dependencies import RequirementsSpec
+from stelvio.aws._packaging.package_store import InstalledDistribution
 from stelvio.aws.function import Function
 from stelvio.aws.function.constants import (
     DEFAULT_ARCHITECTURE,
@@ -47,19 +51,25 @@ from stelvio.aws.function.constants import (
     DEFAULT_TIMEOUT,
 )
 from stelvio.aws.function.dependencies import _FUNCTION_CACHE_SUBDIR
+from stelvio.aws.function.function import AutoLayersRegistry
 from stelvio.aws.layer import Layer
 from stelvio.aws.permission import AwsPermission
 from stelvio.aws.types import AwsArchitecture, AwsLambdaRuntime
+from stelvio.exceptions import StelvioValidationError
 from stelvio.link import Link, Linkable
 
 from ...conftest import TP
 
-LAMBDA_ASSUME_ROLE_POLICY = [
-    {
-        "actions": ["sts:AssumeRole"],
-        "principals": [{"identifiers": ["lambda.amazonaws.com"], "type": "Service"}],
-    }
-]
+LAMBDA_ASSUME_ROLE_POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Action": "sts:AssumeRole",
+            "Principal": {"Service": "lambda.amazonaws.com"},
+        }
+    ],
+}
 
 LINK_FILE_IMPORTS = """import os
 from dataclasses import dataclass
@@ -129,7 +139,7 @@ class FunctionTestCase:
     expected_code_assets: dict[str, tuple[type[Asset], str]]
     links: list[Link | Linkable] = field(default_factory=list)
     expected_envars: dict[str, str | int] = field(default_factory=dict)
-    expected_policy: list[dict[str, list[str]]] | None = None
+    expected_policy: list[dict[str, str | list[str]]] | None = None
     expected_ide_file: tuple[str, str] | None = None
     layers: list[Callable[[], Layer]] | None = None
     expected_layers: list[str] | None = None
@@ -168,27 +178,27 @@ def assert_function_code(
     assets: dict[str, tuple[type[Asset], str]],
     expected_dependencies_path: Path | None,
 ):
-    # Check lambda code
-    code: AssetArchive = function_args.inputs["code"]
-
-    for name, (asset_type, path_text_uri) in assets.items():
-        asset = code.assets[name]
-        assert isinstance(asset, asset_type)
-        if isinstance(asset, FileAsset):
-            assert asset.path == str(project_cwd / path_text_uri)
-        elif isinstance(asset, StringAsset):
-            assert asset.text == path_text_uri
-        elif isinstance(asset, RemoteAsset):
-            assert asset.uri == path_text_uri
-
-    if not expected_dependencies_path:
-        return
-    # Check dependency archive
-    expected_depencencies_key = ""  # direct lambda dependencies are at root
-    assert expected_depencencies_key in code.assets
-    dependencies_archive_asset = code.assets[expected_depencencies_key]
-    assert isinstance(dependencies_archive_asset, FileArchive)
-    assert dependencies_archive_asset.path == str(expected_dependencies_path)
+    # Check lambda code is a single prebuilt zip from the artifact store
+    code: FileArchive = function_args.inputs["code"]
+    assert isinstance(code, FileArchive)
+    artifact_path = Path(code.path)
+    assert artifact_path.parent == project_cwd / ".stelvio" / "artifacts" / "functions"
+
+    with zipfile.ZipFile(artifact_path) as archive:
+        for name, (asset_type, path_text) in assets.items():
+            content = archive.read(name)
+            if asset_type is FileAsset:
+                assert content == (project_cwd / path_text).read_bytes()
+            elif asset_type is StringAsset:
+                assert content.decode() == path_text
+
+        if not expected_dependencies_path:
+            return
+        # Direct lambda dependencies are at the root of the archive
+        for file_path in expected_dependencies_path.rglob("*"):
+            if file_path.is_file():
+                relative_name = file_path.relative_to(expected_dependencies_path).as_posix()
+                assert archive.read(relative_name) == file_path.read_bytes()
 
 
 def expected_layer_arn(layer_name: str) -> str:
@@ -373,8 +383,9 @@ LINK_PROPS_PERMISSIONS_SF_TC = replace(
     ],
     expected_policy=[
         {
-            "actions": ["dynamodb:Query", "dynamodb:GetItem"],
-            "resources": ["arn:aws:dynamodb:us-east-1:123456789012:table/my-table"],
+            "Effect": "Allow",
+            "Action": ["dynamodb:Query", "dynamodb:GetItem"],
+            "Resource": ["arn:aws:dynamodb:us-east-1:123456789012:table/my-table"],
         }
     ],
 )
@@ -403,7 +414,7 @@ def _assert_iam_policy(pulumi_mocks, test_case: FunctionTestCase):
     if test_case.expected_policy:
         assert len(policies) == 1, "Expected 1 policy to be created"
         policy_args = policies[0]
-        policy_str = json.dumps(test_case.expected_policy)
+        policy_str = json.dumps({"Version": "2012-10-17", "Statement": test_case.expected_policy})
         assert policy_str == policy_args.inputs["policy"], "Policy content mismatch"
     else:
         assert len(policies) == 0, "Expected no policy to be created"
@@ -607,6 +618,461 @@ def test_function__(
     function.invoke_arn.apply(check_resources)
 
 
+@pulumi.runtime.test
+def test_function_with_auto_layer_leaves_out_layer_distributions(
+    mock_get_or_install_dependencies_function,
+    mock_get_or_install_dependencies_layer,
+    pulumi_mocks,
+    project_cwd,
+):
+    # Arrange
+    cache_dir = mock_get_or_install_dependencies_function.return_value
+    (cache_dir / "shared").mkdir(exist_ok=True)
+    (cache_dir / "shared" / "__init__.py").write_text("SHARED = 1\n")
+    function = Function("auto", handler="functions/simple.handler", requirements=["shared"])
+    layer = create_layer(name="auto-deps-1")
+    shared = InstalledDistribution(
+        key="shared-1.0-py3-none-any",
+        name="shared",
+        version="1.0",
+        files=(Path("shared/__init__.py"),),
+        size=11,
+    )
+    AutoLayersRegistry.add(function, layer, [shared])
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "auto")[0]
+        assert_function_layers(function_args, [expected_layer_arn("auto-deps-1")])
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            assert "shared/__init__.py" not in archive.namelist()
+            assert "dummy_installed_package" in archive.namelist()
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_function_with_slim_packages_slimmed_dependencies(
+    mock_get_or_install_dependencies_function, pulumi_mocks, project_cwd
+):
+    # Arrange
+    cache_dir = mock_get_or_install_dependencies_function.return_value
+    (cache_dir / "pkg" / "tests").mkdir(parents=True, exist_ok=True)
+    (cache_dir / "pkg" / "__init__.py").write_text("VALUE = 1\n")
+    (cache_dir / "pkg" / "__init__.pyi").write_text("VALUE: int\n")
+    (cache_dir / "pkg" / "tests" / "test_pkg.py").write_text("def test(): ...\n")
+    function = Function(
+        "slim", handler="functions/simple.handler", requirements=["pkg"], slim=True
+    )
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "slim")[0]
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            names = archive.namelist()
+        assert "pkg/__init__.py" in names
+        assert "pkg/__init__.pyi" not in names
+        assert "pkg/tests/test_pkg.py" not in names
+        # Original install is kept for functions without slimming
+        assert (cache_dir / "pkg" / "__init__.pyi").is_file()
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_function_with_precompile_ships_bytecode(
+    mock_get_or_install_dependencies_function, pulumi_mocks, project_cwd
+):
+    # Arrange
+    cache_dir = mock_get_or_install_dependencies_function.return_value
+    (cache_dir / "pkg").mkdir(parents=True, exist_ok=True)
+    (cache_dir / "pkg" / "__init__.py").write_text("VALUE = 1\n")
+    runtime = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    cache_tag = sys.implementation.cache_tag
+    function = Function(
+        "precompiled",
+        handler="functions/simple.handler",
+        requirements=["pkg"],
+        runtime=runtime,
+        precompile=True,
+    )
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "precompiled")[0]
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            names = archive.namelist()
+        assert f"__pycache__/simple.{cache_tag}.pyc" in names
+        assert f"pkg/__pycache__/__init__.{cache_tag}.pyc" in names
+        assert not (cache_dir / "pkg" / "__pycache__").exists()
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+def test_function_exceeding_size_budget_fails_before_creating_resources(
+    mock_get_or_install_dependencies_function, pulumi_mocks, project_cwd
+):
+    # Arrange
+    cache_dir = mock_get_or_install_dependencies_function.return_value
+    (cache_dir / "pkg").mkdir(parents=True, exist_ok=True)
+    (cache_dir / "pkg" / "data.bin").write_bytes(b"#" * 20_000)
+    function = Function(
+        "oversized",
+        handler="functions/simple.handler",
+        requirements=["pkg"],
+        size_budget={"max_unzipped_mb": 0.01},
+    )
+
+    # Act & Assert
+    with pytest.raises(StelvioValidationError, match="Function 'oversized' is too large"):
+        _ = function.resources
+    assert pulumi_mocks.created_roles() == []
+
+
+@pulumi.runtime.test
+def test_function_with_tree_shake_packages_imported_modules(pulumi_mocks, project_cwd):
+    # Arrange
+    folder = project_cwd / "functions" / "folder"
+    (folder / "handler.py").write_text("import helpers\ndef process(event, context): ...\n")
+    (folder / "helpers.py").write_text("VALUE = 1\n")
+    (folder / "config.json").write_text("{}")
+    function = Function(
+        "shaken",
+        handler="functions/folder::handler.process",
+        tree_shake={"include": ["*.json"]},
+    )
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "shaken")[0]
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            assert set(archive.namelist()) == {"config.json", "handler.py", "helpers.py"}
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_function_with_provisioned_concurrency_invokes_live_alias(pulumi_mocks, project_cwd):
+    # Arrange
+    function = Function(
+        "warm", handler="functions/simple.handler", provisioned_concurrency=3, url="public"
+    )
+
+    # Assert
+    def check_resources(invoke_arn):
+        assert pulumi_mocks.created_functions(TP + "warm")[0].inputs["publish"] is True
+        alias = pulumi_mocks.created_aliases(TP + "warm-alias")[0]
+        assert alias.inputs == {
+            "name": "live",
+            "functionName": TP + "warm-test-name",
+            "functionVersion": "1",
+        }
+        provisioned = pulumi_mocks.created_provisioned_concurrency_configs(TP + "warm-pc")[0]
+        assert provisioned.inputs == {
+            "functionName": TP + "warm-test-name",
+            "qualifier": "live",
+            "provisionedConcurrentExecutions": 3,
+        }
+        assert pulumi_mocks.created_function_urls()[0].inputs["qualifier"] == "live"
+        assert invoke_arn.endswith(f"function:{TP}warm-test-name:live/invocations")
+        assert pulumi_mocks.created_scaling_targets() == []
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_function_with_provisioned_concurrency_auto_scaling(pulumi_mocks, project_cwd):
+    # Arrange
+    function = Function(
+        "scaled",
+        handler="functions/simple.handler",
+        provisioned_concurrency={"min_capacity": 2, "max_capacity": 10},
+        tags={"Team": "platform"},
+    )
+
+    # Assert
+    def check_resources(_):
+        assert pulumi_mocks.created_provisioned_concurrency_configs() == []
+        target = pulumi_mocks.created_scaling_targets(TP + "scaled-pc-target")[0]
+        assert target.inputs == {
+            "serviceNamespace": "lambda",
+            "scalableDimension": "lambda:function:ProvisionedConcurrency",
+            "resourceId": f"function:{TP}scaled-test-name:live",
+            "minCapacity": 2,
+            "maxCapacity": 10,
+            "tags": {"Team": "platform"},
+        }
+        policy = pulumi_mocks.created_scaling_policies(TP + "scaled-pc-policy")[0]
+        assert policy.inputs["policyType"] == "TargetTrackingScaling"
+        assert policy.inputs["resourceId"] == f"function:{TP}scaled-test-name:live"
+        assert policy.inputs["targetTrackingScalingPolicyConfiguration"] == {
+            "targetValue": 0.7,
+            "predefinedMetricSpecification": {
+                "predefinedMetricType": "LambdaProvisionedConcurrencyUtilization"
+            },
+        }
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_function_with_snap_start_publishes_versions(pulumi_mocks, project_cwd):
+    # Arrange
+    function = Function("snappy", handler="functions/simple.handler", snap_start=True)
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "snappy")[0]
+        assert function_args.inputs["publish"] is True
+        assert function_args.inputs["snapStart"] == {"applyOn": "PublishedVersions"}
+        assert len(pulumi_mocks.created_aliases(TP + "snappy-alias")) == 1
+        assert pulumi_mocks.created_provisioned_concurrency_configs() == []
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            resources_file = archive.read("stlv_resources.py").decode()
+        assert "def after_restore(func):" in resources_file
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_warmed_function_answers_pings_through_wrapper(pulumi_mocks, project_cwd):
+    # Arrange
+    function = Function("warmed", handler="functions/simple.handler", warm={"concurrency": 4})
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "warmed")[0]
+        assert function_args.inputs["handler"] == "stlv_warm.handler"
+        assert function_args.inputs["environment"]["variables"]["STLV_WARM_HANDLER"] == (
+            "simple.handler"
+        )
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            assert "stlv_warm.py" in archive.namelist()
+        warm_policy = pulumi_mocks.created_role_policies(TP + "warmed-warm-p")[0]
+        statement = json.loads(warm_policy.inputs["policy"])["Statement"][0]
+        assert statement["Action"] == "lambda:InvokeFunction"
+        assert statement["Resource"][1].endswith(f"function:{TP}warmed-test-name:*")
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_function_warmed_once_does_not_invoke_itself(pulumi_mocks, project_cwd):
+    # Arrange
+    function = Function("warmed", handler="functions/simple.handler", warm=True)
+
+    # Assert
+    def check_resources(_):
+        assert function.resources.warm_policy is None
+        assert pulumi_mocks.created_role_policies() == []
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+ASYNC_HANDLER_SOURCE = """import asyncio
+import threading
+
+
+async def handler(event, context):
+    await asyncio.sleep(0)
+    return {"statusCode": 200, "thread": threading.current_thread().name}
+"""
+
+
+@pulumi.runtime.test
+def test_async_handler_runs_through_event_loop_wrapper(pulumi_mocks, project_cwd):
+    # Arrange
+    (project_cwd / "functions" / "async_handler.py").write_text(ASYNC_HANDLER_SOURCE)
+    function = Function("async-fn", handler="functions/async_handler.handler")
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "async-fn")[0]
+        assert function_args.inputs["handler"] == "stlv_async.handler"
+        variables = function_args.inputs["environment"]["variables"]
+        assert variables["STLV_ASYNC_HANDLER"] == "async_handler.handler"
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            assert "stlv_async.py" in archive.namelist()
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_warmed_async_handler_chains_wrappers(pulumi_mocks, project_cwd):
+    # Arrange
+    (project_cwd / "functions" / "async_handler.py").write_text(ASYNC_HANDLER_SOURCE)
+    function = Function("async-fn", handler="functions/async_handler.handler", warm=True)
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "async-fn")[0]
+        assert function_args.inputs["handler"] == "stlv_warm.handler"
+        variables = function_args.inputs["environment"]["variables"]
+        assert variables["STLV_WARM_HANDLER"] == "stlv_async.handler"
+        assert variables["STLV_ASYNC_HANDLER"] == "async_handler.handler"
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_sync_handler_is_not_wrapped(pulumi_mocks, project_cwd):
+    # Arrange
+    (project_cwd / "functions" / "redefined.py").write_text(
+        "async def handler(event, context):\n    pass\n\n\n"
+        "def handler(event, context):\n    pass\n"
+    )
+    function = Function("sync-fn", handler="functions/redefined.handler")
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "sync-fn")[0]
+        assert function_args.inputs["handler"] == "redefined.handler"
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            assert "stlv_async.py" not in archive.namelist()
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+def test_dev_bridge_awaits_async_handler_on_its_loop(pulumi_mocks, project_cwd):
+    (project_cwd / "functions" / "async_handler.py").write_text(ASYNC_HANDLER_SOURCE)
+    function = Function("async-fn", handler="functions/async_handler.handler")
+    lambda_context = {
+        "invoke_id": "req-123",
+        "client_context": None,
+        "cognito_identity": None,
+        "epoch_deadline_time_in_ms": 0,
+        "invoked_function_arn": "arn:aws:lambda:us-east-1:123456789012:function:async-fn",
+        "tenant_id": None,
+    }
+    data = {"event": json.dumps({"event": {"path": "/items"}, "context": lambda_context})}
+
+    result = asyncio.run(function._handle_bridge_event(data))
+
+    assert result.error_result is None
+    assert result.success_result == {
+        "statusCode": 200,
+        "thread": threading.current_thread().name,
+    }
+    assert result.request_path == "/items"
+
+
+@pulumi.runtime.test
+def test_function_with_metrics_ships_metrics_module(pulumi_mocks, project_cwd):
+    # Arrange
+    function = Function("measured", handler="functions/simple.handler", metrics=True)
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "measured")[0]
+        variables = function_args.inputs["environment"]["variables"]
+        assert variables["STLV_APP_NAME"] == "test"
+        assert variables["STLV_STAGE"] == "test"
+        assert variables["STLV_FUNCTION_NAME"] == "measured"
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            metrics_module = archive.read("stlv_metrics.py").decode()
+        assert "def instrument(handler" in metrics_module
+        assert (project_cwd / "functions" / "stlv_metrics.py").read_text() == metrics_module
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_function_without_metrics_has_no_metrics_module(pulumi_mocks, project_cwd):
+    # Arrange
+    function = Function("plain", handler="functions/simple.handler")
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "plain")[0]
+        assert "STLV_FUNCTION_NAME" not in function_args.inputs["environment"]["variables"]
+        with zipfile.ZipFile(function_args.inputs["code"].path) as archive:
+            assert "stlv_metrics.py" not in archive.namelist()
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_metrics_module_is_removed_once_no_function_in_folder_has_metrics(
+    pulumi_mocks, project_cwd
+):
+    # Arrange
+    metrics_file = project_cwd / "functions" / "stlv_metrics.py"
+    metrics_file.write_text("# left over from an earlier deploy\n")
+    function = Function("plain", handler="functions/simple.handler")
+
+    # Assert
+    def check_resources(_):
+        assert not metrics_file.exists()
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_metrics_module_is_kept_while_a_function_in_folder_has_metrics(pulumi_mocks, project_cwd):
+    # Arrange
+    Function("measured", handler="functions/simple2.handler", metrics=True)
+    function = Function("plain", handler="functions/simple.handler")
+
+    # Assert
+    def check_resources(_):
+        assert (project_cwd / "functions" / "stlv_metrics.py").exists()
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_function_without_provisioned_concurrency_has_no_alias(pulumi_mocks, project_cwd):
+    # Arrange
+    function = Function("plain", handler="functions/simple.handler")
+
+    # Assert
+    def check_resources(_):
+        assert "publish" not in pulumi_mocks.created_functions(TP + "plain")[0].inputs
+        assert pulumi_mocks.created_aliases() == []
+        assert function.qualifier is None
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_function_with_staged_artifacts_references_code_in_bucket(pulumi_mocks, project_cwd):
+    # Arrange
+    stager = MagicMock(bucket="stlv-state-test")
+    stager.stage.return_value = "artifacts/test/abc.zip"
+    with patch("stelvio.aws._packaging.staging._artifact_stager", stager):
+        function = Function("staged", handler="functions/simple.handler")
+        _ = function.resources
+
+    # Assert
+    def check_resources(_):
+        function_args = pulumi_mocks.created_functions(TP + "staged")[0]
+        assert "code" not in function_args.inputs
+        assert function_args.inputs["s3Bucket"] == "stlv-state-test"
+        assert function_args.inputs["s3Key"] == "artifacts/test/abc.zip"
+        (artifact_path, _log_context) = stager.stage.call_args.args
+        assert artifact_path.suffix == ".zip"
+
+    # Act
+    function.invoke_arn.apply(check_resources)
+
+
 @pytest.mark.parametrize(
     "test_case_set",
     [
@@ -1035,18 +1501,59 @@ def test_function_to_function_link(pulumi_mocks, project_cwd):
         assert len(policies) == 1
 
         policy_content = json.loads(policies[0].inputs["policy"])
-        assert len(policy_content) == 1
+        assert len(policy_content["Statement"]) == 1
 
-        statement = policy_content[0]
-        assert statement["actions"] == ["lambda:InvokeFunction"]
+        statement = policy_content["Statement"][0]
+        assert statement["Action"] == ["lambda:InvokeFunction"]
 
         # Resource should be target function's ARN
         expected_target_arn = FUNCTION_ARN_TEMPLATE.format(name=TP + "target-function-test-name")
-        assert statement["resources"] == [expected_target_arn]
+        assert statement["Resource"] == [expected_target_arn]
 
     caller.invoke_arn.apply(verify_caller_policy)
 
 
+@pulumi.runtime.test
+def test_function_policy_over_size_limit_is_split(pulumi_mocks, project_cwd):
+    tables = [f"arn:aws:dynamodb:us-east-1:123456789012:table/table-{i:03}" for i in range(150)]
+    function = Function(
+        "many-tables",
+        handler="functions/simple.handler",
+        links=[
+            Link(
+                "tables",
+                properties={},
+                permissions=[AwsPermission(actions=["dynamodb:GetItem"], resources=tables)],
+            )
+        ],
+    )
+
+    def check_policies(_):
+        first = pulumi_mocks.created_policies(TP + "many-tables-p")
+        second = pulumi_mocks.created_policies(TP + "many-tables-p2")
+        assert len(first) == 1
+        assert len(second) == 1
+        statements = [
+            statement
+            for policy in (first[0], second[0])
+            for statement in json.loads(policy.inputs["policy"])["Statement"]
+        ]
+        assert [r for statement in statements for r in statement["Resource"]] == tables
+        for policy in (first[0], second[0]):
+            assert len(policy.inputs["policy"].replace(" ", "")) <= 6144
+
+        attachments = pulumi_mocks.created_role_policy_attachments()
+        assert sorted(a.name for a in attachments) == [
+            TP + "many-tables-basic-execution-r-p-attachment",
+            TP + "many-tables-default-r-p-attachment",
+            TP + "many-tables-default-r-p-attachment-2",
+        ]
+        assert function.resources.policy is not None
+        assert len(function.resources.additional_policies) == 1
+
+    function.invoke_arn.apply(check_policies)
+
+
 @pulumi.runtime.test
 def test_function_to_function_link_env_vars(pulumi_mocks, project_cwd):
     """Test that linking to a function creates correct environment variables."""
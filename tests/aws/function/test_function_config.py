@@ -8,7 +8,9 @@ from stelvio.aws.function import (
     FunctionConfigDict,
     FunctionUrlConfig,
     FunctionUrlConfigDict,
+    WarmConfig,
 )
+from stelvio.aws.function.config import normalize_warm_config
 from stelvio.aws.function.constants import DEFAULT_ARCHITECTURE, DEFAULT_RUNTIME
 from stelvio.aws.layer import Layer
 
@@ -403,3 +405,171 @@ def test_function_config_url_with_dict():
     url_dict = {"auth": "iam", "cors": True}
     config = FunctionConfig(handler="functions/simple.handler", url=url_dict)
     assert config.url == url_dict
+
+
+@pytest.mark.parametrize(
+    ("slim", "error_type", "error_match"),
+    [
+        ("yes", TypeError, "'slim' must be a bool, SlimConfig or SlimConfigDict"),
+        ({"deny": "*/docs"}, TypeError, "deny must be a list of glob patterns"),
+        ({"allow": [""]}, ValueError, "Each allow pattern must be a non-empty string"),
+        ({"use_defaults": "no"}, TypeError, "use_defaults must be a boolean"),
+    ],
+    ids=["not_bool_or_config", "deny_not_list", "empty_allow_pattern", "use_defaults_not_bool"],
+)
+def test_function_config_invalid_slim(slim, error_type, error_match):
+    with pytest.raises(error_type, match=error_match):
+        FunctionConfig(handler="functions/simple.handler", slim=slim)
+
+
+def test_function_config_invalid_precompile():
+    with pytest.raises(TypeError, match="'precompile' must be a boolean"):
+        FunctionConfig(handler="functions/simple.handler", precompile="yes")
+
+
+def test_function_config_invalid_metrics():
+    with pytest.raises(TypeError, match="'metrics' must be a boolean"):
+        FunctionConfig(handler="functions/simple.handler", metrics="yes")
+
+
+@pytest.mark.parametrize(
+    ("compression_level", "error_type", "error_match"),
+    [
+        (True, TypeError, "'compression_level' must be an integer"),
+        ("9", TypeError, "'compression_level' must be an integer"),
+        (-1, ValueError, "'compression_level' must be between 0"),
+        (10, ValueError, "'compression_level' must be between 0"),
+    ],
+)
+def test_function_config_invalid_compression_level(compression_level, error_type, error_match):
+    with pytest.raises(error_type, match=error_match):
+        FunctionConfig(handler="functions/simple.handler", compression_level=compression_level)
+
+
+@pytest.mark.parametrize(
+    ("size_budget", "error_type", "error_match"),
+    [
+        ("10", TypeError, "'size_budget' must be a SizeBudgetConfig or SizeBudgetConfigDict"),
+        ({"max_zipped_mb": "10"}, TypeError, "max_zipped_mb must be a number"),
+        ({"max_unzipped_mb": 0}, ValueError, "max_unzipped_mb must be greater than 0"),
+    ],
+)
+def test_function_config_invalid_size_budget(size_budget, error_type, error_match):
+    with pytest.raises(error_type, match=error_match):
+        FunctionConfig(handler="functions/simple.handler", size_budget=size_budget)
+
+
+@pytest.mark.parametrize(
+    ("provisioned_concurrency", "error_type", "error_match"),
+    [
+        (True, TypeError, "'provisioned_concurrency' must be an integer, not a boolean"),
+        (0, ValueError, "'provisioned_concurrency' must be at least 1"),
+        ("5", TypeError, "'provisioned_concurrency' must be an integer, ProvisionedConcurrency"),
+        ({"min_capacity": 0, "max_capacity": 2}, ValueError, "min_capacity must be at least 1"),
+        ({"min_capacity": 3, "max_capacity": 2}, ValueError, "cannot be greater than"),
+        (
+            {"min_capacity": 1, "max_capacity": 2, "target_utilization": 1},
+            ValueError,
+            "target_utilization must be between 0 and 1",
+        ),
+    ],
+)
+def test_function_config_invalid_provisioned_concurrency(
+    provisioned_concurrency, error_type, error_match
+):
+    with pytest.raises(error_type, match=error_match):
+        FunctionConfig(
+            handler="functions/simple.handler", provisioned_concurrency=provisioned_concurrency
+        )
+
+
+@pytest.mark.parametrize(
+    ("opts", "error_type", "error_match"),
+    [
+        ({"snap_start": "yes"}, TypeError, "'snap_start' must be a boolean"),
+        (
+            {"snap_start": True, "provisioned_concurrency": 2},
+            ValueError,
+            "'snap_start' cannot be combined with 'provisioned_concurrency'",
+        ),
+    ],
+)
+def test_function_config_invalid_snap_start(opts, error_type, error_match):
+    with pytest.raises(error_type, match=error_match):
+        FunctionConfig(handler="functions/simple.handler", **opts)
+
+
+def test_function_config_snap_start_rejects_unsupported_runtime(monkeypatch):
+    monkeypatch.setattr("stelvio.aws.function.config.SNAP_START_RUNTIMES", ("python3.13",))
+
+    with pytest.raises(ValueError, match=r"SnapStart is not supported for runtime 'python3\.12'"):
+        FunctionConfig(handler="functions/simple.handler", runtime="python3.12", snap_start=True)
+
+
+@pytest.mark.parametrize(
+    ("reserved_concurrency", "error_type", "error_match"),
+    [
+        (True, TypeError, "'reserved_concurrency' must be an integer"),
+        (2.5, TypeError, "'reserved_concurrency' must be an integer"),
+        (-1, ValueError, "'reserved_concurrency' cannot be negative"),
+    ],
+)
+def test_function_config_invalid_reserved_concurrency(
+    reserved_concurrency, error_type, error_match
+):
+    with pytest.raises(error_type, match=error_match):
+        FunctionConfig(
+            handler="functions/simple.handler", reserved_concurrency=reserved_concurrency
+        )
+
+
+@pytest.mark.parametrize(
+    ("warm", "error_type", "error_match"),
+    [
+        ("yes", TypeError, "'warm' must be a bool, WarmConfig or WarmConfigDict"),
+        ({"concurrency": 0}, ValueError, "concurrency must be at least 1"),
+        ({"concurrency": 2.0}, TypeError, "concurrency must be an integer"),
+        ({"rate": "5 fortnights"}, ValueError, "Invalid rate expression"),
+    ],
+)
+def test_function_config_invalid_warm(warm, error_type, error_match):
+    with pytest.raises(error_type, match=error_match):
+        FunctionConfig(handler="functions/simple.handler", warm=warm)
+
+
+def test_warm_config_defaults():
+    warm = normalize_warm_config(True)
+
+    assert warm == WarmConfig(concurrency=1, rate="5 minutes")
+    assert warm.schedule == "rate(5 minutes)"
+    assert normalize_warm_config(False) is None
+
+
+def test_function_config_publishes_versions_with_provisioned_concurrency():
+    assert not FunctionConfig(handler="functions/simple.handler").publishes_versions
+    assert FunctionConfig(
+        handler="functions/simple.handler", provisioned_concurrency=2
+    ).publishes_versions
+    assert FunctionConfig(handler="functions/simple.handler", snap_start=True).publishes_versions
+
+
+@pytest.mark.parametrize(
+    ("tree_shake", "error_type", "error_match"),
+    [
+        ("yes", TypeError, "'tree_shake' must be a bool, TreeShakeConfig or TreeShakeConfigDict"),
+        ({"include": "*.json"}, TypeError, "include must be a list of glob patterns"),
+        ({"include": [" "]}, ValueError, "Each include pattern must be a non-empty string"),
+    ],
+    ids=["not_bool_or_config", "include_not_list", "empty_include_pattern"],
+)
+def test_function_config_invalid_tree_shake(tree_shake, error_type, error_match):
+    with pytest.raises(error_type, match=error_match):
+        FunctionConfig(handler="functions/simple.handler", tree_shake=tree_shake)
+
+
+def test_function_config_tree_shake_requires_folder():
+    with pytest.raises(ValueError, match="'tree_shake' only applies to folder-based functions"):
+        FunctionConfig(handler="functions/simple.handler", tree_shake=True)
+
+    assert FunctionConfig(handler="functions/simple.handler", tree_shake=False)
+    assert FunctionConfig(handler="functions/folder::handler.process", tree_shake=True)
@@ -1,27 +1,29 @@
 """Test that IAM functions use safe_name."""
 
+import json
 from unittest.mock import ANY, patch
 
-from pulumi_aws.iam import GetPolicyDocumentStatementArgs
+import pytest
 
 from stelvio import context
-from stelvio.aws.function.function import Function
+from stelvio.aws.function.function import Function, _check_policy_size
 from stelvio.aws.function.iam import _create_lambda_role
+from stelvio.aws.permission import AwsPermission
 
 
-@patch("stelvio.aws.function.function.get_policy_document")
+@patch("stelvio.aws.function.function.render_policy_document")
 @patch("stelvio.aws.function.function.Policy")
 @patch("stelvio.aws.function.function.safe_name", return_value="safe-policy-name")
-def test_policy_uses_safe_name(mock_safe_name, mock_policy, mock_get_policy_document):
-    # Create a Function instance (with mocked internals) to test _create_function_policy
+def test_policy_uses_safe_name(mock_safe_name, mock_policy, mock_render_policy_document):
+    # Create a Function instance (with mocked internals) to test _create_function_policies
     with patch.object(Function, "__init__", lambda self, *args, **kwargs: None):
         func = Function.__new__(Function)
         func._customize = {}  # Set up required attribute for _customizer method
         func._tags = {}
 
         # Act
-        statements = [GetPolicyDocumentStatementArgs(actions=["s3:GetObject"], resources=["arn"])]
-        func._create_function_policy("function-name", statements)
+        permissions = [AwsPermission(actions=["s3:GetObject"], resources=["arn"])]
+        func._create_function_policies("function-name", permissions)
 
         # Assert - verify safe_name was called with correct parameters
         mock_safe_name.assert_called_once_with(context().prefix(), "function-name", 128, "-p")
@@ -30,10 +32,49 @@ def test_policy_uses_safe_name(mock_safe_name, mock_policy, mock_get_policy_docu
         mock_policy.assert_called_once_with("safe-policy-name", path="/", policy=ANY, opts=ANY)
 
 
-@patch("stelvio.aws.function.iam.get_policy_document")
+@patch("stelvio.aws.function.function.render_policy_document")
+@patch("stelvio.aws.function.function.Policy")
+@patch("stelvio.aws.function.function.safe_name", side_effect=lambda *args: f"policy{args[3]}")
+def test_policies_over_size_limit_get_numbered_names(
+    mock_safe_name, mock_policy, mock_render_policy_document
+):
+    with patch.object(Function, "__init__", lambda self, *args, **kwargs: None):
+        func = Function.__new__(Function)
+        func._customize = {}
+        func._tags = {}
+
+        permissions = [
+            AwsPermission(
+                actions=[f"s3:Action{index}"],
+                resources=[f"arn:aws:s3:::bucket-{index}-{'x' * 40}/*"],
+            )
+            for index in range(60)
+        ]
+        policies = func._create_function_policies("function-name", permissions)
+
+        assert len(policies) == 2
+        assert [c.args[3] for c in mock_safe_name.call_args_list] == ["-p", "-p2"]
+        assert [c.args[0] for c in mock_policy.call_args_list] == ["policy-p", "policy-p2"]
+
+
+def test_resolved_policy_over_size_limit_fails():
+    statement = {"Effect": "Allow", "Action": ["s3:GetObject"], "Resource": ["arn"]}
+    small = json.dumps({"Version": "2012-10-17", "Statement": [statement]})
+    large = json.dumps(
+        {
+            "Version": "2012-10-17",
+            "Statement": [{**statement, "Resource": [f"arn:{'x' * 300}:{i}" for i in range(20)]}],
+        }
+    )
+
+    assert _check_policy_size("function-name", small, 1, 1) == small
+    with pytest.raises(ValueError, match="Function 'function-name': IAM policy 2/2 is"):
+        _check_policy_size("function-name", large, 2, 2)
+
+
 @patch("stelvio.aws.function.iam.Role")
 @patch("stelvio.aws.function.iam.safe_name", return_value="safe-role-name")
-def test_role_uses_safe_name(mock_safe_name, mock_role, mock_get_policy_document):
+def test_role_uses_safe_name(mock_safe_name, mock_role):
     # Act
     _create_lambda_role("function-name")
 
@@ -0,0 +1,132 @@
+import asyncio
+import importlib.util
+import inspect
+import json
+from types import ModuleType
+
+import pytest
+
+from stelvio.aws.function.resources_codegen import create_stlv_metrics_file_content
+from stelvio.project import get_stelvio_lib_root
+
+METRICS_MODULE_PATH = get_stelvio_lib_root() / "aws" / "function" / "stub" / "metrics.py"
+
+
+def _load_metrics(monkeypatch, **env) -> ModuleType:
+    monkeypatch.setenv("STLV_APP_NAME", "shop")
+    monkeypatch.setenv("STLV_STAGE", "prod")
+    monkeypatch.setenv("STLV_FUNCTION_NAME", "orders")
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    spec = importlib.util.spec_from_file_location("stlv_metrics", METRICS_MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def metrics(monkeypatch) -> ModuleType:
+    return _load_metrics(monkeypatch)
+
+
+def _documents(capsys) -> list[dict]:
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_codegen_returns_metrics_module():
+    assert create_stlv_metrics_file_content() == METRICS_MODULE_PATH.read_text()
+
+
+def test_flush_prints_buffered_metrics_as_one_emf_document(metrics, capsys):
+    metrics.put_metric("Orders", 1, "Count")
+    metrics.put_metric("Orders", 2, "Count")
+    metrics.put_metric("Total", 9.5)
+    metrics.flush()
+
+    [document] = _documents(capsys)
+    assert document["_aws"]["CloudWatchMetrics"] == [
+        {
+            "Namespace": "Stelvio",
+            "Dimensions": [["App", "Stage", "Function"]],
+            "Metrics": [{"Name": "Orders", "Unit": "Count"}, {"Name": "Total", "Unit": "None"}],
+        }
+    ]
+    assert document["App"] == "shop"
+    assert document["Stage"] == "prod"
+    assert document["Function"] == "orders"
+    assert document["Orders"] == [1, 2]
+    assert document["Total"] == 9.5
+
+    metrics.flush()
+    assert capsys.readouterr().out == ""
+
+
+def test_flush_splits_documents_at_emf_limits(metrics, capsys):
+    for index in range(150):
+        metrics.put_metric(f"Metric{index}", index)
+    for index in range(120):
+        metrics.put_metric("Latency", index, "Milliseconds")
+    metrics.flush()
+
+    documents = _documents(capsys)
+    assert [len(d["_aws"]["CloudWatchMetrics"][0]["Metrics"]) for d in documents] == [100, 51, 1]
+    assert len(documents[1]["Latency"]) == 100
+    assert len(documents[2]["Latency"]) == 20
+
+
+def test_instrument_records_duration_cold_start_and_errors(metrics, capsys):
+    @metrics.instrument
+    def handler(event, context):
+        if event == "fail":
+            raise ValueError(event)
+        with metrics.timed("Downstream"):
+            pass
+        return "ok"
+
+    assert handler("event", None) == "ok"
+    with pytest.raises(ValueError, match="fail"):
+        handler("fail", None)
+
+    first, second = _documents(capsys)
+    assert first["ColdStart"] == 1
+    assert first["Errors"] == 0
+    assert first["Downstream"] >= 0
+    assert first["Duration"] >= first["Downstream"]
+    assert second["ColdStart"] == 0
+    assert second["Errors"] == 1
+    assert "Downstream" not in second
+
+
+def test_instrument_keeps_async_handlers_async(metrics, capsys):
+    @metrics.instrument
+    async def handler(event, context):
+        await asyncio.sleep(0)
+        return event
+
+    assert inspect.iscoroutinefunction(handler)
+    assert asyncio.run(handler("event", None)) == "event"
+    [document] = _documents(capsys)
+    assert document["ColdStart"] == 1
+    assert document["Errors"] == 0
+
+
+def test_provisioned_environment_is_not_a_cold_start(monkeypatch, capsys):
+    metrics = _load_metrics(monkeypatch, AWS_LAMBDA_INITIALIZATION_TYPE="provisioned-concurrency")
+
+    metrics.instrument(lambda event, context: None)(None, None)
+
+    assert _documents(capsys)[0]["ColdStart"] == 0
+
+
+def test_disabled_metrics_leave_handler_alone(monkeypatch, capsys):
+    metrics = _load_metrics(monkeypatch, STLV_METRICS_DISABLED="true")
+
+    def handler(event, context):
+        metrics.put_metric("Orders", 1)
+        with metrics.timed("Downstream"):
+            return event
+
+    assert metrics.instrument(handler) is handler
+    assert handler("event", None) == "event"
+    metrics.flush()
+    assert capsys.readouterr().out == ""
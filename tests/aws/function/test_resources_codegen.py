@@ -1,8 +1,12 @@
+import sys
+from types import SimpleNamespace
+
 import pytest
 
 from stelvio.aws.function.resources_codegen import (
     _pascal_to_snake,
     _to_valid_python_class_name,
+    create_stlv_resource_file_content,
 )
 
 
@@ -37,3 +41,108 @@ def test_to_valid_python_class_name(input_name, expected):
 )
 def test_pascal_to_snake(input_name, expected):
     assert _pascal_to_snake(input_name) == expected
+
+
+def test_snap_start_hooks_are_generated_without_links():
+    content = create_stlv_resource_file_content({}, include_snap_start=True)
+
+    namespace = {}
+    exec(content, namespace)  # noqa: S102
+    calls = []
+    hook = namespace["after_restore"](lambda: calls.append("restored"))
+    hook()
+    assert calls == ["restored"]
+    assert callable(namespace["before_snapshot"])
+
+
+def test_no_content_without_links_cors_or_snap_start():
+    assert create_stlv_resource_file_content({}) is None
+
+
+class _FakeBoto3:
+    def __init__(self):
+        self.clients = []
+
+    def client(self, service, config):
+        self.clients.append((service, config))
+        return object()
+
+    def resource(self, service, config):
+        return SimpleNamespace(Table=lambda name: (service, name))
+
+
+@pytest.fixture
+def fake_boto3(monkeypatch):
+    boto3 = _FakeBoto3()
+    monkeypatch.setitem(sys.modules, "boto3", boto3)
+    config = SimpleNamespace(Config=dict)
+    monkeypatch.setitem(sys.modules, "botocore", SimpleNamespace(config=config))
+    monkeypatch.setitem(sys.modules, "botocore.config", config)
+    return boto3
+
+
+def test_linked_resources_get_clients_created_once_per_service(fake_boto3, monkeypatch):
+    monkeypatch.setenv("STLV_TODOS_TABLE_NAME", "todos-table")
+    content = create_stlv_resource_file_content(
+        {
+            "todos": ["table_arn", "table_name"],
+            "orders": ["table_arn", "table_name"],
+            "uploads": ["bucket_arn", "bucket_name"],
+        }
+    )
+
+    namespace = {}
+    exec(content, namespace)  # noqa: S102
+    resources = namespace["Resources"]
+
+    assert fake_boto3.clients == []
+    assert resources.todos.client is resources.orders.client
+    assert resources.todos.client is resources.todos.client
+    assert resources.uploads.client is not resources.todos.client
+    assert resources.todos.table == ("dynamodb", "todos-table")
+    assert [service for service, _ in fake_boto3.clients] == ["dynamodb", "s3"]
+    config = fake_boto3.clients[0][1]
+    assert config["tcp_keepalive"] is True
+    assert config["retries"]["mode"] == "adaptive"
+    assert config["max_pool_connections"] == 10
+
+
+def test_pool_size_comes_from_environment(fake_boto3, monkeypatch):
+    monkeypatch.setenv("STLV_MAX_POOL_CONNECTIONS", "32")
+    content = create_stlv_resource_file_content({"queue": ["queue_url", "queue_arn"]})
+
+    namespace = {}
+    exec(content, namespace)  # noqa: S102
+    namespace["Resources"].queue.client  # noqa: B018
+
+    assert fake_boto3.clients[0][0] == "sqs"
+    assert fake_boto3.clients[0][1]["max_pool_connections"] == 32
+
+
+def test_no_clients_for_links_of_unknown_resources():
+    content = create_stlv_resource_file_content({"settings": ["name", "timeout"]})
+
+    assert "_client" not in content
+    assert "TYPE_CHECKING" not in content
+
+
+def test_link_properties_win_over_client_accessors():
+    content = create_stlv_resource_file_content({"todos": ["table_name", "client", "table"]})
+
+    assert "def client(self) -> str:" in content
+    assert '-> "DynamoDBClient"' not in content
+    assert '-> "Table"' not in content
+
+
+def test_clients_are_reset_after_snap_start_restore(fake_boto3):
+    content = create_stlv_resource_file_content(
+        {"topic": ["topic_arn", "topic_name"]}, include_snap_start=True
+    )
+
+    namespace = {}
+    exec(content, namespace)  # noqa: S102
+    before = namespace["Resources"].topic.client
+    namespace["_reset_clients"]()
+
+    assert namespace["Resources"].topic.client is not before
+    assert [service for service, _ in fake_boto3.clients] == ["sns", "sns"]
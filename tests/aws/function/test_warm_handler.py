@@ -0,0 +1,78 @@
+import importlib.util
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from stelvio.project import get_stelvio_lib_root
+
+WARM_HANDLER_PATH = get_stelvio_lib_root() / "aws" / "function" / "stub" / "warm_handler.py"
+FUNCTION_ARN = "arn:aws:lambda:us-east-1:123456789012:function:api:live"
+
+
+class FakeLambdaClient:
+    def __init__(self):
+        self.invocations = []
+
+    def invoke(self, **kwargs):
+        self.invocations.append(kwargs)
+
+
+@pytest.fixture
+def warm_handler(tmp_path, monkeypatch) -> ModuleType:
+    (tmp_path / "orders").mkdir()
+    (tmp_path / "orders" / "handler.py").write_text(
+        "def process(event, context):\n    return {'handled': event}\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("STLV_WARM_HANDLER", "orders/handler.process")
+    spec = importlib.util.spec_from_file_location("stlv_warm", WARM_HANDLER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    sys.modules.pop("orders.handler", None)
+    sys.modules.pop("orders", None)
+
+
+def test_passes_other_events_to_handler(warm_handler):
+    assert warm_handler.handler({"id": 1}, None) == {"handled": {"id": 1}}
+    assert warm_handler.handler([1], None) == {"handled": [1]}
+
+
+def test_answers_single_warm_ping_without_handler(warm_handler):
+    warm_handler._lambda_client = FakeLambdaClient()
+
+    assert warm_handler.handler({"stlv_warm": {"concurrency": 1}}, None) == {"warm": True}
+    assert warm_handler._lambda_client.invocations == []
+
+
+def test_fans_out_warm_ping_to_concurrent_self_invocations(warm_handler):
+    warm_handler._lambda_client = FakeLambdaClient()
+    context = SimpleNamespace(invoked_function_arn=FUNCTION_ARN)
+
+    assert warm_handler.handler({"stlv_warm": {"concurrency": 3}}, context) == {"warm": True}
+
+    invocations = warm_handler._lambda_client.invocations
+    assert len(invocations) == 2
+    assert all(invocation["FunctionName"] == FUNCTION_ARN for invocation in invocations)
+    assert invocations[0]["Payload"] == b'{"stlv_warm": {"fanned_out": true}}'
+
+
+def test_fanned_out_ping_holds_environment_without_fanning_out(warm_handler, monkeypatch):
+    warm_handler._lambda_client = FakeLambdaClient()
+    sleeps = []
+    monkeypatch.setattr(warm_handler.time, "sleep", sleeps.append)
+
+    warm_handler.handler({"stlv_warm": {"fanned_out": True}}, None)
+
+    assert sleeps == [warm_handler.FAN_OUT_HOLD_SECONDS]
+    assert warm_handler._lambda_client.invocations == []
+
+
+def test_warm_ping_ends_cold_start_of_metrics(warm_handler, monkeypatch):
+    metrics = SimpleNamespace(cold_start=True)
+    monkeypatch.setitem(sys.modules, "stlv_metrics", metrics)
+
+    warm_handler.handler({"stlv_warm": {"concurrency": 1}}, None)
+
+    assert metrics.cold_start is False
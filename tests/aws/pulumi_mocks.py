@@ -1,4 +1,3 @@
-import json
 from typing import Any
 
 import pulumi_cloudflare
@@ -30,6 +29,9 @@ class PulumiTestMocks(Mocks):
     def __init__(self):
         super().__init__()
         self.created_resources: list[MockResourceArgs] = []
+        # Provider invokes (data sources) made by the program, each a round trip into
+        # the provider outside of tests
+        self.calls: list[MockCallArgs] = []
 
     def new_resource(self, args: MockResourceArgs) -> tuple[str, dict[str, Any]]:  # noqa: PLR0912 C901 PLR0915
         self.created_resources.append(args)
@@ -47,6 +49,15 @@ class PulumiTestMocks(Mocks):
             output_props["invoke_arn"] = (
                 f"arn:aws:apigateway:{region}:lambda:path/2015-03-31/functions/{arn}/invocations"
             )
+            output_props["version"] = "1" if args.inputs.get("publish") else "$LATEST"
+        elif args.typ == "aws:lambda/alias:Alias":
+            function_name, alias_name = args.inputs["functionName"], args.inputs["name"]
+            arn = f"arn:aws:lambda:{region}:{account_id}:function:{function_name}:{alias_name}"
+            output_props["name"] = alias_name
+            output_props["arn"] = arn
+            output_props["invoke_arn"] = (
+                f"arn:aws:apigateway:{region}:lambda:path/2015-03-31/functions/{arn}/invocations"
+            )
         elif args.typ == "aws:lambda/functionUrl:FunctionUrl":
             output_props["function_url"] = f"https://{resource_id}.lambda-url.{region}.on.aws/"
         # IAM resources
@@ -243,9 +254,7 @@ class PulumiTestMocks(Mocks):
 
     def call(self, args: MockCallArgs) -> tuple[dict, list[tuple[str, str]] | None]:
         # print(f"CALL:  {args.token} {args.args}\n")
-        if args.token == "aws:iam/getPolicyDocument:getPolicyDocument":  # noqa: S105
-            statements_str = json.dumps(args.args["statements"])
-            return {"json": statements_str}, []
+        self.calls.append(args)
         if args.token == "aws:index/getCallerIdentity:getCallerIdentity":  # noqa: S105
             return {
                 "accountId": ACCOUNT_ID,
@@ -271,6 +280,22 @@ class PulumiTestMocks(Mocks):
     def created_function_urls(self, name: str | None = None) -> list[MockResourceArgs]:
         return self._filter_created("aws:lambda/functionUrl:FunctionUrl", name)
 
+    def created_aliases(self, name: str | None = None) -> list[MockResourceArgs]:
+        return self._filter_created("aws:lambda/alias:Alias", name)
+
+    def created_provisioned_concurrency_configs(
+        self, name: str | None = None
+    ) -> list[MockResourceArgs]:
+        return self._filter_created(
+            "aws:lambda/provisionedConcurrencyConfig:ProvisionedConcurrencyConfig", name
+        )
+
+    def created_scaling_targets(self, name: str | None = None) -> list[MockResourceArgs]:
+        return self._filter_created("aws:appautoscaling/target:Target", name)
+
+    def created_scaling_policies(self, name: str | None = None) -> list[MockResourceArgs]:
+        return self._filter_created("aws:appautoscaling/policy:Policy", name)
+
     def created_role_policy_attachments(self, name: str | None = None) -> list[MockResourceArgs]:
         return self._filter_created("aws:iam/rolePolicyAttachment:RolePolicyAttachment", name)
 
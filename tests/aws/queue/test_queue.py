@@ -155,21 +155,22 @@ def verify_function_sqs_permissions(pulumi_mocks, function_mock, expected_queue_
     assert function_policy is not None, f"IAM policy not found for function {function_mock.name}"
 
     # Parse the policy document and verify it contains the expected SQS permissions
-    actual_statements = json.loads(function_policy.inputs["policy"])
+    actual_statements = json.loads(function_policy.inputs["policy"])["Statement"]
 
     # Expected policy should contain SQS permissions
     expected_sqs_statement = {
-        "actions": [
+        "Effect": "Allow",
+        "Action": [
             "sqs:ReceiveMessage",
             "sqs:DeleteMessage",
             "sqs:GetQueueAttributes",
         ],
-        "resources": [expected_queue_arn],
+        "Resource": [expected_queue_arn],
     }
 
     # Find the SQS statement in actual policy
     sqs_statements = [
-        stmt for stmt in actual_statements if "sqs:ReceiveMessage" in stmt.get("actions", [])
+        stmt for stmt in actual_statements if "sqs:ReceiveMessage" in stmt.get("Action", [])
     ]
     sqs_statement = sqs_statements[0] if sqs_statements else None
 
@@ -602,6 +603,20 @@ def test_subscription_function_config_opts(pulumi_mocks):
     pulumi.Output.all([queue.arn, esm.arn]).apply(check_dict_unpacked)
 
 
+@pulumi.runtime.test
+def test_subscription_passes_reserved_concurrency_to_function(pulumi_mocks):
+    queue = Queue("reserved")
+
+    subscription = queue.subscribe("test", USERS_HANDLER, reserved_concurrency=5)
+
+    def check_reserved(_):
+        functions = pulumi_mocks.created_functions()
+        assert len(functions) == 1
+        assert functions[0].inputs["reservedConcurrentExecutions"] == 5
+
+    subscription.resources.event_source_mapping.arn.apply(check_reserved)
+
+
 @pulumi.runtime.test
 def test_subscription_link_merging(pulumi_mocks):
     """Test that user-provided links are properly merged with mandatory SQS permissions."""
@@ -971,9 +971,9 @@ def test_notify_function_with_links(pulumi_mocks):
         fn_policy = next((p for p in policies if "test-bucket-on-upload" in p.name), None)
         assert fn_policy is not None, "IAM policy not found for function"
 
-        policy_doc = json.loads(fn_policy.inputs["policy"])
+        policy_doc = json.loads(fn_policy.inputs["policy"])["Statement"]
         dynamo_statements = [
-            s for s in policy_doc if any("dynamodb:" in a for a in s.get("actions", []))
+            s for s in policy_doc if any("dynamodb:" in a for a in s.get("Action", []))
         ]
         # Should have exactly 2 statements for one table: table operations + index operations
         assert len(dynamo_statements) == 2, (
@@ -983,11 +983,11 @@ def test_notify_function_with_links(pulumi_mocks):
         table_statements = [
             s
             for s in dynamo_statements
-            if any("dynamodb:GetItem" in a for a in s.get("actions", []))
+            if any("dynamodb:GetItem" in a for a in s.get("Action", []))
         ]
         assert len(table_statements) == 1, "Expected 1 statement with table operations"
         # Verify concrete DynamoDB actions are present in the table statement
-        dynamo_actions = table_statements[0].get("actions", [])
+        dynamo_actions = table_statements[0].get("Action", [])
         expected_actions = {
             "dynamodb:GetItem",
             "dynamodb:PutItem",
@@ -1033,9 +1033,9 @@ def test_notify_function_merges_links_with_config_links(pulumi_mocks):
         fn_policy = next((p for p in policies if "test-bucket-on-upload" in p.name), None)
         assert fn_policy is not None, "IAM policy not found for function"
 
-        policy_doc = json.loads(fn_policy.inputs["policy"])
+        policy_doc = json.loads(fn_policy.inputs["policy"])["Statement"]
         dynamo_statements = [
-            s for s in policy_doc if any("dynamodb:" in a for a in s.get("actions", []))
+            s for s in policy_doc if any("dynamodb:" in a for a in s.get("Action", []))
         ]
         # Should have exactly 4 statements: 2 per table (table operations + index operations)
         assert len(dynamo_statements) == 4, (
@@ -1045,7 +1045,7 @@ def test_notify_function_merges_links_with_config_links(pulumi_mocks):
         table_statements = [
             s
             for s in dynamo_statements
-            if any("dynamodb:GetItem" in a for a in s.get("actions", []))
+            if any("dynamodb:GetItem" in a for a in s.get("Action", []))
         ]
         assert len(table_statements) == 2, (
             f"Expected 2 table operation statements (one per table), found {len(table_statements)}"
@@ -287,17 +287,17 @@ def test_s3_bucket_access_public_pab_created_with_false_flags_and_policy(pulumi_
         policy_json = policy.inputs["policy"]
         policy_doc = json.loads(policy_json)
 
-        assert len(policy_doc) == 1  # Should have one statement
-        statement = policy_doc[0]
+        assert len(policy_doc["Statement"]) == 1  # Should have one statement
+        statement = policy_doc["Statement"][0]
 
-        assert statement["effect"] == "Allow"
-        assert statement["principals"] == [{"type": "*", "identifiers": ["*"]}]
-        assert statement["actions"] == ["s3:GetObject"]
+        assert statement["Effect"] == "Allow"
+        assert statement["Principal"] == "*"
+        assert statement["Action"] == ["s3:GetObject"]
 
         # Resource should reference the bucket ARN with /*
         expected_bucket_arn = f"arn:aws:s3:::{tn(TP + 'test-bucket')}"
         expected_resource = f"{expected_bucket_arn}/*"
-        assert statement["resources"] == [expected_resource]
+        assert statement["Resource"] == [expected_resource]
 
     # Use the bucket policy ID and PAB ID to trigger the check after all resources are created
     pulumi.Output.all(
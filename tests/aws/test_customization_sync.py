@@ -50,6 +50,7 @@ from stelvio.aws.topic import (
     TopicSubscriptionCustomizationDict,
     TopicSubscriptionResources,
 )
+from stelvio.aws.warmer import WarmerCustomizationDict, WarmerResources
 from tests.test_utils import assert_resources_matches_customization_dict
 
 
@@ -139,6 +140,13 @@ from tests.test_utils import assert_resources_matches_customization_dict
             None,
             id="Cron",
         ),
+        pytest.param(
+            WarmerResources,
+            WarmerCustomizationDict,
+            None,
+            None,
+            id="Warmer",
+        ),
         pytest.param(
             EmailResources,
             EmailCustomizationDict,
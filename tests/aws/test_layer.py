@@ -1,12 +1,14 @@
 import logging
 import re
 import shutil
+import sys
+import zipfile
 from pathlib import Path
 from unittest.mock import patch
 
 import pulumi
 import pytest
-from pulumi import AssetArchive, FileArchive
+from pulumi import FileArchive
 
 from stelvio.aws._packaging.dependencies import RequirementsSpec
 from stelvio.aws.function.constants import DEFAULT_ARCHITECTURE, DEFAULT_RUNTIME
@@ -43,10 +45,18 @@ def mock_cache_fs(tmp_path, monkeypatch):
         lambda subdir: dot_stelvio / "lambda_dependencies" / subdir,
     )
     monkeypatch.setattr("stelvio.project.get_dot_stelvio_dir", lambda: dot_stelvio)
+    monkeypatch.setattr(
+        "stelvio.aws._packaging.artifacts.get_dot_stelvio_dir", lambda: dot_stelvio
+    )
 
     return layer_cache_base
 
 
+def _archive_names(archive: FileArchive) -> set[str]:
+    with zipfile.ZipFile(archive.path) as zf:
+        return set(zf.namelist())
+
+
 @pytest.mark.parametrize(
     ("code", "requirements", "arch", "runtime"),
     [
@@ -83,6 +93,7 @@ def test_layer_with__(  # noqa: PLR0913
         requirements_abs.touch()
     if code:
         (project_cwd / code).mkdir(parents=True, exist_ok=True)
+        (project_cwd / code / "helpers.py").write_text("VALUE = 1\n")
 
     # Act
     layer = Layer(
@@ -97,18 +108,14 @@ def test_layer_with__(  # noqa: PLR0913
         assert layer_args.inputs["layerName"] == TP + layer_name
         assert layer_args.inputs["compatibleRuntimes"] == [runtime or DEFAULT_RUNTIME]
         assert layer_args.inputs["compatibleArchitectures"] == [arch or DEFAULT_ARCHITECTURE]
-        code_archive: AssetArchive = layer_args.inputs["code"]
-        assert isinstance(code_archive, AssetArchive)
-        assert len(code_archive.assets) == bool(code) + bool(requirements)
+        code_archive = layer_args.inputs["code"]
+        assert isinstance(code_archive, FileArchive)
+        assert Path(code_archive.path).parent == mock_cache_fs.parents[1] / "artifacts" / "layers"
+        names = _archive_names(code_archive)
 
-        # Check code archive
+        # Check code files
         if code:
-            code_dir_name = Path(code).name
-            expected_code_key = f"python/{code_dir_name}"
-            assert expected_code_key in code_archive.assets
-            code_archive_asset = code_archive.assets[expected_code_key]
-            assert isinstance(code_archive_asset, FileArchive)
-            assert code_archive_asset.path == str(project_cwd / code)
+            assert f"python/{Path(code).name}/helpers.py" in names
 
         if not requirements:
             mock_get_or_install_dependencies_layer.assert_not_called()
@@ -126,14 +133,35 @@ def test_layer_with__(  # noqa: PLR0913
             cache_subdirectory=_LAYER_CACHE_SUBDIR,
         )
 
-        # Check dependencies archive
-        expected_depencencies_key = f"python/lib/{runtime or DEFAULT_RUNTIME}/site-packages"
-        assert expected_depencencies_key in code_archive.assets
-        dependencies_archive_asset = code_archive.assets[expected_depencencies_key]
-        assert isinstance(dependencies_archive_asset, FileArchive)
-        assert dependencies_archive_asset.path == str(
-            mock_get_or_install_dependencies_layer.return_value
-        )
+        # Check dependencies
+        site_packages = f"python/lib/{runtime or DEFAULT_RUNTIME}/site-packages"
+        assert f"{site_packages}/dummy_installed_package" in names
+
+    layer.arn.apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_layer_with_precompile_ships_bytecode(
+    pulumi_mocks, project_cwd, mock_cache_fs, mock_get_or_install_dependencies_layer
+):
+    # Arrange
+    code_dir = project_cwd / "src" / "my_layer_code"
+    (code_dir / "__pycache__").mkdir(parents=True)
+    (code_dir / "helpers.py").write_text("VALUE = 1\n")
+    (code_dir / "__pycache__" / "helpers.local.pyc").write_bytes(b"local")
+    runtime = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    cache_tag = sys.implementation.cache_tag
+
+    # Act
+    layer = Layer("precompiled", code="src/my_layer_code", runtime=runtime, precompile=True)
+
+    # Assert
+    def check_resources(_):
+        layer_args = pulumi_mocks.created_layer_versions(TP + "precompiled")[0]
+        assert _archive_names(layer_args.inputs["code"]) == {
+            "python/my_layer_code/helpers.py",
+            f"python/my_layer_code/__pycache__/helpers.{cache_tag}.pyc",
+        }
 
     layer.arn.apply(check_resources)
 
@@ -194,6 +222,7 @@ def test_layer_customize_layer_version_resource(
     # Arrange
     code_path = "src/my_layer_code"
     (project_cwd / code_path).mkdir(parents=True, exist_ok=True)
+    (project_cwd / code_path / "helpers.py").write_text("VALUE = 1\n")
 
     layer = Layer(
         "custom-layer",
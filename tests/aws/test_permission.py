@@ -1,4 +1,20 @@
-from stelvio.aws.permission import AwsPermission
+import json
+
+import pulumi
+
+from stelvio.aws.dynamo_db import DynamoTable
+from stelvio.aws.function import Function
+from stelvio.aws.permission import (
+    MANAGED_POLICY_MAX_SIZE,
+    AwsPermission,
+    compact_permissions,
+    estimate_policy_size,
+    policy_size,
+    render_assume_role_policy,
+    render_policy_document,
+    split_permissions,
+)
+from stelvio.aws.s3 import Bucket
 
 
 def test_init_with_simple_values():
@@ -21,3 +37,183 @@ def test_to_provider_format():
     # Check that values are passed through correctly
     assert provider_format.actions == actions
     assert provider_format.resources == resources
+
+
+@pulumi.runtime.test
+def test_render_policy_document_resolves_output_resources(pulumi_mocks):
+    table = DynamoTable("orders", fields={"id": "string"}, partition_key="id")
+    permissions = [
+        AwsPermission(actions=["dynamodb:GetItem"], resources=[table.arn]),
+        AwsPermission(
+            actions=["s3:GetObject", "s3:PutObject"],
+            resources=["arn:aws:s3:::first/*", "arn:aws:s3:::second/*"],
+        ),
+    ]
+
+    def check_policy(args):
+        policy, table_arn = args
+        assert json.loads(policy) == {
+            "Version": "2012-10-17",
+            "Statement": [
+                {"Effect": "Allow", "Action": ["dynamodb:GetItem"], "Resource": [table_arn]},
+                {
+                    "Effect": "Allow",
+                    "Action": ["s3:GetObject", "s3:PutObject"],
+                    "Resource": ["arn:aws:s3:::first/*", "arn:aws:s3:::second/*"],
+                },
+            ],
+        }
+
+    pulumi.Output.all(render_policy_document(permissions), table.arn).apply(check_policy)
+
+
+def test_render_assume_role_policy():
+    assert json.loads(render_assume_role_policy("lambda.amazonaws.com")) == {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Action": "sts:AssumeRole",
+                "Principal": {"Service": "lambda.amazonaws.com"},
+            }
+        ],
+    }
+
+
+@pulumi.runtime.test
+def test_linked_functions_render_policies_without_provider_invokes(pulumi_mocks, project_cwd):
+    # Benchmark of the program phase: policies used to be rendered by invoking the
+    # AWS provider, one round trip per function, role and public bucket
+    table = DynamoTable("orders", fields={"id": "string"}, partition_key="id")
+    bucket = Bucket("assets", access="public")
+    functions = [
+        Function(f"fn-{index}", handler="functions/simple.handler", links=[table, bucket])
+        for index in range(20)
+    ]
+
+    def check_invokes(_):
+        assert len(pulumi_mocks.created_policies()) == len(functions)
+        assert len(pulumi_mocks.created_roles()) == len(functions)
+        assert [call.token for call in pulumi_mocks.calls] == []
+
+    pulumi.Output.all(
+        *(function.resources.policy.arn for function in functions),
+        bucket.resources.bucket_policy.id,
+    ).apply(check_invokes)
+
+
+TABLE_ARN = "arn:aws:dynamodb:us-east-1:123456789012:table/orders"
+
+
+def _arns(count: int) -> list[str]:
+    return [f"arn:aws:dynamodb:us-east-1:123456789012:table/table-{i:03}" for i in range(count)]
+
+
+def test_compact_permissions_merges_same_actions_and_drops_duplicate_resources():
+    table_arn = pulumi.Output.from_input(TABLE_ARN)
+    permissions = [
+        AwsPermission(actions=["dynamodb:GetItem", "dynamodb:Query"], resources=["arn:a"]),
+        AwsPermission(actions=["s3:GetObject"], resources=["arn:b/*"]),
+        AwsPermission(actions=["dynamodb:Query", "dynamodb:GetItem"], resources=[table_arn]),
+        AwsPermission(actions=["dynamodb:GetItem", "dynamodb:Query"], resources=["arn:a"]),
+        AwsPermission(actions=["dynamodb:GetItem", "dynamodb:Query"], resources=[table_arn]),
+    ]
+
+    assert compact_permissions(permissions) == [
+        AwsPermission(
+            actions=["dynamodb:GetItem", "dynamodb:Query"], resources=["arn:a", table_arn]
+        ),
+        AwsPermission(actions=["s3:GetObject"], resources=["arn:b/*"]),
+    ]
+
+
+@pulumi.runtime.test
+def test_render_policy_document_folds_covered_resources(pulumi_mocks):
+    table_arn = pulumi.Output.from_input(TABLE_ARN)
+    permissions = [
+        AwsPermission(
+            actions=["dynamodb:Query", "dynamodb:Scan"],
+            resources=[
+                table_arn.apply(lambda arn: f"{arn}/index/*"),
+                table_arn.apply(lambda arn: f"{arn}/index/*"),
+                table_arn.apply(lambda arn: f"{arn}/index/by-date"),
+            ],
+        ),
+        AwsPermission(actions=["dynamodb:GetItem"], resources=[table_arn]),
+        # A wider link to the same table covers all of the above
+        AwsPermission(actions=["dynamodb:*"], resources=[TABLE_ARN, f"{TABLE_ARN}/*"]),
+        AwsPermission(actions=["s3:GetObject"], resources=["arn:aws:s3:::assets/*"]),
+    ]
+
+    def check_policy(policy):
+        assert json.loads(policy)["Statement"] == [
+            {
+                "Effect": "Allow",
+                "Action": ["dynamodb:*"],
+                "Resource": [TABLE_ARN, f"{TABLE_ARN}/*"],
+            },
+            {"Effect": "Allow", "Action": ["s3:GetObject"], "Resource": ["arn:aws:s3:::assets/*"]},
+        ]
+
+    render_policy_document(permissions).apply(check_policy)
+
+
+@pulumi.runtime.test
+def test_render_policy_document_keeps_equivalent_statements(pulumi_mocks):
+    permissions = [
+        AwsPermission(actions=["dynamodb:GetItem"], resources=[TABLE_ARN]),
+        AwsPermission(actions=["DynamoDB:GetItem"], resources=[TABLE_ARN]),
+    ]
+
+    def check_policy(policy):
+        assert len(json.loads(policy)["Statement"]) == 2
+
+    render_policy_document(permissions).apply(check_policy)
+
+
+def test_policy_size_ignores_whitespace():
+    document = json.dumps({"Version": "2012-10-17", "Statement": []}, indent=4)
+
+    assert policy_size(document) == len('{"Version":"2012-10-17","Statement":[]}')
+
+
+def test_split_permissions_keeps_small_policy_whole():
+    permissions = [
+        AwsPermission(actions=["dynamodb:GetItem"], resources=_arns(3)),
+        AwsPermission(actions=["s3:GetObject"], resources=["arn:aws:s3:::assets/*"]),
+    ]
+
+    assert split_permissions(permissions) == [permissions]
+
+
+def test_split_permissions_splits_large_statement_by_resources():
+    permission = AwsPermission(actions=["dynamodb:GetItem"], resources=_arns(150))
+
+    groups = split_permissions([permission])
+
+    assert len(groups) == 2
+    assert [r for group in groups for p in group for r in p.resources] == _arns(150)
+    for group in groups:
+        assert estimate_policy_size(group) <= MANAGED_POLICY_MAX_SIZE
+
+
+def test_split_permissions_fills_earlier_policies_first():
+    large = AwsPermission(actions=["dynamodb:GetItem"], resources=_arns(90))
+    medium = AwsPermission(actions=["dynamodb:Query"], resources=_arns(20))
+    small = AwsPermission(actions=["s3:GetObject"], resources=["arn:aws:s3:::assets/*"])
+
+    groups = split_permissions([large, medium, small])
+
+    assert groups == [[large, small], [medium]]
+
+
+def test_split_permissions_estimates_output_resources():
+    permission = AwsPermission(
+        actions=["dynamodb:GetItem"],
+        resources=[pulumi.Output.from_input(arn) for arn in _arns(60)],
+    )
+
+    groups = split_permissions([permission])
+
+    assert len(groups) == 2
+    assert estimate_policy_size(groups[0]) <= MANAGED_POLICY_MAX_SIZE
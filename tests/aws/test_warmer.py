@@ -0,0 +1,82 @@
+import json
+
+import pulumi
+import pytest
+
+from stelvio.aws.function import Function
+from stelvio.aws.warmer import Warmer, create_warmers
+
+from ..conftest import TP
+
+
+@pulumi.runtime.test
+def test_warmer_pings_functions_sharing_a_rate(pulumi_mocks, project_cwd):
+    # Arrange
+    Function("api", handler="functions/simple.handler", warm=True)
+    Function("orders", handler="functions/simple.handler", warm={"concurrency": 3})
+    Function("cold", handler="functions/simple.handler")
+
+    # Act
+    warmers = create_warmers()
+
+    # Assert
+    assert [warmer.name for warmer in warmers] == ["warmer-5-minutes"]
+    warmer = warmers[0]
+    assert [function.name for function in warmer.functions] == ["api", "orders"]
+
+    def check_resources(_):
+        rules = pulumi_mocks.created_event_rules()
+        assert len(rules) == 1
+        assert rules[0].inputs["scheduleExpression"] == "rate(5 minutes)"
+
+        target = pulumi_mocks.created_event_targets(f"{TP}warmer-5-minutes-orders")[0]
+        assert json.loads(target.inputs["input"]) == {"stlv_warm": {"concurrency": 3}}
+        assert target.inputs["arn"].endswith(f"function:{TP}orders-test-name")
+
+        permission = pulumi_mocks.assert_permission_created(
+            f"{TP}warmer-5-minutes-orders-permission"
+        )
+        assert permission.inputs["principal"] == "events.amazonaws.com"
+
+    pulumi.Output.all(*[target.id for target in warmer.resources.targets]).apply(check_resources)
+
+
+@pulumi.runtime.test
+def test_warmer_spreads_functions_over_rules_of_five(pulumi_mocks, project_cwd):
+    # Arrange
+    for index in range(7):
+        Function(f"fn-{index}", handler="functions/simple.handler", warm=True)
+
+    # Act
+    warmer = create_warmers()[0]
+
+    # Assert
+    def check_resources(_):
+        rules = pulumi_mocks.created_event_rules()
+        assert [rule.name for rule in rules] == [
+            f"{TP}warmer-5-minutes-0",
+            f"{TP}warmer-5-minutes-1",
+        ]
+        assert len(pulumi_mocks.created_event_targets()) == 7
+
+    pulumi.Output.all(*[rule.id for rule in warmer.resources.rules]).apply(check_resources)
+
+
+def test_create_warmers_groups_functions_by_rate(project_cwd):
+    Function("fast", handler="functions/simple.handler", warm={"rate": "1 minute"})
+    Function("slow", handler="functions/simple.handler", warm={"rate": "15 minutes"})
+
+    warmers = create_warmers()
+
+    assert [warmer.name for warmer in warmers] == ["warmer-1-minute", "warmer-15-minutes"]
+
+
+def test_create_warmers_without_warmed_functions(project_cwd):
+    Function("cold", handler="functions/simple.handler")
+
+    assert create_warmers() == []
+
+
+def test_warmer_rejects_invalid_rate(project_cwd):
+    with pytest.raises(ValueError, match="Invalid rate expression"):
+        Warmer("warmer-bad", "5 fortnights", [])
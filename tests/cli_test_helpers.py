@@ -88,6 +88,9 @@ class FakeCommandRun:
     def delete_snapshots(self) -> None:
         return None
 
+    def clean_staged_artifacts(self, *, destroyed: bool = False) -> None:
+        return None
+
     def complete_update(self, errors=None) -> None:
         return None
 
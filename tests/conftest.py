@@ -6,7 +6,8 @@ from unittest.mock import patch
 import pytest
 from pulumi.runtime import set_mocks
 
-from stelvio.aws.function.function import LinkPropertiesRegistry
+from stelvio.aws._packaging.size_budget import ArtifactContentsRegistry
+from stelvio.aws.function.function import AutoLayersRegistry, LinkPropertiesRegistry
 from stelvio.command_run import _PRELOADED_APP_CONFIGS
 from stelvio.component import ComponentRegistry
 from stelvio.config import AwsConfig
@@ -40,6 +41,8 @@ def _ensure_event_loop():
 @pytest.fixture(autouse=True)
 def clean_registries():
     LinkPropertiesRegistry._folder_links_properties_map.clear()
+    AutoLayersRegistry.clear()
+    ArtifactContentsRegistry.clear()
     ComponentRegistry._instances.clear()
     ComponentRegistry._registered_names.clear()
     ComponentRegistry._user_link_creators.clear()
@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from stelvio.app import StelvioApp
+from stelvio.aws.dynamo_db import DynamoTable
+from stelvio.aws.function import Function
+from stelvio.build import (
+    MANIFEST_VERSION,
+    analyze_function_sizes,
+    build_artifacts,
+    write_build_manifest,
+)
+from stelvio.component import ComponentRegistry
+
+
+@pytest.fixture
+def build_app(project_cwd):
+    app = StelvioApp("test-app")
+
+    @app.run
+    def run() -> None:
+        table = DynamoTable("todos", fields={"id": "S"}, partition_key="id")
+        Function("users", handler="functions/users.handler", links=[table])
+        Function("users-copy", handler="functions/users.handler", links=[table])
+        # Explicitly no layers, sizes are measured without any
+        Function("orders", handler="functions/orders.handler", layers=None)
+
+    yield app
+    StelvioApp._StelvioApp__instance = None  # type: ignore[attr-defined]
+
+
+def test_build_artifacts_packages_every_function(build_app, project_cwd: Path):
+    artifacts = build_artifacts(max_workers=2)
+
+    assert [(a.kind, a.component) for a in artifacts] == [
+        ("functions", "users"),
+        ("functions", "users-copy"),
+        ("functions", "orders"),
+    ]
+    for artifact in artifacts:
+        assert artifact.path.is_file()
+        assert artifact.path.parent == project_cwd / ".stelvio" / "artifacts" / "functions"
+        assert not artifact.cached
+    # Functions with the same code and links share one artifact
+    assert artifacts[0].path == artifacts[1].path
+
+
+def test_build_artifacts_reuses_built_artifacts(build_app):
+    first = build_artifacts()
+    # A later run (e.g. a deploy) registers the components anew
+    ComponentRegistry._instances.clear()
+    ComponentRegistry._registered_names.clear()
+
+    again = build_artifacts()
+
+    assert [a.path for a in again] == [a.path for a in first]
+    assert all(a.cached for a in again)
+
+
+def test_write_build_manifest(build_app, project_cwd: Path):
+    artifacts = build_artifacts()
+    manifest_path = project_cwd / "out" / "manifest.json"
+
+    manifest = write_build_manifest(artifacts, manifest_path)
+
+    assert json.loads(manifest_path.read_text()) == manifest
+    assert manifest["version"] == MANIFEST_VERSION
+    assert (manifest["app"], manifest["env"]) == ("test", "test")
+    entry = manifest["artifacts"][0]
+    assert entry["component"] == "users"
+    assert entry["kind"] == "functions"
+    assert entry["path"] == f".stelvio/artifacts/functions/{artifacts[0].fingerprint}.zip"
+    assert entry["size"] == artifacts[0].path.stat().st_size
+    assert entry["cached"] is False
+    assert "peak_rss" not in entry
+    assert manifest["peak_rss"] > 0
+    assert manifest["functions"] == []
+
+
+def test_analyze_function_sizes_reports_every_function(build_app, project_cwd: Path):
+    artifacts = build_artifacts()
+
+    reports = analyze_function_sizes()
+
+    assert [report.function for report in reports] == ["users", "users-copy", "orders"]
+    assert reports[0].zipped_size == artifacts[0].size
+    assert all(report.violations == [] for report in reports)
+    manifest = write_build_manifest(artifacts, project_cwd / "manifest.json", reports)
+    assert manifest["functions"][2]["function"] == "orders"
@@ -1,5 +1,6 @@
 import json
 import sys
+from contextlib import nullcontext
 from io import StringIO
 from types import SimpleNamespace
 from unittest.mock import Mock, patch
@@ -170,7 +171,7 @@ def test_run_deploy_passes_output_lines_to_completion() -> None:
     handler = Mock()
 
     with (
-        patch.object(commands_module, "_reset_cache_tracking"),
+        patch.object(commands_module, "_track_caches", nullcontext),
         patch.object(commands_module, "_clean_stale_caches"),
         patch.object(commands_module, "print_operation_header"),
         patch.object(commands_module, "CommandRun", return_value=fake_run),
@@ -200,7 +201,7 @@ def test_run_diff_json_prints_summary_without_human_header() -> None:
 
     with (
         patch.object(commands_module, "console", fake_console),
-        patch.object(commands_module, "_reset_cache_tracking"),
+        patch.object(commands_module, "_track_caches", nullcontext),
         patch.object(commands_module, "_clean_stale_caches"),
         patch.object(commands_module, "print_operation_header") as header_mock,
         patch.object(
@@ -231,7 +232,7 @@ def test_run_deploy_json_prints_summary_without_human_header() -> None:
 
     with (
         patch.object(commands_module, "console", fake_console),
-        patch.object(commands_module, "_reset_cache_tracking"),
+        patch.object(commands_module, "_track_caches", nullcontext),
         patch.object(commands_module, "_clean_stale_caches"),
         patch.object(commands_module, "print_operation_header") as header_mock,
         patch.object(
@@ -319,7 +320,7 @@ def test_run_deploy_stream_prints_jsonl_start_and_summary_only() -> None:
     }
 
     with (
-        patch.object(commands_module, "_reset_cache_tracking"),
+        patch.object(commands_module, "_track_caches", nullcontext),
         patch.object(commands_module, "_clean_stale_caches"),
         patch.object(commands_module, "print_operation_header") as header_mock,
         patch.object(
@@ -21,3 +21,9 @@ def test_stelvio_app_config_rejects_non_string_tag_values():
 def test_stelvio_app_config_rejects_non_string_tag_keys():
     with pytest.raises(TypeError, match="string keys and values"):
         StelvioAppConfig(tags={123: "platform"})  # type: ignore[dict-item]
+
+
+@pytest.mark.parametrize("budget", [-1, True, "100"])
+def test_stelvio_app_config_rejects_invalid_concurrency_budget(budget):
+    with pytest.raises(ValueError, match="expected a non-negative integer"):
+        StelvioAppConfig(concurrency_budget=budget)
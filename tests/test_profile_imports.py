@@ -0,0 +1,83 @@
+import sys
+
+import pytest
+
+from stelvio.app import StelvioApp
+from stelvio.aws.function import Function
+from stelvio.aws.layer import Layer
+from stelvio.exceptions import StelvioValidationError
+from stelvio.profile_imports import _parse_importtime, profile_function_imports
+
+# Profiling with the interpreter running the tests needs no other Python installed
+RUNTIME = f"python{sys.version_info.major}.{sys.version_info.minor}"
+
+
+@pytest.fixture
+def profile_app(project_cwd):
+    (project_cwd / "functions" / "simple.py").write_text(
+        "import decimal\nimport shared\ndef handler(event, context): ...\n"
+    )
+    (project_cwd / "functions" / "broken.py").write_text("import missing_module\n")
+    (project_cwd / "src" / "shared").mkdir(parents=True)
+    (project_cwd / "src" / "shared" / "__init__.py").write_text("import fractions\n")
+    app = StelvioApp("test-app")
+
+    @app.run
+    def run() -> None:
+        layer = Layer("shared", code="src/shared", runtime=RUNTIME)
+        Function("simple", handler="functions/simple.handler", runtime=RUNTIME, layers=[layer])
+        Function("broken", handler="functions/broken.handler", runtime=RUNTIME)
+
+    yield app
+    StelvioApp._StelvioApp__instance = None  # type: ignore[attr-defined]
+
+
+def test_profile_imports_handler_with_layers(profile_app):
+    profile = profile_function_imports("simple")
+
+    assert profile.function == "simple"
+    assert profile.handler_module == "simple"
+    assert profile.import_time_us > 0
+    modules = {module.module: module for module in profile.modules}
+    assert modules["simple"].depth == 0
+    # Imported from the layer
+    assert modules["shared"].depth == 1
+    assert modules["fractions"].depth == 2
+    assert profile.module_count == len(profile.modules)
+    assert [(a.kind, a.component) for a in profile.artifacts] == [
+        ("functions", "simple"),
+        ("layers", "shared"),
+    ]
+    assert dict(profile.artifacts[0].entries) == {"simple.py": 62}
+    assert dict(profile.artifacts[1].entries) == {"shared": 17}
+
+    report = profile.to_dict(top=2)
+    assert len(report["top_modules"]) == 2
+    assert report["module_count"] == profile.module_count
+
+
+def test_profile_imports_reports_import_errors(profile_app):
+    with pytest.raises(RuntimeError, match="No module named 'missing_module'"):
+        profile_function_imports("broken")
+
+
+def test_profile_imports_unknown_function(profile_app):
+    with pytest.raises(StelvioValidationError, match="Functions in this app: broken, simple"):
+        profile_function_imports("other")
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:        50 |         50 |     _decimal\n"
+        "import time:       120 |        170 |   decimal\n"
+        "import time:        30 |        200 | handler\n"
+    )
+
+    modules = _parse_importtime(output)
+
+    assert [(m.module, m.self_us, m.cumulative_us, m.depth) for m in modules] == [
+        ("_decimal", 50, 50, 2),
+        ("decimal", 120, 170, 1),
+        ("handler", 30, 200, 0),
+    ]